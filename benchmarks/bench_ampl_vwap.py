@@ -0,0 +1,143 @@
+"""Benchmark: AMPL VWAP over a synthetic day of Bitfinex trades
+
+Compares the VWAP of one "via" route with debug output (AMPL/BTC converted
+with BTC/USD) against the previous implementation, which built every bucket
+twice and walked back slot by slot to the latest BTC/USD bucket, and checks
+both give identical results. It is run a second time with no BTC/USD trades
+in the last hours of the day. Paging through the day with a local stub of
+the Bitfinex API is timed as well.
+
+Usage:
+    python benchmarks/bench_ampl_vwap.py [--trades 500000] [--gap-hours 12]
+"""
+import argparse
+import asyncio
+import random
+import time
+from bisect import bisect_left
+from bisect import bisect_right
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from telliot_feeds.sources.ampleforth import bitfinex
+from telliot_feeds.sources.ampleforth.bitfinex import build_buckets
+from telliot_feeds.sources.ampleforth.bitfinex import RequestBudget
+from telliot_feeds.sources.ampleforth.bitfinex import retrieve_bitfinex_trades
+from telliot_feeds.sources.ampleforth.bitfinex import vwap_from_buckets
+
+DAY_START = 1675296000000
+DAY = 86400000
+
+
+def reference_merge_as_list(from_map: Dict[int, Any], to_map: Dict[int, Any]) -> List[Dict[str, Any]]:
+    """Previous merge walking back slot by slot to the latest "to" bucket"""
+    merged = []
+    for slot, from_slot in from_map.items():
+        s = slot
+        to_slot = None
+        while not to_slot:
+            if s < 0:
+                break
+            to_slot = to_map.get(s)
+            s = s - 1
+        if to_slot:
+            merged.append(
+                {
+                    "trades": abs((to_slot["vwap"] * from_slot["vwap"]) * from_slot["volume"]),
+                    "volume": from_slot["volume"],
+                }
+            )
+    return merged
+
+
+def reference_single_via(start: int, from_list: List[List[Any]], to_list: List[List[Any]]) -> Dict[str, Any]:
+    """Previous VWAP of one "via" route with debug output, which built every bucket twice"""
+    merged = reference_merge_as_list(build_buckets(start, from_list), build_buckets(start, to_list))
+    sum_volume = sum([m["volume"] for m in merged])
+    result: Dict[str, Any] = {"vwap": {"vwap": sum([m["trades"] for m in merged]) / sum_volume, "volume": sum_volume}}
+    result["from"] = [{"slot": slot, **bucket} for slot, bucket in build_buckets(start, from_list).items()]
+    result["to"] = [{"slot": slot, **bucket} for slot, bucket in build_buckets(start, to_list).items()]
+    return result
+
+
+def single_via(start: int, from_list: List[List[Any]], to_list: List[List[Any]]) -> Dict[str, Any]:
+    """Current VWAP of one "via" route with debug output"""
+    from_map = build_buckets(start, from_list)
+    to_map = build_buckets(start, to_list)
+    result: Dict[str, Any] = {"vwap": vwap_from_buckets(from_map, to_map)}
+    result["from"] = [{"slot": slot, **bucket} for slot, bucket in from_map.items()]
+    result["to"] = [{"slot": slot, **bucket} for slot, bucket in to_map.items()]
+    return result
+
+
+def synthetic_trades(n: int, price: float, gaps: List[Tuple[int, int]], seed: int) -> List[List[Any]]:
+    """Time-sorted trades over one day in Bitfinex format, none within `gaps`"""
+    rng = random.Random(seed)
+    trades = []
+    while len(trades) < n:
+        ts = DAY_START + rng.randrange(DAY)
+        if any(lo <= ts < hi for lo, hi in gaps):
+            continue
+        amount = round(rng.uniform(-50, 50), 4)
+        trades.append([0, ts, amount, round(price * rng.lognormvariate(0, 0.01), 8)])
+    trades.sort(key=lambda t: t[1])
+    for i, t in enumerate(trades):
+        t[0] = i
+    return trades
+
+
+class StubClient:
+    """Serves trade history pages of one pair like the Bitfinex API, start and end inclusive"""
+
+    def __init__(self, trades: List[List[Any]]) -> None:
+        self.trades = trades
+        self.times = [t[1] for t in trades]
+        self.requests = 0
+
+    async def get(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests += 1
+        lo = bisect_left(self.times, params["start"])
+        hi = bisect_right(self.times, params["end"])
+        end = min(hi, lo + params["limit"])
+        return {"response": self.trades[lo:end], "status": 200}
+
+
+def timed(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(n_trades: int, gap_hours: int) -> None:
+    hour = DAY // 24
+    n_from = n_trades * 7 // 10
+    from_list = synthetic_trades(n_from, 0.00005, [], seed=1)
+    print(f"{n_trades} trades: {n_from} AMPL/BTC, {n_trades - n_from} BTC/USD")
+    print(f"{'BTC/USD gaps':<22} {'previous (s)':>13} {'current (s)':>12} {'VWAP':>14}")
+    for gap in (0, gap_hours):
+        gaps = [(DAY_START + DAY - gap * hour, DAY_START + DAY)] if gap else []
+        to_list = synthetic_trades(n_trades - n_from, 23000.0, gaps, seed=2)
+
+        reference, t_reference = timed(lambda: reference_single_via(DAY_START, from_list, to_list))
+        current, t_current = timed(lambda: single_via(DAY_START, from_list, to_list))
+        assert current == reference, "VWAP or buckets differ from the previous implementation"
+        label = f"none in last {gap}h" if gap else "none"
+        print(f"{label:<22} {t_reference:>13.3f} {t_current:>12.3f} {current['vwap']['vwap']:>14.10f}")
+
+    stub = StubClient(from_list)
+    bitfinex.get_http_client = lambda: stub  # type: ignore
+    bitfinex.request_budget = RequestBudget(requests=10**9)
+    paged, t_paged = timed(lambda: asyncio.run(retrieve_bitfinex_trades("tAMPBTC", DAY_START, DAY_START + DAY - 1)))
+    assert [t[0] for t in paged] == [t[0] for t in from_list], "paging lost or repeated trades"
+    print(f"paged {len(paged)} AMPL/BTC trades in {stub.requests} requests ({t_paged:.3f}s without rate limit)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trades", type=int, default=500_000)
+    parser.add_argument("--gap-hours", type=int, default=12)
+    args = parser.parse_args()
+    main(args.trades, args.gap_hours)
@@ -0,0 +1,108 @@
+"""Benchmark: blocking per-request sessions vs. the shared async HTTP client
+
+Starts a local stub price API that answers after a fixed latency and fetches
+a 5-source median both ways. With blocking `requests` calls inside coroutines
+the sources run one after another; with the pooled client the median takes
+about as long as the slowest source.
+
+Usage:
+    python benchmarks/bench_http_client.py [--sources 5] [--latency 0.2] [--rounds 3]
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from typing import Any
+from typing import Tuple
+
+import requests
+from aiohttp import web
+
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
+from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.price_service import WebPriceService
+from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.sources.price_aggregator import PriceAggregator
+
+
+def start_stub_server(latency: float) -> Tuple[str, Any]:
+    """Run a stub price API on its own thread and event loop"""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    address = {}
+
+    async def price(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.json_response({"price": float(request.match_info["value"])})
+
+    async def serve() -> None:
+        app = web.Application()
+        app.router.add_get("/price/{value}", price)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        address["url"] = "http://127.0.0.1:{}".format(site._server.sockets[0].getsockname()[1])  # type: ignore
+        started.set()
+
+    def run() -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(serve())
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    return address["url"], loop
+
+
+class BlockingStubService(WebPriceService):
+    """Previous behaviour: a new blocking session per request"""
+
+    async def get_price(self, asset: str, currency: str) -> OptionalDataPoint[float]:
+        with requests.Session() as s:
+            r = s.get(f"{self.url}/price/{asset}", timeout=self.timeout)
+        return float(r.json()["price"]), datetime_now_utc()
+
+
+class AsyncStubService(WebPriceService):
+    """Current behaviour: the shared pooled client"""
+
+    async def get_price(self, asset: str, currency: str) -> OptionalDataPoint[float]:
+        d = await self.get_url(f"/price/{asset}")
+        if "error" in d:
+            return None, None
+        return float(d["response"]["price"]), datetime_now_utc()
+
+
+async def time_median(service_cls: Any, url: str, n_sources: int, rounds: int) -> float:
+    sources = [
+        PriceSource(asset=str(float(i)), currency="usd", service=service_cls(name="stub", url=url))
+        for i in range(n_sources)
+    ]
+    agg = PriceAggregator(asset="stub", currency="usd", sources=sources)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await agg.fetch_new_datapoint()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+async def main(n_sources: int, latency: float, rounds: int) -> None:
+    url, _ = start_stub_server(latency)
+    blocking = await time_median(BlockingStubService, url, n_sources, rounds)
+    pooled = await time_median(AsyncStubService, url, n_sources, rounds)
+    print(f"{n_sources} sources, {latency:.3f}s latency each, median of {rounds} rounds")
+    print(f"  blocking requests.Session : {blocking:.3f}s")
+    print(f"  shared async client       : {pooled:.3f}s")
+    print(f"  speedup                   : {blocking / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.sources, args.latency, args.rounds))
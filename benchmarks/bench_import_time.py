@@ -0,0 +1,68 @@
+"""Benchmark: cold-start import time of the CLI and the feed registry
+
+Each target is imported in a fresh interpreter with `python -X importtime`
+and the cumulative import time of its top-level module is reported (median
+of several runs), together with the number of feed modules that were
+imported along the way.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 5]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import List
+from typing import Tuple
+
+
+TARGETS = [
+    ("feed registry", "import telliot_feeds.feeds"),
+    ("one catalog feed", "from telliot_feeds.feeds import CATALOG_FEEDS; CATALOG_FEEDS['eth-usd-spot']"),
+    ("telliot catalog", "import telliot_feeds.cli.commands.catalog"),
+    ("telliot report", "import telliot_feeds.cli.commands.report"),
+    ("telliot (all commands)", "import telliot_feeds.cli.main"),
+]
+
+COUNT_FEED_MODULES = "; import sys; print(sum(m.startswith('telliot_feeds.feeds.') for m in sys.modules))"
+
+
+def import_time(statement: str) -> Tuple[float, int]:
+    """Seconds spent importing for a statement, and feed modules imported by it"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement + COUNT_FEED_MODULES],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    # lines look like "import time: self [us] | cumulative | imported package"
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if not name.startswith(" ") or name.startswith("  "):
+            continue  # only top-level imports, nested ones are included in their parent
+        total_us += int(cumulative)
+    return total_us / 1e6, int(result.stdout.strip().splitlines()[-1])
+
+
+def main(runs: int) -> None:
+    print(f"{'target':<24} {'import (s)':>11} {'feed modules':>13}")
+    for name, statement in TARGETS:
+        try:
+            samples: List[Tuple[float, int]] = [import_time(statement) for _ in range(runs)]
+        except RuntimeError as e:
+            print(f"{name:<24} {'failed':>11}   {e}")
+            continue
+        seconds = statistics.median(s for s, _ in samples)
+        print(f"{name:<24} {seconds:>11.3f} {samples[-1][1]:>13}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.runs)
@@ -0,0 +1,105 @@
+"""Benchmark: query catalog lookups on the funded-feed path
+
+The tip listener resolves every funded feed's query data to a catalog tag
+(`feed_from_catalog_feeds`, `qtag_from_query_catalog`) and again to a catalog
+entry in the price threshold filter (`query_from_query_catalog`). This
+replays those lookups for every catalog query and compares the indexed
+`Catalog.find` with the previous linear scan over all entries.
+
+Usage:
+    python benchmarks/bench_query_catalog.py [--rounds 20]
+"""
+import argparse
+import time
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+from unittest import mock
+
+from telliot_feeds.queries.catalog import Catalog
+from telliot_feeds.queries.query_catalog import query_catalog
+from telliot_feeds.utils import query_search_utils
+
+
+def linear_find(
+    self: Catalog,
+    *,
+    tag: Optional[str] = None,
+    query_id: Optional[str] = None,
+    query_type: Optional[str] = None,
+    active: Optional[bool] = None,
+) -> List[Any]:
+    """Previous implementation of Catalog.find, kept for comparison"""
+    entries = []
+    for entry in self._entries.values():
+        if tag is not None:
+            if tag not in entry.tag:
+                continue
+        if query_id is not None:
+            if query_id[:2] not in ["0x", "0X"]:
+                query_id = "0x" + query_id
+            if query_id.lower() != entry.query_id.lower():
+                continue
+        if query_type is not None:
+            if query_type.lower() != entry.query_type.lower():
+                continue
+        if active is not None:
+            if active != entry.active:
+                continue
+        entries.append(entry)
+    return entries
+
+
+def funded_feed_lookups(query_data: List[bytes], query_ids: List[str]) -> List[Any]:
+    """Catalog lookups made by the tip listener for one batch of funded feeds"""
+    results = []
+    for qdata, qid in zip(query_data, query_ids):
+        results.append(query_search_utils.feed_from_catalog_feeds(qdata))
+        results.append(query_search_utils.qtag_from_query_catalog(qid=qid))
+        results.append(query_search_utils.query_from_query_catalog(qid=qid))
+    return results
+
+
+def timed(fn: Callable[[], Any], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def main(rounds: int) -> None:
+    entries = query_catalog.find()
+    query_data = [entry.query.query_data for entry in entries]
+    query_ids = [entry.query_id for entry in entries]
+    tags = ["eth", "usd-spot", "volatility", "btc-usd-spot"]
+    lookups = 3 * len(entries)
+
+    indexed = funded_feed_lookups(query_data, query_ids)
+    t_indexed = timed(lambda: funded_feed_lookups(query_data, query_ids), rounds)
+    t_indexed_tags = timed(lambda: [query_catalog.find(tag=tag) for tag in tags], rounds * 50)
+
+    with mock.patch.object(Catalog, "find", linear_find):
+        linear = funded_feed_lookups(query_data, query_ids)
+        t_linear = timed(lambda: funded_feed_lookups(query_data, query_ids), rounds)
+        t_linear_tags = timed(lambda: [query_catalog.find(tag=tag) for tag in tags], rounds * 50)
+
+    assert indexed == linear, "indexed and linear lookups disagree"
+
+    print(f"{len(entries)} catalog entries, {lookups} lookups per funded-feed batch")
+    print(f"{'':<24} {'linear':>10} {'indexed':>10} {'speedup':>8}")
+    print(
+        f"{'funded-feed batch (ms)':<24} {1e3 * t_linear:>10.2f} {1e3 * t_indexed:>10.2f} "
+        f"{t_linear / t_indexed:>7.1f}x"
+    )
+    print(
+        f"{'tag substring (us)':<24} {1e6 * t_linear_tags / len(tags):>10.1f} "
+        f"{1e6 * t_indexed_tags / len(tags):>10.1f} {t_linear_tags / t_indexed_tags:>7.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    main(args.rounds)
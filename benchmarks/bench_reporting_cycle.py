@@ -0,0 +1,254 @@
+"""Benchmark: reporting cycle stages replayed from recorded traffic
+
+Record the HTTP and JSON-RPC traffic of the scenarios once (needs network
+access, and for `report-once` a funded, staked account; it sends a real
+transaction):
+
+    python benchmarks/bench_reporting_cycle.py record spot-median tip-scan report-once --account my-acct
+
+Then replay them from a local server, without network access:
+
+    python benchmarks/bench_reporting_cycle.py replay [--latency 0.05] [--jitter 0.02] [--rounds 5]
+
+For every stage, the median wall-clock time over the rounds, the HTTP and
+JSON-RPC calls made and the peak memory (traced in one extra round) are
+printed. `--json` saves them, `--baseline` compares them with a saved run
+and exits with status 1 if a scenario has no cassette or could not be
+replayed, or if a stage is missing, makes more calls or is slower than the
+tolerance allows.
+
+Scenarios: spot-median, evm-call, mimicry, daily-volatility, tip-scan, report-once
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tracemalloc
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from urllib.parse import parse_qsl
+from urllib.parse import urlsplit
+
+from replay.cassette import Cassette
+from replay.cassette import Redactor
+from replay.intercept import Interceptor
+from replay.intercept import Recorder
+from replay.intercept import Replayer
+from replay.scenarios import cold_caches
+from replay.scenarios import SCENARIOS
+from replay.scenarios import Skipped
+from replay.server import ReplayServer
+from replay.stages import Run
+from replay.stages import Stage
+
+CASSETTES = Path(__file__).parent / "cassettes"
+
+
+def config_secrets(extra: List[str]) -> List[str]:
+    """API keys and keys embedded in node URLs of the telliot configuration"""
+    from telliot_core.apps.telliot_config import TelliotConfig
+
+    secrets = list(extra)
+    try:
+        cfg = TelliotConfig()
+        secrets += [k.key for k in cfg.api_keys.keys if k.key]
+        for endpoint in cfg.endpoints.endpoints:
+            parts = urlsplit(endpoint.url)
+            secrets += [segment for segment in parts.path.split("/") if len(segment) >= 20]
+            secrets += [value for _, value in parse_qsl(parts.query) if len(value) >= 20]
+    except Exception as e:
+        print(f"Only redacting --redact secrets, unable to read telliot config: {e}")
+    return secrets
+
+
+async def run_closing(name: str, run: Run) -> None:
+    """Run a scenario, closing the shared HTTP client before its event loop ends"""
+    from telliot_feeds.utils.http_client import close_http_client
+
+    try:
+        await SCENARIOS[name](run)
+    finally:
+        await close_http_client()
+
+
+def run_scenario(
+    name: str, interceptor: Interceptor, meta: Dict[str, Any], options: Dict[str, Any], trace: bool
+) -> Run:
+    run = Run(calls=interceptor.calls, meta=meta, options=options, trace_memory=trace)
+    with cold_caches():
+        try:
+            asyncio.run(run_closing(name, run))
+        except Skipped:
+            raise
+        except Exception as e:
+            print(f"{name}: scenario raised {type(e).__name__}: {e}")
+    return run
+
+
+def record(args: argparse.Namespace) -> None:
+    redactor = Redactor(config_secrets(args.redact))
+    options = {"account": args.account, "chain_id": args.chain_id, "query_tag": args.query_tag}
+    for name in args.scenarios:
+        cassette = Cassette(meta={"scenario": name, "recorded": datetime.now(timezone.utc).isoformat()})
+        with Recorder(cassette, redactor) as recorder:
+            try:
+                run = run_scenario(name, recorder, cassette.meta, options, trace=False)
+            except Skipped as e:
+                print(f"{name}: skipped, {e}")
+                continue
+        path = args.cassettes / f"{name}.json"
+        cassette.save(path)
+        print(f"{name}: recorded {len(cassette.interactions)} requests to {path}")
+        print_stages(name, [run.stages])
+
+
+def replay(args: argparse.Namespace) -> int:
+    redactor = Redactor(config_secrets(args.redact))
+    report: Dict[str, Any] = {"latency": args.latency, "jitter": args.jitter, "rounds": args.rounds, "scenarios": {}}
+    missing: List[str] = []
+    for name in args.scenarios:
+        path = args.cassettes / f"{name}.json"
+        if not path.exists():
+            print(f"{name}: skipped, no cassette at {path}")
+            missing.append(f"{name}: no cassette at {path}")
+            continue
+        cassette = Cassette.load(path)
+        server = ReplayServer(cassette, latency=args.latency, jitter=args.jitter, seed=args.seed, redactor=redactor)
+        server.start()
+        rounds: List[List[Stage]] = []
+        try:
+            with Replayer(server.url) as replayer:
+                for i in range(args.rounds + 1):
+                    # the extra round traces memory, which slows it down too much to time it
+                    trace = i == args.rounds
+                    server.rewind()
+                    if trace:
+                        tracemalloc.start()
+                    try:
+                        run = run_scenario(name, replayer, dict(cassette.meta), {}, trace=trace)
+                    finally:
+                        if trace:
+                            tracemalloc.stop()
+                    rounds.append(run.stages)
+        except Skipped as e:
+            print(f"{name}: skipped, {e}")
+            missing.append(f"{name}: skipped, {e}")
+            continue
+        finally:
+            server.stop()
+
+        print_stages(name, rounds)
+        if server.inexact:
+            print(f"  answered from recordings of other requests: {dict(server.inexact)}")
+        if server.misses:
+            print(f"  not recorded: {dict(server.misses)}")
+        report["scenarios"][name] = summarize(rounds, server)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=1))
+    if args.baseline:
+        for scenario in missing:
+            print(f"MISSING {scenario}")
+        status = compare(report, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        return 1 if missing else status
+    if not report["scenarios"]:
+        print("No scenario was replayed")
+        return 1
+    return 0
+
+
+def summarize(rounds: List[List[Stage]], server: Optional[ReplayServer] = None) -> Dict[str, Any]:
+    timed, traced = rounds[:-1] or rounds, rounds[-1]
+    stages: Dict[str, Any] = {}
+    for stage in traced:
+        walls = [s.wall for r in timed for s in r if s.name == stage.name]
+        stages[stage.name] = {
+            "wall": statistics.median(walls) if walls else stage.wall,
+            "walls": walls,
+            "http_calls": sum(stage.http.values()),
+            "rpc_calls": sum(stage.rpc.values()),
+            "http": stage.http,
+            "rpc": stage.rpc,
+            "peak_memory": stage.peak_memory,
+            "error": stage.error,
+        }
+    summary: Dict[str, Any] = {"stages": stages}
+    if server is not None:
+        summary["inexact"] = dict(server.inexact)
+        summary["misses"] = dict(server.misses)
+    return summary
+
+
+def print_stages(name: str, rounds: List[List[Stage]]) -> None:
+    print(f"{'scenario':<18} {'stage':<18} {'wall (s)':>9} {'http':>5} {'rpc':>5} {'peak (MiB)':>11}")
+    for stage_name, stage in summarize(rounds)["stages"].items():
+        peak = "-" if stage["peak_memory"] is None else f"{stage['peak_memory'] / 2**20:.1f}"
+        print(
+            f"{name:<18} {stage_name:<18} {stage['wall']:>9.3f} "
+            f"{stage['http_calls']:>5} {stage['rpc_calls']:>5} {peak:>11}"
+        )
+        if stage["error"]:
+            print(f"  {stage['error']}")
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> int:
+    """Print stages doing worse than the baseline, returns the exit status"""
+    regressions = []
+    for name, scenario in report["scenarios"].items():
+        before_stages = baseline.get("scenarios", {}).get(name, {}).get("stages", {})
+        for stage_name in before_stages.keys() - scenario["stages"].keys():
+            regressions.append(f"{name}/{stage_name}: not run")
+        for stage_name, stage in scenario["stages"].items():
+            before = before_stages.get(stage_name)
+            if before is None:
+                continue
+            for calls in ("http_calls", "rpc_calls"):
+                if stage[calls] > before[calls]:
+                    regressions.append(f"{name}/{stage_name}: {stage[calls]} {calls}, was {before[calls]}")
+            if stage["wall"] > before["wall"] * (1 + tolerance):
+                regressions.append(f"{name}/{stage_name}: {stage['wall']:.3f}s, was {before['wall']:.3f}s")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command in ("record", "replay"):
+        sub = subparsers.add_parser(command)
+        sub.add_argument("scenarios", nargs="*", metavar="scenario", help="scenarios to run (default: all)")
+        sub.add_argument("--cassettes", type=Path, default=CASSETTES, help="directory of cassette files")
+        sub.add_argument("--redact", action="append", default=[], help="additional secret to keep out of cassettes")
+    record_parser = subparsers.choices["record"]
+    record_parser.add_argument("--account", help="telliot account reporting in report-once")
+    record_parser.add_argument("--chain-id", type=int, help="chain of tip-scan and report-once")
+    record_parser.add_argument("--query-tag", help="feed reported in report-once (default: eth-usd-spot)")
+    replay_parser = subparsers.choices["replay"]
+    replay_parser.add_argument("--latency", type=float, default=0.05, help="seconds every response is delayed by")
+    replay_parser.add_argument("--jitter", type=float, default=0.02, help="maximum seconds added to or taken from it")
+    replay_parser.add_argument("--seed", type=int, default=0)
+    replay_parser.add_argument("--rounds", type=int, default=3)
+    replay_parser.add_argument("--json", help="save results to this file")
+    replay_parser.add_argument("--baseline", help="results saved with --json to compare with")
+    replay_parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative wall-clock increase")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios {', '.join(sorted(unknown))}, choose from {', '.join(SCENARIOS)}")
+    args.scenarios = args.scenarios or list(SCENARIOS)
+
+    if args.command == "record":
+        record(args)
+        return 0
+    return replay(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Benchmark: TAMI index computation on synthetic Mimicry sales histories
+
+Compares the linear-time `create_index_value_history` with the previous
+implementation, which re-summed every item's last sale price on each
+transaction (O(n^2)), and checks both produce the same index values.
+The previous implementation is only run up to --max-reference sales.
+
+Usage:
+    python benchmarks/bench_tami.py [--sales 100000] [--items 10000] [--max-reference 20000]
+"""
+import argparse
+import math
+import random
+import time
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from telliot_feeds.sources.mimicry.tami import create_index_value_history
+from telliot_feeds.sources.mimicry.tami import tami
+from telliot_feeds.sources.mimicry.types import IndexValueHistoryItem
+from telliot_feeds.sources.mimicry.types import Transaction
+from telliot_feeds.sources.mimicry.utils import filter_valid_transactions
+from telliot_feeds.sources.mimicry.utils import sort_transactions
+
+
+def reference_index_value_history(transaction_history: List[Transaction]) -> List[IndexValueHistoryItem]:
+    """Previous quadratic implementation, kept for comparison"""
+    transaction_map: Dict[Any, Transaction] = {}
+    last_index_value = 0.0
+    last_divisor = 1.0
+    result = []
+    for i, transaction in enumerate(transaction_history):
+        is_first_sale = transaction_map.get(transaction.itemId) is None
+        transaction_map[transaction.itemId] = transaction
+        item_count = len(transaction_map)
+        all_last_sold_value = sum([transaction_map[item].price for item in transaction_map])
+        index_value = all_last_sold_value / (item_count * last_divisor)
+        if i == 0:
+            last_index_value = index_value
+            result.append(IndexValueHistoryItem(transaction.itemId, transaction.price, index_value, transaction))
+            continue
+        next_divisor = last_divisor * (index_value / last_index_value) if is_first_sale else last_divisor
+        weighted_index_value = all_last_sold_value / (item_count * next_divisor)
+        last_index_value = weighted_index_value
+        last_divisor = next_divisor
+        result.append(IndexValueHistoryItem(transaction.itemId, transaction.price, weighted_index_value, transaction))
+    return result
+
+
+def synthetic_history(n_sales: int, n_items: int, seed: int = 0) -> List[Transaction]:
+    """Sales spread over the last five months so every resold item is valid"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    window = timedelta(days=150).total_seconds()
+    history = [
+        Transaction(
+            itemId=rng.randrange(n_items),
+            price=round(rng.lognormvariate(8, 1), 2),
+            date=now - timedelta(seconds=rng.uniform(0, window)),
+        )
+        for _ in range(n_sales)
+    ]
+    return filter_valid_transactions(sort_transactions(history))
+
+
+def timed(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(n_sales: int, n_items: int, max_reference: int) -> None:
+    sizes = sorted({max(1, n_sales // 8), max(1, n_sales // 4), max(1, n_sales // 2), n_sales})
+    print(f"{'sales':>8} {'linear (s)':>11} {'us/sale':>8} {'previous (s)':>13} {'max rel diff':>13}")
+    for size in sizes:
+        history = synthetic_history(size, n_items)
+        linear, t_linear = timed(lambda: create_index_value_history(history))
+        per_sale = 1e6 * t_linear / max(1, len(history))
+
+        if size <= max_reference:
+            reference, t_reference = timed(lambda: reference_index_value_history(history))
+            assert [r.itemId for r in reference] == [r.itemId for r in linear]
+            max_diff = max(
+                (abs(a.indexValue - b.indexValue) / abs(b.indexValue) for a, b in zip(linear, reference)), default=0.0
+            )
+            assert max_diff < 1e-9, f"index values diverge: {max_diff}"
+            print(f"{len(history):>8} {t_linear:>11.3f} {per_sale:>8.2f} {t_reference:>13.3f} {max_diff:>13.2e}")
+        else:
+            print(f"{len(history):>8} {t_linear:>11.3f} {per_sale:>8.2f} {'skipped':>13} {'-':>13}")
+
+    history = synthetic_history(n_sales, n_items)
+    value, t_tami = timed(lambda: tami(history))
+    assert value is not None and math.isfinite(value)
+    print(f"tami() on {len(history)} sales: {value:.2f} in {t_tami:.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sales", type=int, default=100_000)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--max-reference", type=int, default=20_000)
+    args = parser.parse_args()
+    main(args.sales, args.items, args.max_reference)
@@ -0,0 +1,11 @@
+"""Record/replay harness for reporting cycle benchmarks
+
+Scenarios (see `scenarios`) drive feeds, the tip scanner and the reporter
+in named stages. Recording runs them against the real APIs and nodes and
+saves every HTTP and JSON-RPC exchange in a cassette file per scenario.
+Replaying serves the cassette from a local server with a configurable
+latency and jitter, so runs need no network access and are repeatable.
+
+Every stage reports its wall-clock time, the HTTP calls (by host) and
+JSON-RPC calls (by method) it made and its peak memory.
+"""
@@ -0,0 +1,163 @@
+"""Cassettes: recorded HTTP exchanges and how requests are matched to them
+
+A replayed request is answered with the next unused recording of the same
+request (method, URL and body; JSON-RPC ids are ignored). The last one is
+repeated once all are used. Requests differing from every recording, e.g.
+because a timestamp is part of the URL or a transaction is signed anew, are
+answered with the recordings of the same endpoint in recorded order: the
+same host and path for HTTP APIs, the same host and JSON-RPC method for nodes.
+
+Secrets (API keys, keys embedded in node URLs) are replaced before a
+request is recorded or matched, so cassettes can be shared.
+"""
+import json
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from urllib.parse import urlsplit
+
+REDACTED = "<redacted>"
+
+#: Version of the cassette file format
+VERSION = 1
+
+Key = Tuple[str, str, str]
+
+
+@dataclass
+class Interaction:
+    """One recorded HTTP exchange"""
+
+    method: str
+    url: str
+
+    #: Request body, empty if there is none
+    body: str
+
+    status: int
+    response: str
+    content_type: str = "application/json"
+
+    #: Seconds the request took when it was recorded
+    elapsed: float = 0.0
+
+
+def parse_rpc(body: str) -> Optional[Any]:
+    """The decoded JSON-RPC request (or batch) in a body, None if it isn't one"""
+    if not body or body[0] not in "[{":
+        return None
+    try:
+        request = json.loads(body)
+    except ValueError:
+        return None
+    calls = request if isinstance(request, list) else [request]
+    if calls and all(isinstance(c, dict) and "method" in c and "jsonrpc" in c for c in calls):
+        return request
+    return None
+
+
+def rpc_method(body: str) -> Optional[str]:
+    """JSON-RPC method of a request body, methods joined by commas for a batch"""
+    request = parse_rpc(body)
+    if request is None:
+        return None
+    calls = request if isinstance(request, list) else [request]
+    return ",".join(str(c["method"]) for c in calls)
+
+
+def canonical_body(body: str) -> str:
+    """Request body with JSON-RPC ids removed"""
+    request = parse_rpc(body)
+    if request is None:
+        return body
+    calls = request if isinstance(request, list) else [request]
+    stripped = [{k: v for k, v in c.items() if k != "id"} for c in calls]
+    return json.dumps(stripped if isinstance(request, list) else stripped[0], sort_keys=True)
+
+
+def exact_key(method: str, url: str, body: str) -> Key:
+    return method.upper(), url, canonical_body(body)
+
+
+def endpoint_key(method: str, url: str, body: str) -> Key:
+    parts = urlsplit(url)
+    rpc = rpc_method(body)
+    if rpc is not None:
+        return "RPC", parts.netloc, rpc
+    return method.upper(), parts.netloc, parts.path
+
+
+class Redactor:
+    """Replaces secrets in URLs and bodies"""
+
+    def __init__(self, secrets: Iterable[str] = ()) -> None:
+        # longest first, so a secret containing another is replaced whole
+        self.secrets = sorted({s for s in secrets if s and len(s) >= 8}, key=len, reverse=True)
+
+    def __call__(self, text: str) -> str:
+        for secret in self.secrets:
+            text = text.replace(secret, REDACTED)
+        return text
+
+
+@dataclass
+class Cassette:
+    """Recorded exchanges of one scenario"""
+
+    meta: Dict[str, Any] = field(default_factory=dict)
+    interactions: List[Interaction] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.rewind()
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        data = json.loads(Path(path).read_text())
+        if data.get("version") != VERSION:
+            raise ValueError(f"Unsupported cassette version in {path}: {data.get('version')}")
+        return cls(meta=data["meta"], interactions=[Interaction(**i) for i in data["interactions"]])
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": VERSION, "meta": self.meta, "interactions": [asdict(i) for i in self.interactions]}
+        path.write_text(json.dumps(data, indent=1))
+
+    def add(self, interaction: Interaction) -> None:
+        self.interactions.append(interaction)
+        self._index(interaction)
+
+    def rewind(self) -> None:
+        """Start replaying from the first recording again"""
+        self._exact: Dict[Key, List[Interaction]] = {}
+        self._endpoint: Dict[Key, List[Interaction]] = {}
+        self._cursors: Dict[Tuple[str, Key], int] = {}
+        for interaction in self.interactions:
+            self._index(interaction)
+
+    def _index(self, interaction: Interaction) -> None:
+        args = interaction.method, interaction.url, interaction.body
+        self._exact.setdefault(exact_key(*args), []).append(interaction)
+        self._endpoint.setdefault(endpoint_key(*args), []).append(interaction)
+
+    def _next(self, kind: str, key: Key, recorded: List[Interaction]) -> Interaction:
+        cursor = self._cursors.get((kind, key), 0)
+        self._cursors[(kind, key)] = cursor + 1
+        return recorded[min(cursor, len(recorded) - 1)]
+
+    def match(self, method: str, url: str, body: str) -> Tuple[Optional[Interaction], bool]:
+        """Recording answering a request, and whether the request was recorded exactly"""
+        key = exact_key(method, url, body)
+        if key in self._exact:
+            return self._next("exact", key, self._exact[key]), True
+        key = endpoint_key(method, url, body)
+        if key in self._endpoint:
+            return self._next("endpoint", key, self._endpoint[key]), False
+        return None, False
@@ -0,0 +1,230 @@
+"""Interception of the HTTP traffic of telliot-feeds
+
+Every request telliot-feeds makes goes through `requests` (blocking
+sources and web3's HTTPProvider) or aiohttp (the shared async HTTP client).
+While installed, an interceptor wraps `requests.Session.send` and
+`aiohttp.ClientSession._request`: `Recorder` passes requests on and adds
+each exchange to a cassette, `Replayer` sends them to a replay server
+instead. Both count the calls they see.
+"""
+import json
+import time
+from collections import Counter
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+from replay.cassette import Cassette
+from replay.cassette import Interaction
+from replay.cassette import Redactor
+from replay.cassette import rpc_method
+from replay.server import REPLAY_URL_HEADER
+from yarl import URL
+
+
+class CallCounter:
+    """HTTP calls by host and JSON-RPC calls by method"""
+
+    def __init__(self) -> None:
+        self.http: Counter[str] = Counter()
+        self.rpc: Counter[str] = Counter()
+
+    def count(self, url: str, body: str) -> None:
+        self.http[urlsplit(url).netloc] += 1
+        method = rpc_method(body)
+        if method is not None:
+            for m in method.split(","):
+                self.rpc[m] += 1
+
+    def snapshot(self) -> "CallCounter":
+        copy = CallCounter()
+        copy.http = self.http.copy()
+        copy.rpc = self.rpc.copy()
+        return copy
+
+    def since(self, earlier: "CallCounter") -> "CallCounter":
+        """Calls made after `earlier` was taken"""
+        delta = CallCounter()
+        delta.http = self.http - earlier.http
+        delta.rpc = self.rpc - earlier.rpc
+        return delta
+
+
+def decode(body: Any) -> str:
+    if body is None:
+        return ""
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    if isinstance(body, dict):
+        return urlencode(body)
+    return str(body)
+
+
+def aiohttp_body(kwargs: Dict[str, Any]) -> str:
+    """Body of an aiohttp request as it is sent"""
+    if kwargs.get("json") is not None:
+        return json.dumps(kwargs["json"])
+    return decode(kwargs.get("data"))
+
+
+class Interceptor:
+    """Wraps the HTTP libraries while installed, as a context manager"""
+
+    def __init__(self) -> None:
+        self.calls = CallCounter()
+        self._send: Optional[Callable[..., Any]] = None
+        self._request: Optional[Callable[..., Any]] = None
+
+    def __enter__(self) -> "Interceptor":
+        self._send = original_send = requests.Session.send
+        self._request = original_request = aiohttp.ClientSession._request
+        interceptor = self
+
+        def send(session: requests.Session, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+            body = decode(request.body)
+            interceptor.calls.count(str(request.url), body)
+            return interceptor.send(original_send, session, request, body, **kwargs)
+
+        async def _request(session: aiohttp.ClientSession, method: str, str_or_url: Any, **kwargs: Any) -> Any:
+            url = URL(str_or_url)
+            params = kwargs.pop("params", None)
+            if params:
+                url = url.update_query(params)
+            body = aiohttp_body(kwargs)
+            interceptor.calls.count(str(url), body)
+            return await interceptor.request(original_request, session, method, url, body, kwargs)
+
+        requests.Session.send = send  # type: ignore
+        aiohttp.ClientSession._request = _request  # type: ignore
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        requests.Session.send = self._send  # type: ignore
+        aiohttp.ClientSession._request = self._request  # type: ignore
+
+    def send(
+        self,
+        original: Callable[..., Any],
+        session: requests.Session,
+        request: requests.PreparedRequest,
+        body: str,
+        **kwargs: Any,
+    ) -> requests.Response:
+        return original(session, request, **kwargs)
+
+    async def request(
+        self,
+        original: Callable[..., Any],
+        session: aiohttp.ClientSession,
+        method: str,
+        url: URL,
+        body: str,
+        kwargs: Dict[str, Any],
+    ) -> aiohttp.ClientResponse:
+        return await original(session, method, url, **kwargs)
+
+
+class Recorder(Interceptor):
+    """Sends requests to their destination and records them in a cassette"""
+
+    def __init__(self, cassette: Cassette, redactor: Optional[Redactor] = None) -> None:
+        super().__init__()
+        self.cassette = cassette
+        self.redactor = redactor or Redactor()
+
+    def record(
+        self, method: str, url: str, body: str, status: int, response: str, content_type: str, elapsed: float
+    ) -> None:
+        self.cassette.add(
+            Interaction(
+                method=method.upper(),
+                url=self.redactor(url),
+                body=self.redactor(body),
+                status=status,
+                response=response,
+                content_type=content_type,
+                elapsed=round(elapsed, 4),
+            )
+        )
+
+    def send(
+        self,
+        original: Callable[..., Any],
+        session: requests.Session,
+        request: requests.PreparedRequest,
+        body: str,
+        **kwargs: Any,
+    ) -> requests.Response:
+        start = time.perf_counter()
+        response: requests.Response = original(session, request, **kwargs)
+        content_type = response.headers.get("Content-Type", "")
+        self.record(
+            str(request.method),
+            str(request.url),
+            body,
+            response.status_code,
+            response.text,
+            content_type,
+            time.perf_counter() - start,
+        )
+        return response
+
+    async def request(
+        self,
+        original: Callable[..., Any],
+        session: aiohttp.ClientSession,
+        method: str,
+        url: URL,
+        body: str,
+        kwargs: Dict[str, Any],
+    ) -> aiohttp.ClientResponse:
+        start = time.perf_counter()
+        response = await original(session, method, url, **kwargs)
+        # the body is kept by the response, the caller can still read it
+        text = await response.text(errors="replace")
+        content_type = response.headers.get("Content-Type", "")
+        self.record(method, str(url), body, response.status, text, content_type, time.perf_counter() - start)
+        return response
+
+
+class Replayer(Interceptor):
+    """Sends requests to a replay server instead of their destination"""
+
+    def __init__(self, server_url: str) -> None:
+        super().__init__()
+        self.server_url = server_url
+
+    def send(
+        self,
+        original: Callable[..., Any],
+        session: requests.Session,
+        request: requests.PreparedRequest,
+        body: str,
+        **kwargs: Any,
+    ) -> requests.Response:
+        replayed = request.copy()
+        replayed.headers[REPLAY_URL_HEADER] = str(request.url)
+        replayed.url = f"{self.server_url}/replay"
+        return original(session, replayed, **kwargs)
+
+    async def request(
+        self,
+        original: Callable[..., Any],
+        session: aiohttp.ClientSession,
+        method: str,
+        url: URL,
+        body: str,
+        kwargs: Dict[str, Any],
+    ) -> aiohttp.ClientResponse:
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers[REPLAY_URL_HEADER] = str(url)
+        kwargs.pop("json", None)
+        kwargs.pop("data", None)
+        return await original(
+            session, method, f"{self.server_url}/replay", data=body.encode() or None, headers=headers, **kwargs
+        )
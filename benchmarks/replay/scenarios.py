@@ -0,0 +1,178 @@
+"""Benchmark scenarios
+
+Each scenario is a coroutine taking a `Run` and wrapping its steps in
+`run.stage(...)`. Process-wide caches are emptied, and on-disk caches
+moved to a temporary directory, before every run so that each run starts
+cold.
+"""
+import os
+import tempfile
+from contextlib import AsyncExitStack
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import Tuple
+
+from replay.stages import Run
+
+Scenario = Callable[[Run], Awaitable[None]]
+
+#: Chain the reporter scenarios use unless recorded otherwise (Sepolia)
+DEFAULT_CHAIN_ID = 11155111
+
+
+class Skipped(Exception):
+    """A scenario can't run in this environment, e.g. an account is missing"""
+
+
+@contextmanager
+def cold_caches() -> Iterator[None]:
+    """Empty process-wide caches and keep on-disk caches in a temporary directory"""
+    from telliot_feeds.pricing.price_cache import price_cache
+    from telliot_feeds.sources.mimicry import sales_cache
+    from telliot_feeds.sources.price.historical import ohlc_store
+    from telliot_feeds.sources.price.historical.trade_tape import trade_tapes
+    from telliot_feeds.utils import block_index
+    from telliot_feeds.utils import rpc_pool
+
+    modules = [block_index, ohlc_store, sales_cache]
+    homedirs = [m.default_homedir for m in modules]  # type: ignore
+    with tempfile.TemporaryDirectory() as home:
+        for module in modules:
+            module.default_homedir = lambda: Path(home)  # type: ignore
+        for cache in (ohlc_store.ohlc_store, sales_cache.sales_history_cache):
+            cache._directory = None
+        ohlc_store.ohlc_store._series.clear()
+        block_index._indexes.clear()
+        rpc_pool._pools.clear()
+        price_cache.clear()
+        trade_tapes.clear()
+        try:
+            yield
+        finally:
+            for module, homedir in zip(modules, homedirs):
+                module.default_homedir = homedir  # type: ignore
+            for cache in (ohlc_store.ohlc_store, sales_cache.sales_history_cache):
+                cache._directory = None
+            block_index._indexes.clear()
+
+
+async def spot_median(run: Run) -> None:
+    """ETH/USD spot price median over several exchange APIs"""
+    from telliot_feeds.feeds.eth_usd_feed import eth_usd_median_feed
+
+    async with run.stage("fetch"):
+        await eth_usd_median_feed.source.fetch_new_datapoint()
+
+
+async def evm_call(run: Run) -> None:
+    """EVMCall feed calling a mainnet contract"""
+    from telliot_feeds.feeds.evm_call_feed import evm_call_feed_example
+
+    async with run.stage("fetch"):
+        await evm_call_feed_example.source.fetch_new_datapoint()
+
+
+async def mimicry(run: Run) -> None:
+    """Mimicry TAMI index of an NFT collection from its sales history"""
+    from telliot_feeds.feeds.mimicry.collection_stat_feed import mimicry_example_feed
+
+    async with run.stage("fetch"):
+        await mimicry_example_feed.source.fetch_new_datapoint()
+
+
+async def daily_volatility(run: Run) -> None:
+    """ETH/USD 30 day volatility from daily candles of several exchanges"""
+    from telliot_feeds.feeds.eth_usd_30day_volatility import eth_usd_30day_volatility
+
+    async with run.stage("fetch"):
+        await eth_usd_30day_volatility.source.fetch_new_datapoint()
+
+
+def reporter_chain_id(run: Run) -> int:
+    chain_id: int = run.meta.setdefault("chain_id", run.options.get("chain_id") or DEFAULT_CHAIN_ID)
+    return chain_id
+
+
+def reporter_config(run: Run) -> Any:
+    from telliot_core.apps.telliot_config import TelliotConfig
+
+    config = TelliotConfig()
+    config.main.chain_id = reporter_chain_id(run)
+    return config
+
+
+def reporter_account(run: Run) -> Any:
+    """Account the reporter scenario was recorded with, unlocked"""
+    from chained_accounts import find_accounts
+
+    chain_id = reporter_chain_id(run)
+    name = run.meta.setdefault("account", run.options.get("account"))
+    accounts = find_accounts(name=name, chain_id=chain_id) if name else []
+    if not accounts:
+        raise Skipped(f"no account named {name!r} for chain {chain_id}, pass --account")
+    account = accounts[0]
+    account.unlock(os.getenv("BENCH_ACCOUNT_PASSWORD", ""))
+    return account
+
+
+async def connect(run: Run, stack: AsyncExitStack) -> Tuple[Any, Any]:
+    """Start telliot core on the reporter chain and connect the Tellor contracts"""
+    from telliot_core.apps.core import TelliotCore
+
+    async with run.stage("connect"):
+        core = await stack.enter_async_context(TelliotCore(config=reporter_config(run)))
+        contracts = core.get_tellor360_contracts()
+        contracts.oracle.connect()
+        contracts.autopay.connect()
+        contracts.token.connect()
+    return core, contracts
+
+
+async def tip_scan(run: Run) -> None:
+    """Autopay scan for the funded feed with the largest tip"""
+    from telliot_feeds.reporters.tips.suggest_datafeed import get_feed_and_tip
+
+    async with AsyncExitStack() as stack:
+        _, contracts = await connect(run, stack)
+        async with run.stage("get_feed_and_tip"):
+            await get_feed_and_tip(contracts.autopay, skip_manual_feeds=True)
+
+
+async def report_once(run: Run) -> None:
+    """One Tellor360Reporter.report_once, sending a real transaction when recorded"""
+    from telliot_feeds.feeds import CATALOG_FEEDS
+    from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
+
+    query_tag = run.meta.setdefault("query_tag", run.options.get("query_tag") or "eth-usd-spot")
+    account = reporter_account(run)
+    async with AsyncExitStack() as stack:
+        core, contracts = await connect(run, stack)
+        reporter = Tellor360Reporter(
+            endpoint=core.endpoint,
+            account=account,
+            chain_id=core.config.main.chain_id,
+            oracle=contracts.oracle,
+            autopay=contracts.autopay,
+            token=contracts.token,
+            datafeed=CATALOG_FEEDS[query_tag],
+            expected_profit="YOLO",
+            transaction_type=2,
+            wait_period=0,
+        )
+        async with run.stage("report_once"):
+            await reporter.report_once()
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "spot-median": spot_median,
+    "evm-call": evm_call,
+    "mimicry": mimicry,
+    "daily-volatility": daily_volatility,
+    "tip-scan": tip_scan,
+    "report-once": report_once,
+}
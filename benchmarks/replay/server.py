@@ -0,0 +1,134 @@
+"""Local server answering requests from a cassette"""
+import asyncio
+import json
+import random
+import threading
+from collections import Counter
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from aiohttp import web
+from replay.cassette import Cassette
+from replay.cassette import parse_rpc
+from replay.cassette import Redactor
+
+#: Header carrying the URL a replayed request was meant for
+REPLAY_URL_HEADER = "X-Replay-Url"
+
+
+def with_rpc_ids(response: str, request: Any) -> str:
+    """Recorded JSON-RPC response with the ids of the replayed request"""
+    try:
+        decoded = json.loads(response)
+    except ValueError:
+        return response
+    if isinstance(request, dict) and isinstance(decoded, dict):
+        decoded["id"] = request.get("id")
+    elif isinstance(request, list) and isinstance(decoded, list):
+        for call, result in zip(request, decoded):
+            if isinstance(result, dict):
+                result["id"] = call.get("id")
+    return json.dumps(decoded)
+
+
+class ReplayServer:
+    """Serves a cassette on its own thread and event loop
+
+    Args:
+        cassette: Recordings to answer with
+        latency: Seconds every response is delayed by
+        jitter: Maximum seconds added to or taken from the latency, drawn uniformly
+        seed: Seed of the jitter, so runs are repeatable
+        redactor: Applied to requests before they are matched, as when they were recorded
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: int = 0,
+        redactor: Optional[Redactor] = None,
+    ) -> None:
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        self.redactor = redactor or Redactor()
+        self.url = ""
+
+        #: Requests answered from a recording of another request, by endpoint
+        self.inexact: Counter[str] = Counter()
+
+        #: Requests no recording could answer, by URL
+        self.misses: Counter[str] = Counter()
+
+        self._rng = random.Random(seed)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+
+    def rewind(self) -> None:
+        """Replay from the start of the cassette with the same jitter again"""
+        self.cassette.rewind()
+        self._rng = random.Random(self.seed)
+        self.inexact.clear()
+        self.misses.clear()
+
+    def delay(self) -> float:
+        return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+    async def handle(self, request: web.Request) -> web.Response:
+        url = self.redactor(request.headers.get(REPLAY_URL_HEADER, str(request.url)))
+        body = self.redactor(await request.text())
+        interaction, exact = self.cassette.match(request.method, url, body)
+        await asyncio.sleep(self.delay())
+
+        rpc = parse_rpc(body)
+        if interaction is None:
+            self.misses[f"{request.method} {url}"] += 1
+            if isinstance(rpc, dict):
+                error = {"code": -32000, "message": "not recorded"}
+                return web.json_response({"jsonrpc": "2.0", "id": rpc.get("id"), "error": error})
+            return web.json_response({"error": "not recorded"}, status=404)
+
+        if not exact:
+            self.inexact[f"{request.method} {url.split('?')[0]}"] += 1
+        text = interaction.response if rpc is None else with_rpc_ids(interaction.response, rpc)
+        content_type = interaction.content_type.split(";")[0].strip() or "application/json"
+        return web.Response(text=text, status=interaction.status, content_type=content_type)
+
+    def start(self) -> str:
+        """Start serving, returns the server's base URL"""
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+        address: Dict[str, str] = {}
+
+        async def serve() -> None:
+            app = web.Application(client_max_size=64 * 1024**2)
+            app.router.add_route("*", "/{tail:.*}", self.handle)
+            self._runner = web.AppRunner(app)
+            await self._runner.setup()
+            site = web.TCPSite(self._runner, "127.0.0.1", 0)
+            await site.start()
+            address["url"] = "http://127.0.0.1:{}".format(site._server.sockets[0].getsockname()[1])  # type: ignore
+            started.set()
+
+        def run() -> None:
+            assert self._loop is not None
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(serve())
+            self._loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        started.wait()
+        self.url = address["url"]
+        return self.url
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        if self._runner is not None:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
@@ -0,0 +1,63 @@
+"""Measuring the stages of a scenario"""
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import AsyncIterator
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from replay.intercept import CallCounter
+
+
+@dataclass
+class Stage:
+    """Measurements of one stage in one run"""
+
+    name: str
+    wall: float
+    http: Dict[str, int]
+    rpc: Dict[str, int]
+
+    #: Peak bytes allocated during the stage, if memory was traced
+    peak_memory: Optional[int] = None
+
+    #: Exception the stage raised, if any
+    error: Optional[str] = None
+
+
+@dataclass
+class Run:
+    """One run of a scenario
+
+    Scenarios wrap each of their steps in `stage`. Values a scenario needs
+    to repeat its recorded run (e.g. the chain it reported to) go in `meta`,
+    which is saved in the cassette.
+    """
+
+    calls: CallCounter
+    meta: Dict[str, Any]
+    options: Dict[str, Any] = field(default_factory=dict)
+    trace_memory: bool = False
+    stages: List[Stage] = field(default_factory=list)
+
+    @asynccontextmanager
+    async def stage(self, name: str) -> AsyncIterator[None]:
+        before = self.calls.snapshot()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        error = None
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            wall = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+            calls = self.calls.since(before)
+            self.stages.append(Stage(name, wall, dict(calls.http), dict(calls.rpc), peak, error))
@@ -1,11 +1,11 @@
 from typing import Optional
-from typing import TypeVar
 from typing import Tuple
+from typing import TypeVar
 
 import click
 from click.core import Context
-from telliot_core.cli.utils import async_run
 
+from telliot_feeds.cli.utils import async_run
 from telliot_feeds.cli.utils import common_options
 from telliot_feeds.cli.utils import common_reporter_options
 from telliot_feeds.cli.utils import get_accounts_from_name
@@ -58,6 +58,7 @@ async def ampleforth(
     backup_check_time: int,
     unsafe: bool,
     skip_manual_feeds: bool,
+    max_idle: float,
     query_tag: str = "ampleforth-custom",
     check_rewards: bool = False,
 ) -> None:
@@ -133,6 +134,7 @@ async def ampleforth(
             "gas_multiplier": gas_multiplier,
             "max_priority_fee_range": max_priority_fee_range,
             "skip_manual_feeds": skip_manual_feeds,
+            "max_idle": max_idle,
         }
 
         reporter = AmpleforthReporter(
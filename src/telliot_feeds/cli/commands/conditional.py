@@ -1,12 +1,11 @@
 from typing import Optional
-from typing import TypeVar
 from typing import Tuple
-
+from typing import TypeVar
 
 import click
 from click.core import Context
-from telliot_core.cli.utils import async_run
 
+from telliot_feeds.cli.utils import async_run
 from telliot_feeds.cli.utils import common_options
 from telliot_feeds.cli.utils import common_reporter_options
 from telliot_feeds.cli.utils import get_accounts_from_name
@@ -69,6 +68,7 @@ async def conditional(
     query_tag: str,
     unsafe: bool,
     skip_manual_feeds: bool,
+    max_idle: float,
 ) -> None:
     """Report values to Tellor oracle if certain conditions are met."""
     click.echo("Starting Conditional Reporter...")
@@ -142,6 +142,7 @@ async def conditional(
             "gas_multiplier": gas_multiplier,
             "max_priority_fee_range": max_priority_fee_range,
             "skip_manual_feeds": skip_manual_feeds,
+            "max_idle": max_idle,
         }
 
         reporter = ConditionalReporter(
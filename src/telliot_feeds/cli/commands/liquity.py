@@ -1,10 +1,11 @@
-from typing import Optional, Tuple
+from typing import Optional
+from typing import Tuple
 
 import click
 from click.core import Context
-from telliot_core.cli.utils import async_run
 from web3 import Web3
 
+from telliot_feeds.cli.utils import async_run
 from telliot_feeds.cli.utils import common_options
 from telliot_feeds.cli.utils import common_reporter_options
 from telliot_feeds.cli.utils import get_accounts_from_name
@@ -61,6 +62,7 @@ async def liquity(
     chainlink_feed: str,
     unsafe: bool,
     skip_manual_feeds: bool,
+    max_idle: float,
 ) -> None:
     """Report values to Tellor oracle if certain conditions are met."""
     click.echo("Starting Liquity Backup Reporter...")
@@ -142,6 +144,7 @@ async def liquity(
             "gas_multiplier": gas_multiplier,
             "max_priority_fee_range": max_priority_fee_range,
             "skip_manual_feeds": skip_manual_feeds,
+            "max_idle": max_idle,
         }
 
         reporter = ChainlinkBackupReporter(
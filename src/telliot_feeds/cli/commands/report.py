@@ -1,14 +1,15 @@
 from typing import Any
 from typing import Optional
-from typing import Union, Tuple
+from typing import Tuple
+from typing import Union
 
 import click
 from chained_accounts import find_accounts
 from click.core import Context
 from eth_typing import ChecksumAddress
 from eth_utils import to_checksum_address
-from telliot_core.cli.utils import async_run
 
+from telliot_feeds.cli.utils import async_run
 from telliot_feeds.cli.utils import build_feed_from_input
 from telliot_feeds.cli.utils import common_options
 from telliot_feeds.cli.utils import common_reporter_options
@@ -23,12 +24,14 @@ from telliot_feeds.feeds.tellor_rng_feed import assemble_rng_datafeed
 from telliot_feeds.integrations.diva_protocol import DIVA_DIAMOND_ADDRESS
 from telliot_feeds.integrations.diva_protocol import DIVA_TELLOR_MIDDLEWARE_ADDRESS
 from telliot_feeds.integrations.diva_protocol.report import DIVAProtocolReporter
+from telliot_feeds.pricing.price_cache import price_cache
 from telliot_feeds.reporters.flashbot import FlashbotsReporter
 from telliot_feeds.reporters.rng_interval import RNGReporter
 from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
 from telliot_feeds.utils.cfg import check_endpoint
 from telliot_feeds.utils.cfg import setup_config
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.metrics import metrics
 from telliot_feeds.utils.reporter_utils import create_custom_contract
 from telliot_feeds.utils.reporter_utils import prompt_for_abi
 
@@ -51,6 +54,14 @@ def reporter() -> None:
     nargs=1,
     type=str,
 )
+@click.option(
+    "--bundle-blocks",
+    "bundle_blocks",
+    help="number of consecutive blocks each Flashbots bundle is sent for",
+    nargs=1,
+    type=click.IntRange(min=1),
+    default=3,
+)
 @reporter.command()
 @common_options
 @common_reporter_options
@@ -138,8 +149,44 @@ def reporter() -> None:
     default=False,
     help="Reporter will use a random datafeed from the RANDOM_FEEDS catalog.",
 )
+@click.option(
+    "--max-feeds",
+    "-mf",
+    "max_feeds",
+    help="report up to this many of the most funded feeds per loop when the reporter lock allows (default 1)",
+    nargs=1,
+    type=click.IntRange(min=1),
+    default=1,
+)
 @click.option("--rng-auto/--rng-auto-off", default=False)
 @click.option("-spwd", "--signature-password", type=str)
+@click.option(
+    "--price-cache-ttl",
+    "-pct",
+    "price_cache_ttl",
+    help="reuse fetched prices for this many seconds across feeds and profitability checks (default 0: disabled)",
+    nargs=1,
+    type=float,
+    default=0.0,
+)
+@click.option(
+    "--metrics-port",
+    "metrics_port",
+    help="serve stage latencies, source failures and RPC call counts in the OpenMetrics format at "
+    "http://127.0.0.1:<port>/metrics",
+    nargs=1,
+    type=click.IntRange(min=1, max=65535),
+    default=None,
+)
+@click.option(
+    "--metrics-summary-interval",
+    "metrics_summary_interval",
+    help="log a summary of stage latencies, source failures and RPC call counts every this many seconds "
+    "(default 0: disabled)",
+    nargs=1,
+    type=float,
+    default=0.0,
+)
 @click.option(
     "--ignore-tbr/--include-tbr",
     help="optionaly ignore time based rewards in profit calculations. relevant only on eth-mainnet/eth-testnets",
@@ -174,15 +221,28 @@ async def report(
     stake: float,
     account_str: str,
     signature_account: str,
+    bundle_blocks: int,
     check_rewards: bool,
     use_random_feeds: bool,
+    max_feeds: int,
     gas_multiplier: int,
     max_priority_fee_range: int,
     ignore_tbr: bool,
     unsafe: bool,
     skip_manual_feeds: bool,
+    max_idle: float,
+    price_cache_ttl: float,
+    metrics_port: Optional[int],
+    metrics_summary_interval: float,
 ) -> None:
     """Report values to Tellor oracle"""
+    if price_cache_ttl > 0:
+        price_cache.enable(default_ttl=price_cache_ttl)
+
+    metrics.summary_interval = metrics_summary_interval
+    if metrics_port is not None:
+        await metrics.serve(metrics_port)
+
     ctx.obj["ACCOUNT_NAME"] = account_str
     ctx.obj["SIGNATURE_ACCOUNT_NAME"] = signature_account
 
@@ -318,15 +378,18 @@ async def report(
             "min_native_token_balance": int(min_native_token_balance * 10**18),
             "check_rewards": check_rewards,
             "use_random_feeds": use_random_feeds,
+            "max_feeds": max_feeds,
             "gas_multiplier": gas_multiplier,
             "max_priority_fee_range": max_priority_fee_range,
             "ignore_tbr": ignore_tbr,
             "skip_manual_feeds": skip_manual_feeds,
+            "max_idle": max_idle,
         }
         reporter: Union[FlashbotsReporter, RNGReporter, Tellor360Reporter]
         if sig_acct_addr:
             reporter = FlashbotsReporter(
                 signature_account=sig_account,
+                bundle_blocks=bundle_blocks,
                 **common_reporter_kwargs,
             )
         elif rng_auto:
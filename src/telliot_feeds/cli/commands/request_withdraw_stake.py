@@ -2,8 +2,8 @@ from typing import Optional
 
 import click
 from click.core import Context
-from telliot_core.cli.utils import async_run
 
+from telliot_feeds.cli.utils import async_run
 from telliot_feeds.cli.utils import call_oracle
 from telliot_feeds.cli.utils import common_options
 from telliot_feeds.cli.utils import get_accounts_from_name
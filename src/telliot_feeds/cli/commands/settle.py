@@ -2,8 +2,8 @@ import getpass
 
 import click
 from click.core import Context
-from telliot_core.cli.utils import async_run
 
+from telliot_feeds.cli.utils import async_run
 from telliot_feeds.cli.utils import CustomHexBytes
 from telliot_feeds.cli.utils import get_accounts_from_name
 from telliot_feeds.cli.utils import reporter_cli_core
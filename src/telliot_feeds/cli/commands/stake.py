@@ -3,8 +3,8 @@ from typing import Optional
 import click
 from click.core import Context
 from eth_utils import to_checksum_address
-from telliot_core.cli.utils import async_run
 
+from telliot_feeds.cli.utils import async_run
 from telliot_feeds.cli.utils import common_options
 from telliot_feeds.cli.utils import get_accounts_from_name
 from telliot_feeds.cli.utils import reporter_cli_core
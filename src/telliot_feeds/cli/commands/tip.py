@@ -2,8 +2,8 @@ import asyncio
 
 import click
 from click.core import Context
-from telliot_core.cli.utils import async_run
 
+from telliot_feeds.cli.utils import async_run
 from telliot_feeds.cli.utils import reporter_cli_core
 from telliot_feeds.datafeed import DataFeed
 from telliot_feeds.feeds import CATALOG_FEEDS
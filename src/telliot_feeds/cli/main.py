@@ -20,6 +20,8 @@ from telliot_feeds.cli.commands.request_withdraw_stake import request_withdraw
 from telliot_feeds.cli.commands.settle import settle
 from telliot_feeds.cli.commands.stake import stake
 from telliot_feeds.cli.commands.withdraw import withdraw
+from telliot_feeds.utils.http_client import configure_http_client
+from telliot_feeds.utils.http_client import HTTPClientConfig
 from telliot_feeds.utils.log import get_logger
 
 
@@ -32,14 +34,41 @@ logger = get_logger(__name__)
     is_flag=True,
     help="Runs command with test configuration (developer use only)",
 )
+@click.option(
+    "--http-retries",
+    type=int,
+    default=HTTPClientConfig.retries,
+    show_default=True,
+    help="Retries of API requests after a connection error or timeout",
+)
+@click.option(
+    "--http-backoff",
+    type=float,
+    default=HTTPClientConfig.backoff,
+    show_default=True,
+    help="Seconds before the first retry of an API request, doubled for each further one",
+)
+@click.option(
+    "--http-connections-per-host",
+    type=int,
+    default=HTTPClientConfig.limit_per_host,
+    show_default=True,
+    help="Simultaneous connections to a single API host",
+)
 @click.pass_context
 def main(
     ctx: Context,
     test_config: bool,
+    http_retries: int,
+    http_backoff: float,
+    http_connections_per_host: int,
 ) -> None:
     """Telliot command line interface"""
     ctx.ensure_object(dict)
     ctx.obj["TEST_CONFIG"] = test_config
+    configure_http_client(
+        HTTPClientConfig(retries=http_retries, backoff=http_backoff, limit_per_host=http_connections_per_host)
+    )
 
 
 main.add_command(report)
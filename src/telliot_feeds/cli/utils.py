@@ -1,6 +1,8 @@
+import asyncio
 import functools
 import os
 from typing import Any
+from typing import Awaitable
 from typing import Callable
 from typing import cast
 from typing import Dict
@@ -32,11 +34,28 @@ from telliot_feeds.queries.query_catalog import query_catalog
 from telliot_feeds.reporters.gas import GasFees
 from telliot_feeds.utils.cfg import check_endpoint
 from telliot_feeds.utils.cfg import setup_config
+from telliot_feeds.utils.http_client import close_http_client
 from telliot_feeds.utils.reporter_utils import has_native_token_funds
 
 load_dotenv()
 
 
+def async_run(f: Callable[..., Awaitable[Any]]) -> Callable[..., Any]:
+    """Run an async command, closing the shared HTTP client before its event loop ends"""
+
+    async def run(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return await f(*args, **kwargs)
+        finally:
+            await close_http_client()
+
+    @functools.wraps(f)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return asyncio.run(run(*args, **kwargs))
+
+    return wrapper
+
+
 def print_reporter_settings(
     signature_address: str,
     query_tag: str,
@@ -347,6 +366,16 @@ def common_reporter_options(f: Callable[..., Any]) -> Callable[..., Any]:
         callback=parse_profit_input,
         default=("100.0", "0.0"),  # Default to 100% profit and 0 USD
     )
+    @click.option(
+        "--max-idle",
+        "-mi",
+        "max_idle",
+        help="run reporting loops only on new tips, reports or reporter lock expiry, and at least every this many "
+        "seconds; the wait period sets how often new blocks are checked (default 0: run every wait period)",
+        nargs=1,
+        type=float,
+        default=0.0,
+    )
     @click.option(
         "--skip-manual-feeds",
         help="skip feeds that require manual value input when listening to tips",
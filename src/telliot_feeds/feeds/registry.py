@@ -0,0 +1,58 @@
+"""Lazily imported feed registries"""
+import importlib
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import MutableMapping
+
+from telliot_feeds.datafeed import DataFeed
+
+
+def load_feed(module: str, name: str) -> DataFeed[Any]:
+    """Import `module` and return its attribute `name`"""
+    feed: DataFeed[Any] = getattr(importlib.import_module(module), name)
+    return feed
+
+
+class LazyFeedRegistry(MutableMapping[str, DataFeed[Any]]):
+    """Mapping of tags to data feeds that imports each feed on first access
+
+    Membership tests, `len()` and iterating over keys never import anything;
+    looking up a value imports only the module defining that feed.
+
+    Args:
+        names: Mapping of tag to feed name, in registry order
+        load: Callable returning the feed for a feed name
+    """
+
+    def __init__(self, names: Dict[str, str], load: Callable[[str], DataFeed[Any]]) -> None:
+        self._names = dict(names)
+        self._load = load
+        self._feeds: Dict[str, DataFeed[Any]] = {}
+
+    def __getitem__(self, tag: str) -> DataFeed[Any]:
+        feed = self._feeds.get(tag)
+        if feed is None:
+            feed = self._feeds[tag] = self._load(self._names[tag])
+        return feed
+
+    def __setitem__(self, tag: str, feed: DataFeed[Any]) -> None:
+        self._names.setdefault(tag, tag)
+        self._feeds[tag] = feed
+
+    def __delitem__(self, tag: str) -> None:
+        del self._names[tag]
+        self._feeds.pop(tag, None)
+
+    def __contains__(self, tag: object) -> bool:
+        return tag in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._names)})"
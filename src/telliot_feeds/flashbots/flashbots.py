@@ -44,6 +44,7 @@ SECONDS_PER_BLOCK = 15
 class FlashbotsRPC:
     eth_sendBundle = RPCEndpoint("eth_sendBundle")
     eth_callBundle = RPCEndpoint("eth_callBundle")
+    eth_cancelBundle = RPCEndpoint("eth_cancelBundle")
 
 
 class FlashbotsTransactionResponse:
@@ -157,15 +158,17 @@ class Flashbots(Module):
         """Given a raw signed bundle,
         it packages it up with the block numbre and the timestamps"""
         # convert to hex
-        return [
-            {
-                "txs": list(map(lambda x: self.to_hex(x), signed_bundled_transactions)),
-                "blockNumber": hex(target_block_number),
-                "minTimestamp": opts["minTimestamp"] if opts else 0,
-                "maxTimestamp": opts["maxTimestamp"] if opts else 0,
-                "revertingTxHashes": opts["revertingTxHashes"] if opts else [],
-            }
-        ]
+        bundle = {
+            "txs": list(map(lambda x: self.to_hex(x), signed_bundled_transactions)),
+            "blockNumber": hex(target_block_number),
+            "minTimestamp": opts.get("minTimestamp", 0) if opts else 0,
+            "maxTimestamp": opts.get("maxTimestamp", 0) if opts else 0,
+            "revertingTxHashes": opts.get("revertingTxHashes", []) if opts else [],
+        }
+        if opts and opts.get("replacementUuid"):
+            # lets the bundle be cancelled with eth_cancelBundle
+            bundle["replacementUuid"] = opts["replacementUuid"]
+        return [bundle]
 
     sendRawBundle: Method[Callable[[Any], Any]] = Method(FlashbotsRPC.eth_sendBundle, mungers=[send_raw_bundle_munger])
     send_raw_bundle = sendRawBundle
@@ -260,6 +263,14 @@ class Flashbots(Module):
         json_rpc_method=FlashbotsRPC.eth_callBundle, mungers=[call_bundle_munger]
     )
 
+    def cancel_bundle_munger(self, replacement_uuid: str) -> List[Any]:
+        """Cancels a bundle sent with a replacementUuid"""
+        return [{"replacementUuid": replacement_uuid}]
+
+    cancel_bundle: Method[Callable[[Any], Any]] = Method(
+        json_rpc_method=FlashbotsRPC.eth_cancelBundle, mungers=[cancel_bundle_munger]
+    )
+
 
 def _parse_signed_tx(signed_tx: HexBytes) -> TxParams:
     # decode tx params based on its type
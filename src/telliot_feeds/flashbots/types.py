@@ -53,5 +53,6 @@ FlashbotsBundleDictTx = TypedDict(
 
 FlashbotsOpts = TypedDict(
     "FlashbotsOpts",
-    {"minTimestamp": int, "maxTimestamp": int, "revertingTxHashes": List[str]},
+    {"minTimestamp": int, "maxTimestamp": int, "revertingTxHashes": List[str], "replacementUuid": str},
+    total=False,
 )
@@ -28,6 +28,7 @@ from telliot_feeds.integrations.diva_protocol.utils import update_reported_pools
 from telliot_feeds.queries.diva_protocol import DIVAProtocol
 from telliot_feeds.reporters.tellor_360 import Tellor360Reporter
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.metrics import metrics
 
 
 logger = get_logger(__name__)
@@ -209,45 +210,38 @@ class DIVAProtocolReporter(Tellor360Reporter):
         update_reported_pools(pools=reported_pools)
         return ResponseStatus()
 
-    def sign_n_send_transaction(self, built_tx: Any) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+    async def sign_n_send_transaction(self, built_tx: Any) -> Tuple[Optional[TxReceipt], ResponseStatus]:
         """Send a signed transaction to the blockchain and wait for confirmation
 
         Params:
-            tx_signed: The signed transaction object
+            built_tx: The built transaction
 
         Returns a tuple of the transaction receipt and a ResponseStatus object
         """
         lazy_unlock_account(self.account)
-        local_account = self.account.local_account
-        tx_signed = local_account.sign_transaction(built_tx)
-        try:
-            logger.debug("Sending submitValue transaction")
-            tx_hash = self.web3.eth.send_raw_transaction(tx_signed.rawTransaction)
-        except Exception as e:
-            note = "Send transaction failed"
-            return None, error_status(note, log=logger.error, e=e)
-
-        try:
-            # Confirm transaction
-            tx_receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=360)
-
-            tx_url = f"{self.endpoint.explorer}/tx/{tx_hash.hex()}"
-
-            if tx_receipt["status"] == 0:
-                msg = f"Transaction reverted. ({tx_url})"
-                return tx_receipt, error_status(msg, log=logger.error)
-
-            logger.info(f"View reported data: \n{tx_url}")
-            # Update reported pools
-            pools = get_reported_pools()
-            cur_time = int(time.time())
-            if self.datafeed is not None:
-                update_reported_pools(pools=pools, add=[[self.datafeed.query.poolId.hex(), [cur_time, "not settled"]]])
-                logger.info(f"View reported data at timestamp {cur_time}: \n{tx_url}")
-            return tx_receipt, ResponseStatus()
-        except Exception as e:
-            note = "Failed to confirm transaction"
-            return None, error_status(note, log=logger.error, e=e)
+        logger.debug("Sending submitValue transaction")
+        pending, status = await self.transactions.submit(built_tx)
+        if pending is None:
+            return None, status
+
+        tx_receipt, status = await pending.wait()
+        if tx_receipt is None:
+            return None, status
+
+        tx_url = f"{self.endpoint.explorer}/tx/{tx_receipt['transactionHash'].hex()}"
+
+        if tx_receipt["status"] == 0:
+            msg = f"Transaction reverted. ({tx_url})"
+            return tx_receipt, error_status(msg, log=logger.error)
+
+        logger.info(f"View reported data: \n{tx_url}")
+        # Update reported pools
+        pools = get_reported_pools()
+        cur_time = int(time.time())
+        if self.datafeed is not None:
+            update_reported_pools(pools=pools, add=[[self.datafeed.query.poolId.hex(), [cur_time, "not settled"]]])
+            logger.info(f"View reported data at timestamp {cur_time}: \n{tx_url}")
+        return tx_receipt, ResponseStatus()
 
     async def report(self, report_count: Optional[int] = None) -> None:
         """Report values for pool reference assets & settle pools."""
@@ -263,6 +257,7 @@ class DIVAProtocolReporter(Tellor360Reporter):
                     await asyncio.sleep(self.wait_before_settle)
                     _ = await self.settle_pools()
 
+            metrics.log_summary_if_due()
             logger.info(f"Sleeping for {self.wait_period} seconds")
             await asyncio.sleep(self.wait_period)
             if report_count is not None:
@@ -0,0 +1,154 @@
+"""In-memory TTL cache for price source lookups
+
+The cache is opt-in: it is disabled until `price_cache.enable()` is called
+(e.g. by `telliot report --price-cache-ttl`). Once enabled, every
+`PriceSource.fetch_new_datapoint` call is served from the cache while the
+stored price is fresher than the source's TTL, so aggregators that share
+sources and repeated profitability checks hit the network once per window.
+Concurrent lookups of the same key share a single in-flight request.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import Tuple
+
+from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class PriceCache:
+    """Size-bounded LRU cache of time-stamped prices with per-lookup TTLs
+
+    Args:
+        default_ttl: Seconds a cached price stays fresh when the source sets no TTL
+        max_size: Maximum number of cached keys, least recently used are evicted first
+        enabled: Whether lookups go through the cache
+    """
+
+    def __init__(self, default_ttl: float = 30.0, max_size: int = 1024, enabled: bool = False) -> None:
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.enabled = enabled
+
+        # key -> (monotonic time stored, datapoint)
+        self._entries: "OrderedDict[Hashable, Tuple[float, OptionalDataPoint[float]]]" = OrderedDict()
+        self._inflight: Dict[Hashable, "asyncio.Future[OptionalDataPoint[float]]"] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def enable(self, default_ttl: Optional[float] = None, max_size: Optional[int] = None) -> None:
+        """Turn the cache on, optionally changing its settings"""
+        if default_ttl is not None:
+            self.default_ttl = default_ttl
+        if max_size is not None:
+            self.max_size = max_size
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Turn the cache off and drop all entries"""
+        self.enabled = False
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all cached prices"""
+        self._entries.clear()
+
+    def get(self, key: Hashable, ttl: Optional[float] = None) -> Optional[OptionalDataPoint[float]]:
+        """Return the cached datapoint for key if it is still fresh"""
+        ttl = self.default_ttl if ttl is None else ttl
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored, datapoint = entry
+        if time.monotonic() - stored > ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return datapoint
+
+    def put(self, key: Hashable, datapoint: OptionalDataPoint[float]) -> None:
+        """Store a datapoint, evicting the least recently used entries if full"""
+        self._entries[key] = (time.monotonic(), datapoint)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[OptionalDataPoint[float]]],
+        ttl: Optional[float] = None,
+    ) -> OptionalDataPoint[float]:
+        """Return a fresh cached datapoint or fetch, cache and return a new one
+
+        Failed lookups (None values) are returned but never cached.
+        """
+        if not self.enabled or ttl == 0:
+            return await fetch()
+
+        cached = self.get(key, ttl)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is asyncio.get_running_loop():
+            self.hits += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future: "asyncio.Future[OptionalDataPoint[float]]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            datapoint = await fetch()
+        except Exception as e:
+            future.set_exception(e)
+            # Avoid "exception never retrieved" warnings when nobody shared the request
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(datapoint)
+        v, t = datapoint
+        if v is not None and t is not None:
+            self.put(key, datapoint)
+        return datapoint
+
+    async def refresh(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[OptionalDataPoint[float]]],
+        ttl: Optional[float] = None,
+    ) -> OptionalDataPoint[float]:
+        """Fetch a new datapoint even if one is cached or in flight, and cache it
+
+        Failed lookups (None values) are returned but never cached.
+        """
+        datapoint = await fetch()
+        v, t = datapoint
+        if self.enabled and ttl != 0 and v is not None and t is not None:
+            self.put(key, datapoint)
+        return datapoint
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries)}
+
+
+#: Process-wide cache used by all price sources
+price_cache = PriceCache()
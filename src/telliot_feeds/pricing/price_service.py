@@ -2,10 +2,12 @@ from abc import ABC
 from abc import abstractmethod
 from typing import Any
 from typing import Dict
-
-import requests
+from typing import Hashable
+from typing import Optional
 
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.http_client import get_http_client
+from telliot_feeds.utils.http_client import HTTPClient
 
 
 class PriceServiceInterface(ABC):
@@ -35,40 +37,70 @@ class PriceServiceInterface(ABC):
 
 
 class WebPriceService(PriceServiceInterface):
-    """Abstract Base CLass for a Web-based Pricing Service"""
+    """Abstract Base CLass for a Web-based Pricing Service
+
+    Requests go through the process-wide pooled `HTTPClient` unless
+    a dedicated client is provided.
+    """
 
-    def __init__(self, name: str, url: str, timeout: float = 5.0):
+    def __init__(self, name: str, url: str, timeout: float = 5.0, http_client: Optional[HTTPClient] = None):
 
         self.name = name
         self.url = url
         self.timeout = timeout
+        self._http_client = http_client
+
+    @property
+    def http_client(self) -> HTTPClient:
+        """HTTP client used for all requests of this service"""
+        if getattr(self, "_http_client", None) is None:
+            return get_http_client()
+        return self._http_client  # type: ignore
+
+    def cache_key(self, asset: str, currency: str) -> Hashable:
+        """Key identifying a price lookup in the shared price cache
+
+        Services whose result depends on more than the asset and currency
+        (e.g. a historical timestamp) must include that state in the key.
+        """
+        return type(self).__name__, self.url, asset.lower(), currency.lower()
 
-    def get_url(self, url: str = "") -> Dict[str, Any]:
+    async def get_url(
+        self, url: str = "", params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
         """Helper function to get URL JSON response while handling exceptions
 
         Args:
             url: URL to fetch
+            params: Query string parameters
+            headers: Request headers
 
         Returns:
             A dictionary with the following (optional) keys:
                 json (dict or list): Result, if no error occurred
+                status (int): HTTP status code, if a response was received
                 error (str): A description of the error, if one occurred
                 exception (Exception): The exception, if one occurred
         """
 
         request_url = self.url + url
 
-        with requests.Session() as s:
-            try:
-                r = s.get(request_url, timeout=self.timeout)
-                json_data = r.json()
-                return {"response": json_data}
+        return await self.http_client.get(request_url, params=params, headers=headers, timeout=self.timeout)
 
-            except requests.exceptions.ConnectTimeout as e:
-                return {"error": "Timeout Error", "exception": e}
+    async def post_url(
+        self, url: str = "", json_data: Optional[Any] = None, headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Helper function to POST a JSON body (e.g. a subgraph query) and get the JSON response
 
-            except requests.exceptions.JSONDecodeError as e:
-                return {"error": "JSON Decode Error", "exception": e}
+        Args:
+            url: URL to post to
+            json_data: JSON body
+            headers: Request headers
+
+        Returns:
+            A dictionary with the same keys as `get_url`
+        """
+
+        request_url = self.url + url
 
-            except Exception as e:
-                return {"error": str(type(e)), "exception": e}
+        return await self.http_client.post(request_url, json_data=json_data, headers=headers, timeout=self.timeout)
@@ -1,8 +1,10 @@
 from dataclasses import dataclass
 from dataclasses import field
+from typing import Optional
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.price_cache import price_cache
 from telliot_feeds.pricing.price_service import WebPriceService
 
 
@@ -12,6 +14,9 @@ class PriceSource(DataSource[float]):
 
     The Current Asset Price data source retrieves the price of a asset
     in the specified current from a `WebPriceService`.
+
+    When the shared `price_cache` is enabled, lookups are served from it
+    while the last price is fresher than `cache_ttl` seconds.
     """
 
     #: Asset symbol
@@ -23,13 +28,29 @@ class PriceSource(DataSource[float]):
     #: Price Service
     service: WebPriceService = field(default_factory=WebPriceService)  # type: ignore
 
-    async def fetch_new_datapoint(self) -> OptionalDataPoint[float]:
+    #: Seconds a cached price stays fresh (None: cache default, 0: never cache)
+    cache_ttl: Optional[float] = None
+
+    async def fetch_new_datapoint(self, refresh: bool = False) -> OptionalDataPoint[float]:
         """Update current value with time-stamped value fetched from source
 
+        Args:
+            refresh: Request a new price even if one is cached or already being
+                requested, e.g. to hedge a slow request. It is cached as usual.
+
         Returns:
             New datapoint
         """
-        datapoint = await self.service.get_price(self.asset, self.currency)
+        cache_key = getattr(self.service, "cache_key", None)
+        if cache_key is None:
+            datapoint = await self.service.get_price(self.asset, self.currency)
+        else:
+            lookup = price_cache.refresh if refresh else price_cache.get_or_fetch
+            datapoint = await lookup(
+                cache_key(self.asset, self.currency),
+                lambda: self.service.get_price(self.asset, self.currency),
+                ttl=self.cache_ttl,
+            )
         v, t = datapoint
         if v is not None and t is not None:
             self.store_datapoint((v, t))
@@ -0,0 +1,111 @@
+"""Coalesce concurrent lookups into batched API requests
+
+Many APIs (CoinGecko `/simple/price`, CoinMarketCap `quotes/latest`, ...)
+accept several ids per request. A `RequestBatcher` collects every lookup
+issued within a short window, sends a single batched request and hands
+each waiting caller the result for its own key.
+"""
+import asyncio
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Generic
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import TypeVar
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class RequestBatcher(Generic[K, V]):
+    """Collect lookups for a short window and resolve them with one batch call
+
+    Args:
+        fetch_batch: Coroutine function receiving the list of distinct pending
+            keys and returning a mapping from key to result. Keys missing
+            from the mapping resolve to None.
+        window: Seconds to wait for more lookups after the first one arrives
+        max_batch_size: Flush immediately once this many distinct keys are pending
+    """
+
+    def __init__(
+        self,
+        fetch_batch: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        window: float = 0.05,
+        max_batch_size: int = 50,
+    ) -> None:
+        self.fetch_batch = fetch_batch
+        self.window = window
+        self.max_batch_size = max_batch_size
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[K, List["asyncio.Future[Optional[V]]"]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+        #: Number of batch requests sent
+        self.batches = 0
+
+        #: Number of lookups served
+        self.lookups = 0
+
+    async def get(self, key: K) -> Optional[V]:
+        """Queue a lookup and wait for the batched result"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # State left over from a previous (closed) event loop is unusable
+            self._loop = loop
+            self._pending = {}
+            self._flush_handle = None
+
+        future: "asyncio.Future[Optional[V]]" = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        self.lookups += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self.flush)
+
+        return await future
+
+    def flush(self) -> None:
+        """Send all pending lookups now"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        task = asyncio.ensure_future(self._resolve(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, pending: Dict[K, List["asyncio.Future[Optional[V]]"]]) -> None:
+        """Run one batch request and fan the results out to the waiting callers"""
+        self.batches += 1
+        keys = list(pending)
+        try:
+            results = await self.fetch_batch(keys)
+        except Exception as e:
+            logger.warning(f"Batch request for {len(keys)} keys failed: {e}")
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for key, futures in pending.items():
+            result = results.get(key)
+            for future in futures:
+                if not future.done():
+                    future.set_result(result)
@@ -1,9 +1,13 @@
 import json
+from bisect import bisect_left
+from bisect import insort
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 import clamfig
 import yaml
@@ -42,13 +46,68 @@ class Catalog(Base):
 
     The query catalog contains one `CatalogEntry` object for each valid query in the Tellor network.
     It is stored as a mapping of query names (i.e. tags) to `CatalogEntry` objects.
+
+    Lookups by query id and query type go through hash indexes, and tag substring
+    searches through a sorted list of tag suffixes, all kept in sync by `add_entry`.
     """
 
     _entries: Dict[str, CatalogEntry] = field(default_factory=dict)
 
+    #: Insertion position of each tag, to return search results in catalog order
+    _order: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    #: Normalized query id (lowercase, no 0x) -> tags
+    _by_query_id: Dict[str, List[str]] = field(default_factory=dict, init=False, repr=False)
+
+    #: Lowercase query type -> tags
+    _by_query_type: Dict[str, List[str]] = field(default_factory=dict, init=False, repr=False)
+
+    #: Sorted (suffix, tag) pairs of every tag; a substring is a prefix of some suffix
+    _tag_suffixes: List[Tuple[str, str]] = field(default_factory=list, init=False, repr=False)
+
+    #: Results of previous tag substring searches, cleared whenever an entry is added
+    _tag_searches: Dict[str, List[str]] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._sync_index()
+
+    def _sync_index(self) -> None:
+        """Rebuild the indexes if entries were set without `add_entry` (e.g. restored from state)"""
+        if len(getattr(self, "_order", ())) == len(self._entries):
+            return
+        self._order = {}
+        self._by_query_id = {}
+        self._by_query_type = {}
+        self._tag_suffixes = []
+        self._tag_searches = {}
+        for entry in self._entries.values():
+            self._index(entry)
+
+    def _index(self, entry: CatalogEntry) -> None:
+        """Add an entry to the lookup indexes"""
+        self._order[entry.tag] = len(self._order)
+        self._by_query_id.setdefault(_normalize_query_id(entry.query_id), []).append(entry.tag)
+        self._by_query_type.setdefault(entry.query_type.lower(), []).append(entry.tag)
+        for i in range(len(entry.tag)):
+            insort(self._tag_suffixes, (entry.tag[i:], entry.tag))
+        self._tag_searches.clear()
+
+    def _tags_containing(self, substring: str) -> List[str]:
+        """Tags that contain the given substring, in catalog order"""
+        tags = self._tag_searches.get(substring)
+        if tags is None:
+            found = set()
+            i = bisect_left(self._tag_suffixes, (substring, ""))
+            while i < len(self._tag_suffixes) and self._tag_suffixes[i][0].startswith(substring):
+                found.add(self._tag_suffixes[i][1])
+                i += 1
+            tags = self._tag_searches[substring] = sorted(found, key=self._order.__getitem__)
+        return tags
+
     def add_entry(self, tag: str, title: str, q: OracleQuery, active: bool = True) -> None:
         """Add a new entry to the catalog."""
 
+        self._sync_index()
         if tag in self._entries:
             raise Exception(f"Error adding query entry: {tag} already exists")
 
@@ -68,6 +127,7 @@ class Catalog(Base):
         )
 
         self._entries[tag] = entry
+        self._index(entry)
 
     def find(
         self,
@@ -79,17 +139,24 @@ class Catalog(Base):
     ) -> List[OracleQuery]:
         """Search the query catalog for matching entries."""
 
+        self._sync_index()
+
+        if query_id is not None:
+            candidates: Iterable[str] = self._by_query_id.get(_normalize_query_id(query_id), [])
+        elif query_type is not None:
+            candidates = self._by_query_type.get(query_type.lower(), [])
+        elif tag:
+            candidates = self._tags_containing(tag)
+        else:
+            candidates = self._entries.keys()
+
+        # every index lists tags in catalog order
         entries = []
-        for entry in self._entries.values():
+        for candidate in candidates:
+            entry = self._entries[candidate]
             if tag is not None:
                 if tag not in entry.tag:  # includes search for substring
                     continue
-            if query_id is not None:
-                # Add 0x if necessary for match
-                if query_id[:2] not in ["0x", "0X"]:
-                    query_id = "0x" + query_id
-                if query_id.lower() != entry.query_id.lower():
-                    continue
             if query_type is not None:
                 if query_type.lower() != entry.query_type.lower():
                     continue
@@ -122,3 +189,9 @@ class Catalog(Base):
             lines.append("")
 
         return "\n".join(lines)
+
+
+def _normalize_query_id(query_id: str) -> str:
+    """Lowercase query id without 0x prefix"""
+    query_id = query_id.lower()
+    return query_id[2:] if query_id.startswith("0x") else query_id
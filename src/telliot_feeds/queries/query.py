@@ -3,8 +3,10 @@
 """
 from __future__ import annotations
 
+import functools
 import json
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import Optional
 
@@ -44,8 +46,28 @@ class OracleQuery(Serializable):
     - Encoding of the `descriptor` string to compute the `query_data` attribute,
     which is used for the `data` field of a `TellorX.Oracle.tipQuery()` contract call.
 
+    `query_data` and `query_id` are computed once per instance and cached until
+    an attribute is assigned. Parameters mutated in place (e.g. appending to a
+    list parameter) require a call to `clear_cache()`.
+
     """
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Cache the query data encoding of every subclass that implements one
+        prop = cls.__dict__.get("query_data")
+        if isinstance(prop, property) and prop.fget is not None and not hasattr(prop.fget, "__wrapped__"):
+            cls.query_data = property(_cached_query_data(prop.fget), doc=prop.__doc__)  # type: ignore
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        self.clear_cache()
+
+    def clear_cache(self) -> None:
+        """Forget the cached `query_data` and `query_id`"""
+        self.__dict__.pop("_query_data", None)
+        self.__dict__.pop("_query_id", None)
+
     @property
     def value_type(self) -> ValueType:
         """Returns the ValueType expected by the current Query configuration
@@ -76,7 +98,10 @@ class OracleQuery(Serializable):
         ``TellorX.Oracle.tipQuery()`` and ``TellorX.Oracle.submitValue()``
         contract calls.
         """
-        return bytes(Web3.keccak(self.query_data))
+        query_id: Optional[bytes] = self.__dict__.get("_query_id")
+        if query_id is None:
+            query_id = self.__dict__["_query_id"] = bytes(Web3.keccak(self.query_data))
+        return query_id
 
     @property
     def query_data(self) -> bytes:
@@ -93,6 +118,19 @@ class OracleQuery(Serializable):
         raise NotImplementedError
 
 
+def _cached_query_data(encode: Callable[[Any], bytes]) -> Callable[[Any], bytes]:
+    """Wrap a `query_data` getter to store its result on the instance"""
+
+    @functools.wraps(encode)
+    def query_data(self: OracleQuery) -> bytes:
+        data: Optional[bytes] = self.__dict__.get("_query_data")
+        if data is None:
+            data = self.__dict__["_query_data"] = encode(self)
+        return data
+
+    return query_data
+
+
 def query_from_descriptor(descriptor: str) -> OracleQuery:
     """Convert a query descriptor into a query object."""
     state = json.loads(descriptor)
@@ -0,0 +1,151 @@
+"""Flashbots bundle submission for several target blocks
+
+A bundle only lands if a builder includes it in its target block, so
+`BundleSubmitter` sends the same bundle for each of the next
+`target_blocks` blocks at once. The bundle is first simulated with
+`eth_callBundle`, so a transaction that would revert is never sent.
+Inclusion is tracked without blocking the event loop by reading the
+transactions of each new block; once the bundle lands, the bundles sent for
+later blocks are cancelled.
+
+    receipt, status = await BundleSubmitter(w3, target_blocks=3).submit(signed_tx)
+"""
+import asyncio
+import uuid
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from hexbytes import HexBytes
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+from web3 import Web3
+from web3.types import TxReceipt
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Seconds a block is expected to follow the previous one
+SECONDS_PER_BLOCK = 12
+
+
+class BundleSubmitter:
+    """Sends a bundle for several target blocks and waits until one lands
+
+    Args:
+        web3: Connection with the flashbots module attached
+        target_blocks: Number of consecutive blocks the bundle is sent for
+        simulate: Whether to simulate the bundle before sending it
+        poll_interval: Seconds between checks for a new block
+    """
+
+    def __init__(self, web3: Web3, target_blocks: int = 3, simulate: bool = True, poll_interval: float = 1.0) -> None:
+        self.web3 = web3
+        self.target_blocks = target_blocks
+        self.simulate = simulate
+        self.poll_interval = poll_interval
+
+    @property
+    def flashbots(self) -> Any:
+        return self.web3.flashbots  # type: ignore
+
+    async def simulate_bundle(self, signed_txs: List[HexBytes], block: int) -> ResponseStatus:
+        """Simulate a bundle on top of a block with eth_callBundle"""
+        try:
+            header = await asyncio.to_thread(self.web3.eth.get_block, block)
+            result = await asyncio.to_thread(
+                self.flashbots.call_bundle,
+                signed_txs,
+                hex(block + 1),
+                hex(block),
+                header["timestamp"] + SECONDS_PER_BLOCK,
+            )
+        except Exception as e:
+            return error_status("Unable to simulate bundle", e=e, log=logger.error)
+
+        for tx_result in result.get("results", []):
+            if tx_result.get("error") or tx_result.get("revert"):
+                msg = f"Bundle transaction {tx_result.get('txHash')} would fail"
+                e = Exception(tx_result.get("revert") or tx_result.get("error"))
+                return error_status(msg, e=e, log=logger.error)
+        logger.debug(f"Bundle simulation on block {block}: {result}")
+        return ResponseStatus()
+
+    async def send_bundle(self, signed_txs: List[HexBytes], target_block: int) -> Optional[str]:
+        """Send a bundle for one block, returning the uuid that cancels it"""
+        replacement_uuid = str(uuid.uuid4())
+        try:
+            await asyncio.to_thread(
+                self.flashbots.send_raw_bundle, signed_txs, target_block, {"replacementUuid": replacement_uuid}
+            )
+        except Exception as e:
+            logger.warning(f"Unable to send bundle for block {target_block}: {e}")
+            return None
+        return replacement_uuid
+
+    async def cancel_bundle(self, replacement_uuid: str) -> None:
+        try:
+            await asyncio.to_thread(self.flashbots.cancel_bundle, replacement_uuid)
+        except Exception as e:
+            logger.debug(f"Unable to cancel bundle {replacement_uuid}: {e}")
+
+    async def wait_for_inclusion(self, tx_hash: HexBytes, first_block: int, last_block: int) -> Optional[int]:
+        """Number of the block between `first_block` and `last_block` including a transaction
+
+        Returns None once `last_block` was mined without it.
+        """
+        next_block = first_block
+        while next_block <= last_block:
+            try:
+                head = await asyncio.to_thread(lambda: self.web3.eth.block_number)
+                while next_block <= min(head, last_block):
+                    block = await asyncio.to_thread(self.web3.eth.get_block, next_block)
+                    # hashes, unless the block was read with full transactions
+                    hashes = [HexBytes(tx if isinstance(tx, bytes) else tx["hash"]) for tx in block["transactions"]]
+                    if tx_hash in hashes:
+                        return next_block
+                    next_block += 1
+            except Exception as e:
+                logger.debug(f"Unable to read block {next_block}: {e}")
+            if next_block <= last_block:
+                await asyncio.sleep(self.poll_interval)
+        return None
+
+    async def submit(self, signed_tx: HexBytes) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+        """Send a bundle of one signed transaction and wait until it is executed"""
+        signed_txs = [signed_tx]
+        try:
+            block: int = await asyncio.to_thread(lambda: self.web3.eth.block_number)
+        except Exception as e:
+            return None, error_status("Unable to fetch block number", e=e, log=logger.error)
+
+        if self.simulate:
+            status = await self.simulate_bundle(signed_txs, block)
+            if not status.ok:
+                return None, status
+
+        targets = [block + k for k in range(1, self.target_blocks + 1)]
+        uuids = await asyncio.gather(*(self.send_bundle(signed_txs, target) for target in targets))
+        sent: Dict[int, str] = {target: u for target, u in zip(targets, uuids) if u is not None}
+        if not sent:
+            return None, error_status("Unable to send bundle to miners", log=logger.error)
+        logger.info(f"Bundle sent to miners for blocks {min(sent)} to {max(sent)}")
+
+        tx_hash = HexBytes(Web3.keccak(signed_tx))
+        included = await self.wait_for_inclusion(tx_hash, min(sent), max(sent))
+        if included is None:
+            msg = f"Bundle was not executed in blocks {min(sent)} to {max(sent)}"
+            return None, error_status(msg, log=logger.error)
+
+        # the bundles for later blocks can no longer land, let the relay drop them
+        await asyncio.gather(*(self.cancel_bundle(u) for target, u in sent.items() if target > included))
+        logger.info(f"Bundle was executed in block {included}")
+        try:
+            receipt: TxReceipt = await asyncio.to_thread(self.web3.eth.get_transaction_receipt, tx_hash)
+        except Exception as e:
+            return None, error_status("Unable to fetch receipt of executed bundle", e=e, log=logger.error)
+        return receipt, ResponseStatus()
@@ -1,4 +1,3 @@
-import asyncio
 from dataclasses import dataclass
 from typing import Any
 from typing import Optional
@@ -220,8 +219,7 @@ class ChainlinkBackupReporter(Tellor360Reporter):
             else:
                 logger.warning("Unable to connect to the internet!")
 
-            logger.info(f"Sleeping for {self.wait_period} seconds")
-            await asyncio.sleep(self.wait_period)
+            await self.wait_for_next_loop()
 
             if report_count is not None:
                 report_count -= 1
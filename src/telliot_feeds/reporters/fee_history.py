@@ -0,0 +1,178 @@
+"""Rolling fee history for EIP1559 gas estimation
+
+`FeeHistoryCache` keeps the base fees, gas used ratios and priority fee
+percentiles of the most recent blocks in fixed size ring buffers. Each
+`update` fetches only the blocks mined since the last one, and none at all
+when checked less than `max_age` seconds ago, so estimating gas for back to
+back transactions costs no more than one `eth_blockNumber` call.
+
+    cache = FeeHistoryCache([25.0, 50.0, 75.0])
+    status = cache.update(web3)
+    history = cache.fee_history(10)  # same shape as web3.eth.fee_history
+    priority_fee = cache.priority_fee(reward_percentile=50.0, q=60.0)
+"""
+import math
+import time
+from collections import deque
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+from web3 import Web3
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """q-th percentile of values, interpolating linearly between the closest ranks"""
+    if not values:
+        raise ValueError("percentile of empty sequence")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class FeeHistoryCache:
+    """Fee history of the latest blocks, fetched incrementally
+
+    Args:
+        reward_percentiles: Priority fee percentiles requested for each block
+        size: Most blocks kept
+        max_age: Seconds during which the buffer is used without checking for a new block
+    """
+
+    def __init__(self, reward_percentiles: Sequence[float], size: int = 128, max_age: float = 2.0) -> None:
+        self.reward_percentiles = list(reward_percentiles)
+        self.size = size
+        self.max_age = max_age
+
+        #: Connection the buffer was filled from, a new one starts over
+        self.web3: Optional[Web3] = None
+
+        #: Number of the newest block in the buffer
+        self.head: Optional[int] = None
+
+        #: Base fee of the block after `head`
+        self.next_base_fee: Optional[int] = None
+
+        self.blocks: Deque[int] = deque(maxlen=size)
+        self.base_fees: Deque[int] = deque(maxlen=size)
+        self.gas_used_ratios: Deque[float] = deque(maxlen=size)
+        #: Priority fee at each of `reward_percentiles`, per block
+        self.rewards: Deque[List[int]] = deque(maxlen=size)
+
+        self._checked_at = -math.inf
+
+    def clear(self) -> None:
+        self.head = None
+        self.next_base_fee = None
+        self.blocks.clear()
+        self.base_fees.clear()
+        self.gas_used_ratios.clear()
+        self.rewards.clear()
+        self._checked_at = -math.inf
+
+    def update(self, web3: Web3) -> ResponseStatus:
+        """Fetch the fee history of blocks newer than `head`"""
+        if web3 is not self.web3:
+            self.clear()
+            self.web3 = web3
+        now = time.monotonic()
+        if self.head is not None and now - self._checked_at < self.max_age:
+            return ResponseStatus()
+        try:
+            head = web3.eth.block_number
+            if head == self.head:
+                self._checked_at = now
+                return ResponseStatus()
+            if self.head is not None and head < self.head:
+                # reorg or node behind the previous one, the buffer can't be extended
+                self.clear()
+            block_count = self.size if self.head is None else min(head - self.head, self.size)
+            history = web3.eth.fee_history(
+                block_count=block_count, newest_block=head, reward_percentiles=self.reward_percentiles
+            )
+        except Exception as e:
+            return error_status("Error fetching fee history", e=e, log=logger.error)
+        if history is None:
+            return error_status("unable to fetch fee history from node")
+
+        self.extend(history)
+        self._checked_at = now
+        return ResponseStatus()
+
+    def extend(self, history: Any) -> None:
+        """Add the blocks of a `web3.eth.fee_history` response newer than `head`"""
+        base_fees = history["baseFeePerGas"]
+        gas_used_ratios = history.get("gasUsedRatio") or []
+        rewards = history.get("reward") or []
+        oldest = history["oldestBlock"]
+        for i, base_fee in enumerate(base_fees[:-1]):
+            block = oldest + i
+            if self.head is not None and block <= self.head:
+                continue
+            self.blocks.append(block)
+            self.base_fees.append(base_fee)
+            self.gas_used_ratios.append(gas_used_ratios[i] if i < len(gas_used_ratios) else 0.0)
+            self.rewards.append(list(rewards[i]) if i < len(rewards) else [0] * len(self.reward_percentiles))
+            self.head = block
+        self.next_base_fee = base_fees[-1]
+
+    def window(self, block_count: Optional[int] = None) -> int:
+        """Number of buffered blocks used for at most `block_count` blocks"""
+        if block_count is None:
+            return len(self.blocks)
+        return min(block_count, len(self.blocks))
+
+    def fee_history(self, block_count: Optional[int] = None) -> Dict[str, Any]:
+        """The latest blocks in the shape of a `web3.eth.fee_history` response"""
+        n = self.window(block_count)
+        start = len(self.blocks) - n
+        return {
+            "oldestBlock": self.blocks[start] if n else (self.head or 0) + 1,
+            "baseFeePerGas": list(self.base_fees)[start:] + [self.next_base_fee],
+            "gasUsedRatio": list(self.gas_used_ratios)[start:],
+            "reward": list(self.rewards)[start:],
+        }
+
+    def base_fee_ewma(self, alpha: float = 0.2, block_count: Optional[int] = None) -> Optional[int]:
+        """Exponentially weighted moving average of the base fee, ending with the next block's"""
+        n = self.window(block_count)
+        start = len(self.base_fees) - n
+        base_fees = list(self.base_fees)[start:] + [self.next_base_fee]
+        average: Optional[float] = None
+        for base_fee in base_fees:
+            if base_fee is None:
+                continue
+            average = base_fee if average is None else alpha * base_fee + (1 - alpha) * average
+        return None if average is None else round(average)
+
+    def priority_fee(
+        self, reward_percentile: float = 50.0, q: float = 50.0, block_count: Optional[int] = None
+    ) -> Optional[int]:
+        """Percentile across blocks of their priority fee at one of the `reward_percentiles`
+
+        Blocks with no transactions (a zero reward) are left out.
+
+        Args:
+            reward_percentile: Priority fee percentile within each block, one of `reward_percentiles`
+            q: Percentile of the per block priority fees
+            block_count: Latest blocks considered, all buffered if None
+        """
+        index = self.reward_percentiles.index(reward_percentile)
+        n = self.window(block_count)
+        start = len(self.rewards) - n
+        fees = [reward[index] for reward in list(self.rewards)[start:] if reward[index] != 0]
+        if not fees:
+            return None
+        return round(percentile(fees, q))
@@ -1,5 +1,6 @@
 from decimal import Decimal
 from typing import Any
+from typing import cast
 from typing import Dict
 from typing import List
 from typing import Literal
@@ -17,6 +18,7 @@ from web3.contract import ContractFunction
 from web3.types import FeeHistory
 from web3.types import Wei
 
+from telliot_feeds.reporters.fee_history import FeeHistoryCache
 from telliot_feeds.reporters.types import GasParams
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.reporter_utils import fee_history_priority_fee_estimate
@@ -101,6 +103,7 @@ class GasFees:
         reward_percentile: Optional[List[float]] = None,
         block_count: int = 10,  # Number of blocks to use for gas price calculation
         min_native_token_balance: int = 0,  # Minimum native token balance to be considered for gas price calculation
+        fee_history_size: int = 0,  # Blocks of fee history kept between transactions, 0 to fetch it every time
     ):
         self.endpoint = endpoint
         self.account = account
@@ -115,6 +118,9 @@ class GasFees:
         self.reward_percentile = reward_percentile or [25.0, 50.0, 75.0]
         self.block_count = block_count
         self.min_native_token_balance = min_native_token_balance
+        self.fee_history_cache: Optional[FeeHistoryCache] = None
+        if fee_history_size > 0:
+            self.fee_history_cache = FeeHistoryCache(self.reward_percentile, size=max(fee_history_size, block_count))
 
         self.acct_address = to_checksum_address(account.address)
         self.web3: Web3 = endpoint._web3
@@ -193,10 +199,16 @@ class GasFees:
         transaction fees from the EVM network. The number of blocks to retrieve and the
         reward percentiles to compute are hardcoded to 5 blocks and [25, 50, 75] percentiles
         meaning for each block get the 25th, 50th and 75th percentile of priority fee per gas
+        With a fee history cache only blocks mined since the last call are fetched.
 
         Returns:
             - fee_history: FeeHistory
         """
+        if self.fee_history_cache is not None:
+            status = self.fee_history_cache.update(self.web3)
+            if not status.ok:
+                return None, status
+            return cast(FeeHistory, self.fee_history_cache.fee_history(self.block_count)), ResponseStatus()
         try:
             fee_history = self.web3.eth.fee_history(
                 block_count=self.block_count, newest_block="latest", reward_percentiles=self.reward_percentile
@@ -26,9 +26,12 @@ async def get_time_based_rewards(oracle: Tellor360OracleContract) -> int:
         error = last_val_status.error
         logger.warning(f"Unable to calculate time-based rewards for reporter: {error}")
         return 0
-    current_year = await oracle.read("timeBasedReward")
+    time_based_reward, reward_status = await oracle.read("timeBasedReward")
+    if not reward_status.ok:
+        logger.warning(f"Unable to calculate time-based rewards for reporter: {reward_status.error}")
+        return 0
     reward = (
-        (TimeStamp.now().ts - time_of_last_new_value) * (await oracle.read("timeBasedReward"))[0]
+        (TimeStamp.now().ts - time_of_last_new_value) * time_based_reward
     ) / 300  # amount of tokens (5e17) dispersed every five min (300 sec)
 
     return reward #if reward < tbr else tbr
@@ -0,0 +1,174 @@
+"""Event-driven scheduling of reporting loops
+
+Instead of re-running every check each `wait_period`, a reporter using a
+`ReportScheduler` sleeps until a reporting loop may do something new:
+
+- a new tip or funded feed was added to autopay, or someone reported to the
+  oracle (which changes the tips left), found by polling `eth_getLogs` for
+  the blocks since the last check, only when the chain head moved
+- the reporter lock expires
+- `max_idle` seconds passed without either, since some conditions (time
+  based feed windows, off-chain prices) change without any event
+
+Checking for a new block costs one `eth_blockNumber` call per poll interval.
+"""
+import asyncio
+import time
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from eth_utils import event_abi_to_log_topic
+from eth_utils import to_hex
+from telliot_core.contract.contract import Contract
+from web3 import Web3
+from web3.types import LogReceipt
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Oracle events after which reporting may be worthwhile
+ORACLE_EVENTS = ("NewReport",)
+
+#: Autopay events after which reporting may be worthwhile
+AUTOPAY_EVENTS = ("TipAdded", "NewDataFeed", "DataFeedFunded")
+
+
+def event_topics(contract: Contract, names: Sequence[str]) -> Dict[str, Optional[int]]:
+    """Log topics of a contract's events, with the topic index of their indexed `_queryId` if any
+
+    Events missing from the contract's ABI are skipped.
+    """
+    web3_contract: Any = getattr(contract, "contract", None)
+    abi = getattr(web3_contract, "abi", None) or []
+    topics: Dict[str, Optional[int]] = {}
+    for item in abi:
+        if item.get("type") != "event" or item.get("name") not in names:
+            continue
+        indexed = [arg["name"] for arg in item["inputs"] if arg.get("indexed")]
+        topics[to_hex(event_abi_to_log_topic(item))] = indexed.index("_queryId") + 1 if "_queryId" in indexed else None
+    return topics
+
+
+class ReportScheduler:
+    """Waits until something relevant to a reporter happened
+
+    Args:
+        web3: Connection to the chain
+        watches: Contracts and the names of their events to wake up for
+        poll_interval: Seconds between checks for a new block
+        max_idle: Seconds after which `wait` returns even if nothing happened
+        reporter: Address of the reporter, whose own transactions don't wake it
+        max_block_range: Most blocks requested in one `eth_getLogs` call
+    """
+
+    def __init__(
+        self,
+        web3: Web3,
+        watches: Sequence[Tuple[Contract, Sequence[str]]],
+        poll_interval: float = 7.0,
+        max_idle: float = 300.0,
+        reporter: Optional[str] = None,
+        max_block_range: int = 2_000,
+    ) -> None:
+        self.web3 = web3
+        self.watches = watches
+        self.poll_interval = poll_interval
+        self.max_idle = max_idle
+        self.reporter_topic = None if reporter is None else "0x" + reporter[2:].lower().rjust(64, "0")
+        self.max_block_range = max_block_range
+
+        #: Only wake up for events of these query ids, all if None
+        self.query_ids: Optional[List[bytes]] = None
+
+        #: Last block whose logs were checked, None before the first `wait`
+        self.last_block: Optional[int] = None
+
+        #: Watched event topics with the topic index of their query id
+        self.topics: Dict[str, Optional[int]] = {}
+        self.addresses: List[str] = []
+
+    def log_filter(self, from_block: int, to_block: int) -> Optional[Any]:
+        """eth_getLogs filter for the watched events, None if there are none"""
+        if not self.topics:
+            # read from the ABIs once the contracts are connected
+            for contract, names in self.watches:
+                contract_topics = event_topics(contract, names)
+                if contract_topics:
+                    self.addresses.append(contract.address)
+                    self.topics.update(contract_topics)
+        if not self.topics:
+            return None
+        return {"fromBlock": from_block, "toBlock": to_block, "address": self.addresses, "topics": [list(self.topics)]}
+
+    async def poll(self) -> List[LogReceipt]:
+        """Watched events of the blocks mined since the last poll"""
+        try:
+            head: int = await asyncio.to_thread(lambda: self.web3.eth.block_number)
+        except Exception as e:
+            logger.warning(f"Unable to fetch block number: {e}")
+            return []
+        if self.last_block is None or head < self.last_block:
+            self.last_block = head
+            return []
+        if head == self.last_block:
+            return []
+
+        from_block = self.last_block + 1
+        to_block = min(head, from_block + self.max_block_range - 1)
+        log_filter = self.log_filter(from_block, to_block)
+        if log_filter is None:
+            self.last_block = to_block
+            return []
+        try:
+            logs: List[LogReceipt] = await asyncio.to_thread(self.web3.eth.get_logs, log_filter)
+        except Exception as e:
+            logger.warning(f"Unable to fetch logs of blocks {from_block} to {to_block}: {e}")
+            return []
+        self.last_block = to_block
+        return [log for log in logs if self.is_relevant(log)]
+
+    def is_relevant(self, log: LogReceipt) -> bool:
+        """Whether an event may change what the reporter does
+
+        Events caused by the reporter itself and events of other query ids than
+        the `query_ids` watched are not.
+        """
+        topics = [to_hex(topic).lower() for topic in log["topics"]]
+        if self.reporter_topic is not None and self.reporter_topic in topics[1:]:
+            return False
+        if self.query_ids is not None:
+            position = self.topics.get(topics[0])
+            if position is not None and position < len(topics):
+                return topics[position] in {to_hex(query_id).lower() for query_id in self.query_ids}
+        return True
+
+    async def wait(self, wake_at: Optional[float] = None) -> str:
+        """Sleep until a watched event, `wake_at` or `max_idle` seconds pass
+
+        Args:
+            wake_at: Unix time to wake up at, e.g. when the reporter lock expires;
+                ignored if already past
+
+        Returns:
+            Why the wait ended
+        """
+        start = time.time()
+        if wake_at is not None and wake_at <= start:
+            wake_at = None
+        deadline = start + self.max_idle
+        while True:
+            logs = await self.poll()
+            if logs:
+                return f"{len(logs)} new event(s) in block {logs[-1]['blockNumber']}"
+            now = time.time()
+            if wake_at is not None and now >= wake_at:
+                return "reporter lock expired"
+            if now >= deadline:
+                return f"nothing happened for {self.max_idle} seconds"
+            await asyncio.sleep(min(self.poll_interval, (wake_at or deadline) - now, deadline - now))
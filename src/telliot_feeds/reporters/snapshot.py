@@ -0,0 +1,166 @@
+"""Per-loop snapshot of reporter state
+
+Before deciding whether and what to report, `Tellor360Reporter` reads the
+oracle stake amount, its staker info, the time based reward state, the tip of
+its datafeed and its native token balance. `take_snapshot` fetches all of
+these in one multicall aggregate, so every decision of a reporting loop sees
+the same block and costs a single RPC round trip.
+
+`SnapshotContract` wraps a contract so that its reads are answered from the
+snapshot, falling back to calling the contract for reads that were not part
+of the snapshot or failed in it.
+"""
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from multicall import Call
+from multicall import Multicall
+from telliot_core.contract.contract import Contract
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+from web3 import Web3
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Multicall signatures of the contract reads a snapshot can include
+READ_SIGNATURES = {
+    "getStakeAmount": "getStakeAmount()(uint256)",
+    "getStakerInfo": ("getStakerInfo(address)(uint256,uint256,uint256,uint256,uint256,uint256,uint256,uint256,bool)"),
+    "timeOfLastDistribution": "timeOfLastDistribution()(uint256)",
+    "timeBasedReward": "timeBasedReward()(uint256)",
+    "getCurrentTip": "getCurrentTip(bytes32)(uint256)",
+}
+
+#: (contract address, function name, arguments)
+ReadKey = Tuple[str, str, Tuple[Any, ...]]
+
+
+def read_key(address: str, func_name: str, **kwargs: Any) -> ReadKey:
+    return address, func_name, tuple(kwargs.values())
+
+
+@dataclass
+class Read:
+    """A contract read to include in a snapshot, with arguments in signature order"""
+
+    contract: Contract
+    func_name: str
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> ReadKey:
+        return read_key(self.contract.address, self.func_name, **self.kwargs)
+
+
+@dataclass
+class ReporterSnapshot:
+    """Contract and account state read at a single block"""
+
+    #: Block the state was read at
+    block_number: Optional[int] = None
+
+    #: Timestamp of that block
+    timestamp: Optional[int] = None
+
+    #: Native token balance of the reporter account
+    native_balance: Optional[int] = None
+
+    #: Results of successful reads
+    reads: Dict[ReadKey, Any] = field(default_factory=dict)
+
+    def get(self, address: str, func_name: str, **kwargs: Any) -> Optional[Any]:
+        """Result of a read, None if it was not part of the snapshot or failed"""
+        return self.reads.get(read_key(address, func_name, **kwargs))
+
+
+class SnapshotContract:
+    """Answers contract reads from a snapshot, calling the contract for anything else
+
+    All other attributes are those of the wrapped contract.
+    """
+
+    def __init__(self, contract: Contract, snapshot: Optional[ReporterSnapshot]) -> None:
+        self.contract = contract
+        self.snapshot = snapshot
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.contract, name)
+
+    async def read(self, func_name: str, **kwargs: Any) -> Tuple[Any, ResponseStatus]:
+        """Read like `Contract.read`, from the snapshot when possible"""
+        if self.snapshot is not None:
+            value = self.snapshot.get(self.contract.address, func_name, **kwargs)
+            if value is not None:
+                return value, ResponseStatus()
+        value, status = await self.contract.read(func_name, **kwargs)
+        return value, status
+
+    async def get_current_tip(self, query_id: bytes) -> Tuple[Optional[int], ResponseStatus]:
+        """One time tip of a query id, like the autopay contract's `get_current_tip`"""
+        if self.snapshot is not None:
+            tip = self.snapshot.get(self.contract.address, "getCurrentTip", _queryId=query_id)
+            if tip is not None:
+                return tip, ResponseStatus()
+        tip_amount: Optional[int]
+        tip_amount, status = await self.contract.get_current_tip(query_id)
+        return tip_amount, status
+
+
+async def take_snapshot(w3: Web3, account: str, reads: List[Read]) -> Tuple[Optional[ReporterSnapshot], ResponseStatus]:
+    """Fetch contract reads, the account's native balance and the block in one multicall
+
+    Individual reads that revert are left out of the snapshot.
+
+    Returns:
+    - (ReporterSnapshot, ResponseStatus)
+    """
+    calls = []
+    outputs = []
+    for i, read in enumerate(reads):
+        signature = READ_SIGNATURES[read.func_name]
+        outputs.append(signature.rsplit("(", 1)[1].count(",") + 1)
+        calls.append(
+            Call(
+                target=read.contract.address,
+                function=[signature] + list(read.kwargs.values()),
+                returns=[[(i, j), None] for j in range(outputs[i])],
+            )
+        )
+
+    try:
+        multi_call = Multicall(calls=calls, _w3=w3, require_success=False)
+        # block and account state are read from the multicall contract itself
+        address = multi_call.multicall_address
+        multi_call.calls.extend(
+            [
+                Call(address, ["getEthBalance(address)(uint256)", account], [["native_balance", None]]),
+                Call(address, ["getBlockNumber()(uint256)"], [["block_number", None]]),
+                Call(address, ["getCurrentBlockTimestamp()(uint256)"], [["timestamp", None]]),
+            ]
+        )
+        data: Dict[Any, Any] = await multi_call.coroutine()
+    except Exception as e:
+        return None, error_status("Unable to read reporter state snapshot", e=e, log=logger.warning)
+
+    snapshot = ReporterSnapshot(
+        block_number=data.get("block_number"),
+        timestamp=data.get("timestamp"),
+        native_balance=data.get("native_balance"),
+    )
+    for i, read in enumerate(reads):
+        values = [data.get((i, j)) for j in range(outputs[i])]
+        if any(value is None for value in values):
+            logger.debug(f"{read.func_name} failed in reporter state snapshot")
+            continue
+        snapshot.reads[read.key] = values[0] if len(values) == 1 else values
+
+    logger.debug(f"Read reporter state at block {snapshot.block_number}")
+    return snapshot, ResponseStatus()
@@ -4,10 +4,12 @@ import time
 from datetime import timedelta, datetime
 from typing import Any
 from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Tuple
 from typing import Union
 from typing import Tuple
+from typing import cast
 
 
 from eth_abi.exceptions import EncodingTypeError
@@ -26,12 +28,23 @@ from telliot_feeds.feeds.trb_usd_feed import trb_usd_median_feed
 from telliot_feeds.feeds.fetch_usd_feed import fetch_usd_median_feed
 from telliot_feeds.feeds.tfetch_usd_feed import tfetch_usd_median_feed
 from telliot_feeds.reporters.rewards.time_based_rewards import get_time_based_rewards
+from telliot_feeds.reporters.scheduler import AUTOPAY_EVENTS
+from telliot_feeds.reporters.scheduler import ORACLE_EVENTS
+from telliot_feeds.reporters.scheduler import ReportScheduler
+from telliot_feeds.reporters.snapshot import Read
+from telliot_feeds.reporters.snapshot import ReporterSnapshot
+from telliot_feeds.reporters.snapshot import SnapshotContract
+from telliot_feeds.reporters.snapshot import take_snapshot
 from telliot_feeds.reporters.stake import Stake
 from telliot_feeds.reporters.tips.suggest_datafeed import get_feed_and_tip
+from telliot_feeds.reporters.tips.suggest_datafeed import get_feeds_and_tips
 from telliot_feeds.reporters.tips.tip_amount import fetch_feed_tip
+from telliot_feeds.reporters.transactions import NonceManager
+from telliot_feeds.reporters.transactions import TransactionPipeline
 from telliot_feeds.reporters.types import GasParams
 from telliot_feeds.reporters.types import StakerInfo
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.metrics import metrics
 from telliot_feeds.utils.reporter_utils import get_native_token_feed
 from telliot_feeds.utils.reporter_utils import has_native_token_funds
 from telliot_feeds.utils.reporter_utils import is_online
@@ -58,12 +71,18 @@ class Tellor360Reporter(Stake):
         stake: float = 0,
         use_random_feeds: bool = False,
         skip_manual_feeds: bool = False,
+        max_feeds: int = 1,
+        max_idle: float = 0,
+        fee_history_size: int = 128,
         **kwargs: Any,
     ) -> None:
-        super().__init__(**kwargs)
+        # fee history is kept between loops, each gas estimate only fetches the blocks mined since the last
+        super().__init__(fee_history_size=fee_history_size, **kwargs)
         self.autopay = autopay
         self.datafeed = datafeed
         self.skip_manual_feeds = skip_manual_feeds
+        # most funded feeds reported per loop when no datafeed is selected
+        self.max_feeds = max_feeds
         self.use_random_feeds: bool = use_random_feeds
         self.qtag_selected = False if self.datafeed is None else True
         self.expected_profit = expected_profit
@@ -75,6 +94,24 @@ class Tellor360Reporter(Stake):
         self.wait_period = wait_period
         self.chain_id = chain_id
         self.acct_addr = to_checksum_address(self.account.address)
+        # state read at the start of each reporting loop, None outside of report()
+        self.snapshot: Optional[ReporterSnapshot] = None
+        # with max_idle set, loops run when tips, reports or the reporter lock change instead of every wait_period
+        self.scheduler: Optional[ReportScheduler] = None
+        if max_idle > 0:
+            self.scheduler = ReportScheduler(
+                self.web3,
+                [(self.oracle, ORACLE_EVENTS), (self.autopay, AUTOPAY_EVENTS)],
+                poll_interval=max(1, self.wait_period),
+                max_idle=max_idle,
+                reporter=self.acct_addr,
+            )
+        self.nonces = NonceManager(self.get_acct_nonce)
+        self.transactions = TransactionPipeline(
+            self.web3, self.account, self.nonces, max_fee_per_gas=self.max_fee_per_gas
+        )
+        # counts the reporter's JSON-RPC requests by method
+        metrics.instrument_web3(self.web3)
         logger.info(f"Reporting with account: {self.acct_addr}")
         
         '''May be updated later depending on Telliot use in other chains with other token addresses'''
@@ -92,6 +129,42 @@ class Tellor360Reporter(Stake):
             "price_submitted": 0.0,
         }
 
+    @property
+    def oracle_state(self) -> Contract:
+        """Oracle contract answering reads from the current snapshot"""
+        return cast(Contract, SnapshotContract(self.oracle, self.snapshot))
+
+    @property
+    def autopay_state(self) -> Contract:
+        """Autopay contract answering reads from the current snapshot"""
+        return cast(Contract, SnapshotContract(self.autopay, self.snapshot))
+
+    def snapshot_reads(self) -> List[Read]:
+        """Contract reads the next reporting loop will need"""
+        reads = [
+            Read(self.oracle, "getStakeAmount"),
+            Read(self.oracle, "getStakerInfo", {"_stakerAddress": self.acct_addr}),
+        ]
+        if self.check_rewards and not self.ignore_tbr and self.chain_id in CHAINS_WITH_TBR:
+            reads.append(Read(self.oracle, "timeOfLastDistribution"))
+            reads.append(Read(self.oracle, "timeBasedReward"))
+        if self.check_rewards and self.datafeed is not None:
+            try:
+                reads.append(Read(self.autopay, "getCurrentTip", {"_queryId": self.datafeed.query.query_id}))
+            except EncodingTypeError:
+                pass  # logged when the tip is fetched
+        return reads
+
+    async def update_snapshot(self) -> ResponseStatus:
+        """Read the state needed by a reporting loop in one multicall
+
+        If the multicall fails, reads fall back to calling the contracts directly.
+        """
+        with metrics.stage("update_snapshot") as span:
+            self.snapshot, status = await take_snapshot(self.web3, self.acct_addr, self.snapshot_reads())
+            span.failed = not status.ok
+        return status
+
     async def get_stake_amount(self) -> Tuple[Optional[int], ResponseStatus]:
         """Reads the current stake amount from the oracle contract
 
@@ -99,7 +172,7 @@ class Tellor360Reporter(Stake):
         - (int, ResponseStatus) the current stake amount in TellorFlex
         """
         stake_amount: int
-        stake_amount, status = await self.oracle.read("getStakeAmount")
+        stake_amount, status = await self.oracle_state.read("getStakeAmount")
         if not status.ok:
             msg = f"Unable to read current stake amount: {status.error}"
             return None, error_status(msg, status.e, log=logger.error)
@@ -111,7 +184,7 @@ class Tellor360Reporter(Stake):
         Returns:
         - (StakerInfo, ResponseStatus) the staker details for the account
         """
-        response, status = await self.oracle.read("getStakerInfo", _stakerAddress=self.acct_addr)
+        response, status = await self.oracle_state.read("getStakerInfo", _stakerAddress=self.acct_addr)
         if not status.ok:
             msg = f"Unable to read account staker info: {status.error}"
             return None, error_status(msg, status.e, log=logger.error)
@@ -176,6 +249,8 @@ class Tellor360Reporter(Stake):
             amount_to_stake = max(int(to_stake_amount_1), int(to_stake_amount_2))
 
             _, deposit_status = await self.deposit_stake(amount_to_stake)
+            # approve and deposit were sent outside of the transaction pipeline
+            self.nonces.resync()
             if not deposit_status.ok:
                 return False, deposit_status
 
@@ -190,11 +265,25 @@ class Tellor360Reporter(Stake):
         Return:
         - ResponseStatus: yay or nay
         """
+        lock_expiry = self.reporter_lock_expiry()
+        if lock_expiry is None:
+            msg = "Unable to calculate reporter lock remaining time"
+            return error_status(msg, log=logger.info)
+
+        time_remaining = round(lock_expiry - time.time())
+        if time_remaining > 0:
+            hr_min_sec = str(timedelta(seconds=time_remaining))
+            msg = "Currently in reporter lock. Time left: " + hr_min_sec
+            return error_status(msg, log=logger.info)
+
+        return ResponseStatus()
+
+    def reporter_lock_expiry(self) -> Optional[float]:
+        """Unix time the reporter lock ends, None if the staker info is unknown"""
         staker_balance = self.stake_info.current_staker_balance
         current_stake_amount = self.stake_info.current_stake_amount
         if staker_balance is None or current_stake_amount is None:
-            msg = "Unable to calculate reporter lock remaining time"
-            return error_status(msg, log=logger.info)
+            return None
 
         # 12hrs in seconds is 43200
         try:
@@ -202,20 +291,67 @@ class Tellor360Reporter(Stake):
             self.discord_notification_data['reporter_lock_time'] = reporter_lock
         except ZeroDivisionError:  # Tellor Playground contract's stakeAmount is 0
             reporter_lock = 0
-        time_remaining = round(self.stake_info.last_report_time + reporter_lock - time.time())
-        if time_remaining > 0:
-            hr_min_sec = str(timedelta(seconds=time_remaining))
-            msg = "Currently in reporter lock. Time left: " + hr_min_sec
-            return error_status(msg, log=logger.info)
+        return self.stake_info.last_report_time + reporter_lock
 
-        return ResponseStatus()
+    async def wait_for_next_loop(self) -> None:
+        """Sleep before the next reporting loop
+
+        Without a scheduler this is `wait_period` seconds, otherwise until a new tip,
+        report or the end of the reporter lock (see `ReportScheduler`).
+        """
+        metrics.log_summary_if_due()
+        if self.scheduler is None:
+            logger.info(f"Sleeping for {self.wait_period} seconds")
+            await asyncio.sleep(self.wait_period)
+            return
+        if self.qtag_selected and self.datafeed is not None:
+            self.scheduler.query_ids = [self.datafeed.query.query_id]
+        reason = await self.scheduler.wait(wake_at=self.reporter_lock_expiry())
+        logger.info(f"Starting reporting loop: {reason}")
+
+    def report_slots(self) -> int:
+        """Number of reports the reporter lock allows in consecutive blocks, at most `max_feeds`
+
+        TellorFlex accepts a report when
+        (block.timestamp - lastReport) * 1000 > reportingLock * 1000 / (stakedBalance / stakeAmount),
+        dividing the balance by the stake amount first. Reports in blocks one second
+        apart pass only when the right hand side is below 1000.
+        """
+        staker_balance = self.stake_info.current_staker_balance
+        stake_amount = self.stake_info.current_stake_amount
+        if not staker_balance or stake_amount is None:
+            return 1
+        if stake_amount == 0:  # Tellor Playground contract's stakeAmount is 0
+            return self.max_feeds
+        stakes = staker_balance // stake_amount
+        if stakes and 43200 * 1000 // stakes < 1000:
+            return self.max_feeds
+        return 1
+
+    async def wait_for_next_block(self, block_number: int, timeout: float = 120) -> ResponseStatus:
+        """Wait until a block with a later timestamp than block `block_number` is mined
+
+        The oracle rejects a second report of the same reporter with the same block timestamp.
+        """
+        try:
+            mined = await asyncio.to_thread(self.web3.eth.get_block, block_number)
+            deadline = time.monotonic() + timeout
+            while True:
+                latest = await asyncio.to_thread(self.web3.eth.get_block, "latest")
+                if latest["timestamp"] > mined["timestamp"]:
+                    return ResponseStatus()
+                if time.monotonic() > deadline:
+                    return error_status(f"No block mined after block {block_number}", log=logger.warning)
+                await asyncio.sleep(1)
+        except Exception as e:
+            return error_status("Unable to read latest block", e=e, log=logger.warning)
 
     async def rewards(self) -> int:
         """Fetches total time based rewards plus tips for current datafeed"""
         if self.datafeed is not None:
             try:
                 datafeed = self.datafeed
-                self.autopaytip += await fetch_feed_tip(self.autopay, datafeed)
+                self.autopaytip += await fetch_feed_tip(self.autopay_state, datafeed)
             except EncodingTypeError:
                 logger.warning(f"Unable to generate data/id for query: {self.datafeed.query}")
         if self.ignore_tbr:
@@ -223,7 +359,7 @@ class Tellor360Reporter(Stake):
             return self.autopaytip
         elif self.chain_id in CHAINS_WITH_TBR:
             logger.info("Fetching time based rewards")
-            time_based_rewards = await get_time_based_rewards(self.oracle)
+            time_based_rewards = await get_time_based_rewards(self.oracle_state)
             logger.info(f"Time based rewards: {self.to_ether(time_based_rewards):.04f}")
             if time_based_rewards is not None:
                 self.autopaytip += time_based_rewards
@@ -428,59 +564,60 @@ class Tellor360Reporter(Stake):
 
         return contract_function.buildTransaction(params), ResponseStatus()  # type: ignore
 
-    def sign_n_send_transaction(self, built_tx: Any) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+    async def sign_n_send_transaction(self, built_tx: Any) -> Tuple[Optional[TxReceipt], ResponseStatus]:
         """Send a signed transaction to the blockchain and wait for confirmation
 
+        The event loop keeps running while the transaction confirms, see `TransactionPipeline`.
+
         Params:
-            tx_signed: The signed transaction object
+            built_tx: The built transaction
 
         Returns a tuple of the transaction receipt and a ResponseStatus object
         """
         lazy_unlock_account(self.account)
-        local_account = self.account.local_account
-        tx_signed = local_account.sign_transaction(built_tx)
-        try:
-            tx_hash = self.web3.eth.send_raw_transaction(tx_signed.rawTransaction)
-        except Exception as e:
-            note = "Send transaction failed"
-            msg = f"Transaction failed:\n     {e}"
+        pending, status = await self.transactions.submit(built_tx)
+        if pending is None:
+            msg = f"Transaction failed:\n     {status.e}"
             response = submit_or_not(msg)
             logger.info(response)
-            return None, error_status(note, log=logger.error, e=e)
-
-        try:
-            # Confirm transaction
-            tx_receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=360)
+            return None, status
 
-            tx_url = f"{self.endpoint.explorer}/tx/{tx_hash.hex()}"
+        with metrics.stage("wait_for_receipt") as span:
+            tx_receipt, status = await pending.wait()
+            span.failed = tx_receipt is None or tx_receipt["status"] == 0
+        if tx_receipt is None:
+            return None, status
 
-            if tx_receipt["status"] == 0:
-                msg = f"Transaction reverted:\n ({tx_url})"
-                response = submit_or_not(msg)
-                logger.info(response)
-                return tx_receipt, error_status(msg, log=logger.error)
+        tx_url = f"{self.endpoint.explorer}/tx/{tx_receipt['transactionHash'].hex()}"
 
-            logger.info(f"View reported data: \n{tx_url}")
-            self.discord_notification_data['transaction_url'] = tx_url
-            response = submit_or_not(self.discord_notification_data)
+        if tx_receipt["status"] == 0:
+            msg = f"Transaction reverted:\n ({tx_url})"
+            response = submit_or_not(msg)
             logger.info(response)
-            return tx_receipt, ResponseStatus()
-        except Exception as e:
-            note = "Failed to confirm transaction"
-            return None, error_status(note, log=logger.error, e=e)
+            return tx_receipt, error_status(msg, log=logger.error)
+
+        logger.info(f"View reported data: \n{tx_url}")
+        self.discord_notification_data['transaction_url'] = tx_url
+        response = submit_or_not(self.discord_notification_data)
+        logger.info(response)
+        return tx_receipt, ResponseStatus()
 
     def get_acct_nonce(self) -> Tuple[Optional[int], ResponseStatus]:
-        """Get the nonce for the account"""
+        """Get the next nonce of the account, counting its transactions still in the mempool
+
+        The nonce manager resyncs while transactions may be in flight, the latest
+        block's count would hand out a nonce that is already pending.
+        """
         try:
-            return self.web3.eth.get_transaction_count(self.acct_address), ResponseStatus()
+            return self.web3.eth.get_transaction_count(self.acct_address, "pending"), ResponseStatus()
         except ValueError as e:
             return None, error_status("Account nonce request timed out", e=e, log=logger.warning)
         except Exception as e:
             return None, error_status("Unable to retrieve account nonce", e=e, log=logger.error)
 
     def tx_params(self, **gas_fees: GasParams) -> Tuple[Optional[Dict[str, Any]], ResponseStatus]:
-        """Return transaction parameters"""
-        nonce, status = self.get_acct_nonce()
+        """Return transaction parameters, allocating the next account nonce"""
+        nonce, status = self.nonces.allocate()
         if nonce is None:
             return None, status
         return {
@@ -492,7 +629,10 @@ class Tellor360Reporter(Stake):
     def has_native_token(self) -> bool:
         """Check if account has native token funds for a network for gas fees
         of at least min_native_token_balance that is set in the cli"""
-        return has_native_token_funds(self.acct_addr, self.web3, min_balance=self.min_native_token_balance)
+        balance = None if self.snapshot is None else self.snapshot.native_balance
+        return has_native_token_funds(
+            self.acct_addr, self.web3, min_balance=self.min_native_token_balance, balance=balance
+        )
 
     async def report_once(
         self,
@@ -503,42 +643,130 @@ class Tellor360Reporter(Stake):
         and last submission time. Also, this method does not
         submit values if doing so won't make a profit."""
         # Check staker status
-        staked, status = await self.ensure_staked()
+        with metrics.stage("ensure_staked") as span:
+            staked, status = await self.ensure_staked()
+            span.failed = not staked or not status.ok
         if not staked or not status.ok:
             return None, status
 
-        status = await self.check_reporter_lock()
+        with metrics.stage("check_reporter_lock") as span:
+            status = await self.check_reporter_lock()
+            span.failed = not status.ok
         if not status.ok:
             return None, status
 
         # Get suggested datafeed if none provided
-        datafeed = await self.fetch_datafeed()
+        with metrics.stage("fetch_datafeed") as span:
+            datafeed = await self.fetch_datafeed()
+            span.failed = not datafeed
         if not datafeed:
             msg = "Unable to suggest datafeed"
             return None, error_status(note=msg, log=logger.info)
 
-        params, status = await self.submission_txn_params(datafeed)
+        with metrics.stage("submission_txn_params") as span:
+            params, status = await self.submission_txn_params(datafeed)
+            span.failed = not status.ok or params is None
         if not status.ok or params is None:
             return None, status
 
-        build_tx, status = self.build_transaction("submitValue", **params)
+        with metrics.stage("build_transaction") as span:
+            build_tx, status = self.build_transaction("submitValue", **params)
+            span.failed = not status.ok or build_tx is None
         if not status.ok or build_tx is None:
             return None, status
 
         # Check if profitable if not YOLO
-        status = await self.ensure_profitable()
+        with metrics.stage("ensure_profitable") as span:
+            status = await self.ensure_profitable()
+            span.failed = not status.ok
         logger.debug(f"Ensure profitibility method status: {status}")
         if not status.ok:
+            self.nonces.release(build_tx["nonce"])
             return None, status
 
         logger.debug("Sending submitValue transaction")
-        tx_receipt, status = self.sign_n_send_transaction(build_tx)
+        with metrics.stage("sign_n_send_transaction") as span:
+            tx_receipt, status = await self.sign_n_send_transaction(build_tx)
+            span.failed = not status.ok
         # reset datafeed for a new suggestion if qtag wasn't selected in cli
         if self.qtag_selected is False:
             self.datafeed = None
 
         return tx_receipt, status
 
+    async def report_top_feeds(self) -> Tuple[List[TxReceipt], ResponseStatus]:
+        """Report the most funded feeds in one loop
+
+        Up to `report_slots` feed values are fetched concurrently. The reports are then
+        sent one at a time, each checked for profitability on its own (time based rewards
+        count towards the first only), after the previous one was mined and a later block
+        exists, since the oracle rejects two reports of a reporter in the same block.
+
+        Returns a tuple of the receipts of confirmed reports and a ResponseStatus object
+        """
+        with metrics.stage("ensure_staked") as span:
+            staked, status = await self.ensure_staked()
+            span.failed = not staked or not status.ok
+        if not staked or not status.ok:
+            return [], status
+
+        with metrics.stage("check_reporter_lock") as span:
+            status = await self.check_reporter_lock()
+            span.failed = not status.ok
+        if not status.ok:
+            return [], status
+
+        with metrics.stage("fetch_datafeed") as span:
+            suggestions = await get_feeds_and_tips(self.autopay, self.skip_manual_feeds, self.report_slots())
+            span.failed = not suggestions
+        if not suggestions:
+            msg = "Unable to suggest datafeed"
+            return [], error_status(note=msg, log=logger.info)
+
+        self.autopaytip = 0
+        time_based_rewards = await self.rewards() if self.check_rewards else 0
+
+        with metrics.stage("submission_txn_params") as span:
+            all_params = await asyncio.gather(*[self.submission_txn_params(feed) for feed, _ in suggestions])
+            span.failed = not any(status.ok and params is not None for params, status in all_params)
+
+        receipts: List[TxReceipt] = []
+        failed: List[ResponseStatus] = []
+        for (datafeed, tip_amount), (params, status) in zip(suggestions, all_params):
+            if not status.ok or params is None:
+                continue
+            if receipts:
+                status = await self.wait_for_next_block(receipts[-1]["blockNumber"])
+                if not status.ok:
+                    failed.append(status)
+                    break
+            logger.info(f"Datafeed: {datafeed.query.type}, tip amount: {self.to_ether(tip_amount)}")
+            self.autopaytip = tip_amount if receipts else tip_amount + time_based_rewards
+            with metrics.stage("build_transaction") as span:
+                build_tx, status = self.build_transaction("submitValue", **params)
+                span.failed = not status.ok or build_tx is None
+            if not status.ok or build_tx is None:
+                continue
+            with metrics.stage("ensure_profitable") as span:
+                status = await self.ensure_profitable()
+                span.failed = not status.ok
+            if not status.ok:
+                self.nonces.release(build_tx["nonce"])
+                continue
+
+            logger.debug("Sending submitValue transaction")
+            with metrics.stage("sign_n_send_transaction") as span:
+                tx_receipt, status = await self.sign_n_send_transaction(build_tx)
+                span.failed = not status.ok
+            if tx_receipt is None or not status.ok:
+                failed.append(status)
+                continue
+            receipts.append(tx_receipt)
+
+        if not receipts and not failed:
+            return [], error_status("No profitable datafeed to report", log=logger.info)
+        return receipts, failed[0] if failed else ResponseStatus()
+
     async def is_online(self) -> bool:
         return await is_online()
 
@@ -547,13 +775,19 @@ class Tellor360Reporter(Stake):
 
         while report_count is None or report_count > 0:
             if await self.is_online():
-                if self.has_native_token():
-                    _, _ = await self.report_once()
+                await self.update_snapshot()
+                try:
+                    if self.has_native_token():
+                        if self.max_feeds > 1 and not self.qtag_selected and not self.use_random_feeds:
+                            _, _ = await self.report_top_feeds()
+                        else:
+                            _, _ = await self.report_once()
+                finally:
+                    self.snapshot = None
             else:
                 logger.warning("Unable to connect to the internet!")
 
-            logger.info(f"Sleeping for {self.wait_period} seconds")
-            await asyncio.sleep(self.wait_period)
+            await self.wait_for_next_loop()
 
             if report_count is not None:
                 report_count -= 1
@@ -11,6 +11,7 @@ from telliot_core.utils.timestamp import TimeStamp
 from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
 from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
 from telliot_feeds.reporters.tips.listener.funded_feeds_filter import FundedFeedFilter
+from telliot_feeds.reporters.tips.listener.tip_scanner import get_tip_scanner
 from telliot_feeds.reporters.tips.multicall_functions.multicall_autopay import MulticallAutopay
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.query_search_utils import feed_in_feed_builder_mapping
@@ -65,9 +66,10 @@ class FundedFeeds(FundedFeedFilter):
         # assemble both feed id and query id
         qtype_supported_feeds = self.generate_ids(feeds=qtype_supported_feeds)
 
-        # make the first multicall and values and timestamps for the past month
-        feeds_timestsamps_and_values_lis, status = await self.multi_call.month_of_timestamps_and_values(
-            feeds=qtype_supported_feeds, now_timestamp=now_timestamp, max_age=month_old_timestamp, max_count=40_000
+        # values and timestamps for the past month, only reports new since the last cycle are fetched
+        scanner = get_tip_scanner(self.multi_call)
+        feeds_timestsamps_and_values_lis, status = await scanner.timestamps_and_values(
+            feeds=qtype_supported_feeds, now_timestamp=now_timestamp, month_old_timestamp=month_old_timestamp
         )
 
         if not status.ok or not feeds_timestsamps_and_values_lis:
@@ -82,8 +84,8 @@ class FundedFeeds(FundedFeedFilter):
             feeds=feeds_timestsamps_and_values_filtered
         )
 
-        # get claim status count for every query ids eligible timestamp
-        reward_claimed_status, status = await self.multi_call.rewards_claimed_status_call(
+        # get claim status count for every query ids eligible timestamp not already known to be claimed
+        reward_claimed_status, status = await scanner.unclaimed_timestamps_count(
             feeds=historical_timestamps_list_filtered
         )
 
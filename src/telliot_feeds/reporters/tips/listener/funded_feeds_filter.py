@@ -1,4 +1,5 @@
-import math
+import asyncio
+import dataclasses
 from typing import Optional
 
 from eth_abi import encode_abi
@@ -9,6 +10,7 @@ from telliot_feeds.feeds import CATALOG_FEEDS
 from telliot_feeds.feeds import DATAFEED_BUILDER_MAPPING
 from telliot_feeds.reporters.tips import TYPES_WITH_GENERIC_SOURCE
 from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import Values
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.query_search_utils import decode_typ_name
 from telliot_feeds.utils.query_search_utils import get_query_from_qtyp_name
@@ -65,7 +67,7 @@ class FundedFeedFilter:
         Return: bool
         """
         # Number of intervals since start time
-        num_intervals = math.floor((timestamp_to_check - feed_start_timestamp) / feed_interval)
+        num_intervals = (timestamp_to_check - feed_start_timestamp) // feed_interval
         # Start time of latest submission window
         current_window_start = feed_start_timestamp + (feed_interval * num_intervals)
         time_diff = timestamp_to_check - current_window_start
@@ -99,6 +101,9 @@ class FundedFeedFilter:
             if query is None:
                 logger.info(f"Unable to decode query data {query_data.hex()}")
                 return None
+            # feeds built from the same query type share a feed object, give each query its own
+            # since prices of several queries are checked at once
+            datafeed = dataclasses.replace(datafeed, source=dataclasses.replace(datafeed.source))
             datafeed.query = query
             for param in datafeed.query.__dict__.keys():
                 val = getattr(query, param)
@@ -136,39 +141,31 @@ class FundedFeedFilter:
         """Check list of values for older submission would've been eligible for a tip
         if so the timestamps will be checked later to see if a tip for them has been claimed
 
+        A submission was eligible if it was the first in its window or, for feeds with
+        a priceThreshold, if its value changed enough from the submission before it.
+
         Args:
         - feeds
 
         Returns: filtered feeds list
         """
         for feed in feeds:
+            history = feed.queryid_timestamps_values_list
             # in case a query id has has none or too few to compare
-            if len(feed.queryid_timestamps_values_list) < 2:
+            if len(history) < 2:
                 continue
-            for current, previous in zip(
-                feed.queryid_timestamps_values_list[::-1], feed.queryid_timestamps_values_list[-2::-1]
-            ):
-                in_eligibile_window = self.is_timestamp_first_in_window(
-                    timestamp_before=previous.timestamp,
-                    timestamp_to_check=current.timestamp,
-                    feed_start_timestamp=feed.params.startTime,
-                    feed_window=feed.params.window,
-                    feed_interval=feed.params.interval,
-                )
-                if not in_eligibile_window:
-                    if feed.params.priceThreshold == 0:
-                        feed.queryid_timestamps_values_list.remove(current)
-                    else:
-                        try:
-                            previous_value = int(int(previous.value.hex(), 16) / 1e18)
-                        except ValueError:
-                            _ = error_status("Error decoding current query id value")
-                            continue
-
-                        price_change = _get_price_change(previous_val=previous_value, current_val=current.value)
-
-                        if price_change < feed.params.priceThreshold:
-                            feed.queryid_timestamps_values_list.remove(current)
+            params = feed.params
+            first_in_window = first_in_window_flags(
+                [v.timestamp for v in history], params.startTime, params.interval, params.window
+            )
+            eligible = [history[0]]
+            for previous, current, in_window in zip(history, history[1:], first_in_window):
+                if in_window or (
+                    params.priceThreshold != 0
+                    and _threshold_met(feed.query_id, previous, current, params.priceThreshold)
+                ):
+                    eligible.append(current)
+            feed.queryid_timestamps_values_list = eligible
 
         return feeds
 
@@ -183,17 +180,23 @@ class FundedFeedFilter:
 
         Returns: list of feeds
         """
-        for feed in list(feeds):
-            key = (feed.feed_id, feed.query_id)
-            if key not in unclaimed_timestamps_count:
-                continue
-            unclaimed_count = unclaimed_timestamps_count[key]
+        for feed in feeds:
+            unclaimed_count = unclaimed_timestamps_count.get((feed.feed_id, feed.query_id), 0)
             feed.params.balance -= feed.params.reward * unclaimed_count
-            # if remaining balance is zero filter out the feed from the list
-            if feed.params.balance <= 0:
-                feeds.remove(feed)
+        # if remaining balance is zero filter out the feed from the list
+        feeds[:] = [feed for feed in feeds if feed.params.balance > 0]
         return feeds
 
+    def has_price_source(self, feed: QueryIdandFeedDetails) -> bool:
+        """See if query type has API source to check price threshold"""
+        if qtag_from_query_catalog(qid=feed.query_id.hex()) in CATALOG_FEEDS:
+            return True
+        qtype = decode_typ_name(feed.query_data)
+        if qtype not in TYPES_WITH_GENERIC_SOURCE:
+            logger.info(f"No auto source for feed with query type {qtype} to check threshold")
+            return False
+        return True
+
     async def window_and_priceThreshold_unmet_filter(
         self, feeds: list[QueryIdandFeedDetails], now_timestamp: int
     ) -> list[QueryIdandFeedDetails]:
@@ -201,6 +204,9 @@ class FundedFeedFilter:
         """Remove feeds from list that either submitting now won't be first in window
         or price threshold is not met
 
+        Window eligibility is checked for every feed first, then the current prices of
+        the remaining price threshold feeds are fetched concurrently, once per query id.
+
         Args:
         - feeds: list of feeds
         - now_timestamp: current timestamp used to check if first in window
@@ -208,7 +214,9 @@ class FundedFeedFilter:
         Returns: list of feeds that could possibly reward a tip
         """
         self.prices: dict[bytes, float] = {}
-        for feed in list(feeds):
+        # feeds that could reward a tip, with whether that depends on their price threshold
+        candidates: list[tuple[QueryIdandFeedDetails, bool]] = []
+        for feed in feeds:
             # check if your timestamp will be first in window for
             # this feed if not discard feed_details
             # lesser node calls to make
@@ -219,46 +227,68 @@ class FundedFeedFilter:
                 timestamp_before=feed.current_value_timestamp,
                 timestamp_to_check=now_timestamp,
             )
-
-            balance = feed.params.balance
-            price_threshold = feed.params.priceThreshold
-
             if in_eligible_window:
                 sloped_reward = feed.params.rewardIncreasePerSecond * time_diff
                 feed.params.reward += sloped_reward
-                if balance < feed.params.reward:
-                    feeds.remove(feed)
-                continue
-            elif price_threshold == 0 and not in_eligible_window:
-                # if now_timestamp is not in eligible window, discard funded feed
-                # remove feedId from feedId to queryId mapping
-                # discard funded feed
-                feeds.remove(feed)
-                continue
+                if feed.params.balance >= feed.params.reward:
+                    candidates.append((feed, False))
+            # if now_timestamp is not in eligible window, discard funded feed
+            # unless its price threshold can be met
+            elif feed.params.priceThreshold != 0 and self.has_price_source(feed):
+                candidates.append((feed, True))
+
+        # feeds of the same query id share its current value, so the price change is the same
+        threshold_feeds = {feed.query_id: feed for feed, threshold in candidates if threshold}
+        changes = await asyncio.gather(
+            *[
+                self.price_change(query_data=feed.query_data, value_before=feed.current_queryid_value)
+                for feed in threshold_feeds.values()
+            ]
+        )
+        price_changes = dict(zip(threshold_feeds, changes))
 
-            if price_threshold != 0 and not in_eligible_window:
-                # See if query type has API source to check price threshold
-                if qtag_from_query_catalog(qid=feed.query_id.hex()) not in CATALOG_FEEDS:
-                    qtype = decode_typ_name(feed.query_data)
-                    if qtype not in TYPES_WITH_GENERIC_SOURCE:
-                        logger.info(f"No auto source for feed with query type {qtype} to check threshold")
-                        feeds.remove(feed)
-                        continue
-                price_change = await self.price_change(
-                    query_data=feed.query_data,
-                    value_before=feed.current_queryid_value,
-                )
-                if price_change is None:
-                    # unable to fetch price data
-                    feeds.remove(feed)
-                    continue
-                if price_change < price_threshold:
-                    feeds.remove(feed)
-                    continue
+        def eligible(feed: QueryIdandFeedDetails, threshold: bool) -> bool:
+            if not threshold:
+                return True
+            price_change = price_changes[feed.query_id]
+            # None when unable to fetch price data
+            return price_change is not None and price_change >= feed.params.priceThreshold
 
+        feeds[:] = [feed for feed, threshold in candidates if eligible(feed, threshold)]
         return feeds
 
 
+def first_in_window_flags(timestamps: list[int], start: int, interval: int, window: int) -> list[bool]:
+    """For each timestamp after the first, whether it was the first submission in its window
+
+    Args:
+    - timestamps: submission timestamps, oldest first
+    - start, interval, window: feed parameters
+
+    Returns: list one shorter than timestamps
+    """
+    window_starts = [start + interval * ((timestamp - start) // interval) for timestamp in timestamps]
+    return [
+        timestamp - window_start < window and before < window_start
+        for before, timestamp, window_start in zip(timestamps, timestamps[1:], window_starts[1:])
+    ]
+
+
+def _threshold_met(query_id: bytes, previous: Values, current: Values, price_threshold: int) -> bool:
+    """Whether the value changed by at least the price threshold from the submission before
+
+    Values that can't be decoded as numbers don't meet the threshold.
+    """
+    try:
+        previous_value = int(previous.value.hex(), 16)
+        current_value = int(current.value.hex(), 16)
+    except ValueError:
+        note = f"Unable to decode values of query id {query_id.hex()} to check price threshold at {current.timestamp}"
+        _ = error_status(note=note, log=logger.warning)
+        return False
+    return _get_price_change(previous_val=previous_value, current_val=current_value) >= price_threshold
+
+
 def _get_price_change(previous_val: float, current_val: float) -> int:
     """Get percentage change
 
@@ -0,0 +1,225 @@
+"""Keep autopay report history between tip listener cycles
+
+`FundedFeeds` needs a month of reported values for every funded query id and
+the reward claim status of each eligible timestamp. Instead of fetching all
+of it on every reporting loop, a `TipScanner` caches each query id's
+timestamps and values and the timestamps already known to be claimed, and
+only asks the autopay contract for what changed since its last cycle.
+
+Reports younger than `refresh_window` seconds are always fetched again, so
+values removed by a dispute drop out of the cached history.
+"""
+from bisect import bisect_right
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Optional
+
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import Values
+from telliot_feeds.reporters.tips.multicall_functions.multicall_autopay import MulticallAutopay
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Seconds of recent history re-fetched every cycle (tips are claimable after 12 hours)
+REFRESH_WINDOW = 43_200
+
+
+@dataclass
+class QueryIdHistory:
+    """Cached reports of a query id, oldest first"""
+
+    timestamps: list[int] = field(default_factory=list)
+    values: list[bytes] = field(default_factory=list)
+
+    #: Timestamp the history is complete up to
+    synced_until: int = 0
+
+    def merge(self, since: int, timestamps: list[int], values: list[bytes]) -> None:
+        """Replace every cached report after `since` with freshly fetched ones"""
+        keep = bisect_right(self.timestamps, since)
+        del self.timestamps[keep:]
+        del self.values[keep:]
+        for timestamp, value in sorted(zip(timestamps, values)):
+            if timestamp > since:
+                self.timestamps.append(timestamp)
+                self.values.append(value)
+
+    def prune(self, oldest: int) -> None:
+        """Drop reports at or before `oldest`"""
+        drop = bisect_right(self.timestamps, oldest)
+        del self.timestamps[:drop]
+        del self.values[:drop]
+
+
+class TipScanner:
+    """Incremental reader of autopay report history and reward claim status
+
+    Args:
+        multi_call: MulticallAutopay used to batch contract calls
+        refresh_window: Seconds of recent history re-fetched every cycle
+    """
+
+    def __init__(self, multi_call: MulticallAutopay, refresh_window: int = REFRESH_WINDOW) -> None:
+        self.multi_call = multi_call
+        self.refresh_window = refresh_window
+        self.histories: dict[bytes, QueryIdHistory] = {}
+        #: (feed_id, query_id) -> timestamps whose reward has been claimed
+        self.claimed: dict[tuple[bytes, bytes], set[int]] = {}
+
+    def reset(self) -> None:
+        """Forget all cached history"""
+        self.histories.clear()
+        self.claimed.clear()
+
+    async def timestamps_and_values(
+        self, feeds: list[QueryIdandFeedDetails], now_timestamp: int, month_old_timestamp: int, max_count: int = 40_000
+    ) -> tuple[Optional[list[QueryIdandFeedDetails]], ResponseStatus]:
+        """Fill in a month of timestamps and values for every feed, fetching only new reports
+
+        Args:
+        - feeds: list of QueryIdandFeedDetails
+        - now_timestamp: current time in unix timestamps
+        - month_old_timestamp: now_timestamp - 2_592_000
+
+        Return: the feeds with current value and timestamps/values list set,
+        like `MulticallAutopay.month_of_timestamps_and_values`
+        """
+        windows: dict[bytes, int] = {}
+        for query_id in {feed.query_id for feed in feeds}:
+            history = self.histories.get(query_id)
+            if history is not None and history.synced_until > now_timestamp:
+                # the chain went back in time (e.g. a reverted local chain), start over
+                logger.debug(f"Discarding tip history of 0x{query_id.hex()} synced past {now_timestamp}")
+                history = None
+                self.forget(query_id)
+            if history is None:
+                windows[query_id] = month_old_timestamp
+            else:
+                windows[query_id] = max(month_old_timestamp, history.synced_until - self.refresh_window)
+
+        if not windows:
+            return None, error_status("Unable to assemble getMultipleValues Call object")
+
+        calls = [
+            self.multi_call.get_multiple_values_before(
+                query_id=query_id, now_timestamp=now_timestamp, max_age=now_timestamp - since, max_count=max_count
+            )
+            for query_id, since in windows.items()
+        ]
+        multiple_values_response, status = await self.multi_call.multi_call(calls)
+
+        if not status.ok:
+            return None, status
+
+        if not multiple_values_response:
+            return None, error_status("No response returned from getMultipleValuesBefore batch multicall")
+
+        for query_id, since in windows.items():
+            values = multiple_values_response.get(("values_array", query_id))
+            timestamps = multiple_values_response.get(("timestamps_array", query_id))
+            # short circuit since None means failed response and can't calculate tip accurately
+            if values is None or timestamps is None:
+                self.forget(query_id)
+                return None, error_status(f"getMultipleValuesBefore call failed for 0x{query_id.hex()}")
+
+            history = self.histories.setdefault(query_id, QueryIdHistory())
+            history.merge(since, timestamps, values)
+            history.prune(month_old_timestamp)
+            history.synced_until = now_timestamp
+
+        for feed in feeds:
+            history = self.histories[feed.query_id]
+            first = bisect_right(history.timestamps, max(month_old_timestamp, feed.params.startTime - 1))
+            timestamps = history.timestamps[first:]
+            values = history.values[first:]
+
+            feed.current_value_timestamp = timestamps[-1] if timestamps else 0
+            feed.current_queryid_value = values[-1] if values else b""
+            feed.queryid_timestamps_values_list = list(map(Values, values, timestamps))
+
+        self.prune_claims(month_old_timestamp)
+        return feeds, status
+
+    async def unclaimed_timestamps_count(
+        self, feeds: list[QueryIdandFeedDetails]
+    ) -> tuple[Optional[dict[tuple[bytes, bytes], int]], ResponseStatus]:
+        """Count unclaimed timestamps per (feed id, query id)
+
+        Claim status is only requested for timestamps not already known to be claimed.
+
+        Return: dict with count of unclaimed timestamps, like `MulticallAutopay.rewards_claimed_status_call`
+        """
+        counts: dict[tuple[bytes, bytes], int] = {}
+        to_check: dict[tuple[bytes, bytes], list[int]] = {}
+        for feed in feeds:
+            if not feed.queryid_timestamps_values_list:
+                continue
+            key = (feed.feed_id, feed.query_id)
+            claimed = self.claimed.get(key, set())
+            unknown = [v.timestamp for v in feed.queryid_timestamps_values_list if v.timestamp not in claimed]
+            counts[key] = 0
+            if unknown:
+                to_check[key] = unknown
+
+        if not counts:
+            return None, error_status("No getRewardClaimStatusList Calls to assemble")
+
+        if not to_check:
+            return counts, ResponseStatus()
+
+        calls = [
+            self.multi_call.get_reward_claimed_status(feed_id, query_id, timestamps)
+            for (feed_id, query_id), timestamps in to_check.items()
+        ]
+        resp, status = await self.multi_call.multi_call(calls, success=True)
+
+        if not status.ok:
+            return None, status
+
+        if not resp:
+            return None, error_status("No response returned from getRewardClaimStatusList batch multicall")
+
+        for key, timestamps in to_check.items():
+            statuses = resp.get(key)
+            if statuses is None:
+                return None, error_status("getRewardClaimStatusList call failed")
+            claimed = self.claimed.setdefault(key, set())
+            for timestamp, is_claimed in zip(timestamps, statuses):
+                if is_claimed:
+                    claimed.add(timestamp)
+                else:
+                    counts[key] += 1
+
+        return counts, status
+
+    def forget(self, query_id: bytes) -> None:
+        """Drop cached history and claims of a query id"""
+        self.histories.pop(query_id, None)
+        for key in [key for key in self.claimed if key[1] == query_id]:
+            del self.claimed[key]
+
+    def prune_claims(self, oldest: int) -> None:
+        """Drop claim status of timestamps at or before `oldest`"""
+        for key, claimed in list(self.claimed.items()):
+            claimed.difference_update([timestamp for timestamp in claimed if timestamp <= oldest])
+            if not claimed:
+                del self.claimed[key]
+
+
+_scanners: dict[tuple[int, str], TipScanner] = {}
+
+
+def get_tip_scanner(multi_call: MulticallAutopay) -> TipScanner:
+    """Return the process-wide scanner for the autopay contract of `multi_call`"""
+    autopay = multi_call.autopay
+    key = (autopay.node.chain_id, autopay.address)
+    scanner = _scanners.get(key)
+    if scanner is None:
+        scanner = _scanners[key] = TipScanner(multi_call)
+    scanner.multi_call = multi_call
+    return scanner
@@ -1,4 +1,6 @@
+import dataclasses
 from typing import Any
+from typing import List
 from typing import Optional
 from typing import Tuple
 
@@ -19,6 +21,46 @@ from telliot_feeds.utils.query_search_utils import get_query_from_qtyp_name
 logger = get_logger(__name__)
 
 
+async def get_sorted_suggestions(
+    autopay: TellorFlexAutopayContract, current_timestamp: Optional[TimeStamp] = None
+) -> List[Tuple[bytes, int]]:
+    """Fetch funded feeds and one time tips, as (query data, tip amount) sorted by tip, largest first"""
+    if current_timestamp is None:
+        current_timestamp = TimeStamp.now().ts
+
+    multi_call = MulticallAutopay()
+
+    funded_feeds = FundedFeeds(autopay=autopay, multi_call=multi_call)
+
+    feed_tips = await funded_feeds.querydata_and_tip(current_time=current_timestamp)
+    onetime_tips = await get_funded_one_time_tips(autopay=autopay)
+
+    if not feed_tips and not onetime_tips:
+        logger.info("No tips available in autopay")
+        return []
+
+    return get_sorted_tips(feed_tips, onetime_tips)
+
+
+def find_feed(query_data: bytes, skip_manual_feeds: bool) -> Optional[DataFeed[Any]]:
+    """Catalog or builder datafeed able to report a query"""
+    datafeed = feed_from_catalog_feeds(query_data)
+
+    if datafeed is None:
+        # TODO: add skip manual feed flag to make optional; currently skips all manual feeds
+        datafeed = feed_in_feed_builder_mapping(query_data, skip_manual_feeds=skip_manual_feeds)
+    return datafeed
+
+
+def set_feed_query(datafeed: DataFeed[Any], query_data: bytes) -> None:
+    """Set a datafeed's query and source parameters from query data"""
+    query = get_query_from_qtyp_name(query_data)
+    datafeed.query = query  # type: ignore
+    for param in datafeed.query.__dict__.keys():
+        val = getattr(query, param)
+        setattr(datafeed.source, param, val)
+
+
 # suggest a feed here not a query tag, because build feed portion
 # or check both mappings for type
 async def get_feed_and_tip(
@@ -33,40 +75,39 @@ async def get_feed_and_tip(
     Returns:
     - tuple of feed and tip amount
     """
-    if current_timestamp is None:
-        current_timestamp = TimeStamp.now().ts
-
-    multi_call = MulticallAutopay()
-
-    funded_feeds = FundedFeeds(autopay=autopay, multi_call=multi_call)
-
-    feed_tips = await funded_feeds.querydata_and_tip(current_time=current_timestamp)
-    onetime_tips = await get_funded_one_time_tips(autopay=autopay)
-
-    if not feed_tips and not onetime_tips:
-        logger.info("No tips available in autopay")
+    suggestions = await get_feeds_and_tips(autopay, skip_manual_feeds, 1, current_timestamp)
+    if not suggestions:
         return None, None
+    return suggestions[0]
 
-    sorted_tips = get_sorted_tips(feed_tips, onetime_tips)
-    for suggestion in sorted_tips:
-        query_data, tip_amount = suggestion
-        if tip_amount == 0:
-            return None, None
 
-        datafeed = feed_from_catalog_feeds(query_data)
+async def get_feeds_and_tips(
+    autopay: TellorFlexAutopayContract,
+    skip_manual_feeds: bool,
+    limit: int,
+    current_timestamp: Optional[TimeStamp] = None,
+) -> List[Tuple[DataFeed[Any], int]]:
+    """Fetch feeds with their tip and suggest up to `limit` reportable feeds with the largest tips
 
-        if datafeed is None:
-            # TODO: add skip manual feed flag to make optional; currently skips all manual feeds
-            datafeed = feed_in_feed_builder_mapping(query_data, skip_manual_feeds=skip_manual_feeds)
-
-        if datafeed is not None:
-            query = get_query_from_qtyp_name(query_data)
-            datafeed.query = query  # type: ignore
-            for param in datafeed.query.__dict__.keys():
-                val = getattr(query, param)
-                setattr(datafeed.source, param, val)
-            break
+    Args:
+    - autopay contract object
+    - skip_manual_feeds: whether to skip feeds that need manual input
+    - limit: maximum number of feeds to suggest
+    - current_timestamp
 
-    if datafeed is None:
-        return None, None
-    return datafeed, tip_amount
+    Returns:
+    - list of (feed, tip amount), largest tip first
+    """
+    suggestions: List[Tuple[DataFeed[Any], int]] = []
+    for query_data, tip_amount in await get_sorted_suggestions(autopay, current_timestamp):
+        if tip_amount == 0 or len(suggestions) >= limit:
+            break
+        datafeed = find_feed(query_data, skip_manual_feeds)
+        if datafeed is None:
+            continue
+        if any(datafeed is feed for feed, _ in suggestions):
+            # feeds built from the same query type share a feed object, give each query its own
+            datafeed = dataclasses.replace(datafeed, source=dataclasses.replace(datafeed.source))
+        set_feed_query(datafeed, query_data)
+        suggestions.append((datafeed, tip_amount))
+    return suggestions
@@ -0,0 +1,261 @@
+"""Non-blocking transaction submission
+
+`TransactionPipeline` signs and sends transactions without blocking the event
+loop, then tracks each one in a background task: the receipt is polled with
+a growing interval, and a transaction still pending after `replace_after`
+seconds is replaced by a copy with the same nonce and higher fees.
+
+`NonceManager` hands out account nonces locally, so consecutive transactions
+don't each ask the node for the transaction count. It re-reads the count
+from the chain when it may be out of sync: on first use, after a nonce was
+rejected and after a transaction failed to confirm.
+
+    pending, status = await pipeline.submit(built_tx)
+    ...  # prepare the next report while this one confirms
+    receipt, status = await pending.wait()
+"""
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from chained_accounts import ChainedAccount
+from hexbytes import HexBytes
+from telliot_core.utils.response import error_status
+from telliot_core.utils.response import ResponseStatus
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+from web3.types import TxReceipt
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Node error messages meaning a nonce is no longer available
+NONCE_ERRORS = ("nonce too low", "already known", "replacement transaction underpriced", "known transaction")
+
+
+def is_nonce_error(e: Exception) -> bool:
+    message = str(e).lower()
+    return any(error in message for error in NONCE_ERRORS)
+
+
+class NonceManager:
+    """Allocates account nonces locally, reading the chain only when out of sync
+
+    Args:
+        fetch: Returns the account's transaction count from the chain
+    """
+
+    def __init__(self, fetch: Callable[[], Tuple[Optional[int], ResponseStatus]]) -> None:
+        self.fetch = fetch
+        #: Next nonce to hand out, None until read from the chain
+        self.next: Optional[int] = None
+
+    def allocate(self) -> Tuple[Optional[int], ResponseStatus]:
+        """Nonce for a new transaction"""
+        if self.next is None:
+            nonce, status = self.fetch()
+            if nonce is None:
+                return None, status
+            self.next = nonce
+        nonce = self.next
+        self.next += 1
+        return nonce, ResponseStatus()
+
+    def release(self, nonce: int) -> None:
+        """Give back a nonce whose transaction was never sent"""
+        if self.next is not None and nonce == self.next - 1:
+            self.next = nonce
+        else:
+            # a later nonce is already out, the gap has to be filled from the chain count
+            self.resync()
+
+    def resync(self) -> None:
+        """Read the next nonce from the chain again"""
+        self.next = None
+
+
+def bump_fees(tx: Dict[str, Any], factor: float) -> Dict[str, Any]:
+    """Copy of a transaction with its fees raised by a factor"""
+    bumped = dict(tx)
+    for fee in ("maxFeePerGas", "maxPriorityFeePerGas", "gasPrice"):
+        if bumped.get(fee) is not None:
+            bumped[fee] = math.ceil(int(bumped[fee]) * factor)
+    return bumped
+
+
+@dataclass
+class PendingTransaction:
+    """A sent transaction and the replacements sent for it"""
+
+    #: Parameters of the most recently sent version
+    tx: Dict[str, Any]
+
+    #: Hashes of every version sent, oldest first
+    hashes: List[HexBytes]
+
+    #: Monotonic times of the first and the latest send
+    submitted_at: float = field(default_factory=time.monotonic)
+    sent_at: float = field(default_factory=time.monotonic)
+
+    #: Background task resolving to (receipt, status)
+    task: Optional["asyncio.Task[Tuple[Optional[TxReceipt], ResponseStatus]]"] = None
+
+    @property
+    def nonce(self) -> int:
+        return int(self.tx["nonce"])
+
+    @property
+    def replacements(self) -> int:
+        return len(self.hashes) - 1
+
+    async def wait(self) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+        """Receipt of whichever version was mined"""
+        assert self.task is not None
+        return await self.task
+
+
+class TransactionPipeline:
+    """Sends transactions and tracks them until mined, replacing stuck ones
+
+    Args:
+        web3: Connection used to send transactions and poll receipts
+        account: Account signing the transactions, unlocked before `submit`
+        nonces: Nonce manager of the account
+        timeout: Seconds after the first send before giving up on a transaction
+        replace_after: Seconds a version may stay pending before it is replaced
+        fee_bump: Factor the fees of a replacement are raised by, nodes require at least 1.1
+        max_replacements: Replacements sent per transaction at most
+        max_fee_per_gas: Fee cap in wei a replacement may not exceed
+        poll_interval: First receipt polling interval, doubled up to `max_poll_interval`
+    """
+
+    def __init__(
+        self,
+        web3: Web3,
+        account: ChainedAccount,
+        nonces: NonceManager,
+        timeout: float = 360,
+        replace_after: float = 90,
+        fee_bump: float = 1.125,
+        max_replacements: int = 3,
+        max_fee_per_gas: Optional[int] = None,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 12.0,
+    ) -> None:
+        self.web3 = web3
+        self.account = account
+        self.nonces = nonces
+        self.timeout = timeout
+        self.replace_after = replace_after
+        self.fee_bump = fee_bump
+        self.max_replacements = max_replacements
+        self.max_fee_per_gas = max_fee_per_gas
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        #: Transactions not yet resolved, by nonce
+        self.pending: Dict[int, PendingTransaction] = {}
+        self._send_lock: Optional[asyncio.Lock] = None
+
+    async def _send(self, tx: Dict[str, Any]) -> HexBytes:
+        tx_signed = self.account.local_account.sign_transaction(tx)
+        tx_hash: HexBytes = await asyncio.to_thread(self.web3.eth.send_raw_transaction, tx_signed.rawTransaction)
+        return tx_hash
+
+    async def submit(self, tx: Dict[str, Any]) -> Tuple[Optional[PendingTransaction], ResponseStatus]:
+        """Sign and send a built transaction and start tracking it
+
+        If the node rejects the nonce (e.g. the account sent a transaction
+        elsewhere), the nonce is read from the chain and the send retried once.
+        Concurrent submissions are sent one at a time, in the order submitted.
+        """
+        if self._send_lock is None:
+            self._send_lock = asyncio.Lock()
+        async with self._send_lock:
+            return await self._submit(tx)
+
+    async def _submit(self, tx: Dict[str, Any]) -> Tuple[Optional[PendingTransaction], ResponseStatus]:
+        try:
+            try:
+                tx_hash = await self._send(tx)
+            except Exception as e:
+                if not is_nonce_error(e):
+                    raise
+                logger.info(f"Nonce {tx['nonce']} no longer available, retrying with the account's current nonce")
+                self.nonces.resync()
+                nonce, status = self.nonces.allocate()
+                if nonce is None:
+                    return None, status
+                tx = {**tx, "nonce": nonce}
+                tx_hash = await self._send(tx)
+        except Exception as e:
+            if is_nonce_error(e):
+                self.nonces.resync()
+            else:
+                self.nonces.release(int(tx["nonce"]))
+            return None, error_status("Send transaction failed", log=logger.error, e=e)
+
+        pending = PendingTransaction(tx=tx, hashes=[tx_hash])
+        pending.task = asyncio.create_task(self._track(pending))
+        self.pending[pending.nonce] = pending
+        logger.debug(f"Sent transaction {tx_hash.hex()} with nonce {pending.nonce}")
+        return pending, ResponseStatus()
+
+    async def _receipt(self, pending: PendingTransaction) -> Optional[TxReceipt]:
+        """Receipt of any version of a transaction, newest first"""
+        for tx_hash in reversed(pending.hashes):
+            try:
+                receipt: TxReceipt = await asyncio.to_thread(self.web3.eth.get_transaction_receipt, tx_hash)
+                return receipt
+            except TransactionNotFound:
+                continue
+            except Exception as e:
+                logger.debug(f"Unable to fetch receipt of {tx_hash.hex()}: {e}")
+        return None
+
+    async def _replace(self, pending: PendingTransaction) -> None:
+        """Send the transaction again with the same nonce and higher fees"""
+        pending.sent_at = time.monotonic()
+        tx = bump_fees(pending.tx, self.fee_bump)
+        fee = tx.get("maxFeePerGas") or tx.get("gasPrice")
+        if self.max_fee_per_gas is not None and fee is not None and fee > self.max_fee_per_gas:
+            logger.info(f"Not replacing transaction with nonce {pending.nonce}: fee cap reached")
+            return
+        try:
+            tx_hash = await self._send(tx)
+        except Exception as e:
+            # a nonce error here usually means an earlier version was just mined
+            logger.info(f"Unable to replace transaction with nonce {pending.nonce}: {e}")
+            return
+        pending.tx = tx
+        pending.hashes.append(tx_hash)
+        logger.info(f"Replaced stuck transaction with nonce {pending.nonce} by {tx_hash.hex()}")
+
+    async def _track(self, pending: PendingTransaction) -> Tuple[Optional[TxReceipt], ResponseStatus]:
+        try:
+            delay = self.poll_interval
+            while True:
+                receipt = await self._receipt(pending)
+                if receipt is not None:
+                    return receipt, ResponseStatus()
+                now = time.monotonic()
+                if now - pending.submitted_at > self.timeout:
+                    self.nonces.resync()
+                    msg = f"Transaction {pending.hashes[-1].hex()} not mined after {self.timeout} seconds"
+                    return None, error_status("Failed to confirm transaction", e=TimeoutError(msg), log=logger.error)
+                if now - pending.sent_at > self.replace_after and pending.replacements < self.max_replacements:
+                    await self._replace(pending)
+                    delay = self.poll_interval
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_poll_interval)
+        finally:
+            self.pending.pop(pending.nonce, None)
@@ -1,13 +1,17 @@
 """Bitfinex data source."""
 import asyncio
 import logging
+import time
+from bisect import bisect_right
+from collections import deque
 from typing import Any
-
-import requests
+from typing import AsyncIterator
+from typing import Deque
+from typing import Optional
+from typing import Set
 
 from telliot_feeds.sources.ampleforth.symbols import SYMBOLS
-
-# import time
+from telliot_feeds.utils.http_client import get_http_client
 
 
 logger = logging.getLogger(__name__)
@@ -16,6 +20,14 @@ logger = logging.getLogger(__name__)
 THOUSAND_MIN = 1000 * 60  # original JS names this variable "TEN_MINUTES"
 NO_TRADES_FOUND = "No trades found"
 
+TRADES_URL = "https://api-pub.bitfinex.com/v2/trades/{route}/hist"
+
+#: Maximum number of trades Bitfinex returns per request
+PAGE_LIMIT = 10000
+
+#: Trade history requests Bitfinex allows per minute
+REQUESTS_PER_MINUTE = 30
+
 
 def build_buckets(start: int, a_list: list[list[int]], bucket_size: int = THOUSAND_MIN) -> dict[int, dict[str, Any]]:
     """Build buckets for VWAP calculation."""
@@ -43,17 +55,15 @@ def build_buckets(start: int, a_list: list[list[int]], bucket_size: int = THOUSA
 
 
 def merge_as_list(from_map: dict[int, dict[str, Any]], to_map: dict[int, dict[str, Any]]) -> list[dict[str, Any]]:
-    """Merge two maps into a list of trades."""
+    """Merge two maps into a list of trades.
+
+    Each "from" bucket is converted with the latest "to" bucket at or before its slot."""
+    to_slots = sorted(slot for slot in to_map if slot >= 0)
     merged: list[dict[str, Any]] = []
     for slot, from_slot in from_map.items():
-        s = slot
-        to_slot = None
-        while not to_slot:
-            if s < 0:
-                break
-            to_slot = to_map.get(s)
-            s = s - 1
-        if to_slot:
+        i = bisect_right(to_slots, slot)
+        if i:
+            to_slot = to_map[to_slots[i - 1]]
             merged.append(
                 {
                     "trades": abs((to_slot["vwap"] * from_slot["vwap"]) * from_slot["volume"]),
@@ -65,65 +75,124 @@ def merge_as_list(from_map: dict[int, dict[str, Any]], to_map: dict[int, dict[st
 
 def volume_weighted_average_price(start: int, from_list: list[list[int]], to_list: list[list[int]]) -> dict[str, Any]:
     """Calculate volume weighted average price."""
-    from_map = build_buckets(start, from_list)
-    to_map = build_buckets(start, to_list)
+    return vwap_from_buckets(build_buckets(start, from_list), build_buckets(start, to_list))
+
+
+def vwap_from_buckets(from_map: dict[int, dict[str, Any]], to_map: dict[int, dict[str, Any]]) -> dict[str, Any]:
+    """Calculate volume weighted average price from buckets."""
     merged_list = merge_as_list(from_map, to_map)
     sum_amount_and_prices = sum([m["trades"] for m in merged_list])
     sum_volume = sum([m["volume"] for m in merged_list])
     return {"vwap": sum_amount_and_prices / sum_volume, "volume": sum_volume}
 
 
-def retrieve_bitfinex_trades(route: str, start: int, end: int) -> Any:
+class RequestBudget:
+    """Delays requests to stay within a number of requests per sliding window"""
+
+    def __init__(self, requests: int = REQUESTS_PER_MINUTE, window: float = 60.0) -> None:
+        self.requests = requests
+        self.window = window
+        self._sent: Deque[float] = deque()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            while self._sent and self._sent[0] <= now - self.window:
+                self._sent.popleft()
+            if len(self._sent) >= self.requests:
+                delay = self._sent.popleft() + self.window - now
+                logger.info(f"Bitfinex request budget used up, waiting {delay:.1f}s")
+                await asyncio.sleep(delay)
+            self._sent.append(time.monotonic())
+
+
+#: Budget shared by all Bitfinex trade history requests of the process
+request_budget = RequestBudget()
+
+
+async def iter_bitfinex_trade_pages(route: str, start: int, end: int) -> AsyncIterator[list[list[Any]]]:
+    """Pages of trades from Bitfinex API, oldest first.
+
+    A full page is continued from the timestamp of its last trade, the trades
+    at that timestamp are returned again and dropped from the next page."""
+    url = TRADES_URL.format(route=route)
+    seen_ids: Set[int] = set()
+    while True:
+        await request_budget.acquire()
+        params = {"limit": PAGE_LIMIT, "sort": 1, "start": start, "end": end}
+        d = await get_http_client().get(url, params=params)
+        if "error" in d:
+            raise Exception(d["error"])
+        page = d["response"]
+        if not isinstance(page, list):
+            raise Exception(f"unexpected response: {page}")
+
+        trades = [t for t in page if t[0] not in seen_ids]
+        if trades:
+            yield trades
+        if len(page) < PAGE_LIMIT:
+            return
+
+        logger.warning(f"Bitfinex response too big, scrolling: {route} ({start} - {end})")
+        last_timestamp = page[-1][1]
+        if last_timestamp == start:
+            # a single millisecond fills the page, its other trades can't be paged through
+            logger.warning(f"Skipping Bitfinex trades for {route} at {start} beyond the first {PAGE_LIMIT}")
+            last_timestamp += 1
+        seen_ids = {t[0] for t in page if t[1] == last_timestamp}
+        start = last_timestamp
+
+
+async def retrieve_bitfinex_trades(route: str, start: int, end: int) -> list[list[Any]]:
     """Retrieve trades from Bitfinex API."""
-    # rate-limit: 30 req/min
-    url = f"https://api-pub.bitfinex.com/v2/trades/{route}/hist?limit=10000&sort=1&start={start}&end={end}"
+    all_trades: list[list[Any]] = []
     try:
-        response = requests.get(url)
+        async for page in iter_bitfinex_trade_pages(route, start, end):
+            all_trades.extend(page)
     except Exception as e:
-        logger.error(f"Error when retrieving Bitfinex trades for {route}:", e)
+        logger.error(f"Error when retrieving Bitfinex trades for {route}: {e}")
         return []
 
-    # convert response
-    all_trades = response.json()
     if not all_trades:
         logger.warning(f"Could not get Bitfinex trades for {route}")
         return []
-
-    if len(all_trades) >= 10000:
-        logger.warning(f"Bitfinex response too big, scrolling: {route} ({start} - {end})")
-        last_timestamp = all_trades[-1][1]
-        next_frame = retrieve_bitfinex_trades(route, last_timestamp, end)
-        all_trades.extend(next_frame)
     logger.info(f"Bitfinex trades for {route}: {len(all_trades)}")
     return all_trades
 
 
-def calculate_all_single_via(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
+async def calculate_all_single_via(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
     """Calculate VWAP for a single symbol via all exchanges."""
-    from_list = retrieve_bitfinex_trades(SYMBOLS[symbol["hops"][0]]["bitFinexSymbol"], start, end)
-    to_list = retrieve_bitfinex_trades(SYMBOLS[symbol["hops"][1]]["bitFinexSymbol"], start, end)
+    from_list, to_list = await asyncio.gather(
+        retrieve_bitfinex_trades(SYMBOLS[symbol["hops"][0]]["bitFinexSymbol"], start, end),
+        retrieve_bitfinex_trades(SYMBOLS[symbol["hops"][1]]["bitFinexSymbol"], start, end),
+    )
+    from_map = build_buckets(start, from_list)
+    to_map = build_buckets(start, to_list)
     result = {}
 
     if from_list and to_list:
-        result[f"bitFinexVwapVia{symbol['via']}"] = volume_weighted_average_price(start, from_list, to_list)
+        result[f"bitFinexVwapVia{symbol['via']}"] = vwap_from_buckets(from_map, to_map)
     else:
         result[f"bitFinexVwapVia{symbol['via']}"] = NO_TRADES_FOUND  # type: ignore
 
     if show_debug:
         result["source"] = {}
         result["source"][f"bitFinex_{symbol['from']}to{symbol['via']}"] = [
-            {"slot": slot, **bucket} for slot, bucket in build_buckets(start, from_list).items()
+            {"slot": slot, **bucket} for slot, bucket in from_map.items()
         ]
         result["source"][f"bitFinex_{symbol['via']}to{symbol['to']}"] = [
-            {"slot": slot, **bucket} for slot, bucket in build_buckets(start, to_list).items()
+            {"slot": slot, **bucket} for slot, bucket in to_map.items()
         ]
 
     return result
 
 
-def calculate_vwap_direct(symbol_route: dict[str, Any], start: int, end: int) -> dict[str, Any]:
+async def calculate_vwap_direct(symbol_route: dict[str, Any], start: int, end: int) -> dict[str, Any]:
     """Calculate VWAP for a single symbol directly."""
-    response = retrieve_bitfinex_trades(symbol_route["bitFinexSymbol"], start, end)
+    response = await retrieve_bitfinex_trades(symbol_route["bitFinexSymbol"], start, end)
     if len(response) == 0:
         raise Exception(f'No trades found for {symbol_route["bitFinexSymbol"]}')
     sum_amount_and_prices = sum([abs(trade[2] * trade[3]) for trade in response])
@@ -131,12 +200,13 @@ def calculate_vwap_direct(symbol_route: dict[str, Any], start: int, end: int) ->
     return {"vwap": sum_amount_and_prices / sum_volume, "volume": sum_volume}
 
 
-def calculate_vwap_via_all(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
+async def calculate_vwap_via_all(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
     """Calculate VWAP for a single symbol via all symbols."""
-    p_result = [calculate_vwap_direct(SYMBOLS[symbol["direct"]], start, end)]
-    for h in symbol["viaHops"]:
-        p_result.append(calculate_all_single_via(SYMBOLS[h], start, end, show_debug))
-    result = {"bitFinexVwapDirect": p_result[0]}
+    p_result = await asyncio.gather(
+        calculate_vwap_direct(SYMBOLS[symbol["direct"]], start, end),
+        *(calculate_all_single_via(SYMBOLS[h], start, end, show_debug) for h in symbol["viaHops"]),
+    )
+    result: dict[str, Any] = {"bitFinexVwapDirect": p_result[0]}
 
     if show_debug:
         result["source"] = {}
@@ -148,9 +218,7 @@ def calculate_vwap_via_all(symbol: dict[str, Any], start: int, end: int, show_de
             result["source"].update(source)
         result.update(p_result[i])
 
-    all_vwaps = [
-        v["vwap"] * v["volume"] for k, v in result.items() if k != "source" and v != NO_TRADES_FOUND  # type: ignore
-    ]
+    all_vwaps = [v["vwap"] * v["volume"] for k, v in result.items() if k != "source" and v != NO_TRADES_FOUND]
     sum_volumes_and_prices = sum(all_vwaps)
     sum_volume = sum(v["volume"] for k, v in result.items() if k != "source" and "volume" in v)
 
@@ -160,7 +228,7 @@ def calculate_vwap_via_all(symbol: dict[str, Any], start: int, end: int, show_de
 
 async def get_value_from_bitfinex(symbol: dict[str, Any], start: int, end: int, show_debug: bool) -> dict[str, Any]:
     """Get VWAP for any symbol or group of symbols in SYMBOLS."""
-    result = calculate_vwap_via_all(symbol, start, end, show_debug)
+    result = await calculate_vwap_via_all(symbol, start, end, show_debug)
     return result
 
 
@@ -14,6 +14,8 @@ from web3.types import BlockData
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.block_index import get_block
+from telliot_feeds.utils.block_index import get_block_index
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.source_utils import update_web3
 
@@ -40,19 +42,7 @@ class EVMBalanceSource(DataSource[Any]):
 
     def get_block(self, w3: Web3, block_number: int, full_transaction: bool = False) -> Optional[BlockData]:
         """Get block info with error handling for POA chains"""
-        try:
-            block = w3.eth.get_block(block_number, full_transaction)
-        except ExtraDataLengthError as e:
-            logger.info(f"POA chain detected. Injecting POA middleware in response to exception: {e}")
-            try:
-                w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-            except ValueError as e:
-                logger.error(f"Unable to inject web3 middleware for POA chain connection: {e}")
-            block = w3.eth.get_block(block_number, full_transaction)
-        except Exception as e:
-            logger.error(f"Error fetching block info: {e}")
-            block = None
-        return block
+        return get_block(w3, block_number, full_transaction)
 
     def get_balance(self, w3: Web3, address: str, block_number: int) -> Optional[int]:
         """Get balance of address at block number"""
@@ -99,7 +89,7 @@ class EVMBalanceSource(DataSource[Any]):
         return balance
 
     async def search_block_by_timestamp(self) -> Optional[int]:
-        """Binary search for the block closest to the target timestamp
+        """Find the block closest to the target timestamp using the chain's shared block index
 
         Returns:
             The closest block number less than or equal to the target timestamp
@@ -108,38 +98,10 @@ class EVMBalanceSource(DataSource[Any]):
             raise ValueError("Web3 not instantiated")
         if not self.timestamp:
             raise ValueError("Timestamp not provided")
+        if not self.chainId:
+            raise ValueError("Chain ID not provided")
 
-        left_block_number = 0
-        right_block_number: int = self.web3.eth.block_number
-        mid_block_number = (left_block_number + right_block_number) // 2
-        target_timestamp = self.timestamp
-
-        while right_block_number - left_block_number > 2:
-            mid_block = self.get_block(self.web3, mid_block_number)
-            if not mid_block:
-                return None
-            mid_block_timestamp = mid_block["timestamp"]
-
-            # Check for exact match
-            if mid_block_timestamp == target_timestamp:
-                return mid_block_number
-
-            if mid_block_timestamp < target_timestamp:
-                left_block_number = mid_block_number
-            else:
-                right_block_number = mid_block_number
-            mid_block_number = (left_block_number + right_block_number) // 2
-
-        mid_block = self.get_block(self.web3, mid_block_number)
-        if not mid_block:
-            return None
-        mid_block_timestamp = mid_block["timestamp"]
-        if mid_block_timestamp <= target_timestamp:
-            return mid_block_number
-        else:
-            if left_block_number == 0:
-                return None
-            return left_block_number
+        return await get_block_index(self.web3, self.chainId).block_number_at(self.timestamp)
 
     async def fetch_new_datapoint(self) -> OptionalDataPoint[int]:
         """Fetch balance of EVM address at a given timestamp
@@ -13,6 +13,8 @@ from web3.types import BlockData
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.utils.block_index import get_block
+from telliot_feeds.utils.block_index import get_block_index
 from telliot_feeds.utils.log import get_logger
 from telliot_feeds.utils.source_utils import update_web3
 
@@ -39,19 +41,7 @@ class EVMBalanceCurrentSource(DataSource[Any]):
 
     def get_block(self, w3: Web3, block_number: int, full_transaction: bool = False) -> Optional[BlockData]:
         """Get block info with error handling for POA chains"""
-        try:
-            block = w3.eth.get_block(block_number, full_transaction)
-        except ExtraDataLengthError as e:
-            logger.info(f"POA chain detected. Injecting POA middleware in response to exception: {e}")
-            try:
-                w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-            except ValueError as e:
-                logger.error(f"Unable to inject web3 middleware for POA chain connection: {e}")
-            block = w3.eth.get_block(block_number, full_transaction)
-        except Exception as e:
-            logger.error(f"Error fetching block info: {e}")
-            block = None
-        return block
+        return get_block(w3, block_number, full_transaction)
 
     def get_balance(self, w3: Web3, address: str, block_number: int) -> Optional[int]:
         """Get balance of address at block number"""
@@ -117,10 +107,7 @@ class EVMBalanceCurrentSource(DataSource[Any]):
         if not block_num:
             raise ValueError("Block number not provided")
 
-        block = self.get_block(self.web3, block_num)
-        if block is None:
-            return None
-        return block["timestamp"]
+        return await get_block_index(self.web3, self.chainId).block_timestamp(block_num)
 
     async def fetch_new_datapoint(self) -> OptionalDataPoint[list[int]]:
         """Fetch balance of EVM address at a given timestamp
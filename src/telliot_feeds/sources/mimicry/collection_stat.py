@@ -5,6 +5,7 @@ from datetime import timezone
 from typing import Any
 from typing import List
 from typing import Optional
+from typing import Set
 from typing import Union
 
 import requests
@@ -17,6 +18,7 @@ from urllib3.util import Retry
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.sources.mimicry.sales_cache import sales_history_cache
 from telliot_feeds.sources.mimicry.tami import tami
 from telliot_feeds.sources.mimicry.types import Transaction
 from telliot_feeds.sources.mimicry.utils import sort_transactions
@@ -57,7 +59,7 @@ class MimicryCollectionStatSource(DataSource[float]):
 
         sorted_transactions.reverse()
 
-        last_sale_found = []
+        last_sale_found: Set[Union[float, int, str]] = set()
 
         for sale in sorted_transactions:
 
@@ -72,35 +74,25 @@ class MimicryCollectionStatSource(DataSource[float]):
             else:
                 values.append(transaction_history.floor_price)
 
-            last_sale_found.append(sale.itemId)
+            last_sale_found.add(sale.itemId)
 
         return sum(values)
 
-    async def request_historical_sales_data(self, contract: str, all: bool = True) -> Optional[TransactionList]:
-        """Requests historical sales
-         data of the selected collection.
-         Data retrieved from Reservoir.
-
-        Agruments:
-            all (bool): if True, see all data for the selected collection (if False, only 12 months)
+    def request_sales(self, contract: str, start_timestamp: int) -> Optional[List[Transaction]]:
+        """Requests every sale of the selected collection at or after start_timestamp.
+        Data retrieved from Reservoir, 1000 sales per page.
 
         Returns:
-            TransactionList: formatted historical sales data of a collection retrieved from Reservoir
-
+            List[Transaction]: sales of the collection, or None if a request failed
         """
         continuation_token = ""
-        tx_list = TransactionList()
+        sales: List[Transaction] = []
         while True:
             url = f"https://api.reservoir.tools/sales/v4?contract={contract}"
             headers = {"accept": "*/*", "x-api-key": "demo-api-key"}
             with requests.Session() as s:
                 s.mount("https://", adapter)
-                if not all:
-                    one_year_ago = datetime.utcnow() - relativedelta(years=1)
-                    start_timestamp = int(one_year_ago.timestamp())
-                    url += f"&startTimestamp={start_timestamp}"
-                else:
-                    url += "&startTimestamp=0"
+                url += f"&startTimestamp={start_timestamp}"
                 # paginate
                 if continuation_token:
                     url += "&continuation=" + continuation_token
@@ -133,15 +125,62 @@ class MimicryCollectionStatSource(DataSource[float]):
                     except KeyError as e:
                         logger.error("Mimicry: Reservoir Sales API KeyError: " + str(e))
                         return None
+                    if price is None:
+                        continue
                     tx = Transaction(
                         price=price, itemId=item_id, date=datetime.fromtimestamp(timestamp, tz=timezone.utc)
                     )
-                    tx_list.transactions.append(tx)
+                    sales.append(tx)
 
                 # if on last page
                 if len(sales_data) < 1000:
                     break
 
+        return sales
+
+    async def request_historical_sales_data(self, contract: str, all: bool = True) -> Optional[TransactionList]:
+        """Requests historical sales
+         data of the selected collection.
+         Data retrieved from Reservoir.
+
+        Unless `sales_history_cache.enabled` is False, sales are kept on disk
+        (see `sales_cache`) and only sales newer than the last cached one are requested.
+
+        Agruments:
+            all (bool): if True, see all data for the selected collection (if False, only 12 months)
+
+        Returns:
+            TransactionList: formatted historical sales data of a collection retrieved from Reservoir
+
+        """
+        if not all:
+            one_year_ago = datetime.utcnow() - relativedelta(years=1)
+            start_timestamp = int(one_year_ago.timestamp())
+        else:
+            start_timestamp = 0
+
+        tx_list = TransactionList()
+        if sales_history_cache.enabled:
+            cached = sales_history_cache.load(self.chainId, contract)
+            if cached is not None and cached.start_timestamp > start_timestamp:
+                # cached history does not reach back far enough
+                cached = None
+
+            sales = self.request_sales(contract, cached.last_timestamp if cached is not None else start_timestamp)
+            if sales is None:
+                return None
+
+            if cached is None:
+                cached = sales_history_cache.replace(self.chainId, contract, start_timestamp, sales)
+            else:
+                cached = sales_history_cache.append(self.chainId, contract, cached, sales)
+            tx_list.transactions = cached.transactions(since=start_timestamp)
+        else:
+            sales = self.request_sales(contract, start_timestamp)
+            if sales is None:
+                return None
+            tx_list.transactions = sales
+
         if self.metric == 1:
             url = (
                 "https://api.reservoir.tools/oracle/collections/floor-ask/v4?kind="
@@ -150,8 +189,10 @@ class MimicryCollectionStatSource(DataSource[float]):
             headers = {"accept": "*/*", "x-api-key": "demo-api-key"}
 
             try:
-                request = s.get(url, timeout=10, headers=headers)
-                request.raise_for_status()
+                with requests.Session() as s:
+                    s.mount("https://", adapter)
+                    request = s.get(url, timeout=10, headers=headers)
+                    request.raise_for_status()
             except (RequestException, Timeout) as e:
                 logger.error(f"Request to Reservoir FloorPrice API failed: {str(e)}")
                 return None
@@ -0,0 +1,211 @@
+"""Persistent per-collection cache of Reservoir sales
+
+Downloading the full sales history of a large NFT collection takes dozens of
+paginated Reservoir requests. The cache keeps every downloaded sale on disk
+so later fetches only request sales newer than the last cached one.
+
+Each collection is stored column-wise in its own directory under
+`<telliot home>/mimicry_sales/<chain id>_<contract>/`:
+
+    timestamps.bin  sale timestamps (int64, seconds, ascending)
+    prices.bin      sale prices in USD (float64)
+    token_ids.txt   token ids, one per line
+    meta.json       row count and the earliest timestamp covered
+
+Columns are append-only; `meta.json` is replaced atomically after each append
+and its row count is authoritative, so a partially written append is ignored.
+"""
+import json
+import os
+from array import array
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from telliot_core.utils.home import default_homedir
+
+from telliot_feeds.sources.mimicry.types import Transaction
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+TIMESTAMPS_FILE = "timestamps.bin"
+PRICES_FILE = "prices.bin"
+TOKEN_IDS_FILE = "token_ids.txt"
+META_FILE = "meta.json"
+
+
+@dataclass
+class CachedSales:
+    """Column-wise sales history of one collection, sorted by timestamp"""
+
+    #: Earliest timestamp the history is complete from
+    start_timestamp: int = 0
+
+    timestamps: "array[int]" = field(default_factory=lambda: array("q"))
+    prices: "array[float]" = field(default_factory=lambda: array("d"))
+    token_ids: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def last_timestamp(self) -> int:
+        """Timestamp of the most recent cached sale, or the start of the history if empty"""
+        return self.timestamps[-1] if self.timestamps else self.start_timestamp
+
+    def transactions(self, since: int = 0) -> List[Transaction]:
+        """Cached sales at or after the given timestamp, oldest first"""
+        return [
+            Transaction(itemId=token_id, price=price, date=datetime.fromtimestamp(ts, tz=timezone.utc))
+            for ts, price, token_id in zip(self.timestamps, self.prices, self.token_ids)
+            if ts >= since
+        ]
+
+
+def _sale_key(timestamp: int, price: float, token_id: Any) -> Tuple[int, float, str]:
+    return timestamp, float(price), str(token_id)
+
+
+class SalesHistoryCache:
+    """On-disk store of collection sales histories
+
+    Args:
+        directory: Where collection histories are stored,
+            defaults to `mimicry_sales` in the telliot home directory
+        enabled: Whether Mimicry sources use the cache or download the full history every time
+    """
+
+    def __init__(self, directory: Optional[Path] = None, enabled: bool = True) -> None:
+        self._directory = directory
+        self.enabled = enabled
+
+    @property
+    def directory(self) -> Path:
+        if self._directory is None:
+            self._directory = Path(default_homedir()) / "mimicry_sales"
+        return self._directory
+
+    @directory.setter
+    def directory(self, directory: Path) -> None:
+        self._directory = Path(directory)
+
+    def path(self, chain_id: Optional[int], contract: str) -> Path:
+        """Directory holding the history of one collection"""
+        return self.directory / f"{chain_id}_{contract.lower()}"
+
+    def load(self, chain_id: Optional[int], contract: str) -> Optional[CachedSales]:
+        """Read the cached history of a collection, None if there is none or it is unreadable"""
+        path = self.path(chain_id, contract)
+        try:
+            meta = json.loads((path / META_FILE).read_text())
+            count = int(meta["count"])
+
+            timestamps = array("q")
+            timestamps.frombytes((path / TIMESTAMPS_FILE).read_bytes()[: count * timestamps.itemsize])
+            prices = array("d")
+            prices.frombytes((path / PRICES_FILE).read_bytes()[: count * prices.itemsize])
+            token_ids = (path / TOKEN_IDS_FILE).read_text().split("\n")[:count]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable Mimicry sales cache at {path}: {e}")
+            return None
+
+        if not len(timestamps) == len(prices) == len(token_ids) == count:
+            logger.warning(f"Ignoring truncated Mimicry sales cache at {path}")
+            return None
+
+        return CachedSales(
+            start_timestamp=int(meta["start_timestamp"]), timestamps=timestamps, prices=prices, token_ids=token_ids
+        )
+
+    def replace(
+        self, chain_id: Optional[int], contract: str, start_timestamp: int, sales: List[Transaction]
+    ) -> CachedSales:
+        """Store a complete history from start_timestamp, discarding any cached one"""
+        self.clear(chain_id, contract)
+        path = self.path(chain_id, contract)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in (TIMESTAMPS_FILE, PRICES_FILE, TOKEN_IDS_FILE):
+            (path / name).write_bytes(b"")
+        return self._append(path, CachedSales(start_timestamp=start_timestamp), sales)
+
+    def append(
+        self, chain_id: Optional[int], contract: str, cached: CachedSales, sales: List[Transaction]
+    ) -> CachedSales:
+        """Add sales fetched from `cached.last_timestamp` onward to a cached history
+
+        Sales older than the cached history or already cached are skipped.
+        """
+        last = cached.last_timestamp
+        seen: Set[Tuple[int, float, str]] = set()
+        for i in range(len(cached) - 1, -1, -1):
+            if cached.timestamps[i] != last:
+                break
+            seen.add(_sale_key(cached.timestamps[i], cached.prices[i], cached.token_ids[i]))
+
+        new_sales = []
+        for sale in sales:
+            timestamp = int(sale.date.timestamp())
+            if timestamp < last or _sale_key(timestamp, sale.price, sale.itemId) in seen:
+                continue
+            new_sales.append(sale)
+
+        return self._append(self.path(chain_id, contract), cached, new_sales)
+
+    def clear(self, chain_id: Optional[int], contract: str) -> None:
+        """Delete the cached history of a collection"""
+        path = self.path(chain_id, contract)
+        for name in (META_FILE, TIMESTAMPS_FILE, PRICES_FILE, TOKEN_IDS_FILE):
+            try:
+                (path / name).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _append(self, path: Path, cached: CachedSales, sales: List[Transaction]) -> CachedSales:
+        """Append sales to the column files and commit the new row count"""
+        sales = sorted(sales, key=lambda s: s.date)
+        timestamps = array("q", (int(s.date.timestamp()) for s in sales))
+        prices = array("d", (float(s.price) for s in sales))
+        token_ids = [str(s.itemId) for s in sales]
+
+        count = len(cached)
+        try:
+            # Drop rows of an append that was interrupted before its meta.json was written
+            with open(path / TIMESTAMPS_FILE, "r+b") as f:
+                f.truncate(count * timestamps.itemsize)
+                f.seek(0, os.SEEK_END)
+                timestamps.tofile(f)
+            with open(path / PRICES_FILE, "r+b") as f:
+                f.truncate(count * prices.itemsize)
+                f.seek(0, os.SEEK_END)
+                prices.tofile(f)
+            with open(path / TOKEN_IDS_FILE, "r+b") as f:
+                f.truncate(sum(len(token_id.encode()) + 1 for token_id in cached.token_ids))
+                f.seek(0, os.SEEK_END)
+                f.write("".join(token_id + "\n" for token_id in token_ids).encode())
+
+            meta = {"count": count + len(sales), "start_timestamp": cached.start_timestamp}
+            tmp = path / (META_FILE + ".tmp")
+            tmp.write_text(json.dumps(meta))
+            os.replace(tmp, path / META_FILE)
+        except OSError as e:
+            logger.warning(f"Unable to update Mimicry sales cache at {path}: {e}")
+
+        cached.timestamps.extend(timestamps)
+        cached.prices.extend(prices)
+        cached.token_ids.extend(token_ids)
+        return cached
+
+
+#: Process-wide cache used by Mimicry collection sources
+sales_history_cache = SalesHistoryCache()
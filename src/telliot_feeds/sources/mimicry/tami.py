@@ -14,12 +14,17 @@ def create_index_value_history(transaction_history: List[Transaction]) -> List[I
     """Given a list of transactions, this creates a list that contains the index value at the
     time of each transaction, and includes the transaction as well.
 
+    Runs in linear time: the sum of every item's last sale price is kept
+    as a running total rather than recomputed for each transaction.
+
     Args:
     - transaction_history: A list of transactions sorted by date.
 
     Returns:
     - A list of IndexValueHistoryItem objects (itemId, price, indexValue, Transaction)."""
-    transaction_map: Dict[Union[float, int, str], Transaction] = {}
+    # last sale price of every item seen so far, and their running total
+    last_price_map: Dict[Union[float, int, str], Union[float, int]] = {}
+    all_last_sold_value: Union[float, int] = 0
 
     last_index_value = 0.0
     last_divisor = 1.0
@@ -29,13 +34,18 @@ def create_index_value_history(transaction_history: List[Transaction]) -> List[I
     for i in range(len(transaction_history)):
         transaction = transaction_history[i]
 
-        is_first_sale = transaction_map.get(transaction.itemId) is None
+        previous_price = last_price_map.get(transaction.itemId)
+        is_first_sale = previous_price is None
 
-        transaction_map[transaction.itemId] = transaction
+        last_price_map[transaction.itemId] = transaction.price
 
-        item_count = len(transaction_map)
+        item_count = len(last_price_map)
 
-        all_last_sold_value = sum([transaction_map[item].price for item in transaction_map])
+        # update the sum of last sale prices instead of re-summing every item
+        if previous_price is None:
+            all_last_sold_value += transaction.price
+        else:
+            all_last_sold_value += transaction.price - previous_price
 
         index_value = all_last_sold_value / (item_count * last_divisor)
 
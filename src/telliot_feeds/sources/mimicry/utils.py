@@ -23,7 +23,7 @@ def filter_valid_transactions(transaction_history: List[Transaction]) -> List[Tr
     one_year_ago = (now - relativedelta(years=1)).replace(tzinfo=timezone.utc)
     six_months_ago = (now - relativedelta(months=6)).replace(tzinfo=timezone.utc)
 
-    inclusion_map: Dict[Union[float, int], InclusionMapValue] = {}
+    inclusion_map: Dict[Union[float, int, str], InclusionMapValue] = {}
     for transaction in transaction_history:
 
         item_id = transaction.itemId
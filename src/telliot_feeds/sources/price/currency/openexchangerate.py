@@ -37,7 +37,7 @@ class OpenExchangeRateCurrencyPriceService(WebPriceService):
         try:
             request_url = f"/v6/latest/{asset.upper()}"
 
-            d = self.get_url(request_url)
+            d = await self.get_url(request_url)
             if "error" in d:
                 logger.error(d)
                 return None, None
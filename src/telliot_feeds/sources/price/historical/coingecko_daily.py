@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from typing import Any
+from typing import Hashable
 from urllib.parse import urlencode
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
@@ -19,6 +20,10 @@ class CoingeckoDailyHistoricalPriceService(CoinGeckoSpotPriceService):
         self.days = days
         super().__init__(**kwargs)
 
+    def cache_key(self, asset: str, currency: str) -> Hashable:
+        """Include the requested number of days in the price cache key"""
+        return super().cache_key(asset, currency), self.days
+
     async def get_price(self, asset: str, currency: str) -> OptionalDataPoint[float]:
         """Implement PriceServiceInterface
 
@@ -38,7 +43,7 @@ class CoingeckoDailyHistoricalPriceService(CoinGeckoSpotPriceService):
         url_params = urlencode({"vs_currency": currency, "days": self.days, "interval": "daily"})
         request_url = f"/api/v3/coins/{coin_id}/market_chart?{url_params}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
 
         if "error" in d:
             if "api.coingecko.com used Cloudflare to restrict access" in str(d["exception"]):
@@ -1,16 +1,16 @@
 from dataclasses import dataclass
+from dataclasses import field
 from datetime import datetime
 from typing import Any
+from typing import List
 from typing import Optional
 from typing import Tuple
 from urllib.parse import urlencode
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
-from telliot_feeds.dtypes.datapoint import OptionalDataPoint
-from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.sources.price.historical.trade_tape import HistoricalTradeService
+from telliot_feeds.sources.price.historical.trade_tape import Trade
 from telliot_feeds.utils.log import get_logger
 
 
@@ -21,8 +21,14 @@ logger = get_logger(__name__)
 CRYPTOWATCH_PAIRS = {"ethusd", "btcusd"}
 
 
-class CryptowatchHistoricalPriceService(WebPriceService):
-    """Cryptowatch Historical Price Service"""
+class CryptowatchHistoricalPriceService(HistoricalTradeService):
+    """Cryptowatch Historical Price Service
+
+    Cryptowatch has no trades history, the close of each one minute candle
+    is used as a trade at its close time.
+    """
+
+    exchange = "cryptowatch"
 
     def __init__(
         self,
@@ -30,38 +36,9 @@ class CryptowatchHistoricalPriceService(WebPriceService):
         name: str = "Cryptowatch Historical Price Service",
         url: str = "https://api.cryptowat.ch/",
         ts: int = 0,
+        period: int = 10000,
     ):
-        self.name = name
-        self.url = url
-        self.ts = ts
-        self.timeout = timeout
-
-    def get_url(self, url: str = "") -> dict[str, Any]:
-        """Helper function to get URL JSON response while handling exceptions
-
-        Args:
-            url: URL to fetch
-
-        Returns:
-            A dictionary with the following (optional) keys:
-                json (dict or list): Result, if no error occurred
-                error (str): A description of the error, if one occurred
-                exception (Exception): The exception, if one occurred
-        """
-
-        request_url = self.url + url
-
-        with requests.Session() as s:
-            try:
-                r = s.get(request_url, timeout=self.timeout)
-                json_data = r.json()
-                return {"response": json_data}
-
-            except requests.exceptions.ConnectTimeout as e:
-                return {"error": "Timeout Error", "exception": e}
-
-            except Exception as e:
-                return {"error": str(type(e)), "exception": e}
+        super().__init__(name=name, url=url, timeout=timeout, ts=ts, period=period)
 
     async def get_candles(
         self,
@@ -100,7 +77,7 @@ class CryptowatchHistoricalPriceService(WebPriceService):
 
         request_url = f"markets/coinbase-pro/{pair}/ohlc?{url_params}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
         candles = None
 
         if "error" in d:
@@ -121,36 +98,18 @@ class CryptowatchHistoricalPriceService(WebPriceService):
 
         return candles, datetime_now_utc()
 
-    async def get_price(
-        self, asset: str, currency: str, period: int = 10000, ts: Optional[int] = None
-    ) -> OptionalDataPoint[float]:
-        """Implement PriceServiceInterface
-
-        This implementation gets the historical price from
-        the Cryptowatch API using a timestamp. Historical prices are
-        fetched from Cryptowatch's recorded Coinbase-pro data.
-
-        Documentation for Cryptowatch API:
-        https://docs.cryptowat.ch/rest-api/markets/ohlc
-        """
-        candles, dt = await self.get_candles(asset=asset, currency=currency, ts=ts, period=period)
-
-        if candles is not None:
-            try:
-                if len(candles) == 0:
-                    logger.warning(
-                        f"No candle data from Cryptowatch historical price source for given timestamp: {ts}."
-                    )
-                    return None, None
-
-                # Price from last candle in period
-                return float(candles[-1][4]), dt
-
-            except KeyError as e:
-                msg = f"Error parsing Cryptowatch API candle data: KeyError: {e}"
-                logger.critical(msg)
-
-        return None, None
+    async def fetch_trades(self, asset: str, currency: str, start: int, end: int) -> Optional[List[Trade]]:
+        """Close prices of the one minute candles closed between two unix times"""
+        candles, _ = await self.get_candles(asset=asset, currency=currency, ts=end, period=end - start)
+        if candles is None:
+            return None
+        try:
+            # candles are [close time, open, high, low, close, volume, quote volume]
+            return [(float(c[0]), float(c[4])) for c in candles]
+        except (IndexError, TypeError, ValueError) as e:
+            msg = f"Error parsing Cryptowatch API candle data: {e}"
+            logger.critical(msg)
+            return None
 
 
 @dataclass
@@ -158,7 +117,7 @@ class CryptowatchHistoricalPriceSource(PriceSource):
     ts: int = 0
     asset: str = ""
     currency: str = ""
-    service: CryptowatchHistoricalPriceService = CryptowatchHistoricalPriceService(ts=ts)
+    service: CryptowatchHistoricalPriceService = field(default_factory=CryptowatchHistoricalPriceService)
 
     def __post_init__(self) -> None:
         self.service.ts = self.ts
@@ -1,24 +1,43 @@
 from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Hashable
 from typing import Optional
 
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.sources.price.historical.cryptowatch import CryptowatchHistoricalPriceService
+from telliot_feeds.sources.price.historical.ohlc_store import ohlc_store
+from telliot_feeds.sources.price.historical.ohlc_store import OHLCStore
 from telliot_feeds.utils.log import get_logger
-from telliot_feeds.utils.stdev_calculator import stdev_calculator
+from telliot_feeds.utils.stdev_calculator import trailing_volatilities
 
 
 logger = get_logger(__name__)
 
 
 class CryptowatchHistoricalOHLCPriceService(CryptowatchHistoricalPriceService):
-    """Cryptowatch Historical Daily OHLC Price Service"""
+    """Cryptowatch Historical Daily OHLC Price Service
+
+    Candles are kept in an `OHLCStore`, only candles newer than the stored
+    ones are requested.
+    """
+
+    def __init__(self, days: int = 30, store: Optional[OHLCStore] = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.days = days
+        self.store = store or ohlc_store
+
+    def cache_key(self, asset: str, currency: str) -> Hashable:
+        """Include the requested number of days in the price cache key"""
+        return super().cache_key(asset, currency), self.days
 
     async def get_price(
         self,
         asset: str,
         currency: str,
-        period: int = 30 * 86400,  # thirty days in seconds
+        period: Optional[int] = None,
         ts: Optional[int] = None,
         candle_periods: int = 86400,  # one day in seconds
     ) -> OptionalDataPoint[float]:
@@ -29,31 +48,45 @@ class CryptowatchHistoricalOHLCPriceService(CryptowatchHistoricalPriceService):
         the Cryptowatch API using a timestamp. Historical prices are
         fetched from Cryptowatch's recorded Coinbase-pro data.
 
+        Returns the standard deviation of the last `days` returns of candles
+        closed before `ts` (default: now).
+
         Documentation for Cryptowatch API:
         https://docs.cryptowat.ch/rest-api/markets/ohlc
         """
-        candles, dt = await self.get_candles(
-            asset=asset, currency=currency, ts=ts, period=period, candle_periods=candle_periods
-        )
-        if candles is not None:
-            try:
-                if len(candles) < 30:
-                    logger.warning("Not enough data to calculate volatility.")
-                    return None, None
-                close_prices = [i[4] for i in candles]
-
-                volatility = stdev_calculator(close_prices)
-
-                return volatility, dt
-
-            except IndexError as e:
-                msg = f"Error parsing Cryptowatch API candle data: IndexError: {e}"
-                logger.error(msg)
-
-            except Exception as e:
-                logger.error(e)
-
-        return None, None
+        if ts is None:
+            ts = self.ts or int(datetime_now_utc().timestamp())
+        pair = f"{asset.lower()}{currency.lower()}"
+        candles = self.store.load("cryptowatch", pair, candle_periods)
+        if candles.is_stale(now=ts):
+            last = candles.last_timestamp
+            if period is None:
+                # candles since the last stored one, or enough for the window
+                start = ts - (self.days + 2) * candle_periods if last is None else last + candle_periods
+                period = ts - start
+            new_candles, _ = await self.get_candles(
+                asset=asset, currency=currency, ts=ts, period=period, candle_periods=candle_periods
+            )
+            if new_candles is not None:
+                try:
+                    # Cryptowatch candles are [close time, open, high, low, close, volume, quote volume]
+                    parsed = [
+                        (int(c[0]) - candle_periods, float(c[1]), float(c[2]), float(c[3]), float(c[4]))
+                        for c in new_candles
+                    ]
+                    candles = self.store.append("cryptowatch", pair, candle_periods, parsed, now=ts)
+                except (IndexError, TypeError, ValueError) as e:
+                    msg = f"Error parsing Cryptowatch API candle data: {e}"
+                    logger.error(msg)
+
+        closes = candles.last_closes(self.days + 1, until=ts)
+        if len(closes) <= self.days:
+            logger.warning("Not enough data to calculate volatility.")
+            return None, None
+        volatility = trailing_volatilities(closes, [self.days])[self.days]
+        if volatility is None:
+            return None, None
+        return volatility, datetime_now_utc()
 
 
 @dataclass
@@ -61,7 +94,9 @@ class CryptowatchHistoricalOHLCPriceSource(PriceSource):
     ts: int = 0
     asset: str = ""
     currency: str = ""
-    service: CryptowatchHistoricalOHLCPriceService = CryptowatchHistoricalOHLCPriceService(ts=ts)
+    days: int = 30
+    service: CryptowatchHistoricalOHLCPriceService = field(default_factory=CryptowatchHistoricalOHLCPriceService)
 
     def __post_init__(self) -> None:
         self.service.ts = self.ts
+        self.service.days = self.days
@@ -1,16 +1,16 @@
 from dataclasses import dataclass
+from dataclasses import field
 from datetime import datetime
 from typing import Any
+from typing import List
 from typing import Optional
 from typing import Tuple
 from urllib.parse import urlencode
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
-from telliot_feeds.dtypes.datapoint import OptionalDataPoint
-from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.sources.price.historical.trade_tape import HistoricalTradeService
+from telliot_feeds.sources.price.historical.trade_tape import Trade
 from telliot_feeds.utils.log import get_logger
 
 
@@ -23,48 +23,27 @@ logger = get_logger(__name__)
 kraken_assets = {"ETH", "XBT"}
 kraken_currencies = {"USD"}
 
+#: Trades returned per Trades request
+TRADES_PER_PAGE = 1000
+
+#: Most Trades requests for one time range
+MAX_PAGES = 20
+
 
-class KrakenHistoricalPriceService(WebPriceService):
+class KrakenHistoricalPriceService(HistoricalTradeService):
     """Kraken Historical Price Service"""
 
+    exchange = "kraken"
+
     def __init__(
         self,
         timeout: float = 0.5,
         name: str = "Kraken Historical Price Service",
         url: str = "https://api.kraken.com",
         ts: int = 0,
+        period: int = 900,  # 15 minutes
     ):
-        self.name = name
-        self.url = url
-        self.ts = ts
-        self.timeout = timeout
-
-    def get_url(self, url: str = "") -> dict[str, Any]:
-        """Helper function to get URL JSON response while handling exceptions
-
-        Args:
-            url: URL to fetch
-
-        Returns:
-            A dictionary with the following (optional) keys:
-                json (dict or list): Result, if no error occurred
-                error (str): A description of the error, if one occurred
-                exception (Exception): The exception, if one occurred
-        """
-
-        request_url = self.url + url
-
-        with requests.Session() as s:
-            try:
-                r = s.get(request_url, timeout=self.timeout)
-                json_data = r.json()
-                return {"response": json_data}
-
-            except requests.exceptions.ConnectTimeout as e:
-                return {"error": "Timeout Error", "exception": e}
-
-            except Exception as e:
-                return {"error": str(type(e)), "exception": e}
+        super().__init__(name=name, url=url, timeout=timeout, ts=ts, period=period)
 
     def get_request_url(self, asset: str, currency: str, period_start: int) -> str:
         """Assemble Kraken historical trades request url."""
@@ -110,28 +89,36 @@ class KrakenHistoricalPriceService(WebPriceService):
 
         return trades
 
-    async def get_price(self, asset: str, currency: str, ts: Optional[int] = None) -> OptionalDataPoint[float]:
-        """Implement PriceServiceInterface
+    async def fetch_trades(self, asset: str, currency: str, start: int, end: int) -> Optional[List[Trade]]:
+        """Fetch all trades between two unix times, a page of 1000 trades at a time
 
-        This implementation gets the historical price from
-        the Kraken API using a timestamp."""
-        if ts is None:
-            ts = self.ts
-
-        # fetch trades data for a minute before expiry,
-        # if no trades found, then fetch trades for 2 minutes before expiry, etc.
-        # break after checking fifteen minutes before expiry
-        for i in range(15):
-            period = 60 * (i + 1)
-            trades, dt = await self.get_trades(asset, currency, period, ts)
-            if not trades:
-                continue
-            price = float(trades[-1][0])
-            logger.info(f"Price found up to {i+1} min before expiry: {price}")
-            return price, dt
-
-        logger.info("No trades found up to 15 minutes before expiry.")
-        return None, None
+        None if the range takes more than MAX_PAGES pages, as the trades
+        fetched would leave its end uncovered.
+        """
+        trades: List[Trade] = []
+        since = start
+        for _ in range(MAX_PAGES):
+            d = await self.get_url(self.get_request_url(asset, currency, since))
+            if "error" in d:
+                logger.error(d)
+                return None
+            elif "response" not in d:
+                raise Exception("Invalid response from get_url")
+
+            page = self.resp_all_trades_parse(resp=d["response"], asset=asset, currency=currency)
+            if page is None:
+                return None
+            try:
+                trades.extend((float(t[2]), float(t[0])) for t in page)
+                # cursor of the next page, in nanoseconds
+                since = int(d["response"]["result"]["last"])
+            except (IndexError, KeyError, TypeError, ValueError) as e:
+                logger.error(f"Error parsing Kraken API trades: {e}")
+                return None
+            if len(page) < TRADES_PER_PAGE or trades[-1][0] > end:
+                return trades
+        logger.warning(f"Kraken trades of {asset}/{currency} since {start} exceed {MAX_PAGES} pages")
+        return None
 
     async def get_trades(
         self,
@@ -163,7 +150,7 @@ class KrakenHistoricalPriceService(WebPriceService):
 
         req_url = self.get_request_url(asset, currency, period_start)
 
-        d = self.get_url(req_url)
+        d = await self.get_url(req_url)
 
         if "error" in d:
             logger.error(d)
@@ -184,7 +171,7 @@ class KrakenHistoricalPriceSource(PriceSource):
     ts: int = 0
     asset: str = ""
     currency: str = ""
-    service: KrakenHistoricalPriceService = KrakenHistoricalPriceService(ts=ts)
+    service: KrakenHistoricalPriceService = field(default_factory=KrakenHistoricalPriceService)
 
     def __post_init__(self) -> None:
         self.service.ts = self.ts
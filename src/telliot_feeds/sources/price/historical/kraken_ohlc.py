@@ -1,12 +1,20 @@
 from dataclasses import dataclass
+from dataclasses import field
 from typing import Any
+from typing import Hashable
+from typing import List
 from typing import Optional
 from urllib.parse import urlencode
 
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
+from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.sources.price.historical.kraken import KrakenHistoricalPriceService
+from telliot_feeds.sources.price.historical.ohlc_store import Candle
+from telliot_feeds.sources.price.historical.ohlc_store import ohlc_store
+from telliot_feeds.sources.price.historical.ohlc_store import OHLCStore
 from telliot_feeds.utils.log import get_logger
-from telliot_feeds.utils.stdev_calculator import stdev_calculator
+from telliot_feeds.utils.stdev_calculator import trailing_volatilities
 
 logger = get_logger(__name__)
 
@@ -17,8 +25,25 @@ logger = get_logger(__name__)
 kraken_assets = {"ETH", "XBT"}
 kraken_currencies = {"USD"}
 
+DAY = 86400
+
 
 class KrakenHistoricalPriceServiceOHLC(KrakenHistoricalPriceService):
+    """Volatility of the daily returns of Kraken daily candles
+
+    Candles are kept in an `OHLCStore`, only candles newer than the stored
+    ones are requested.
+    """
+
+    def __init__(self, days: int = 30, store: Optional[OHLCStore] = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.days = days
+        self.store = store or ohlc_store
+
+    def cache_key(self, asset: str, currency: str) -> Hashable:
+        """Include the requested number of days in the price cache key"""
+        return super().cache_key(asset, currency), self.days
+
     def get_request_url(self, asset: str, currency: str, period_start: int) -> str:
         """Assemble Kraken historical trades request url."""
         asset = asset.upper()
@@ -33,26 +58,60 @@ class KrakenHistoricalPriceServiceOHLC(KrakenHistoricalPriceService):
         # Source: https://docs.kraken.com/rest/#operation/getRecentTrades
         return f"/0/public/OHLC?{url_params}"
 
-    def resp_price_parse(self, asset: str, currency: str, resp: dict[Any, Any]) -> Optional[float]:
-        """Gets OHLC prices from Kraken API"""
+    def resp_candles_parse(self, asset: str, currency: str, resp: dict[Any, Any]) -> Optional[List[Candle]]:
+        """Gets OHLC candles from Kraken API"""
+        pair_key = f"X{asset.upper()}Z{currency.upper()}"
         try:
-            # OHLC prices for last thrity days
-            pair_key = f"X{asset.upper()}Z{currency.upper()}"
-            try:
-                data = resp["result"][pair_key]
-                if len(data) < 30:
-                    logger.warning("Not enough data to calculate volatility")
-                    return None
-            except KeyError as e:
-                msg = f"Error parsing Kraken API response: KeyError: {e}"
-                logger.error(msg)
-                return None
-            close_prices = [float(i[4]) for i in data]
-            volatility = stdev_calculator(close_prices)
-        except Exception as e:
-            logger.error(e)
+            data = resp["result"][pair_key]
+            return [(int(c[0]), float(c[1]), float(c[2]), float(c[3]), float(c[4])) for c in data]
+        except KeyError as e:
+            msg = f"Error parsing Kraken API response: KeyError: {e}"
+            logger.error(msg)
+        except (IndexError, TypeError, ValueError) as e:
+            logger.error(f"Error parsing Kraken API candle data: {e}")
+        return None
+
+    def resp_price_parse(self, asset: str, currency: str, resp: dict[Any, Any]) -> Optional[float]:
+        """Gets the volatility of OHLC close prices from Kraken API"""
+        candles = self.resp_candles_parse(asset, currency, resp)
+        if candles is None:
+            return None
+        if len(candles) <= self.days:
+            logger.warning("Not enough data to calculate volatility")
             return None
-        return volatility
+        return trailing_volatilities([c[4] for c in candles], [self.days])[self.days]
+
+    async def get_price(
+        self, asset: str, currency: str, period: Optional[int] = None, ts: Optional[int] = None
+    ) -> OptionalDataPoint[float]:
+        """Implement PriceServiceInterface
+
+        Standard deviation of the last `days` daily returns. Candles are
+        downloaded from `ts` when none are stored yet, `period` is unused."""
+        pair = f"{asset.upper()}{currency.upper()}"
+        candles = self.store.load("kraken", pair, DAY)
+        if candles.is_stale():
+            since = candles.last_timestamp
+            if since is None:
+                since = ts if ts is not None else self.ts
+                # enough history for the window even if ts is recent
+                since = min(since, int(datetime_now_utc().timestamp()) - (self.days + 2) * DAY)
+            d = await self.get_url(self.get_request_url(asset, currency, since))
+            if "error" in d:
+                logger.error(d)
+            elif "response" in d:
+                new_candles = self.resp_candles_parse(asset, currency, d["response"])
+                if new_candles is not None:
+                    candles = self.store.append("kraken", pair, DAY, new_candles)
+
+        closes = candles.last_closes(self.days + 1)
+        if len(closes) <= self.days:
+            logger.warning("Not enough data to calculate volatility")
+            return None, None
+        volatility = trailing_volatilities(closes, [self.days])[self.days]
+        if volatility is None:
+            return None, None
+        return volatility, datetime_now_utc()
 
 
 @dataclass
@@ -60,7 +119,9 @@ class KrakenHistoricalPriceSourceOHLC(PriceSource):
     ts: int = 0
     asset: str = ""
     currency: str = ""
-    service: KrakenHistoricalPriceServiceOHLC = KrakenHistoricalPriceServiceOHLC(ts=ts)
+    days: int = 30
+    service: KrakenHistoricalPriceServiceOHLC = field(default_factory=KrakenHistoricalPriceServiceOHLC)
 
     def __post_init__(self) -> None:
         self.service.ts = self.ts
+        self.service.days = self.days
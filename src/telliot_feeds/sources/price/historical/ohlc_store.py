@@ -0,0 +1,171 @@
+"""Persistent store of OHLC candles
+
+Volatility feeds need weeks of daily candles, which used to be downloaded
+again on every fetch. The store keeps every closed candle on disk, per
+exchange, pair and candle interval, so sources only request candles newer
+than the last stored one. Feeds for other windows of the same pair read the
+same candles without any download.
+
+Each series is a single append-only file of fixed size records under
+`<telliot home>/ohlc/<exchange>_<pair>_<interval>.bin`:
+
+    open time (int64, seconds), open, high, low, close (float64)
+
+A record cut short by an interrupted write is ignored and overwritten by
+the next append.
+"""
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from telliot_core.utils.home import default_homedir
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Open time, open, high, low, close
+Candle = Tuple[int, float, float, float, float]
+
+RECORD = struct.Struct("<qdddd")
+
+
+@dataclass
+class Candles:
+    """Closed candles of one series, sorted by open time"""
+
+    #: Candle length in seconds
+    interval: int
+
+    timestamps: "array[int]" = field(default_factory=lambda: array("q"))
+    opens: "array[float]" = field(default_factory=lambda: array("d"))
+    highs: "array[float]" = field(default_factory=lambda: array("d"))
+    lows: "array[float]" = field(default_factory=lambda: array("d"))
+    closes: "array[float]" = field(default_factory=lambda: array("d"))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """Open time of the most recent stored candle"""
+        return self.timestamps[-1] if self.timestamps else None
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        """Whether a closed candle newer than the stored ones may exist"""
+        if now is None:
+            now = time.time()
+        last = self.last_timestamp
+        return last is None or last + 2 * self.interval <= now
+
+    def last_closes(self, count: int, until: Optional[float] = None) -> List[float]:
+        """Close prices of the latest `count` candles closed by `until`, fewer if not stored"""
+        end = len(self.timestamps) if until is None else bisect_right(self.timestamps, until - self.interval)
+        start = max(end - count, 0)
+        return list(self.closes[start:end])
+
+    def append(self, candle: Candle) -> None:
+        ts, open_, high, low, close = candle
+        self.timestamps.append(ts)
+        self.opens.append(open_)
+        self.highs.append(high)
+        self.lows.append(low)
+        self.closes.append(close)
+
+
+class OHLCStore:
+    """On-disk store of candle series, kept in memory once read
+
+    Args:
+        directory: Where series are stored, defaults to `ohlc` in the telliot home directory
+    """
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        self._directory = directory
+        self._series: Dict[Path, Candles] = {}
+
+    @property
+    def directory(self) -> Path:
+        if self._directory is None:
+            self._directory = Path(default_homedir()) / "ohlc"
+        return self._directory
+
+    @directory.setter
+    def directory(self, directory: Path) -> None:
+        self._directory = Path(directory)
+        self._series.clear()
+
+    def path(self, exchange: str, pair: str, interval: int) -> Path:
+        """File holding one series"""
+        return self.directory / f"{exchange.lower()}_{pair.lower()}_{interval}.bin"
+
+    def load(self, exchange: str, pair: str, interval: int) -> Candles:
+        """Stored candles of a series, empty if there are none or the file is unreadable"""
+        path = self.path(exchange, pair, interval)
+        if path in self._series:
+            return self._series[path]
+
+        candles = Candles(interval=interval)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            data = b""
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable OHLC store at {path}: {e}")
+            data = b""
+        for ts, open_, high, low, close in RECORD.iter_unpack(data[: len(data) - len(data) % RECORD.size]):
+            candles.append((ts, open_, high, low, close))
+        self._series[path] = candles
+        return candles
+
+    def append(
+        self, exchange: str, pair: str, interval: int, new_candles: Iterable[Candle], now: Optional[float] = None
+    ) -> Candles:
+        """Store the closed candles newer than the stored ones
+
+        Candles still open at `now` (default: current time) are skipped, so
+        the store never holds a close price that may still change.
+        """
+        if now is None:
+            now = time.time()
+        candles = self.load(exchange, pair, interval)
+        last = candles.last_timestamp
+        added: List[Candle] = []
+        for candle in sorted(new_candles):
+            ts = candle[0]
+            if (last is not None and ts <= last) or ts + interval > now:
+                continue
+            added.append(candle)
+            last = ts
+        if not added:
+            return candles
+
+        path = self.path(exchange, pair, interval)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "ab") as f:
+                # drop a record cut short by an interrupted append
+                f.truncate(len(candles) * RECORD.size)
+                f.seek(0, os.SEEK_END)
+                f.write(b"".join(RECORD.pack(*candle) for candle in added))
+        except OSError as e:
+            logger.warning(f"Unable to update OHLC store at {path}: {e}")
+
+        for candle in added:
+            candles.append(candle)
+        return candles
+
+
+#: Process-wide store used by historical OHLC sources
+ohlc_store = OHLCStore()
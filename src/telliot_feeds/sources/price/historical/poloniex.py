@@ -1,15 +1,18 @@
 from dataclasses import dataclass
+from dataclasses import field
 from datetime import datetime
+from datetime import timezone
 from typing import Any
+from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Tuple
 from urllib.parse import urlencode
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
-from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.sources.price.historical.trade_tape import HistoricalTradeService
+from telliot_feeds.sources.price.historical.trade_tape import Trade
 from telliot_feeds.utils.log import get_logger
 
 
@@ -20,48 +23,31 @@ logger = get_logger(__name__)
 # Poloniex swaps the usual order of asset/currency to currency/asset
 poloniex_pairs = {"DAI_ETH", "TUSD_ETH", "DAI_BTC", "TUSD_BTC"}
 
+#: Most trades returned per returnTradeHistory request
+TRADES_PER_PAGE = 1000
+
+#: Most returnTradeHistory requests for one time range
+MAX_PAGES = 20
+
 
-class PoloniexHistoricalPriceService:
+class PoloniexHistoricalPriceService(HistoricalTradeService):
     """Poloniex Historical Price Service"""
 
+    exchange = "poloniex"
+
     def __init__(
         self,
         ts: int = 0,
         timeout: float = 1,
         name: str = "Poloniex Historical Price Service",
         url: str = "https://poloniex.com/",
+        period: int = 20000,
     ):
-        self.name = name
-        self.url = url
-        self.ts = ts
-        self.timeout = timeout
-
-    def get_url(self, url: str = "") -> dict[str, Any]:
-        """Helper function to get URL JSON response while handling exceptions
-
-        Args:
-            url: URL to fetch
-
-        Returns:
-            A dictionary with the following (optional) keys:
-                json (dict or list): Result, if no error occurred
-                error (str): A description of the error, if one occurred
-                exception (Exception): The exception, if one occurred
-        """
-
-        request_url = self.url + url
-
-        with requests.Session() as s:
-            try:
-                r = s.get(request_url, timeout=self.timeout)
-                json_data = r.json()
-                return {"response": json_data}
-
-            except requests.exceptions.ConnectTimeout as e:
-                return {"error": "Timeout Error", "exception": e}
+        super().__init__(name=name, url=url, timeout=timeout, ts=ts, period=period)
 
-            except Exception as e:
-                return {"error": str(type(e)), "exception": e}
+    def pair(self, asset: str, currency: str) -> str:
+        """Poloniex wants the reverse of standard order: asset/currency"""
+        return f"{currency}_{asset}".upper()
 
     async def get_trades(
         self,
@@ -93,7 +79,7 @@ class PoloniexHistoricalPriceService:
         # Source: https://docs.poloniex.com/#returntradehistory-public
         request_url = f"public?command=returnTradeHistory&{url_params}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
         trades = []
 
         if "error" in str(d):
@@ -112,33 +98,31 @@ class PoloniexHistoricalPriceService:
 
         return trades, datetime_now_utc()
 
-    async def get_price(
-        self,
-        asset: str,
-        currency: str,
-        period: int = 20000,
-        ts: Optional[int] = None,
-    ) -> OptionalDataPoint[float]:
-        """Implement PriceServiceInterface
+    async def fetch_trades(self, asset: str, currency: str, start: int, end: int) -> Optional[List[Trade]]:
+        """Fetch all trades between two unix times
 
-        This implementation gets the historical price from
-        the Poloniex API using a timestamp."""
-        trades, dt = await self.get_trades(asset=asset, currency=currency, ts=ts, period=period)
-
-        if trades is not None:
+        Poloniex returns the newest 1000 trades of a range, older pages are
+        requested by moving the end of the range back. None if the range takes
+        more than MAX_PAGES pages, as its start would be missing.
+        """
+        trades: Dict[Any, Trade] = {}
+        for _ in range(MAX_PAGES):
+            page, _ = await self.get_trades(asset=asset, currency=currency, ts=end, period=end - start)
+            if page is None:
+                return None
             try:
-                if len(trades) == 0:
-                    logger.warning(f"No data from Poloniex historical price source for given timestamp: {ts}.")
-                    return None, None
-
-                # Price from last trade in period
-                return float(trades[-1]["rate"]), dt
-
-            except KeyError as e:
-                msg = f"Error parsing Poloniex API response: KeyError: {e}"
+                for trade in page:
+                    date = datetime.strptime(trade["date"], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+                    trades[trade.get("globalTradeID", trade["date"])] = (date.timestamp(), float(trade["rate"]))
+            except (KeyError, TypeError, ValueError) as e:
+                msg = f"Error parsing Poloniex API response: {e}"
                 logger.critical(msg)
-
-        return None, None
+                return None
+            if len(page) < TRADES_PER_PAGE:
+                return list(trades.values())
+            end = int(min(t[0] for t in trades.values()))
+        logger.warning(f"Poloniex trades of {asset}/{currency} since {start} exceed {MAX_PAGES} pages")
+        return None
 
 
 @dataclass
@@ -146,7 +130,7 @@ class PoloniexHistoricalPriceSource(PriceSource):
     ts: int = 0
     asset: str = ""
     currency: str = ""
-    service: PoloniexHistoricalPriceService = PoloniexHistoricalPriceService(ts=ts)  # type: ignore
+    service: PoloniexHistoricalPriceService = field(default_factory=PoloniexHistoricalPriceService)
 
     def __post_init__(self) -> None:
         self.service.ts = self.ts
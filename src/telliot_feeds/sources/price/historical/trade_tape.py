@@ -0,0 +1,196 @@
+"""Cached trade tapes for historical price lookups
+
+Historical price services answer "what was the last price at or before
+time T". Instead of requesting trades around T for every lookup, services
+deriving from `HistoricalTradeService` fetch the whole search window once
+(`fetch_trades`, which pages through the exchange API as needed) and add it
+to a `TradeTape`: the time-sorted trades of one pair on one exchange, along
+with the time ranges they cover. Lookups are bisections of the tape, and a
+lookup near an earlier one (e.g. DIVA pools expiring minutes apart) only
+fetches the part of its window not covered yet.
+"""
+import asyncio
+import time
+from abc import abstractmethod
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
+from telliot_feeds.dtypes.datapoint import OptionalDataPoint
+from telliot_feeds.pricing.price_service import WebPriceService
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Unix time and price of a trade
+Trade = Tuple[float, float]
+
+#: Seconds after which an exchange is assumed to have published all trades
+SETTLE_TIME = 60
+
+
+@dataclass
+class TradeTape:
+    """Time-sorted trades of one pair and the time ranges fetched completely"""
+
+    times: "array[float]" = field(default_factory=lambda: array("d"))
+    prices: "array[float]" = field(default_factory=lambda: array("d"))
+
+    #: Sorted, non-overlapping (start, end) ranges whose trades are all on the tape
+    covered: List[Tuple[float, float]] = field(default_factory=list)
+
+    #: Serialises fetches for the tape, created on first use
+    lock: Optional[asyncio.Lock] = None
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def missing(self, start: float, end: float) -> List[Tuple[float, float]]:
+        """Parts of a time range not covered yet"""
+        gaps = []
+        for covered_start, covered_end in self.covered:
+            if covered_end < start:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > start:
+                gaps.append((start, covered_start))
+            start = max(start, covered_end)
+        if start < end:
+            gaps.append((start, end))
+        return gaps
+
+    def add(self, start: float, end: float, trades: List[Trade]) -> None:
+        """Replace the trades of a time range with all trades fetched for it"""
+        trades = sorted(t for t in trades if start <= t[0] <= end)
+        lo = bisect_left(self.times, start)
+        hi = bisect_right(self.times, end)
+        self.times[lo:hi] = array("d", (t[0] for t in trades))
+        self.prices[lo:hi] = array("d", (t[1] for t in trades))
+
+        ranges = sorted(self.covered + [(start, end)])
+        self.covered = [ranges[0]]
+        for range_start, range_end in ranges[1:]:
+            last_start, last_end = self.covered[-1]
+            if range_start <= last_end:
+                self.covered[-1] = (last_start, max(last_end, range_end))
+            else:
+                self.covered.append((range_start, range_end))
+
+    def last_trade(self, ts: float, since: Optional[float] = None) -> Optional[Trade]:
+        """Last trade at or before `ts`, None if there is none since `since`"""
+        i = bisect_right(self.times, ts)
+        if i == 0 or (since is not None and self.times[i - 1] < since):
+            return None
+        return self.times[i - 1], self.prices[i - 1]
+
+
+class TradeTapes:
+    """Trade tapes by exchange and pair, shared by all services of the process"""
+
+    def __init__(self) -> None:
+        self._tapes: Dict[Tuple[str, str], TradeTape] = {}
+
+    def get(self, exchange: str, pair: str) -> TradeTape:
+        key = exchange.lower(), pair.lower()
+        if key not in self._tapes:
+            self._tapes[key] = TradeTape()
+        return self._tapes[key]
+
+    def clear(self) -> None:
+        self._tapes.clear()
+
+
+#: Process-wide trade tapes used by historical price services
+trade_tapes = TradeTapes()
+
+
+class HistoricalTradeService(WebPriceService):
+    """Historical price service answering from a cached trade tape
+
+    Subclasses implement `fetch_trades` for their exchange.
+
+    Args:
+        ts: Default unix time prices are looked up at
+        period: Seconds before the lookup time searched for a trade
+        tapes: Trade tapes to use, the process-wide ones by default
+    """
+
+    exchange: str = ""
+
+    def __init__(
+        self, name: str, url: str, timeout: float, ts: int = 0, period: int = 900, tapes: Optional[TradeTapes] = None
+    ) -> None:
+        super().__init__(name=name, url=url, timeout=timeout)
+        self.ts = ts
+        self.period = period
+        self.tapes = tapes or trade_tapes
+
+    def cache_key(self, asset: str, currency: str) -> Hashable:
+        """Include the requested timestamp in the price cache key"""
+        return super().cache_key(asset, currency), self.ts
+
+    def pair(self, asset: str, currency: str) -> str:
+        """Name of a pair on the exchange, also the key of its trade tape"""
+        return f"{asset}{currency}".upper()
+
+    @abstractmethod
+    async def fetch_trades(self, asset: str, currency: str, start: int, end: int) -> Optional[List[Trade]]:
+        """All trades of a pair between two unix times, None if they couldn't be fetched"""
+
+    async def get_trade(
+        self, asset: str, currency: str, ts: Optional[int] = None, period: Optional[int] = None
+    ) -> Optional[Trade]:
+        """Last trade at or before `ts` and at most `period` seconds earlier"""
+        if ts is None:
+            ts = self.ts
+        if period is None:
+            period = self.period
+        start = ts - period
+        # the most recent trades may not all be published yet, so they are fetched but not cached
+        settled = min(ts, int(time.time()) - SETTLE_TIME)
+
+        tape = self.tapes.get(self.exchange, self.pair(asset, currency))
+        if tape.lock is None:
+            tape.lock = asyncio.Lock()
+        async with tape.lock:
+            if start < settled:
+                for gap_start, gap_end in tape.missing(start, settled):
+                    trades = await self.fetch_trades(asset, currency, int(gap_start), int(gap_end))
+                    if trades is None:
+                        return None
+                    tape.add(gap_start, gap_end, trades)
+
+        if settled < ts:
+            recent_start = max(start, settled)
+            recent = await self.fetch_trades(asset, currency, recent_start, ts)
+            if recent is None:
+                return None
+            trade = max((t for t in recent if recent_start <= t[0] <= ts), default=None)
+            if trade is not None:
+                return trade
+        return tape.last_trade(ts, since=start)
+
+    async def get_price(
+        self, asset: str, currency: str, period: Optional[int] = None, ts: Optional[int] = None
+    ) -> OptionalDataPoint[float]:
+        """Implement PriceServiceInterface
+
+        Price of the last trade at or before `ts` (default: the service's ts)
+        within the `period` seconds before it."""
+        if ts is None:
+            ts = self.ts
+        trade = await self.get_trade(asset, currency, ts=ts, period=period)
+        if trade is None:
+            logger.warning(f"No trades found on {self.name} for {asset}/{currency} before timestamp: {ts}")
+            return None, None
+        return trade[1], datetime_now_utc()
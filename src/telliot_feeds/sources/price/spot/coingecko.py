@@ -1,18 +1,19 @@
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Tuple
 from urllib.parse import urlencode
 
-from requests import Session
-from requests.exceptions import ConnectionError
-from requests.exceptions import Timeout
-from requests.exceptions import TooManyRedirects
 from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.pricing.request_batcher import RequestBatcher
 from telliot_feeds.utils.log import get_logger
 
 
@@ -98,15 +99,53 @@ API_KEY = TelliotConfig().api_keys.find(name="coingecko")[0].key
 
 
 class CoinGeckoSpotPriceService(WebPriceService):
-    """CoinGecko Price Service"""
+    """CoinGecko Price Service
 
-    def __init__(self, **kwargs: Any) -> None:
+    Lookups from all CoinGecko sources are coalesced: every request issued
+    within `batch_window` seconds is sent as a single `/simple/price` call
+    with comma-separated ids and currencies.
+    """
+
+    #: Batchers shared by the instances of the service with the same settings
+    _batchers: Dict[Hashable, RequestBatcher[Tuple[str, str], Dict[str, Any]]] = {}
+
+    def __init__(self, batch: bool = True, batch_window: float = 0.05, **kwargs: Any) -> None:
         kwargs["name"] = "CoinGecko Price Service"
         if API_KEY == "":
             kwargs["url"] = "https://api.coingecko.com"
         else:
             kwargs["url"] = "https://pro-api.coingecko.com"
         super().__init__(**kwargs)
+        self.batch = batch
+        self.batch_window = batch_window
+
+    @property
+    def batcher(self) -> RequestBatcher[Tuple[str, str], Dict[str, Any]]:
+        """Request batcher shared across every CoinGecko source with this service's settings"""
+        key = (type(self), self.url, self.timeout, self._http_client, self.batch_window)
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            batcher = self._batchers[key] = RequestBatcher(self.get_simple_prices, window=self.batch_window)
+        return batcher
+
+    async def get_simple_prices(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Fetch prices for several (coin id, currency) pairs with one request
+
+        Returns:
+            The `get_url` result of the combined request for every key
+        """
+        ids = sorted({coin_id for coin_id, _ in keys})
+        currencies = sorted({currency for _, currency in keys})
+
+        url_params = urlencode({"ids": ",".join(ids), "vs_currencies": ",".join(currencies)})
+        request_url = "/api/v3/simple/price?{}".format(url_params)
+
+        headers = {"Accepts": "application/json"}
+        if API_KEY != "":
+            headers["x-cg-pro-api-key"] = API_KEY
+
+        d = await self.get_url(request_url, headers=headers)
+        return {key: d for key in keys}
 
     async def get_price(self, asset: str, currency: str) -> OptionalDataPoint[float]:
         """Implement PriceServiceInterface
@@ -124,30 +163,26 @@ class CoinGeckoSpotPriceService(WebPriceService):
         if not coin_id:
             raise Exception("Asset not supported: {}".format(asset))
 
-        url_params = urlencode({"ids": coin_id, "vs_currencies": currency})
-        request_url = self.url + "/api/v3/simple/price?{}".format(url_params)
-
-        session = Session()
-        if API_KEY != "":
-            headers = {
-                "Accepts": "application/json",
-                "x-cg-pro-api-key": API_KEY,
-            }
-            session.headers.update(headers)
-
-        try:
-            response = session.get(request_url)
+        if self.batch:
+            d = await self.batcher.get((coin_id, currency))
+        else:
+            d = (await self.get_simple_prices([(coin_id, currency)]))[(coin_id, currency)]
 
-            if response.status_code >= 400:
-                logger.warning(f"CoinGecko Error Status {response.status_code}: {response}")
-                return None, None
+        if d is None:
+            logger.warning("No response from CoinGecko batch request")
+            return None, None
 
-            res = response.json()
+        status = d.get("status")
+        if status is not None and status >= 400:
+            logger.warning(f"CoinGecko Error Status {status}: {d.get('response')}")
+            return None, None
 
-        except (ConnectionError, Timeout, TooManyRedirects) as e:
-            logger.warning(e)
+        if "error" in d:
+            logger.warning(d["exception"])
             return None, None
 
+        res = d["response"]
+
         try:
             price = float(res[coin_id][currency])
             return price, datetime_now_utc()
@@ -190,7 +225,7 @@ class CoinGeckoBRC20SpotPriceService(WebPriceService):
         url_params = urlencode({"ids": coin_id, "vs_currencies": currency})
         request_url = "/api/v3/simple/price?{}".format(url_params)
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
 
         if "error" in d:
             if "api.coingecko.com used Cloudflare to restrict access" in str(d["exception"]):
@@ -1,18 +1,18 @@
-import json
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Tuple
 
-from requests import Session
-from requests.exceptions import ConnectionError
-from requests.exceptions import Timeout
-from requests.exceptions import TooManyRedirects
 from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
 from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.pricing.request_batcher import RequestBatcher
 from telliot_feeds.utils.log import get_logger
 
 logger = get_logger(__name__)
@@ -24,12 +24,48 @@ API_KEY = TelliotConfig().api_keys.find(name="coinmarketcap")[0].key
 
 
 class CoinMarketCapSpotPriceService(WebPriceService):
-    """CoinMarketCap Price Service"""
+    """CoinMarketCap Price Service
 
-    def __init__(self, **kwargs: Any) -> None:
+    Concurrent lookups are coalesced into one `quotes/latest` request
+    with comma-separated symbols.
+    """
+
+    #: Batchers shared by the instances of the service with the same settings
+    _batchers: Dict[Hashable, RequestBatcher[Tuple[str, str], Dict[str, Any]]] = {}
+
+    def __init__(self, batch: bool = True, batch_window: float = 0.05, **kwargs: Any) -> None:
         kwargs["name"] = "CoinMarketCap Price Service"
         kwargs["url"] = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
         super().__init__(**kwargs)
+        self.batch = batch
+        self.batch_window = batch_window
+
+    @property
+    def batcher(self) -> RequestBatcher[Tuple[str, str], Dict[str, Any]]:
+        """Request batcher shared across every CoinMarketCap source with this service's settings"""
+        key = (type(self), self.url, self.timeout, self._http_client, self.batch_window)
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            batcher = self._batchers[key] = RequestBatcher(self.get_quotes, window=self.batch_window)
+        return batcher
+
+    async def get_quotes(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Fetch quotes for several (symbol, currency) pairs with one request
+
+        Returns:
+            The `get_url` result of the combined request for every key
+        """
+        parameters = {
+            "symbol": ",".join(sorted({asset for asset, _ in keys})),
+            "convert": ",".join(sorted({currency for _, currency in keys})),
+        }
+        headers = {
+            "Accepts": "application/json",
+            "X-CMC_PRO_API_KEY": API_KEY,
+        }
+
+        d = await self.get_url(params=parameters, headers=headers)
+        return {key: d for key in keys}
 
     async def get_price(self, asset: str, currency: str) -> OptionalDataPoint[float]:
 
@@ -46,30 +82,26 @@ class CoinMarketCapSpotPriceService(WebPriceService):
         if currency not in coinmarketcap_currencies:
             raise Exception(f"Currency not supported: {currency}")
 
-        request_url = "https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest"
+        if self.batch:
+            d = await self.batcher.get((asset, currency))
+        else:
+            d = (await self.get_quotes([(asset, currency)]))[(asset, currency)]
 
-        parameters = {"symbol": asset}
-        headers = {
-            "Accepts": "application/json",
-            "X-CMC_PRO_API_KEY": API_KEY,
-        }
-
-        session = Session()
-        session.headers.update(headers)
-
-        try:
-            response = session.get(request_url, params=parameters)
-
-            if response.status_code >= 400:
-                logger.warning(f"CoinMarketCap Error Status {response.status_code}")
-                return None, None
+        if d is None:
+            logger.warning("No response from CoinMarketCap batch request")
+            return None, None
 
-            data = json.loads(response.text)
+        status = d.get("status")
+        if status is not None and status >= 400:
+            logger.warning(f"CoinMarketCap Error Status {status}")
+            return None, None
 
-        except (ConnectionError, Timeout, TooManyRedirects) as e:
-            logger.warning(e)
+        if "error" in d:
+            logger.warning(d["exception"])
             return None, None
 
+        data = d["response"]
+
         try:
             price = data["data"][asset]["quote"][currency]["price"]
             return price, datetime_now_utc()
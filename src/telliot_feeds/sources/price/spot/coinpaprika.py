@@ -33,7 +33,7 @@ class CoinpaprikaSpotPriceService(WebPriceService):
 
         request_url = f"/v1/tickers/{asset}?&{url_params}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
 
         if "error" in d:
             logger.error(d)
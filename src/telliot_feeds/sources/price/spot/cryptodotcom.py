@@ -31,7 +31,7 @@ class CryptodotcomSpotPriceService(WebPriceService):
         market_symbol = f"{format(asset.upper())}_{format(currency.upper())}"
         request_url = f"/v2/public/get-ticker?instrument_name={market_symbol}"
 
-        d = self.get_url(request_url)
+        d = await self.get_url(request_url)
 
         if "error" in d:
             logger.error(d)
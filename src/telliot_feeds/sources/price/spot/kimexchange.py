@@ -2,7 +2,6 @@ from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
 
-import requests
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
@@ -49,19 +48,14 @@ class kimexchangePriceService(WebPriceService):
 
         request_url = self.url + "/project_clmqdcfcs3f6d2ptj3yp05ndz/subgraphs/Algebra/0.0.1/gn"
 
-        with requests.Session() as s:
-            try:
-                r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
-                res = r.json()
-                data = {"response": res}
-
-            except requests.exceptions.ConnectTimeout:
-                logger.warning("Timeout Error, No prices retrieved from Kim exchange")
-                return None, None
+        data = await self.http_client.post(request_url, json_data=json_data, headers=headers, timeout=self.timeout)
+        if data.get("error") == "Timeout Error":
+            logger.warning("Timeout Error, No prices retrieved from Kim exchange")
+            return None, None
 
-            except Exception:
-                logger.warning("No prices retrieved from kim exchange")
-                return None, None
+        elif "exception" in data:
+            logger.warning("No prices retrieved from kim exchange")
+            return None, None
 
         if "error" in data:
             logger.error(data)
@@ -2,8 +2,6 @@ from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
 
-import requests
-from requests import Session
 from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
@@ -66,25 +64,19 @@ class nuriPriceService(WebPriceService):
         request_url = f"{self.url}/subgraphs/id/Eqr2CueSusTohoTsXCiQgQbaApjuK2ikFvpqkVTPo1y5"
         logger.info(f"{request_url}")
 
-        session = Session()
         if API_KEY != "":
             headers = {"Accepts": "application/json", "Authorization": f"Bearer {API_KEY}"}
-            session.headers.update(headers)
 
-        with requests.Session() as s:
-            try:
-                r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
-                res = r.json()
-                data = {"response": res}
-                logger.info(f"{data}")
+        data = await self.http_client.post(request_url, json_data=json_data, headers=headers, timeout=self.timeout)
+        if data.get("error") == "Timeout Error":
+            logger.warning("Timeout Error, No pool prices retrieved from Nuri")
+            return None, None
 
-            except requests.exceptions.ConnectTimeout:
-                logger.warning("Timeout Error, No pool prices retrieved from Nuri")
-                return None, None
+        elif "exception" in data:
+            logger.warning("No pool prices retrieved from Nuri")
+            return None, None
 
-            except Exception:
-                logger.warning("No pool prices retrieved from Nuri")
-                return None, None
+        logger.info(f"{data}")
 
         if "error" in data:
             logger.error(data)
@@ -7,8 +7,6 @@ from typing import Any
 
 from decimal import Decimal
 
-import requests
-
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_service import WebPriceService
@@ -85,19 +83,14 @@ class PulseXSubgraphService(WebPriceService):
 
         request_url = self.url + "/subgraphs/name/pulsechain/pulsex"
 
-        with requests.Session() as s:
-            try:
-                r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
-                res = r.json()
-                data = {"response": res}
-
-            except requests.exceptions.ConnectTimeout:
-                logger.warning("Timeout Error, No prices retrieved from PulseX Subgraph")
-                return None, None
+        data = await self.http_client.post(request_url, json_data=json_data, headers=headers, timeout=self.timeout)
+        if data.get("error") == "Timeout Error":
+            logger.warning("Timeout Error, No prices retrieved from PulseX Subgraph")
+            return None, None
 
-            except Exception as e:
-                logger.warning(f"No prices retrieved from PulseX Subgraph with Exception {e}")
-                return None, None
+        elif "exception" in data:
+            logger.warning(f"No prices retrieved from PulseX Subgraph with Exception {data['exception']}")
+            return None, None
 
         if "error" in data:
             logger.error(data)
@@ -2,8 +2,6 @@ from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
 
-import requests
-from requests import Session
 from telliot_core.apps.telliot_config import TelliotConfig
 
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
@@ -63,24 +61,17 @@ class UniswapV3PoolPriceService(WebPriceService):
 
         request_url = f"{self.url}/api/subgraphs/id/5zvR82QoaXYFyDEKLZ9t6v9adgnptxYpKpSbxtgVENFV"
 
-        session = Session()
         if API_KEY != "":
             headers = {"Accepts": "application/json", "Authorization": f"Bearer {API_KEY}"}
-            session.headers.update(headers)
 
-        with requests.Session() as s:
-            try:
-                r = s.post(request_url, headers=headers, json=json_data, timeout=self.timeout)
-                res = r.json()
-                data = {"response": res}
-
-            except requests.exceptions.ConnectTimeout:
-                logger.warning("Timeout Error, No pool prices retrieved from Uniswap")
-                return None, None
+        data = await self.http_client.post(request_url, json_data=json_data, headers=headers, timeout=self.timeout)
+        if data.get("error") == "Timeout Error":
+            logger.warning("Timeout Error, No pool prices retrieved from Uniswap")
+            return None, None
 
-            except Exception:
-                logger.warning("No pool prices retrieved from Uniswap")
-                return None, None
+        elif "exception" in data:
+            logger.warning("No pool prices retrieved from Uniswap")
+            return None, None
 
         if "error" in data:
             logger.error(data)
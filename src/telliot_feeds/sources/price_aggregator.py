@@ -1,20 +1,113 @@
 import asyncio
 import statistics
+from collections import deque
 from dataclasses import dataclass
 from dataclasses import field
+from datetime import datetime
+from typing import Any
 from typing import Callable
+from typing import Deque
+from typing import Dict
 from typing import List
 from typing import Literal
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import TypeVar
 
 from telliot_feeds.datasource import DataSource
 from telliot_feeds.dtypes.datapoint import datetime_now_utc
 from telliot_feeds.dtypes.datapoint import OptionalDataPoint
 from telliot_feeds.pricing.price_source import PriceSource
 from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.metrics import metrics
 
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+#: Number of latency samples kept per source for hedging
+LATENCY_HISTORY = 50
+
+#: Minimum number of samples before a source is hedged
+MIN_HEDGE_SAMPLES = 5
+
+
+@dataclass
+class AggregationStats:
+    """How a PriceAggregator arrived at its latest value"""
+
+    #: Number of valid prices the value was computed from
+    quorum: int
+
+    #: Number of sources queried
+    sources: int
+
+    #: Seconds from the first request to the aggregated value
+    latency: float
+
+    #: Sources still pending when the quorum or deadline was reached
+    dropped: List[str] = field(default_factory=list)
+
+    #: Sources that answered without a valid price or raised
+    failed: List[str] = field(default_factory=list)
+
+    #: Sources that received a hedged duplicate request
+    hedged: List[str] = field(default_factory=list)
+
+
+@dataclass
+class AggregationRound:
+    """Sources dropped and hedged in one aggregation
+
+    Kept per call rather than on the aggregator, since feed sources are shared
+    and their fetches may overlap.
+    """
+
+    #: Indexes of sources still pending when the quorum or deadline was reached
+    dropped: Set[int] = field(default_factory=set)
+
+    #: Indexes of sources that received a hedged duplicate request
+    hedged: Set[int] = field(default_factory=set)
+
+
+class AggregatedDataPoint(Tuple[Optional[float], Optional[datetime]]):
+    """A time-stamped value tuple that also carries its `AggregationStats`"""
+
+    stats: AggregationStats
+
+    def __new__(
+        cls, value: Optional[float], timestamp: Optional[datetime], stats: AggregationStats
+    ) -> "AggregatedDataPoint":
+        datapoint = super().__new__(cls, (value, timestamp))
+        datapoint.stats = stats
+        return datapoint
+
+
+def source_name(source: DataSource[Any]) -> str:
+    """Short human-readable identifier of a source"""
+    service = getattr(source, "service", None)
+    name = getattr(service, "name", None) or type(source).__name__
+    asset = getattr(source, "asset", "")
+    currency = getattr(source, "currency", "")
+    return f"{name} {asset}/{currency}".strip("/ ")
+
+
+async def fetch_traced(source: DataSource[T], refresh: bool = False) -> OptionalDataPoint[T]:
+    """Fetch a source, recording its latency and whether it returned a value
+
+    With `refresh`, a price source requests a new price even if the same
+    lookup is cached or already in flight, as a hedged request must.
+    """
+    with metrics.source(source_name(source)) as span:
+        if refresh and isinstance(source, PriceSource):
+            datapoint: OptionalDataPoint[Any] = await source.fetch_new_datapoint(refresh=True)
+        else:
+            datapoint = await source.fetch_new_datapoint()
+        span.failed = datapoint[0] is None
+    return datapoint
+
 
 @dataclass
 class PriceAggregator(DataSource[float]):
@@ -34,6 +127,22 @@ class PriceAggregator(DataSource[float]):
     #: Data feed sources
     sources: List[PriceSource] = field(default_factory=list)
 
+    #: Seconds to wait for sources before aggregating whatever has answered
+    deadline: Optional[float] = None
+
+    #: Aggregate as soon as this many sources returned a valid price
+    quorum: Optional[int] = None
+
+    #: Send a duplicate request to a source that is slower than this
+    #: percentile (0-100) of its own past latencies
+    hedge_percentile: Optional[float] = None
+
+    #: Statistics of the most recent aggregation
+    last_stats: Optional[AggregationStats] = field(default=None, init=False, repr=False)
+
+    #: Recent latencies in seconds, per source index
+    _latencies: Dict[int, Deque[float]] = field(default_factory=dict, init=False, repr=False)
+
     def __post_init__(self) -> None:
         if self.algorithm == "median":
             self._algorithm = statistics.median
@@ -47,20 +156,119 @@ class PriceAggregator(DataSource[float]):
         symbol = asset + "/" + currency
         return f"PriceAggregator {symbol} {self.algorithm}"
 
-    async def update_sources(self) -> List[OptionalDataPoint[float]]:
+    def hedge_delay(self, index: int) -> Optional[float]:
+        """Seconds to wait before hedging the source at index, if hedging applies"""
+        if self.hedge_percentile is None:
+            return None
+        samples = self._latencies.get(index)
+        if not samples or len(samples) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        rank = min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile / 100))
+        return ordered[rank]
+
+    async def fetch_source(self, index: int, state: AggregationRound) -> OptionalDataPoint[float]:
+        """Fetch one source, hedging it with a duplicate request if it is slow
+
+        The first request returning a price wins. An empty answer or an error
+        only counts once the other request failed too.
+        """
+        source = self.sources[index]
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        tasks = [asyncio.ensure_future(fetch_traced(source))]
+        datapoint: Optional[OptionalDataPoint[float]] = None
+        error: Optional[Exception] = None
+        try:
+            delay = self.hedge_delay(index)
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+                if not tasks[0].done():
+                    state.hedged.add(index)
+                    logger.info(f"Hedging slow source {source_name(source)} after {delay:.2f}s")
+                    tasks.append(asyncio.ensure_future(fetch_traced(source, refresh=True)))
+
+            pending = set(tasks)
+            while pending and (datapoint is None or datapoint[0] is None):
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        error = e
+                        continue
+                    if datapoint is None or result[0] is not None:
+                        datapoint = result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if datapoint is None:
+            assert error is not None
+            raise error
+        self._latencies.setdefault(index, deque(maxlen=LATENCY_HISTORY)).append(loop.time() - start)
+        return datapoint
+
+    async def update_sources(self, state: Optional[AggregationRound] = None) -> List[OptionalDataPoint[float]]:
         """Update data feed sources
 
+        Without a deadline, quorum or hedging every source is awaited.
+        Otherwise sources still pending once the quorum is reached or the
+        deadline expires are cancelled and reported as (None, None).
+
+        Args:
+            state: Records the sources dropped and hedged in this update
+
         Returns:
             Dictionary of updated source values, mapping data source UID
             to the time-stamped answer for that data source
         """
+        if state is None:
+            state = AggregationRound()
 
-        async def gather_inputs() -> List[OptionalDataPoint[float]]:
-            sources = self.sources
-            datapoints = await asyncio.gather(*[source.fetch_new_datapoint() for source in sources])
-            return datapoints
+        if self.deadline is None and self.quorum is None and self.hedge_percentile is None:
 
-        inputs = await gather_inputs()
+            async def gather_inputs() -> List[OptionalDataPoint[float]]:
+                sources = self.sources
+                datapoints = await asyncio.gather(*[fetch_traced(source) for source in sources])
+                return datapoints
+
+            return await gather_inputs()
+
+        loop = asyncio.get_running_loop()
+        expires = None if self.deadline is None else loop.time() + self.deadline
+
+        inputs: List[OptionalDataPoint[float]] = [(None, None)] * len(self.sources)
+        tasks = {asyncio.ensure_future(self.fetch_source(i, state)): i for i in range(len(self.sources))}
+        pending = set(tasks)
+        valid = 0
+
+        try:
+            while pending:
+                timeout = None if expires is None else expires - loop.time()
+                if timeout is not None and timeout <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = tasks[task]
+                    try:
+                        inputs[index] = task.result()
+                    except Exception as e:
+                        logger.warning(f"Source {source_name(self.sources[index])} failed: {e}")
+                        continue
+                    if inputs[index][0] is not None:
+                        valid += 1
+                if self.quorum is not None and valid >= self.quorum:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        state.dropped = {tasks[task] for task in pending}
+        if state.dropped:
+            dropped = ", ".join(source_name(self.sources[i]) for i in sorted(state.dropped))
+            logger.info(f"{self}: aggregating without {len(state.dropped)} pending source(s): {dropped}")
 
         return inputs
 
@@ -72,26 +280,41 @@ class PriceAggregator(DataSource[float]):
                     to the database
 
         Returns:
-            Current time-stamped value
+            Current time-stamped value, carrying the `AggregationStats` of this round
         """
-        datapoints = await self.update_sources()
+        start = asyncio.get_running_loop().time()
+        state = AggregationRound()
+        datapoints = await self.update_sources(state)
 
         prices = []
-        for datapoint in datapoints:
+        failed = []
+        for i, datapoint in enumerate(datapoints):
             v, _ = datapoint  # Ignore input timestamps
             # Check for valid answers
             if v is not None and isinstance(v, float):
                 prices.append(v)
+            elif i not in state.dropped:
+                failed.append(source_name(self.sources[i]))
+
+        self.last_stats = AggregationStats(
+            quorum=len(prices),
+            sources=len(self.sources),
+            latency=asyncio.get_running_loop().time() - start,
+            dropped=[source_name(self.sources[i]) for i in sorted(state.dropped)],
+            failed=failed,
+            hedged=[source_name(self.sources[i]) for i in sorted(state.hedged)],
+        )
 
         if not prices:
             logger.warning(f"No prices retrieved for {self}.")
-            return None, None
+            return AggregatedDataPoint(None, None, self.last_stats)
 
         # Run the algorithm on all valid prices
         logger.info(f"Running {self.algorithm} on {prices}")
         result = self._algorithm(prices)
-        datapoint = (result, datetime_now_utc())
-        self.store_datapoint(datapoint)
+        timestamp = datetime_now_utc()
+        self.store_datapoint((result, timestamp))
+        datapoint = AggregatedDataPoint(result, timestamp, self.last_stats)
         logger.info("Feed Price: {} reported at time {}".format(datapoint[0], datapoint[1]))
         logger.info("Number of sources used in aggregate: {}".format(len(prices)))
 
@@ -0,0 +1,344 @@
+"""Shared block-by-timestamp lookup
+
+Several sources need the last block mined at or before a timestamp. Instead
+of each running its own binary search (about 25 sequential `eth_getBlock`
+calls on mainnet), they share one `BlockTimeIndex` per chain.
+
+The index interpolates between the closest known (block number, timestamp)
+anchors, fetches a few candidate blocks around the estimate concurrently,
+and narrows the bracket with every answer. Settled blocks seen along the way
+are kept as anchors in `<telliot home>/block_index/<chain id>.json`, so
+later lookups (and later runs) start from a tight bracket.
+"""
+import asyncio
+import json
+import math
+import os
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from telliot_core.utils.home import default_homedir
+from web3 import Web3
+from web3.exceptions import ExtraDataLengthError
+from web3.middleware import geth_poa_middleware
+from web3.types import BlockData
+from web3.types import BlockIdentifier
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Blocks behind the head that are considered final and may be used as anchors
+FINALITY_BLOCKS = 128
+
+#: Maximum number of anchors kept per chain
+MAX_ANCHORS = 4096
+
+#: Blocks behind the head used to measure the average block time of a new chain
+BLOCK_TIME_SAMPLE = 10_000
+
+#: Search rounds using interpolation before falling back to also probing the midpoint
+INTERPOLATION_ROUNDS = 3
+
+
+def get_block(w3: Web3, block_identifier: BlockIdentifier, full_transaction: bool = False) -> Optional[BlockData]:
+    """Get block info with error handling for POA chains"""
+    try:
+        block = w3.eth.get_block(block_identifier, full_transaction)
+    except ExtraDataLengthError as e:
+        logger.info(f"POA chain detected. Injecting POA middleware in response to exception: {e}")
+        try:
+            w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        except ValueError as e:
+            logger.error(f"Unable to inject web3 middleware for POA chain connection: {e}")
+        block = w3.eth.get_block(block_identifier, full_transaction)
+    except Exception as e:
+        logger.error(f"Error fetching block info: {e}")
+        block = None
+    return block
+
+
+class StaleAnchors(Exception):
+    """A fetched block contradicts the cached anchors (e.g. a restarted local chain)"""
+
+
+class BlockTimeIndex:
+    """Finds blocks by timestamp on one chain, remembering settled blocks
+
+    Args:
+        w3: Connection to the chain
+        chain_id: Chain the index belongs to, names the cache file
+        directory: Where anchors are stored, defaults to `block_index` in the
+            telliot home directory
+        persist: Whether anchors are read from and written to disk
+    """
+
+    def __init__(self, w3: Web3, chain_id: int, directory: Optional[Path] = None, persist: bool = True) -> None:
+        self.w3 = w3
+        self.chain_id = chain_id
+        self.persist = persist
+        self._directory = directory
+
+        #: Anchor block numbers and their timestamps, both ascending
+        self.numbers: List[int] = []
+        self.timestamps: List[int] = []
+
+        #: Average seconds per block, measured on first use
+        self.block_time: Optional[float] = None
+
+        #: Most recently seen head of the chain
+        self.head: Optional[Tuple[int, int]] = None
+
+        #: Number of blocks fetched, for diagnostics
+        self.fetched = 0
+
+        self._loaded = False
+        self._dirty = False
+        self._verified = False
+
+    @property
+    def path(self) -> Path:
+        """File holding the anchors of this chain"""
+        if self._directory is None:
+            self._directory = Path(default_homedir()) / "block_index"
+        return self._directory / f"{self.chain_id}.json"
+
+    def load(self) -> None:
+        """Read anchors from disk, once"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.persist:
+            return
+        try:
+            state = json.loads(self.path.read_text())
+            anchors = sorted((int(n), int(t)) for n, t in state["anchors"])
+            block_time = state.get("block_time")
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable block index at {self.path}: {e}")
+            return
+        for number, timestamp in anchors:
+            self.add_anchor(number, timestamp)
+        self.block_time = float(block_time) if block_time else None
+        self._dirty = False
+
+    def save(self) -> None:
+        """Write anchors to disk if they changed"""
+        if not self.persist or not self._dirty:
+            return
+        state = {"block_time": self.block_time, "anchors": list(zip(self.numbers, self.timestamps))}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(state))
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Unable to save block index at {self.path}: {e}")
+
+    def reset(self) -> None:
+        """Forget all anchors, in memory and on disk"""
+        self.numbers.clear()
+        self.timestamps.clear()
+        self.block_time = None
+        self.head = None
+        self._dirty = True
+        self.save()
+
+    def add_anchor(self, number: int, timestamp: int) -> None:
+        """Remember the timestamp of a settled block"""
+        i = bisect_right(self.numbers, number)
+        if i and self.numbers[i - 1] == number:
+            return
+        self.numbers.insert(i, number)
+        self.timestamps.insert(i, timestamp)
+        self._dirty = True
+        if len(self.numbers) > MAX_ANCHORS:
+            # thin out evenly, always keeping the latest anchor
+            del self.numbers[-2::-2]
+            del self.timestamps[-2::-2]
+
+    def anchored_timestamp(self, number: int) -> Optional[int]:
+        """Cached timestamp of a block, if it is an anchor"""
+        i = bisect_right(self.numbers, number) - 1
+        if i >= 0 and self.numbers[i] == number:
+            return self.timestamps[i]
+        return None
+
+    async def fetch(self, numbers: Iterable[BlockIdentifier]) -> Optional[Dict[BlockIdentifier, Tuple[int, int]]]:
+        """Fetch blocks concurrently, returning (number, timestamp) per identifier, None on any failure"""
+        identifiers = list(numbers)
+        blocks = await asyncio.gather(*[asyncio.to_thread(get_block, self.w3, i) for i in identifiers])
+        self.fetched += len(identifiers)
+        fetched: Dict[BlockIdentifier, Tuple[int, int]] = {}
+        for i, block in zip(identifiers, blocks):
+            if block is None:
+                return None
+            fetched[i] = (block["number"], block["timestamp"])
+        return fetched
+
+    async def block_timestamp(self, number: int) -> Optional[int]:
+        """Timestamp of a block, from the anchors if possible"""
+        self.load()
+        timestamp = self.anchored_timestamp(number)
+        if timestamp is not None:
+            return timestamp
+        blocks = await self.fetch([number])
+        if blocks is None:
+            return None
+        self._record(blocks.values())
+        self.save()
+        return blocks[number][1]
+
+    async def block_number_at(self, timestamp: int) -> Optional[int]:
+        """Number of the last block mined at or before a timestamp
+
+        Returns:
+            The block number, or None if the timestamp precedes the first
+            block or blocks could not be fetched
+        """
+        self.load()
+        try:
+            number = await self._search(timestamp)
+        except StaleAnchors:
+            logger.info(f"Block index of chain {self.chain_id} no longer matches the chain, rebuilding it")
+            self.reset()
+            number = await self._search(timestamp)
+        self.save()
+        return number
+
+    async def _verify_anchors(self) -> bool:
+        """Check once that the latest stored anchor still matches the chain
+
+        Returns:
+            False if the chain could not be reached
+        """
+        if self._verified or not self.numbers:
+            self._verified = True
+            return True
+        number, timestamp = self.numbers[-1], self.timestamps[-1]
+        head, anchor = await asyncio.gather(self.fetch(["latest"]), self.fetch([number]))
+        if head is None:
+            return False
+        if head["latest"][0] < number or (anchor is not None and anchor[number][1] != timestamp):
+            raise StaleAnchors()
+        if anchor is None:
+            return False
+        self.head = head["latest"]
+        self._verified = True
+        return True
+
+    async def _search(self, target: int) -> Optional[int]:
+        if not await self._verify_anchors():
+            return None
+
+        # Bracket the target between the closest anchors: lo.timestamp <= target < hi.timestamp
+        i = bisect_right(self.timestamps, target)
+        lo = (self.numbers[i - 1], self.timestamps[i - 1]) if i else None
+        hi = (self.numbers[i], self.timestamps[i]) if i < len(self.numbers) else None
+
+        if hi is None and self.head is not None and target < self.head[1]:
+            hi = self.head
+        if hi is None:
+            blocks = await self.fetch(["latest"])
+            if blocks is None:
+                return None
+            head = blocks["latest"]
+            if self.numbers and head[0] < self.numbers[-1]:
+                raise StaleAnchors()
+            self.head = head
+            self._record([head])
+            if head[1] <= target:
+                return head[0]
+            hi = head
+
+        if self.block_time is None:
+            sample = max(0, hi[0] - BLOCK_TIME_SAMPLE)
+            blocks = await self.fetch([sample])
+            if blocks is None:
+                return None
+            self.block_time = (hi[1] - blocks[sample][1]) / max(1, hi[0] - sample) or 1.0
+            lo, hi = self._narrow(target, lo, hi, blocks.values())
+            self._record(blocks.values())
+
+        rounds = 0
+        while lo is None or hi[0] - lo[0] > 1:
+            if lo is None and hi[0] == 0:
+                return None  # before the first block
+            rounds += 1
+            blocks = await self.fetch(self._candidates(target, lo, hi, rounds))
+            if blocks is None:
+                return None
+            lo, hi = self._narrow(target, lo, hi, blocks.values())
+            self._record(blocks.values())
+
+        logger.debug(f"Found block {lo[0]} at {target} on chain {self.chain_id} after {rounds} round(s)")
+        return lo[0]
+
+    def _candidates(self, target: int, lo: Optional[Tuple[int, int]], hi: Tuple[int, int], rounds: int) -> List[int]:
+        """Block numbers to probe next, strictly inside the bracket"""
+        assert self.block_time is not None
+        if lo is None:
+            # extrapolate back from the upper bound using the average block time
+            distance = (hi[1] - target) / self.block_time
+            estimate = hi[0] - math.ceil(distance)
+            spread = max(2, math.ceil(distance / 20))
+            first = -1
+        else:
+            estimate = lo[0] + int((target - lo[1]) * (hi[0] - lo[0]) / max(1, hi[1] - lo[1]))
+            spread = max(2, (hi[0] - lo[0]) // 32)
+            first = lo[0]
+        estimate = min(max(estimate, first + 1), hi[0] - 1)
+
+        candidates = {estimate - spread, estimate, estimate + 1, estimate + spread}
+        if rounds > INTERPOLATION_ROUNDS:
+            candidates.add((max(first, 0) + hi[0]) // 2)
+        return sorted(n for n in candidates if first < n < hi[0])
+
+    def _narrow(
+        self,
+        target: int,
+        lo: Optional[Tuple[int, int]],
+        hi: Tuple[int, int],
+        blocks: Iterable[Tuple[int, int]],
+    ) -> Tuple[Optional[Tuple[int, int]], Tuple[int, int]]:
+        """Tighten the bracket with fetched blocks"""
+        for number, timestamp in blocks:
+            if (lo is not None and number > lo[0] and timestamp < lo[1]) or (number < hi[0] and timestamp > hi[1]):
+                raise StaleAnchors()
+            if timestamp <= target:
+                if lo is None or number > lo[0]:
+                    lo = (number, timestamp)
+            elif number < hi[0]:
+                hi = (number, timestamp)
+        return lo, hi
+
+    def _record(self, blocks: Iterable[Tuple[int, int]]) -> None:
+        """Keep settled blocks as anchors"""
+        settled = max(
+            self.head[0] - FINALITY_BLOCKS if self.head else -1,
+            self.numbers[-1] if self.numbers else -1,
+        )
+        for number, timestamp in blocks:
+            if number <= settled:
+                self.add_anchor(number, timestamp)
+
+
+_indexes: Dict[int, BlockTimeIndex] = {}
+
+
+def get_block_index(w3: Web3, chain_id: int) -> BlockTimeIndex:
+    """Return the process-wide block index of a chain, using the given connection"""
+    index = _indexes.get(chain_id)
+    if index is None:
+        index = _indexes[chain_id] = BlockTimeIndex(w3, chain_id)
+    index.w3 = w3
+    return index
@@ -1,38 +1,207 @@
-"""Send text messages using Twilio."""
+"""Discord notifications of the reporter
+
+Messages are posted to the webhook set in the DISCORD_WEBHOOK_URL_4
+environment variable by a background thread, so a slow, rate-limited or
+unreachable webhook never delays reporting. Messages queued while a post
+is in flight are sent together in one post.
+"""
+import atexit
 import os
-from typing import Any
-from dotenv import load_dotenv
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from datetime import timedelta
+from typing import Callable
+from typing import Deque
+from typing import Optional
 from typing import Union
 
+import requests
+from dotenv import load_dotenv
+
+from telliot_feeds.utils.log import get_logger
+
 load_dotenv()
 
-import click
-from discordwebhook import Discord
+logger = get_logger(__name__)
+
+#: Discord rejects messages longer than this
+MAX_MESSAGE_LENGTH = 2000
+
+#: Separator of messages sent together in one post
+BATCH_SEPARATOR = "\n\n"
+
+
+def get_webhook_url() -> Optional[str]:
+    """Read the Discord webhook url from the environment."""
+    return os.getenv("DISCORD_WEBHOOK_URL_4") or None
+
+
+class WebhookDispatcher:
+    """Posts messages to a Discord webhook from a background thread
+
+    `submit` only queues a message. The worker waits `linger` seconds after
+    the first message of a burst and sends everything queued by then in as
+    few posts as the message length limit allows. Failed posts are retried
+    with exponential backoff, or after the delay a rate-limited response
+    asks for.
+
+    Args:
+        webhook_url: Returns the webhook url, None if notifications are off
+        max_queued: Messages kept while the webhook is slow or down, the oldest are dropped first
+        linger: Seconds to wait for further messages before posting
+        max_retries: Attempts to post a message before it is dropped
+        backoff: Seconds before the first retry, doubled for each further one
+        max_backoff: Longest wait between attempts in seconds
+        timeout: Seconds before a post is abandoned
+    """
+
+    def __init__(
+        self,
+        webhook_url: Callable[[], Optional[str]] = get_webhook_url,
+        max_queued: int = 100,
+        linger: float = 1.0,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        timeout: float = 10.0,
+    ) -> None:
+        self.webhook_url = webhook_url
+        self.linger = linger
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+
+        self._queue: Deque[str] = deque(maxlen=max_queued)
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._busy = False
+
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def submit(self, message: str) -> None:
+        """Queue a message, dropping the oldest one if the queue is full"""
+        with self._condition:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+                logger.warning("Discord notification queue is full, dropping the oldest message")
+            self._queue.append(message)
+            self._condition.notify_all()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="discord-notifications", daemon=True)
+                self._thread.start()
+                # send what is still queued when the reporter exits, e.g. after --submit-once
+                atexit.register(self.flush)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until every queued message was sent or dropped, False on timeout"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._queue or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def next_batch(self) -> str:
+        """Pop the queued messages fitting in one post, called with the lock held"""
+        batch = self._queue.popleft()[:MAX_MESSAGE_LENGTH]
+        while self._queue and len(batch) + len(BATCH_SEPARATOR) + len(self._queue[0]) <= MAX_MESSAGE_LENGTH:
+            batch += BATCH_SEPARATOR + self._queue.popleft()
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                self._busy = True
+            time.sleep(self.linger)
+            while True:
+                with self._condition:
+                    if not self._queue:
+                        self._busy = False
+                        self._condition.notify_all()
+                        break
+                    batch = self.next_batch()
+                self.post(batch)
+
+    def post(self, content: str) -> bool:
+        """Post to the webhook, retrying failures, True if it was accepted"""
+        for attempt in range(self.max_retries):
+            url = self.webhook_url()
+            if not url:
+                logger.warning("Discord webhook not set, dropping notification")
+                break
+            delay = min(self.max_backoff, self.backoff * 2**attempt)
+            try:
+                response = requests.post(url, json={"content": content}, timeout=self.timeout)
+            except requests.RequestException as e:
+                logger.info(f"Discord notification failed, retrying in {delay:.1f}s: {e}")
+            else:
+                if response.ok:
+                    self.sent += 1
+                    return True
+                if response.status_code == 429:
+                    delay = min(self.max_backoff, retry_after(response, delay))
+                    logger.info(f"Discord webhook rate limited, retrying in {delay:.1f}s")
+                elif response.status_code < 500:
+                    logger.warning(f"Discord webhook rejected notification: {response.status_code} {response.text}")
+                    break
+                else:
+                    logger.info(f"Discord webhook error {response.status_code}, retrying in {delay:.1f}s")
+            if attempt + 1 < self.max_retries:
+                time.sleep(delay)
+        self.failed += 1
+        return False
+
+
+def retry_after(response: requests.Response, default: float) -> float:
+    """Seconds a rate-limited Discord response asks to wait"""
+    try:
+        return float(response.json()["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        pass
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return default
+
+
+#: Dispatcher of all notifications of this process
+dispatcher = WebhookDispatcher()
+
+
+def queue_message(message: str) -> str:
+    """Queue a message for the webhook, returns a line describing the outcome to log"""
+    if not dispatcher.webhook_url():
+        return "Discord Notification: Webhook not set. Won't send nofitication."
+    dispatcher.submit(message)
+    return "Discord notification: Queued for webhook api set in .env"
+
 
 def generic_alert(msg: str) -> None:
     """Send a Discord message via webhook."""
     send_discord_msg_telliot(msg)
-    return
-    
+
+
 def timestamp_convert(timestamp: int) -> str:
-    '''Convert timestamp to local time.'''
-    local_date = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+    """Convert timestamp to local time."""
+    local_date = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
     return local_date
-    
-def submit_or_not(notification_data: Union[dict, str]) -> Union[str, dict]:
-    '''Send a Discord message when the reporter succeeds or fails to submit a report'''
+
+
+def submit_or_not(notification_data: Union[dict, str]) -> str:
+    """Send a Discord message when the reporter succeeds or fails to submit a report"""
     if isinstance(notification_data, dict):
-        notification_data['last_report'] = timestamp_convert(notification_data.get('last_report', 0))
+        notification_data["last_report"] = timestamp_convert(notification_data.get("last_report", 0))
     return send_discord_msg_telliot(notification_data)
 
-def get_alert_bot_4() -> Discord:
-    """Read the Discord webhook url from the environment."""
-    DISCORD_WEBHOOK_URL_4 = os.getenv("DISCORD_WEBHOOK_URL_4")
-    if not DISCORD_WEBHOOK_URL_4:
-        raise Exception("Webhook not set. Won't send nofitication.")
-    return Discord(url=DISCORD_WEBHOOK_URL_4)
-
 
 def send_discord_msg_telliot(notification_data: Union[dict, str]) -> str:
     """Send Discord notification with data from notification dictionary in tellor360."""
@@ -40,33 +209,23 @@ def send_discord_msg_telliot(notification_data: Union[dict, str]) -> str:
     if isinstance(notification_data, str):
         message = f"❗ {MONITOR_NAME} Notification:\n\n {notification_data}"
     else:
-        message =(
+        message = (
             f"ℹ️ {MONITOR_NAME} Notification:\n"
             f"**Query:** {notification_data.get('query', 'N/A')}\n"
-            f"**Price Submitted:** {notification_data.get('price_submitted', 0.0):.7f}".rstrip('0').rstrip('.') + "\n"
+            f"**Price Submitted:** {notification_data.get('price_submitted', 0.0):.7f}".rstrip("0").rstrip(".") + "\n"
             f"**Account:** {notification_data.get('account', 'N/A')}\n"
             f"**Last Report at:** {notification_data.get('last_report', 'N/A')}\n"
             f"**Reporter Interval:** ~{timedelta(seconds=int(notification_data.get('reporter_lock_time', 0)))}\n"
             f"**Transaction URL:** {notification_data.get('transaction_url', 'N/A')}\n"
             f"**Rewards + Tips received:** ~{notification_data.get('tbrtips', 0.0):.4f} FETCH\n"
-            f"**Percent and USD profits:** ~{notification_data.get('percent_profit', 'N/A'):.2f} %  |  "\
+            f"**Percent and USD profits:** ~{notification_data.get('percent_profit', 'N/A'):.2f} %  |  "
             f"~{notification_data.get('usd_profit', 'N/A'):.2f} USD \n"
         )
-    try:
-        get_alert_bot_4().post(content=message)
-        return f"Discord notification: Sent to webhook api set in .env"
-    except Exception as e:
-        return f"Discord Notification: {e}"
+    return queue_message(message)
+
 
 def dispute_notification(msg: str) -> str:
-    '''Send a notification if a dispute (stake lowered) is detected'''
+    """Send a notification if a dispute (stake lowered) is detected"""
     MONITOR_NAME = os.getenv("MONITOR_NAME_TELLIOT", "Monitor")
-    message =(
-        f"‼️{MONITOR_NAME} Notification:\n"
-        f"**Check your Reporter:** {msg}'\n"
-    )
-    try:
-        get_alert_bot_4().post(content=message)
-        return f"Discord notification: Sent to webhook api set in .env"
-    except Exception as e:
-        return f"Discord Notification: {e}"
+    message = f"‼️{MONITOR_NAME} Notification:\n**Check your Reporter:** {msg}'\n"
+    return queue_message(message)
@@ -0,0 +1,172 @@
+"""Shared asynchronous HTTP client
+
+A single, process-wide pool of keep-alive connections used by every
+web-based price service. Sessions are bound to the event loop they were
+created on, so a separate session is kept per running loop. Close it with
+`close_http_client` before the loop ends, the CLI commands do so on exit.
+"""
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from aiohttp import ClientError
+from aiohttp import ClientSession
+from aiohttp import ClientTimeout
+from aiohttp import TCPConnector
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class HTTPClientConfig:
+    """Connection pool settings for the shared HTTP client"""
+
+    #: Total number of simultaneous connections
+    limit: int = 100
+
+    #: Simultaneous connections to a single host
+    limit_per_host: int = 10
+
+    #: Seconds to cache DNS lookups
+    ttl_dns_cache: int = 300
+
+    #: Seconds to keep idle connections open
+    keepalive_timeout: float = 30.0
+
+    #: Default request timeout in seconds
+    timeout: float = 5.0
+
+    #: Number of retries after a connection error or timeout
+    retries: int = 0
+
+    #: Base delay in seconds between retries, doubled on every attempt
+    backoff: float = 0.5
+
+
+class HTTPClient:
+    """Pooled asynchronous HTTP client returning `get_url`-style results
+
+    Every request returns a dictionary with the following (optional) keys:
+        response (dict or list): Decoded JSON body, if no error occurred
+        status (int): HTTP status code of the response
+        error (str): A description of the error, if one occurred
+        exception (Exception): The exception, if one occurred
+    """
+
+    def __init__(self, config: Optional[HTTPClientConfig] = None) -> None:
+        self.config = config or HTTPClientConfig()
+        self._sessions: Dict[asyncio.AbstractEventLoop, ClientSession] = {}
+
+    def session(self) -> ClientSession:
+        """Return the pooled session for the running event loop"""
+        loop = asyncio.get_running_loop()
+        # a session references its loop, so sessions of loops closed without `close` are dropped here
+        for closed in [other for other in self._sessions if other.is_closed()]:
+            del self._sessions[closed]
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = TCPConnector(
+                limit=self.config.limit,
+                limit_per_host=self.config.limit_per_host,
+                ttl_dns_cache=self.config.ttl_dns_cache,
+                keepalive_timeout=self.config.keepalive_timeout,
+            )
+            session = ClientSession(connector=connector)
+            self._sessions[loop] = session
+        return session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        json_data: Optional[Any] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Send a request and decode the JSON response while handling exceptions
+
+        Args:
+            method: HTTP method
+            url: Full URL to request
+            params: Query string parameters
+            headers: Request headers
+            json_data: JSON body to send
+            timeout: Total request timeout in seconds, defaults to the client config
+            retries: Retries after connection errors or timeouts, defaults to the client config
+        """
+        client_timeout = ClientTimeout(total=timeout if timeout is not None else self.config.timeout)
+        attempts = 1 + (retries if retries is not None else self.config.retries)
+
+        result: Dict[str, Any] = {}
+        for attempt in range(attempts):
+            if attempt > 0:
+                await asyncio.sleep(self.config.backoff * 2 ** (attempt - 1))
+            try:
+                async with self.session().request(
+                    method, url, params=params, headers=headers, json=json_data, timeout=client_timeout
+                ) as r:
+                    text = await r.text()
+                    try:
+                        return {"response": json.loads(text), "status": r.status}
+                    except json.JSONDecodeError as e:
+                        return {"error": "JSON Decode Error", "exception": e, "status": r.status}
+
+            except asyncio.TimeoutError as e:
+                result = {"error": "Timeout Error", "exception": e}
+
+            except ClientError as e:
+                result = {"error": str(type(e)), "exception": e}
+
+            except Exception as e:
+                return {"error": str(type(e)), "exception": e}
+
+            logger.debug(f"Request to {url} failed on attempt {attempt + 1}/{attempts}: {result['error']}")
+
+        return result
+
+    async def get(self, url: str, **kwargs: Any) -> Dict[str, Any]:
+        """Send a GET request"""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> Dict[str, Any]:
+        """Send a POST request"""
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self) -> None:
+        """Close the session of the running event loop"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+
+_client: Optional[HTTPClient] = None
+
+
+def get_http_client() -> HTTPClient:
+    """Return the process-wide HTTP client"""
+    global _client
+    if _client is None:
+        _client = HTTPClient()
+    return _client
+
+
+def configure_http_client(config: HTTPClientConfig) -> HTTPClient:
+    """Replace the process-wide HTTP client with one using the given settings"""
+    global _client
+    _client = HTTPClient(config)
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the pooled connections of the process-wide client for the running loop"""
+    if _client is not None:
+        await _client.close()
@@ -0,0 +1,347 @@
+"""Latency and call count metrics of reporters
+
+Reporting stages and price source fetches are wrapped in timed spans, which
+record their duration in a histogram and count the ones that failed. The
+JSON-RPC requests of instrumented Web3 instances are counted by method.
+Recording only updates a few counters in memory, so it is always on; the
+metrics can optionally be read from a local OpenMetrics endpoint (e.g.
+scraped by Prometheus) and logged in a periodic summary line.
+
+    with metrics.stage("ensure_staked") as span:
+        staked, status = await reporter.ensure_staked()
+        span.failed = not status.ok
+
+    await metrics.serve(port=9090)  # http://127.0.0.1:9090/metrics
+"""
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import ContextManager
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from web3 import Web3
+from web3.types import RPCEndpoint
+from web3.types import RPCResponse
+
+from telliot_feeds.utils.log import get_logger
+
+
+logger = get_logger(__name__)
+
+#: Upper bounds in seconds of the latency histogram buckets
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+#: Metric families
+REPORT_STAGE = "telliot_report_stage"
+SOURCE_FETCH = "telliot_source_fetch"
+RPC_REQUESTS = "telliot_rpc_requests"
+RPC_ERRORS = "telliot_rpc_errors"
+
+HELP = {
+    f"{REPORT_STAGE}_seconds": "Duration of reporter stages",
+    f"{REPORT_STAGE}_failures": "Reporter stages that raised or returned an error status",
+    f"{SOURCE_FETCH}_seconds": "Duration of price source fetches",
+    f"{SOURCE_FETCH}_failures": "Price source fetches that raised, were abandoned or returned no value",
+    RPC_REQUESTS: "JSON-RPC requests by method",
+    RPC_ERRORS: "JSON-RPC requests that raised or were answered with an error",
+}
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+#: Name of the request counting middleware added to Web3 instances
+MIDDLEWARE_NAME = "telliot_metrics"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+@dataclass
+class Histogram:
+    """Counts of observations per bucket, the last bucket is unbounded"""
+
+    bounds: Tuple[float, ...]
+    counts: List[int] = field(default_factory=list)
+    sum: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def since(self, earlier: Optional["Histogram"]) -> "Histogram":
+        """Observations made after `earlier` was copied from this histogram"""
+        if earlier is None:
+            return Histogram(self.bounds, list(self.counts), self.sum, self.count)
+        counts = [now - before for now, before in zip(self.counts, earlier.counts)]
+        return Histogram(self.bounds, counts, self.sum - earlier.sum, self.count - earlier.count)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate of the q-quantile, interpolated within its bucket
+
+        Observations beyond the last bound are reported as that bound.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        lower = 0.0
+        for bound, n in zip(self.bounds, self.counts):
+            if n and cumulative + n >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / n
+            cumulative += n
+            lower = bound
+        return self.bounds[-1]
+
+
+@dataclass
+class Span:
+    """A timed operation, see `Metrics.span`"""
+
+    #: Set by the caller when the operation finished without a usable result
+    failed: bool = False
+
+    #: Duration in seconds, once finished
+    seconds: Optional[float] = None
+
+
+def format_labels(labels: Labels, extra: str = "") -> str:
+    escaped = [f'{k}="{escape(v)}"' for k, v in labels]
+    if extra:
+        escaped.append(extra)
+    return "{" + ",".join(escaped) + "}" if escaped else ""
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.2f}s"
+
+
+class Metrics:
+    """Thread-safe registry of latency histograms and counters
+
+    Args:
+        buckets: Upper bounds in seconds of the latency histogram buckets
+        summary_interval: Seconds between summary log lines, 0 to not log them
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, summary_interval: float = 0.0) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.summary_interval = summary_interval
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], int] = {}
+        self._lock = threading.Lock()
+
+        # values at the time of the last summary, which covers what happened since
+        self._summarized_at = time.monotonic()
+        self._summarized_histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._summarized_counters: Dict[Tuple[str, Labels], int] = {}
+
+        self._runner: Optional[Any] = None
+
+    def reset(self) -> None:
+        """Drop all recorded values"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._summarized_histograms.clear()
+            self._summarized_counters.clear()
+            self._summarized_at = time.monotonic()
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def inc(self, name: str, *, amount: int = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def histogram(self, name: str, **labels: str) -> Optional[Histogram]:
+        """Copy of a histogram, None if nothing was observed"""
+        with self._lock:
+            histogram = self._histograms.get((name, tuple(sorted(labels.items()))))
+            return None if histogram is None else histogram.since(None)
+
+    def counter(self, name: str, **labels: str) -> int:
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    @contextmanager
+    def span(self, family: str, **labels: str) -> Iterator[Span]:
+        """Time the block in the `<family>_seconds` histogram
+
+        Blocks that raise, or that set `failed` on the yielded span, are
+        counted in `<family>_failures`. Cancelled blocks, e.g. sources a
+        PriceAggregator stopped waiting for, count as failures and their
+        truncated duration is not recorded.
+        """
+        span = Span()
+        cancelled = False
+        start = time.perf_counter()
+        try:
+            yield span
+        except asyncio.CancelledError:
+            cancelled = span.failed = True
+            raise
+        except Exception:
+            span.failed = True
+            raise
+        finally:
+            span.seconds = time.perf_counter() - start
+            if not cancelled:
+                self.observe(f"{family}_seconds", span.seconds, **labels)
+            if span.failed:
+                self.inc(f"{family}_failures", amount=1, **labels)
+
+    def stage(self, name: str) -> ContextManager[Span]:
+        """Span of a reporter stage"""
+        return self.span(REPORT_STAGE, stage=name)
+
+    def source(self, name: str) -> ContextManager[Span]:
+        """Span of a price source fetch"""
+        return self.span(SOURCE_FETCH, source=name)
+
+    def rpc_middleware(
+        self, make_request: Callable[[RPCEndpoint, Any], RPCResponse], w3: Web3
+    ) -> Callable[[RPCEndpoint, Any], RPCResponse]:
+        """Web3 middleware counting requests and errors by method"""
+
+        def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            self.inc(RPC_REQUESTS, method=method)
+            try:
+                response = make_request(method, params)
+            except Exception:
+                self.inc(RPC_ERRORS, method=method)
+                raise
+            if "error" in response:
+                self.inc(RPC_ERRORS, method=method)
+            return response
+
+        return middleware
+
+    def instrument_web3(self, w3: Web3) -> None:
+        """Count the JSON-RPC requests of a Web3 instance, once per instance"""
+        if MIDDLEWARE_NAME not in w3.middleware_onion:
+            w3.middleware_onion.add(self.rpc_middleware, name=MIDDLEWARE_NAME)
+
+    def render(self) -> str:
+        """All metrics in the OpenMetrics text format"""
+        with self._lock:
+            histograms = sorted((key, h.since(None)) for key, h in self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        lines: List[str] = []
+        family = None
+        for (name, labels), histogram in histograms:
+            if name != family:
+                family = name
+                lines += self._header(name, "histogram")
+            cumulative = 0
+            for bound, n in zip(histogram.bounds + (float("inf"),), histogram.counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                bucket = format_labels(labels, f'le="{le}"')
+                lines.append(f"{name}_bucket{bucket} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum}")
+            lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+        for (name, labels), value in counters:
+            if name != family:
+                family = name
+                lines += self._header(name, "counter")
+            lines.append(f"{name}_total{format_labels(labels)} {value}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _header(name: str, kind: str) -> List[str]:
+        header = [f"# TYPE {name} {kind}"]
+        if name in HELP:
+            header.append(f"# HELP {name} {HELP[name]}")
+        return header
+
+    def summary(self) -> str:
+        """One line summarizing the metrics recorded since the previous summary"""
+        with self._lock:
+            histograms = {key: h.since(self._summarized_histograms.get(key)) for key, h in self._histograms.items()}
+            counters = {key: n - self._summarized_counters.get(key, 0) for key, n in self._counters.items()}
+            self._summarized_histograms = {key: h.since(None) for key, h in self._histograms.items()}
+            self._summarized_counters = dict(self._counters)
+            elapsed = time.monotonic() - self._summarized_at
+            self._summarized_at = time.monotonic()
+
+        parts = []
+        for family, label in ((REPORT_STAGE, "stage"), (SOURCE_FETCH, "source")):
+            spans = []
+            for (name, labels), histogram in sorted(histograms.items()):
+                if name != f"{family}_seconds" or not histogram.count:
+                    continue
+                failures = counters.get((f"{family}_failures", labels), 0)
+                spans.append(
+                    f"{dict(labels)[label]} n={histogram.count} p50={format_seconds(histogram.quantile(0.5))} "
+                    f"p95={format_seconds(histogram.quantile(0.95))}" + (f" failed={failures}" if failures else "")
+                )
+            if spans:
+                parts.append(f"{label}s: " + ", ".join(spans))
+
+        rpc = sorted(
+            ((dict(labels)["method"], n) for (name, labels), n in counters.items() if name == RPC_REQUESTS and n),
+            key=lambda item: -item[1],
+        )
+        if rpc:
+            errors = sum(n for (name, _), n in counters.items() if name == RPC_ERRORS)
+            calls = " ".join(f"{method}={n}" for method, n in rpc)
+            parts.append(f"rpc: {sum(n for _, n in rpc)} requests ({calls}), {errors} errors")
+
+        return f"Metrics of the last {elapsed:.0f}s: " + ("; ".join(parts) if parts else "nothing recorded")
+
+    def log_summary_if_due(self) -> None:
+        """Log a summary if the summary interval passed since the last one"""
+        if self.summary_interval > 0 and time.monotonic() - self._summarized_at >= self.summary_interval:
+            logger.info(self.summary())
+
+    async def serve(self, port: int, host: str = "127.0.0.1") -> None:
+        """Serve the metrics at http://host:port/metrics on the running event loop"""
+        # the server is optional, only import it when used
+        from aiohttp import web
+
+        async def handle(request: web.Request) -> web.Response:
+            return web.Response(body=self.render().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        logger.info(f"Serving metrics at http://{host}:{port}/metrics")
+
+    async def stop(self) -> None:
+        """Stop serving the metrics"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+#: Metrics of this process
+metrics = Metrics()
@@ -1,4 +1,7 @@
 import ast
+import copy
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any
 from typing import Optional
 
@@ -17,7 +20,14 @@ from telliot_feeds.utils.log import get_logger
 
 logger = get_logger(__name__)
 
+#: Maximum number of decoded queries kept in the interning table
+MAX_INTERNED_QUERIES = 1024
 
+#: Query data -> query object decoded from it
+_interned_queries: "OrderedDict[bytes, OracleQuery]" = OrderedDict()
+
+
+@lru_cache(maxsize=MAX_INTERNED_QUERIES)
 def decode_typ_name(qdata: bytes) -> str:
     """Decode query type name from query data
 
@@ -90,12 +100,27 @@ def get_query_from_qtyp_name(qdata: bytes) -> Optional[OracleQuery]:
     Args:
     - qdata: query data in bytes
 
+    Decoded queries are kept in a process-wide interning table keyed by query data;
+    callers get their own copy, so setting attributes on it doesn't affect the table.
+
     Return: query
     """
-    qtyp_name = decode_typ_name(qdata)
-    query_object: Optional[OracleQuery] = Registry.registry.get(qtyp_name)
+    query = _interned_queries.get(qdata)
+    if query is None:
+        qtyp_name = decode_typ_name(qdata)
+        query_object: Optional[OracleQuery] = Registry.registry.get(qtyp_name)
+        if query_object is None:
+            return None
+        query = query_object.get_query_from_data(qdata)
+        if query is None:
+            return None
+        _interned_queries[qdata] = query
+        if len(_interned_queries) > MAX_INTERNED_QUERIES:
+            _interned_queries.popitem(last=False)
+    else:
+        _interned_queries.move_to_end(qdata)
 
-    return query_object.get_query_from_data(qdata) if query_object is not None else None
+    return copy.copy(query)
 
 
 def query_from_query_catalog(*, qid: Optional[str] = None, qtype_name: Optional[str] = None) -> Optional[OracleQuery]:
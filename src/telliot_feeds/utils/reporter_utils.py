@@ -86,7 +86,8 @@ async def tellor_suggested_report(
 
 def suggest_random_feed() -> DataFeed[Any]:
     """Suggest a random feed to report against."""
-    return random.choice(list(RANDOM_FEEDS.values()))
+    # pick a tag first so only the chosen feed is imported
+    return RANDOM_FEEDS[random.choice(list(RANDOM_FEEDS))]
 
 
 async def is_online() -> bool:
@@ -109,13 +110,18 @@ def has_native_token_funds(
     web3: Web3,
     alert: Callable[[str], None] = alert_placeholder,
     min_balance: int = 10**18,
+    balance: Optional[int] = None,
 ) -> bool:
-    """Check if an account has native token funds."""
-    try:
-        balance = web3.eth.get_balance(account)
-    except Exception as e:
-        logger.warning(f"Error fetching native token balance for {account}: {e}")
-        return False
+    """Check if an account has native token funds.
+
+    The balance is fetched from the node unless already known.
+    """
+    if balance is None:
+        try:
+            balance = web3.eth.get_balance(account)
+        except Exception as e:
+            logger.warning(f"Error fetching native token balance for {account}: {e}")
+            return False
 
     if balance < min_balance:
         str_bal = f"{balance / 10**18:.2f}"
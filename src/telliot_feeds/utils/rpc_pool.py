@@ -0,0 +1,261 @@
+"""Pool of RPC endpoints for one chain
+
+`RPCPool` is a web3 provider over every endpoint configured for a chain. Each
+request goes to the fastest healthy endpoint, judged by a moving average of
+its recent latencies. Connection errors, timeouts and rate-limit responses
+put an endpoint in an exponentially growing cooldown and the request is
+retried on the next endpoint, so a failing node is skipped transparently.
+
+Optionally, read requests are raced against the two best endpoints and the
+first answer wins.
+
+    w3 = get_web3(chain_id, cfg)  # one shared, pooled Web3 per chain
+    get_rpc_pool(chain_id, cfg).health()
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import cast
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from telliot_core.apps.telliot_config import TelliotConfig
+from web3 import HTTPProvider
+from web3 import Web3
+from web3 import WebsocketProvider
+from web3.providers.base import BaseProvider
+from web3.types import RPCEndpoint
+from web3.types import RPCResponse
+
+from telliot_feeds.utils.log import get_logger
+from telliot_feeds.utils.metrics import metrics
+
+
+logger = get_logger(__name__)
+
+#: Weight of the newest sample in an endpoint's moving average latency
+LATENCY_SMOOTHING = 0.2
+
+#: Number of recent requests the error rate is computed over
+ERROR_WINDOW = 50
+
+#: Cooldown after a failure in seconds, doubled for each consecutive failure
+COOLDOWN = 5.0
+MAX_COOLDOWN = 300.0
+
+#: JSON-RPC error codes meaning the node, not the request, is at fault (rate limiting)
+NODE_ERROR_CODES = {-32005}
+
+#: Methods that change state and are therefore never raced
+WRITE_METHODS = {"eth_sendRawTransaction", "eth_sendTransaction", "eth_sign", "eth_signTransaction"}
+
+
+class AllEndpointsFailed(Exception):
+    """Raised when a request failed on every endpoint of a pool"""
+
+
+@dataclass
+class EndpointHealth:
+    """Rolling request statistics of one endpoint"""
+
+    url: str
+
+    #: Moving average of successful request latencies in seconds
+    latency: Optional[float] = None
+
+    #: Outcome of recent requests, True for a failure
+    outcomes: Deque[bool] = field(default_factory=lambda: deque(maxlen=ERROR_WINDOW))
+
+    #: Failures since the last success
+    consecutive_failures: int = 0
+
+    #: Monotonic time until which the endpoint is only used as a last resort
+    cooldown_until: float = 0.0
+
+    requests: int = 0
+    failures: int = 0
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+    def record_success(self, latency: float) -> None:
+        self.requests += 1
+        self.outcomes.append(False)
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += LATENCY_SMOOTHING * (latency - self.latency)
+
+    def record_failure(self, now: float) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.outcomes.append(True)
+        self.consecutive_failures += 1
+        self.cooldown_until = now + min(MAX_COOLDOWN, COOLDOWN * 2 ** (self.consecutive_failures - 1))
+
+    def as_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy(now),
+            "latency_ms": None if self.latency is None else round(self.latency * 1000, 1),
+            "error_rate": round(self.error_rate, 3),
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+def make_provider(url: str, timeout: float) -> Optional[BaseProvider]:
+    """Web3 provider for an endpoint url, None if the scheme is not supported"""
+    if url.startswith("http"):
+        return HTTPProvider(url, request_kwargs={"timeout": timeout})
+    if url.startswith("ws"):
+        return WebsocketProvider(url, websocket_timeout=int(timeout))
+    logger.warning(f"Unsupported RPC endpoint url: {url}")
+    return None
+
+
+class RPCPool(BaseProvider):
+    """Web3 provider routing each request to the best of several endpoints
+
+    Args:
+        urls: Endpoint urls, in order of preference until latencies are known
+        timeout: Seconds before a request to an endpoint is abandoned
+        race_reads: Send read requests to the two best endpoints at once
+    """
+
+    def __init__(self, urls: Sequence[str], timeout: float = 10.0, race_reads: bool = False) -> None:
+        super().__init__()
+        self.providers: List[BaseProvider] = []
+        self.stats: List[EndpointHealth] = []
+        for url in dict.fromkeys(urls):
+            provider = make_provider(url, timeout)
+            if provider is not None:
+                self.providers.append(provider)
+                self.stats.append(EndpointHealth(url))
+        if not self.providers:
+            raise ValueError("No usable RPC endpoint urls")
+        self.race_reads = race_reads
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __repr__(self) -> str:
+        return f"RPCPool({[s.url for s in self.stats]})"
+
+    def ranked(self) -> List[int]:
+        """Endpoint indexes in the order requests try them"""
+        now = time.monotonic()
+        with self._lock:
+
+            def rank(i: int) -> Tuple[bool, float, float, int]:
+                stats = self.stats[i]
+                if not stats.healthy(now):
+                    # last resort, soonest out of cooldown first
+                    return True, stats.cooldown_until, 0.0, i
+                # endpoints without a latency yet are tried first to measure them
+                return False, 0.0, -1.0 if stats.latency is None else stats.latency, i
+
+            return sorted(range(len(self.providers)), key=rank)
+
+    def health(self) -> List[Dict[str, Any]]:
+        """Per-endpoint health metrics, best endpoint first"""
+        now = time.monotonic()
+        with self._lock:
+            stats = [self.stats[i].as_dict(now) for i in range(len(self.stats))]
+        return [stats[i] for i in self.ranked()]
+
+    def _request(self, i: int, method: RPCEndpoint, params: Any) -> RPCResponse:
+        """Send a request to one endpoint, recording its outcome"""
+        start = time.monotonic()
+        try:
+            response = self.providers[i].make_request(method, params)
+        except Exception:
+            with self._lock:
+                self.stats[i].record_failure(time.monotonic())
+            raise
+        error = response.get("error")
+        if isinstance(error, dict) and error.get("code") in NODE_ERROR_CODES:
+            with self._lock:
+                self.stats[i].record_failure(time.monotonic())
+            raise ConnectionError(f"{self.stats[i].url} refused {method}: {error.get('message')}")
+        with self._lock:
+            self.stats[i].record_success(time.monotonic() - start)
+        return response
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        order = self.ranked()
+        if self.race_reads and method not in WRITE_METHODS and len(order) > 1:
+            response = self._race(order[:2], method, params)
+            if response is not None:
+                return response
+            order = order[2:]
+
+        errors = []
+        for i in order:
+            try:
+                return self._request(i, method, params)
+            except Exception as e:
+                logger.info(f"RPC request {method} failed on {self.stats[i].url}, trying next endpoint: {e}")
+                errors.append(e)
+        raise AllEndpointsFailed(f"{method} failed on all {len(self.providers)} endpoints: {errors}")
+
+    def _race(self, indexes: List[int], method: RPCEndpoint, params: Any) -> Optional[RPCResponse]:
+        """First successful response of several endpoints, None if all fail"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rpc-pool")
+        pending = {self._executor.submit(self._request, i, method, params) for i in indexes}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+        return None
+
+    def isConnected(self) -> bool:
+        return any(self._connected(p) for p in self.providers)
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return self.isConnected()
+
+    @staticmethod
+    def _connected(provider: BaseProvider) -> bool:
+        check = getattr(provider, "isConnected", None) or getattr(provider, "is_connected")
+        try:
+            return bool(check())
+        except Exception:
+            return False
+
+
+_pools: Dict[Tuple[int, Tuple[str, ...]], Web3] = {}
+
+
+def get_web3(chain_id: int, cfg: TelliotConfig) -> Web3:
+    """Shared Web3 instance over every endpoint configured for a chain"""
+    urls = tuple(endpoint.url for endpoint in cfg.endpoints.find(chain_id=chain_id))
+    if not urls:
+        raise ValueError(f"Endpoint not found for chain_id={chain_id}")
+    w3 = _pools.get((chain_id, urls))
+    if w3 is None:
+        w3 = _pools[(chain_id, urls)] = Web3(RPCPool(urls))
+        metrics.instrument_web3(w3)
+    return w3
+
+
+def get_rpc_pool(chain_id: int, cfg: TelliotConfig) -> RPCPool:
+    """The pool behind `get_web3` for a chain"""
+    return cast(RPCPool, get_web3(chain_id, cfg).provider)
@@ -1,18 +1,68 @@
-from statistics import stdev
+import math
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
 from typing import List
+from typing import Mapping
 from typing import Optional
+from typing import Sequence
+from typing import TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+
+
+def pct_returns(close_prices: Sequence[float]) -> Optional[List[float]]:
+    """Percent change between consecutive prices, None if a price is zero"""
+    if any(price == 0 for price in close_prices[:-1]):
+        return None
+    return [(j - i) / i for i, j in zip(close_prices[:-1], close_prices[1:])]
+
+
+def trailing_volatilities(close_prices: Sequence[float], windows: Iterable[int]) -> Dict[int, Optional[float]]:
+    """Standard deviation of the last `window` returns of a price series, for each window
+
+    Returns are computed once and summed cumulatively, so every window costs
+    constant time. A window is None if the series is too short for it (a
+    window of n returns needs n + 1 prices) or contains a zero price.
+    """
+    windows = list(windows)
+    returns = pct_returns(close_prices)
+    if returns is None:
+        return {window: None for window in windows}
+
+    # shift by the first return so the sums of squares don't lose precision
+    shift = returns[0] if returns else 0.0
+    sums = [0.0]
+    squares = [0.0]
+    for r in reversed(returns):
+        sums.append(sums[-1] + (r - shift))
+        squares.append(squares[-1] + (r - shift) ** 2)
+
+    volatilities: Dict[int, Optional[float]] = {}
+    for window in windows:
+        if window < 2 or window > len(returns):
+            volatilities[window] = None
+            continue
+        variance = (squares[window] - sums[window] ** 2 / window) / (window - 1)
+        volatilities[window] = math.sqrt(max(variance, 0.0))
+    return volatilities
+
+
+def volatility_table(
+    close_prices: Mapping[K, Sequence[float]], windows: Iterable[int]
+) -> Dict[K, Dict[int, Optional[float]]]:
+    """Trailing volatilities of several price series (e.g. one per asset) for the same windows"""
+    windows = list(windows)
+    return {key: trailing_volatilities(prices, windows) for key, prices in close_prices.items()}
 
 
 def stdev_calculator(close_prices: List[float]) -> Optional[float]:
     """
     Calculates the percent change(daily returns) for a list of numbers and returns the standard deviation
     """
-
-    pct_change = []
-    for i, j in zip(close_prices[:-1], close_prices[1:]):
-        try:
-            pct = (j - i) / i
-        except ZeroDivisionError:
-            pct = None
-        pct_change.append(pct)
-    return stdev(pct_change)  # type: ignore
+    window = len(close_prices) - 1
+    volatility = trailing_volatilities(close_prices, [window])[window]
+    if volatility is None:
+        raise ValueError(f"unable to calculate the standard deviation of {window} returns")
+    return volatility
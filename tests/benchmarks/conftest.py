@@ -0,0 +1,5 @@
+"""The benchmarks import their `replay` package as a top-level package"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[2] / "benchmarks"))
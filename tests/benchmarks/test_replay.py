@@ -0,0 +1,195 @@
+import argparse
+import json
+
+import bench_reporting_cycle
+import pytest
+import requests
+from replay.cassette import Cassette
+from replay.cassette import Interaction
+from replay.cassette import REDACTED
+from replay.cassette import Redactor
+from replay.server import REPLAY_URL_HEADER
+from replay.server import ReplayServer
+
+SECRET = "0123456789abcdef0123"
+NODE = f"https://node.example/v3/{SECRET}"
+PRICE = "https://api.example/price?ids=ethereum"
+
+
+def rpc(method, id, params=()):
+    return json.dumps({"jsonrpc": "2.0", "id": id, "method": method, "params": list(params)})
+
+
+def rpc_result(result, id=1):
+    return json.dumps({"jsonrpc": "2.0", "id": id, "result": result})
+
+
+@pytest.fixture
+def cassette():
+    return Cassette(
+        meta={"scenario": "test"},
+        interactions=[
+            Interaction("POST", NODE, rpc("eth_blockNumber", 1), 200, rpc_result("0x1")),
+            Interaction("POST", NODE, rpc("eth_blockNumber", 2), 200, rpc_result("0x2")),
+            Interaction("POST", NODE, rpc("eth_call", 3, ["0xaa"]), 200, rpc_result("0x0a")),
+            Interaction("GET", PRICE, "", 200, '{"ethereum": {"usd": 1000}}'),
+        ],
+    )
+
+
+def test_match_ignores_rpc_ids_and_repeats_the_last_recording(cassette):
+    responses = []
+    for id in (7, 8, 9):
+        interaction, exact = cassette.match("POST", NODE, rpc("eth_blockNumber", id))
+        assert exact
+        responses.append(json.loads(interaction.response)["result"])
+
+    assert responses == ["0x1", "0x2", "0x2"]
+
+
+def test_match_falls_back_to_the_endpoint(cassette):
+    interaction, exact = cassette.match("POST", NODE, rpc("eth_call", 1, ["0xbb"]))
+    assert not exact
+    assert json.loads(interaction.response)["result"] == "0x0a"
+
+    interaction, exact = cassette.match("get", "https://api.example/price?ids=bitcoin", "")
+    assert not exact
+    assert interaction.url == PRICE
+
+    assert cassette.match("POST", NODE, rpc("eth_chainId", 1)) == (None, False)
+    assert cassette.match("GET", "https://other.example/price?ids=ethereum", "") == (None, False)
+
+
+def test_rewind_replays_from_the_start(cassette):
+    cassette.match("POST", NODE, rpc("eth_blockNumber", 1))
+    cassette.rewind()
+
+    interaction, _ = cassette.match("POST", NODE, rpc("eth_blockNumber", 1))
+    assert json.loads(interaction.response)["result"] == "0x1"
+
+
+def test_save_and_load(cassette, tmp_path):
+    path = tmp_path / "cassettes" / "test.json"
+    cassette.save(path)
+
+    loaded = Cassette.load(path)
+    assert loaded.meta == cassette.meta
+    assert loaded.interactions == cassette.interactions
+
+    data = json.loads(path.read_text())
+    data["version"] = 0
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError):
+        Cassette.load(path)
+
+
+def test_redactor_replaces_longest_secret_first():
+    redact = Redactor([SECRET, "0123456789", "short"])
+
+    assert redact(NODE) == f"https://node.example/v3/{REDACTED}"
+    assert redact("key=0123456789&short") == f"key={REDACTED}&short"
+
+
+@pytest.fixture
+def server(cassette):
+    # recorded with the node key redacted, replayed requests are redacted before they are matched
+    redactor = Redactor([SECRET])
+    for interaction in cassette.interactions:
+        interaction.url = redactor(interaction.url)
+    cassette.rewind()
+    server = ReplayServer(cassette, redactor=redactor)
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_server_answers_with_recordings(server):
+    response = requests.post(
+        f"{server.url}/replay",
+        data=rpc("eth_blockNumber", 42),
+        headers={REPLAY_URL_HEADER: NODE, "Content-Type": "application/json"},
+    )
+    assert response.json() == {"jsonrpc": "2.0", "id": 42, "result": "0x1"}
+
+    response = requests.get(f"{server.url}/replay", headers={REPLAY_URL_HEADER: "https://api.example/price?ids=btc"})
+    assert response.json() == {"ethereum": {"usd": 1000}}
+    assert dict(server.inexact) == {"GET https://api.example/price": 1}
+    assert not server.misses
+
+
+def test_server_counts_unrecorded_requests(server):
+    response = requests.post(f"{server.url}/replay", data=rpc("eth_chainId", 5), headers={REPLAY_URL_HEADER: NODE})
+    assert response.status_code == 200
+    assert response.json()["error"]["message"] == "not recorded"
+    assert response.json()["id"] == 5
+
+    url = "https://other.example/price"
+    response = requests.get(f"{server.url}/replay", headers={REPLAY_URL_HEADER: url})
+    assert response.status_code == 404
+    assert dict(server.misses) == {f"POST https://node.example/v3/{REDACTED}": 1, f"GET {url}": 1}
+
+    server.rewind()
+    assert not server.misses
+
+
+def replay_args(cassettes, **kwargs):
+    defaults = dict(
+        scenarios=["spot-median"],
+        cassettes=cassettes,
+        redact=[],
+        latency=0.0,
+        jitter=0.0,
+        seed=0,
+        rounds=1,
+        json=None,
+        baseline=None,
+        tolerance=0.25,
+    )
+    return argparse.Namespace(**{**defaults, **kwargs})
+
+
+def test_replay_fails_without_cassettes(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(bench_reporting_cycle, "config_secrets", lambda extra: extra)
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"scenarios": {"spot-median": {"stages": {}}}}))
+
+    assert bench_reporting_cycle.replay(replay_args(tmp_path)) == 1
+    assert bench_reporting_cycle.replay(replay_args(tmp_path, baseline=str(baseline))) == 1
+    assert "MISSING spot-median: no cassette" in capsys.readouterr().out
+
+
+def test_compare_flags_missing_stages_and_regressions():
+    stage = {"wall": 1.0, "http_calls": 1, "rpc_calls": 2}
+    baseline = {"scenarios": {"spot-median": {"stages": {"fetch": stage, "aggregate": stage}}}}
+
+    report = {"scenarios": {"spot-median": {"stages": {"fetch": stage, "aggregate": stage}}}}
+    assert bench_reporting_cycle.compare(report, baseline, 0.25) == 0
+
+    report = {"scenarios": {"spot-median": {"stages": {"fetch": stage}}}}
+    assert bench_reporting_cycle.compare(report, baseline, 0.25) == 1
+
+    slower = {**stage, "wall": 1.5}
+    report = {"scenarios": {"spot-median": {"stages": {"fetch": stage, "aggregate": slower}}}}
+    assert bench_reporting_cycle.compare(report, baseline, 0.25) == 1
+
+
+def test_committed_cassettes_replay_within_baseline(tmp_path, monkeypatch):
+    """Replay the committed cassettes offline, failing on calls the baseline doesn't make"""
+    monkeypatch.setattr(bench_reporting_cycle, "config_secrets", lambda extra: extra)
+    cassettes = bench_reporting_cycle.CASSETTES
+    scenarios = sorted(path.stem for path in cassettes.glob("*.json"))
+    results = tmp_path / "results.json"
+    # wall-clock times of shared CI runners vary too much to compare
+    args = replay_args(
+        cassettes,
+        scenarios=scenarios,
+        json=str(results),
+        baseline=str(cassettes.parent / "baseline.json"),
+        tolerance=float("inf"),
+    )
+
+    assert scenarios
+    assert bench_reporting_cycle.replay(args) == 0
+    for name, scenario in json.loads(results.read_text())["scenarios"].items():
+        assert not scenario["misses"], name
+        assert all(stage["error"] is None for stage in scenario["stages"].values()), name
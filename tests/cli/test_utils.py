@@ -3,12 +3,29 @@ from unittest import mock
 import pytest
 from hexbytes import HexBytes
 
+from telliot_feeds.cli.utils import async_run
 from telliot_feeds.cli.utils import build_query
 from telliot_feeds.cli.utils import call_oracle
 from telliot_feeds.cli.utils import CustomHexBytes
 from telliot_feeds.queries.abi_query import AbiQuery
 from telliot_feeds.queries.price.spot_price import SpotPrice
 from telliot_feeds.reporters.stake import Stake
+from telliot_feeds.utils import http_client
+
+
+def test_async_run_closes_http_client(monkeypatch):
+    client = http_client.HTTPClient()
+    monkeypatch.setattr(http_client, "_client", client)
+    sessions = []
+
+    @async_run
+    async def command(value):
+        sessions.append(client.session())
+        return value
+
+    assert command(1) == 1
+    assert sessions[0].closed
+    assert not client._sessions
 
 
 def test_build_query():
@@ -0,0 +1,45 @@
+import sys
+
+import telliot_feeds.feeds as feeds
+from telliot_feeds.datafeed import DataFeed
+from telliot_feeds.feeds import CATALOG_FEEDS
+from telliot_feeds.feeds import DATAFEED_BUILDER_MAPPING
+from telliot_feeds.feeds import FEED_MODULES
+from telliot_feeds.feeds.registry import LazyFeedRegistry
+
+
+def test_registry_loads_feed_on_first_access():
+    loaded = []
+
+    def load(name):
+        loaded.append(name)
+        return f"feed {name}"
+
+    registry = LazyFeedRegistry({"a": "a_feed", "b": "b_feed"}, load)
+    assert "a" in registry
+    assert len(registry) == 2
+    assert list(registry) == ["a", "b"]
+    assert loaded == []
+
+    assert registry["a"] == "feed a_feed"
+    assert registry["a"] == "feed a_feed"
+    assert loaded == ["a_feed"]
+
+    registry["c"] = "custom"
+    assert registry["c"] == "custom"
+    del registry["a"]
+    assert "a" not in registry
+    assert list(registry) == ["b", "c"]
+
+
+def test_feeds_resolve_to_one_object():
+    feed = CATALOG_FEEDS["eth-usd-spot"]
+    assert isinstance(feed, DataFeed)
+    assert feeds.eth_usd_median_feed is feed
+    module = sys.modules["telliot_feeds.feeds." + FEED_MODULES["eth_usd_median_feed"]]
+    assert module.eth_usd_median_feed is feed
+
+
+def test_feed_names_are_listed():
+    assert isinstance(DATAFEED_BUILDER_MAPPING["SpotPrice"], DataFeed)
+    assert set(FEED_MODULES) <= set(dir(feeds))
@@ -1,4 +1,7 @@
 from dataclasses import dataclass
+from unittest import mock
+
+from eth_abi import encode_abi
 
 from telliot_feeds.queries.price.spot_price import SpotPrice
 from telliot_feeds.queries.query import OracleQuery
@@ -23,3 +26,20 @@ def test_query_from_state():
     print(q)
     assert isinstance(q, SpotPrice)
     assert q.asset == "ohm"
+
+
+def test_query_data_and_id_are_cached():
+    q = SpotPrice(asset="btc", currency="usd")
+    with mock.patch("telliot_feeds.queries.abi_query.encode_abi", wraps=encode_abi) as encode:
+        query_data = q.query_data
+        query_id = q.query_id
+        encodings = encode.call_count
+        assert q.query_data is query_data
+        assert q.query_id is query_id
+        assert encode.call_count == encodings  # nothing encoded again
+
+    # assigning a parameter invalidates the cache
+    q.asset = "eth"
+    assert q.query_data == SpotPrice(asset="eth", currency="usd").query_data
+    assert q.query_id == SpotPrice(asset="eth", currency="usd").query_id
+    assert q.query_id != query_id
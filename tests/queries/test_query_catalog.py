@@ -1,3 +1,5 @@
+from telliot_feeds.queries.catalog import Catalog
+from telliot_feeds.queries.price.spot_price import SpotPrice
 from telliot_feeds.queries.query import OracleQuery
 from telliot_feeds.queries.query_catalog import query_catalog
 
@@ -26,3 +28,35 @@ def test_to_markdown():
     md = query_catalog.to_markdown()
     assert isinstance(md, str)
     print(md)
+
+
+def test_indexed_find_matches_linear_scan():
+    """Indexed lookups return the same entries, in the same order, as scanning every entry"""
+    entries = list(query_catalog._entries.values())
+    for entry in entries[:20]:
+        qid = entry.query_id
+        assert query_catalog.find(query_id=qid) == [e for e in entries if e.query_id.lower() == qid.lower()]
+        assert query_catalog.find(query_id=qid[2:].upper()) == query_catalog.find(query_id=qid)
+        assert query_catalog.find(query_type=entry.query_type.upper()) == [
+            e for e in entries if e.query_type == entry.query_type
+        ]
+
+    for substring in ["eth", "usd-spot", "-", "volatility", "not-a-tag"]:
+        assert query_catalog.find(tag=substring) == [e for e in entries if substring in e.tag]
+    assert query_catalog.find(tag="usd", active=False) == [e for e in entries if "usd" in e.tag and not e.active]
+
+
+def test_add_entry_updates_indexes():
+    catalog = Catalog()
+    catalog.add_entry(tag="btc-usd-spot", title="BTC/USD spot price", q=SpotPrice(asset="btc", currency="usd"))
+    catalog.add_entry(tag="eth-usd-spot", title="ETH/USD spot price", q=SpotPrice(asset="eth", currency="usd"))
+
+    qid = SpotPrice(asset="eth", currency="usd").query_id.hex()
+    assert [e.tag for e in catalog.find(query_id=qid)] == ["eth-usd-spot"]
+    assert [e.tag for e in catalog.find(query_type="spotprice")] == ["btc-usd-spot", "eth-usd-spot"]
+    assert [e.tag for e in catalog.find(tag="c-u")] == ["btc-usd-spot"]
+
+    # entries set directly (e.g. restored from state) are indexed on the next lookup
+    restored = Catalog()
+    restored._entries = dict(catalog._entries)
+    assert [e.tag for e in restored.find(query_id=qid)] == ["eth-usd-spot"]
@@ -141,6 +141,13 @@ async def test_fail_get_account_nonce(tellor_360, caplog, guaranteed_price_sourc
         assert val is None
         assert "Unable to retrieve account nonce: UnknownException" in caplog.text
 
+    # transactions still pending count towards the nonce
+    with mock.patch("web3.eth.Eth.get_transaction_count", return_value=5) as get_transaction_count:
+        val, status = r.get_acct_nonce()
+        assert status.ok
+        assert val == 5
+        get_transaction_count.assert_called_once_with(r.acct_address, "pending")
+
 
 @pytest.mark.asyncio
 async def test_get_time_based_rewards(tellor_360, caplog):
@@ -587,3 +594,60 @@ async def test_reset_datafeed(tellor_flex_reporter):
             chain.sleep(43201)
 
     _ = await reprt()
+
+
+@pytest.mark.asyncio
+async def test_report_top_feeds(tellor_360, guaranteed_price_source, monkeypatch):
+    """Test reporting several funded feeds in one loop, in consecutive blocks"""
+    contracts, account = tellor_360
+    feeds = [eth_usd_median_feed, btc_usd_median_feed, trb_usd_median_feed]
+    for feed in feeds:
+        feed.source = guaranteed_price_source
+
+    async def mock_get_feeds_and_tips(autopay, skip_manual_feeds, limit):
+        return [(feed, int(1e18)) for feed in feeds[:limit]]
+
+    monkeypatch.setattr("telliot_feeds.reporters.tellor_360.get_feeds_and_tips", mock_get_feeds_and_tips)
+
+    r = Tellor360Reporter(
+        oracle=contracts.oracle,
+        token=contracts.token,
+        autopay=contracts.autopay,
+        endpoint=contracts.oracle.node,
+        account=account,
+        chain_id=CHAIN_ID,
+        transaction_type=0,
+        min_native_token_balance=0,
+        check_rewards=False,
+        max_feeds=2,
+        **txn_kwargs,
+    )
+    r.ensure_staked = passing_bool_w_status
+    r.check_reporter_lock = AsyncMock(return_value=ResponseStatus())
+    r.sign_n_send_transaction = AsyncMock(return_value=({"status": 1, "blockNumber": 7}, ResponseStatus()))
+    r.wait_for_next_block = AsyncMock(return_value=ResponseStatus())
+
+    # reporter lock doesn't allow more than one report at a time
+    r.stake_info.store_stake_amount(int(10e18))
+    r.stake_info.store_staker_balance(int(10e18))
+    receipts, status = await r.report_top_feeds()
+    assert status.ok
+    assert len(receipts) == 1
+
+    # the oracle divides the balance by the stake amount first: 43200 * 1000 / 43200 isn't below 1000
+    r.stake_info.store_stake_amount(2)
+    r.stake_info.store_staker_balance(86401)
+    assert r.report_slots() == 1
+
+    # no reporter lock (stake far above the stake amount)
+    r.stake_info.store_stake_amount(1)
+    r.stake_info.store_staker_balance(int(10e18))
+    assert r.report_slots() == 2
+    receipts, status = await r.report_top_feeds()
+    assert status.ok
+    assert len(receipts) == 2
+    # the second report waits for a block after the one the first was mined in
+    r.wait_for_next_block.assert_awaited_once_with(7)
+
+    built_txs = [call.args[0] for call in r.sign_n_send_transaction.call_args_list[1:]]
+    assert built_txs[1]["nonce"] == built_txs[0]["nonce"] + 1
@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from hexbytes import HexBytes
+from web3 import Web3
+
+from telliot_feeds.reporters.bundles import BundleSubmitter
+
+
+SIGNED_TX = HexBytes(b"\x02" + b"\x01" * 100)
+TX_HASH = HexBytes(Web3.keccak(SIGNED_TX))
+
+
+class StubEth:
+    """Chain mining a block whenever `mine` is called"""
+
+    def __init__(self, block_number=100):
+        self.block_number = block_number
+        self.blocks = {}
+
+    def mine(self, *txs):
+        self.block_number += 1
+        self.blocks[self.block_number] = list(txs)
+
+    def get_block(self, number):
+        return {"number": number, "timestamp": 1_000 + number, "transactions": self.blocks.get(number, [])}
+
+    def get_transaction_receipt(self, tx_hash):
+        block = next(n for n, txs in self.blocks.items() if tx_hash in txs)
+        return {"transactionHash": tx_hash, "blockNumber": block}
+
+
+class StubFlashbots:
+    def __init__(self, simulation=None, send_errors=()):
+        self.simulation = simulation or {"results": [{"txHash": TX_HASH.hex(), "gasUsed": 21000}]}
+        self.send_errors = set(send_errors)
+        self.simulated = []
+        self.sent = {}
+        self.cancelled = []
+
+    def call_bundle(self, txs, block_number, state_block_number, timestamp):
+        self.simulated.append((block_number, state_block_number, timestamp))
+        return self.simulation
+
+    def send_raw_bundle(self, txs, target_block_number, opts):
+        if target_block_number in self.send_errors:
+            raise ConnectionError("relay unavailable")
+        self.sent[target_block_number] = opts["replacementUuid"]
+
+    def cancel_bundle(self, replacement_uuid):
+        self.cancelled.append(replacement_uuid)
+
+
+def submitter(**kwargs):
+    w3 = SimpleNamespace(eth=StubEth(), flashbots=StubFlashbots(**kwargs))
+    return w3, BundleSubmitter(w3, target_blocks=3, poll_interval=0.01)
+
+
+@pytest.mark.asyncio
+async def test_bundle_sent_for_several_blocks_and_rest_cancelled():
+    w3, bundles = submitter()
+    task = asyncio.create_task(bundles.submit(SIGNED_TX))
+    await asyncio.sleep(0.05)
+    assert w3.flashbots.simulated == [("0x65", "0x64", 1_112)]
+    assert sorted(w3.flashbots.sent) == [101, 102, 103]
+
+    # the event loop isn't blocked while waiting for inclusion
+    w3.eth.mine()
+    await asyncio.sleep(0.05)
+    assert not task.done()
+    w3.eth.mine(TX_HASH)
+
+    receipt, status = await task
+    assert status.ok
+    assert receipt["blockNumber"] == 102
+    assert w3.flashbots.cancelled == [w3.flashbots.sent[103]]
+
+
+@pytest.mark.asyncio
+async def test_reverting_bundle_is_not_sent():
+    w3, bundles = submitter(simulation={"results": [{"txHash": "0x1", "error": "execution reverted"}]})
+    receipt, status = await bundles.submit(SIGNED_TX)
+    assert receipt is None
+    assert "would fail" in status.error
+    assert w3.flashbots.sent == {}
+
+
+@pytest.mark.asyncio
+async def test_bundle_not_included():
+    w3, bundles = submitter(send_errors=[103])
+    task = asyncio.create_task(bundles.submit(SIGNED_TX))
+    await asyncio.sleep(0.05)
+    # failed sends don't count as targets
+    assert sorted(w3.flashbots.sent) == [101, 102]
+    w3.eth.mine()
+    w3.eth.mine()
+
+    receipt, status = await task
+    assert receipt is None
+    assert "Bundle was not executed in blocks 101 to 102" in status.error
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import pytest
+
+from telliot_feeds.reporters.fee_history import FeeHistoryCache
+from telliot_feeds.reporters.fee_history import percentile
+
+
+class StubEth:
+    """Chain whose block n has base fee n gwei and priority fees n, 2n and 3n wei"""
+
+    def __init__(self, block_number):
+        self.block_number = block_number
+        self.requests = []
+
+    def fee_history(self, block_count, newest_block, reward_percentiles):
+        self.requests.append((block_count, newest_block))
+        oldest = max(newest_block - block_count + 1, 0)
+        blocks = range(oldest, newest_block + 1)
+        return {
+            "oldestBlock": oldest,
+            "baseFeePerGas": [n * 10**9 for n in blocks] + [(newest_block + 1) * 10**9],
+            "gasUsedRatio": [0.5 for _ in blocks],
+            "reward": [[n, 2 * n, 3 * n] for n in blocks],
+        }
+
+
+def test_percentile():
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([4, 1, 3], 100) == 4
+    assert percentile([7], 25) == 7
+    with pytest.raises(ValueError):
+        percentile([], 50)
+
+
+def test_fetches_only_new_blocks():
+    w3 = SimpleNamespace(eth=StubEth(block_number=100))
+    cache = FeeHistoryCache([25.0, 50.0, 75.0], size=8, max_age=0)
+
+    assert cache.update(w3).ok
+    assert w3.eth.requests == [(8, 100)]
+    assert list(cache.blocks) == list(range(93, 101))
+
+    # same head, nothing fetched
+    assert cache.update(w3).ok
+    assert len(w3.eth.requests) == 1
+
+    w3.eth.block_number = 103
+    assert cache.update(w3).ok
+    assert w3.eth.requests[-1] == (3, 103)
+    assert list(cache.blocks) == list(range(96, 104))
+
+    history = cache.fee_history(4)
+    assert history["oldestBlock"] == 100
+    assert history["baseFeePerGas"] == [n * 10**9 for n in range(100, 105)]
+    assert history["reward"][-1] == [103, 206, 309]
+
+
+def test_recent_check_is_reused():
+    w3 = SimpleNamespace(eth=StubEth(block_number=10))
+    cache = FeeHistoryCache([50.0], size=4, max_age=60)
+    cache.update(w3)
+    w3.eth.block_number = 11
+    cache.update(w3)
+    assert cache.head == 10
+
+    # a new connection starts over
+    w3_other = SimpleNamespace(eth=StubEth(block_number=11))
+    cache.update(w3_other)
+    assert cache.head == 11
+    assert w3_other.eth.requests == [(4, 11)]
+
+
+def test_fetch_error():
+    class FailingEth(StubEth):
+        def fee_history(self, *args, **kwargs):
+            raise ValueError("bingo")
+
+    cache = FeeHistoryCache([50.0])
+    status = cache.update(SimpleNamespace(eth=FailingEth(block_number=1)))
+    assert not status.ok
+    assert "Error fetching fee history" in status.error
+
+
+def test_estimators():
+    w3 = SimpleNamespace(eth=StubEth(block_number=4))
+    cache = FeeHistoryCache([25.0, 50.0, 75.0], size=5, max_age=0)
+    cache.update(w3)
+
+    # block 0 has no priority fees and is left out
+    assert cache.priority_fee(reward_percentile=50.0, q=50.0) == 5
+    assert cache.priority_fee(reward_percentile=75.0, q=100.0, block_count=2) == 12
+    assert cache.base_fee_ewma(alpha=1.0) == 5 * 10**9
+    assert 0 < cache.base_fee_ewma(alpha=0.5) < 5 * 10**9
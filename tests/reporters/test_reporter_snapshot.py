@@ -0,0 +1,110 @@
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.reporters.rewards.time_based_rewards import get_time_based_rewards
+from telliot_feeds.reporters.snapshot import Read
+from telliot_feeds.reporters.snapshot import SnapshotContract
+from telliot_feeds.reporters.snapshot import take_snapshot
+
+
+ACCOUNT = "0x000000000000000000000000000000000000dEaD"
+ORACLE = "0x0000000000000000000000000000000000000001"
+AUTOPAY = "0x0000000000000000000000000000000000000002"
+QUERY_ID = b"q" * 32
+
+
+def contract(address):
+    c = MagicMock()
+    c.address = address
+    c.read = AsyncMock(return_value=("from contract", ResponseStatus()))
+    c.get_current_tip = AsyncMock(return_value=(0, ResponseStatus()))
+    return c
+
+
+def fake_multicall(response):
+    """Multicall class answering every aggregate with `response`, recording the calls made"""
+    instances = []
+
+    class FakeMulticall:
+        multicall_address = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+        def __init__(self, calls, **kwargs):
+            self.calls = calls
+            instances.append(self)
+
+        async def coroutine(self):
+            return response
+
+    return FakeMulticall, instances
+
+
+@pytest.mark.asyncio
+async def test_take_snapshot():
+    oracle, autopay = contract(ORACLE), contract(AUTOPAY)
+    reads = [
+        Read(oracle, "getStakeAmount"),
+        Read(oracle, "getStakerInfo", {"_stakerAddress": ACCOUNT}),
+        Read(oracle, "timeOfLastDistribution"),
+        Read(autopay, "getCurrentTip", {"_queryId": QUERY_ID}),
+    ]
+    response = {
+        (0, 0): 100,
+        **{(1, j): j for j in range(9)},
+        (2, 0): None,  # reverted
+        (3, 0): 7,
+        "native_balance": 10**18,
+        "block_number": 123,
+        "timestamp": 456,
+    }
+    multicall, instances = fake_multicall(response)
+    with patch("telliot_feeds.reporters.snapshot.Multicall", multicall):
+        snapshot, status = await take_snapshot(MagicMock(), ACCOUNT, reads)
+
+    assert status.ok
+    # one aggregate with every read plus balance, block number and timestamp
+    assert len(instances) == 1
+    assert len(instances[0].calls) == 7
+    assert (snapshot.block_number, snapshot.timestamp, snapshot.native_balance) == (123, 456, 10**18)
+    assert snapshot.get(ORACLE, "getStakeAmount") == 100
+    assert snapshot.get(ORACLE, "getStakerInfo", _stakerAddress=ACCOUNT) == list(range(9))
+    assert snapshot.get(ORACLE, "timeOfLastDistribution") is None
+
+    # reads fall back to the contract when missing from the snapshot
+    oracle_state = SnapshotContract(oracle, snapshot)
+    assert await oracle_state.read("getStakeAmount") == (100, ResponseStatus())
+    value, _ = await oracle_state.read("timeOfLastDistribution")
+    assert value == "from contract"
+    oracle.read.assert_awaited_once_with("timeOfLastDistribution")
+
+    autopay_state = SnapshotContract(autopay, snapshot)
+    tip, status = await autopay_state.get_current_tip(QUERY_ID)
+    assert tip == 7 and status.ok
+    assert autopay_state.address == AUTOPAY
+    autopay.get_current_tip.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_take_snapshot_failure():
+    with patch("telliot_feeds.reporters.snapshot.Multicall", side_effect=KeyError(1337)):
+        snapshot, status = await take_snapshot(MagicMock(), ACCOUNT, [])
+    assert snapshot is None
+    assert not status.ok
+
+
+@pytest.mark.asyncio
+async def test_time_based_rewards_read_once():
+    oracle = contract(ORACLE)
+    multicall, _ = fake_multicall({(0, 0): 1_000, (1, 0): 5 * 10**17})
+    reads = [Read(oracle, "timeOfLastDistribution"), Read(oracle, "timeBasedReward")]
+    with patch("telliot_feeds.reporters.snapshot.Multicall", multicall):
+        snapshot, _ = await take_snapshot(MagicMock(), ACCOUNT, reads)
+
+    with patch("telliot_feeds.reporters.rewards.time_based_rewards.TimeStamp.now") as now:
+        now.return_value.ts = 1_300
+        reward = await get_time_based_rewards(SnapshotContract(oracle, snapshot))
+    assert reward == 5 * 10**17
+    oracle.read.assert_not_awaited()
@@ -0,0 +1,104 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+
+from telliot_feeds.reporters.scheduler import AUTOPAY_EVENTS
+from telliot_feeds.reporters.scheduler import ORACLE_EVENTS
+from telliot_feeds.reporters.scheduler import ReportScheduler
+
+
+def event(name, *indexed):
+    return {
+        "type": "event",
+        "name": name,
+        "anonymous": False,
+        "inputs": [{"name": arg, "type": typ, "indexed": True} for arg, typ in indexed]
+        + [{"name": "_data", "type": "bytes", "indexed": False}],
+    }
+
+
+NEW_REPORT = event("NewReport", ("_queryId", "bytes32"), ("_time", "uint256"), ("_reporter", "address"))
+TIP_ADDED = event("TipAdded", ("_queryId", "bytes32"))
+ORACLE = SimpleNamespace(address="0x" + "01" * 20, contract=SimpleNamespace(abi=[NEW_REPORT]))
+AUTOPAY = SimpleNamespace(address="0x" + "02" * 20, contract=SimpleNamespace(abi=[TIP_ADDED]))
+REPORTER = "0x" + "ab" * 20
+QUERY_ID = b"q" * 32
+
+
+def tip_log(block, query_id=QUERY_ID):
+    return {"blockNumber": block, "topics": [HexBytes(event_abi_to_log_topic(TIP_ADDED)), HexBytes(query_id)]}
+
+
+def report_log(block, reporter):
+    topics = [
+        event_abi_to_log_topic(NEW_REPORT),
+        QUERY_ID,
+        (1).to_bytes(32, "big"),
+        bytes(12) + bytes.fromhex(reporter[2:]),
+    ]
+    return {"blockNumber": block, "topics": [HexBytes(topic) for topic in topics]}
+
+
+class StubEth:
+    def __init__(self):
+        self.block_number = 100
+        self.logs = []
+        self.filters = []
+
+    def get_logs(self, log_filter):
+        self.filters.append(log_filter)
+        return [log for log in self.logs if log_filter["fromBlock"] <= log["blockNumber"] <= log_filter["toBlock"]]
+
+
+@pytest.fixture
+def scheduler():
+    w3 = SimpleNamespace(eth=StubEth())
+    return ReportScheduler(
+        w3, [(ORACLE, ORACLE_EVENTS), (AUTOPAY, AUTOPAY_EVENTS)], poll_interval=0.01, max_idle=0.1, reporter=REPORTER
+    )
+
+
+@pytest.mark.asyncio
+async def test_wakes_on_new_tip(scheduler):
+    eth = scheduler.web3.eth
+    assert await scheduler.wait() == "nothing happened for 0.1 seconds"
+    # no new block, no logs requested
+    assert eth.filters == []
+
+    eth.block_number = 102
+    eth.logs = [tip_log(101)]
+    assert await scheduler.wait() == "1 new event(s) in block 101"
+    assert eth.filters[0]["fromBlock"] == 101
+    assert eth.filters[0]["address"] == [ORACLE.address, AUTOPAY.address]
+    assert len(eth.filters[0]["topics"][0]) == 2
+
+    # logs are only requested for blocks not checked yet
+    eth.block_number = 103
+    assert (await scheduler.wait()).startswith("nothing happened")
+    assert eth.filters[-1]["fromBlock"] == 103
+
+
+@pytest.mark.asyncio
+async def test_ignores_own_reports_and_other_queries(scheduler):
+    eth = scheduler.web3.eth
+    await scheduler.poll()
+    scheduler.query_ids = [QUERY_ID]
+
+    eth.block_number = 101
+    eth.logs = [report_log(101, REPORTER), tip_log(101, query_id=b"o" * 32)]
+    assert (await scheduler.wait()).startswith("nothing happened")
+
+    eth.block_number = 102
+    eth.logs.append(report_log(102, "0x" + "cd" * 20))
+    assert await scheduler.wait() == "1 new event(s) in block 102"
+
+
+@pytest.mark.asyncio
+async def test_wakes_when_reporter_lock_expires(scheduler):
+    scheduler.max_idle = 10
+    start = time.time()
+    assert await scheduler.wait(wake_at=start + 0.05) == "reporter lock expired"
+    assert time.time() - start < 1
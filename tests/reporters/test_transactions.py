@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+from eth_account import Account
+from hexbytes import HexBytes
+from telliot_core.utils.response import ResponseStatus
+from web3.exceptions import TransactionNotFound
+
+from telliot_feeds.reporters.transactions import bump_fees
+from telliot_feeds.reporters.transactions import NonceManager
+from telliot_feeds.reporters.transactions import TransactionPipeline
+
+
+class StubEth:
+    """Accepts raw transactions, mining one only once `mine` is called"""
+
+    def __init__(self, transaction_count=0):
+        self.transaction_count = transaction_count
+        self.sent = []
+        self.mined = set()
+        self.send_errors = []
+
+    def send_raw_transaction(self, raw):
+        if self.send_errors:
+            raise self.send_errors.pop(0)
+        tx_hash = HexBytes(bytes([len(self.sent) + 1]) * 32)
+        self.sent.append(raw)
+        return tx_hash
+
+    def get_transaction_receipt(self, tx_hash):
+        if tx_hash not in self.mined:
+            raise TransactionNotFound(f"{tx_hash.hex()} not found")
+        return {"transactionHash": tx_hash, "status": 1}
+
+    def get_transaction_count(self, address):
+        return self.transaction_count
+
+
+class StubWeb3:
+    def __init__(self, **kwargs):
+        self.eth = StubEth(**kwargs)
+
+
+class StubAccount:
+    local_account = Account.create()
+
+
+def legacy_tx(nonce, gas_price=10):
+    return {
+        "nonce": nonce,
+        "gasPrice": gas_price,
+        "gas": 21_000,
+        "to": StubAccount.local_account.address,
+        "value": 0,
+        "chainId": 1,
+    }
+
+
+def pipeline(w3, **kwargs):
+    nonces = NonceManager(lambda: (w3.eth.get_transaction_count(None), ResponseStatus()))
+    return TransactionPipeline(w3, StubAccount(), nonces, poll_interval=0.01, max_poll_interval=0.01, **kwargs)
+
+
+def test_nonce_manager():
+    count = {"fetches": 0}
+
+    def fetch():
+        count["fetches"] += 1
+        return 5, ResponseStatus()
+
+    nonces = NonceManager(fetch)
+    assert [nonces.allocate()[0] for _ in range(3)] == [5, 6, 7]
+    assert count["fetches"] == 1
+
+    # the last nonce is handed out again, an earlier one forces a re-read
+    nonces.release(7)
+    assert nonces.allocate()[0] == 7
+    nonces.release(6)
+    assert nonces.allocate()[0] == 5
+    assert count["fetches"] == 2
+
+
+def test_bump_fees():
+    tx = {"maxFeePerGas": 100, "maxPriorityFeePerGas": 3, "gasPrice": None, "nonce": 1}
+    assert bump_fees(tx, 1.125) == {"maxFeePerGas": 113, "maxPriorityFeePerGas": 4, "gasPrice": None, "nonce": 1}
+
+
+@pytest.mark.asyncio
+async def test_submit_tracks_receipt_in_background():
+    w3 = StubWeb3()
+    p = pipeline(w3)
+
+    pending, status = await p.submit(legacy_tx(0))
+    assert status.ok
+    assert p.pending == {0: pending}
+
+    # the event loop keeps running while the transaction is pending
+    await asyncio.sleep(0.05)
+    assert not pending.task.done()
+
+    w3.eth.mined.add(pending.hashes[0])
+    receipt, status = await pending.wait()
+    assert status.ok
+    assert receipt["transactionHash"] == pending.hashes[0]
+    assert p.pending == {}
+
+
+@pytest.mark.asyncio
+async def test_stuck_transaction_is_replaced():
+    w3 = StubWeb3()
+    p = pipeline(w3, replace_after=0.02, max_replacements=2)
+
+    pending, _ = await p.submit(legacy_tx(0, gas_price=100))
+    await asyncio.sleep(0.2)
+    assert pending.replacements == 2
+    assert pending.tx["gasPrice"] == 128
+    assert pending.nonce == 0
+
+    w3.eth.mined.add(pending.hashes[1])
+    receipt, status = await pending.wait()
+    assert status.ok
+    assert receipt["transactionHash"] == pending.hashes[1]
+
+
+@pytest.mark.asyncio
+async def test_rejected_nonce_is_reread():
+    w3 = StubWeb3(transaction_count=3)
+    p = pipeline(w3)
+    p.nonces.next = 1
+
+    w3.eth.send_errors = [ValueError({"code": -32000, "message": "nonce too low"})]
+    pending, status = await p.submit(legacy_tx(1))
+    assert status.ok
+    assert pending.nonce == 3
+    assert p.nonces.next == 4
+    pending.task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_send_failure_releases_nonce():
+    w3 = StubWeb3()
+    p = pipeline(w3)
+    nonce, _ = p.nonces.allocate()
+
+    w3.eth.send_errors = [Exception("bingo")]
+    pending, status = await p.submit(legacy_tx(nonce))
+    assert pending is None
+    assert "Send transaction failed" in status.error
+    assert p.nonces.allocate()[0] == nonce
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_transaction_times_out():
+    w3 = StubWeb3()
+    p = pipeline(w3, timeout=0.05, max_replacements=0)
+    p.nonces.next = 1
+
+    pending, _ = await p.submit(legacy_tx(0))
+    receipt, status = await pending.wait()
+    assert receipt is None
+    assert not status.ok
+    assert "Failed to confirm transaction" in status.error
+    assert p.nonces.next is None
@@ -0,0 +1,77 @@
+import pytest
+
+from telliot_feeds.sources.ampleforth import bitfinex
+from telliot_feeds.sources.ampleforth.bitfinex import build_buckets
+from telliot_feeds.sources.ampleforth.bitfinex import merge_as_list
+from telliot_feeds.sources.ampleforth.bitfinex import RequestBudget
+from telliot_feeds.sources.ampleforth.bitfinex import retrieve_bitfinex_trades
+from telliot_feeds.sources.ampleforth.bitfinex import THOUSAND_MIN
+from telliot_feeds.sources.ampleforth.bitfinex import volume_weighted_average_price
+
+
+def test_merge_uses_latest_earlier_to_bucket():
+    """Each from bucket is converted with the last to bucket at or before its slot"""
+    start = 1_000_000
+    minute = THOUSAND_MIN
+    from_list = [
+        [1, start - minute, 1.0, 0.5],  # before start, no to bucket can apply
+        [2, start + 1, 2.0, 0.5],
+        [3, start + 5 * minute, -1.0, 1.0],
+        [4, start + 90 * minute, 4.0, 0.25],
+    ]
+    to_list = [
+        [5, start + 2, 1.0, 100.0],
+        [6, start + 3 * minute, 1.0, 200.0],
+        [7, start + 3 * minute + 1, 3.0, 0.0],
+    ]
+    merged = merge_as_list(build_buckets(start, from_list), build_buckets(start, to_list))
+    assert merged == [
+        {"trades": 100.0, "volume": 2.0},
+        {"trades": 50.0, "volume": 1.0},
+        {"trades": 50.0, "volume": 4.0},
+    ]
+    assert volume_weighted_average_price(start, from_list, to_list) == {"vwap": 200.0 / 7.0, "volume": 7.0}
+
+
+class PagedTrades:
+    """Serves trades in pages like the Bitfinex API, both bounds inclusive"""
+
+    def __init__(self, trades):
+        self.trades = trades
+        self.starts = []
+
+    async def get(self, url, params):
+        self.starts.append(params["start"])
+        page = [t for t in self.trades if params["start"] <= t[1] <= params["end"]]
+        return {"response": page[: params["limit"]], "status": 200}
+
+
+@pytest.mark.asyncio
+async def test_retrieve_trades_pages_without_duplicates(monkeypatch):
+    trades = [[i, 1000 + i // 3, 1.0, 1.0] for i in range(25)]
+    client = PagedTrades(trades)
+    monkeypatch.setattr(bitfinex, "PAGE_LIMIT", 10)
+    monkeypatch.setattr(bitfinex, "get_http_client", lambda: client)
+    monkeypatch.setattr(bitfinex, "request_budget", RequestBudget(requests=100))
+
+    retrieved = await retrieve_bitfinex_trades("tAMPUSD", 1000, 2000)
+
+    assert retrieved == trades
+    # pages continue from the timestamp of their last trade
+    assert client.starts == [1000, 1003, 1006]
+
+
+@pytest.mark.asyncio
+async def test_request_budget_waits_for_window(monkeypatch):
+    sleeps = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(bitfinex.asyncio, "sleep", sleep)
+    budget = RequestBudget(requests=2, window=60.0)
+    for _ in range(3):
+        await budget.acquire()
+
+    assert len(sleeps) == 1
+    assert 59.0 < sleeps[0] <= 60.0
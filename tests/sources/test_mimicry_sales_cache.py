@@ -0,0 +1,82 @@
+from datetime import datetime
+from datetime import timezone
+from unittest import mock
+
+import pytest
+
+from telliot_feeds.sources.mimicry.collection_stat import MimicryCollectionStatSource
+from telliot_feeds.sources.mimicry.sales_cache import sales_history_cache
+from telliot_feeds.sources.mimicry.sales_cache import SalesHistoryCache
+from telliot_feeds.sources.mimicry.types import Transaction
+
+
+CONTRACT = "0x5180db8F5c931aaE63c74266b211F580155ecac8"
+
+
+def sale(token_id, price, timestamp):
+    return {"price": {"amount": {"usd": price}}, "token": {"tokenId": token_id}, "timestamp": timestamp}
+
+
+def tx(token_id, price, timestamp):
+    return Transaction(itemId=token_id, price=price, date=datetime.fromtimestamp(timestamp, tz=timezone.utc))
+
+
+def reservoir_response(sales):
+    response = mock.MagicMock()
+    response.json.return_value = {"sales": sales, "continuation": None}
+    return response
+
+
+def test_sales_cache_round_trip(tmp_path):
+    cache = SalesHistoryCache(tmp_path)
+    assert cache.load(1, CONTRACT) is None
+
+    cache.replace(1, CONTRACT, 0, [tx("2", 20.0, 200), tx("1", 10.0, 100)])
+    cached = cache.load(1, CONTRACT)
+    assert len(cached) == 2
+    assert cached.last_timestamp == 200
+    assert [t.itemId for t in cached.transactions()] == ["1", "2"]
+
+    # sales at the last cached timestamp are returned again by Reservoir and must not duplicate
+    cache.append(1, CONTRACT, cached, [tx("3", 30.0, 300), tx("2", 20.0, 200), tx("4", 25.0, 200)])
+    cached = cache.load(1, CONTRACT)
+    assert [(t.itemId, t.price) for t in cached.transactions()] == [("1", 10.0), ("2", 20.0), ("4", 25.0), ("3", 30.0)]
+    assert [t.itemId for t in cached.transactions(since=250)] == ["3"]
+
+
+def test_sales_cache_ignores_interrupted_append(tmp_path):
+    cache = SalesHistoryCache(tmp_path)
+    cached = cache.replace(1, CONTRACT, 0, [tx("1", 10.0, 100)])
+
+    # rows written without a committed meta.json are not part of the history
+    with open(cache.path(1, CONTRACT) / "timestamps.bin", "ab") as f:
+        f.write(b"\x00" * 8)
+    assert len(cache.load(1, CONTRACT)) == 1
+
+    cache.append(1, CONTRACT, cached, [tx("2", 20.0, 200)])
+    assert [t.itemId for t in cache.load(1, CONTRACT).transactions()] == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_collection_stat_fetches_only_new_sales(tmp_path, monkeypatch):
+    monkeypatch.setattr(sales_history_cache, "directory", tmp_path)
+    source = MimicryCollectionStatSource(chainId=1, collectionAddress=CONTRACT, metric=0)
+
+    with mock.patch("requests.Session.get") as get:
+        # sales without a USD price are skipped whether or not they are cached
+        get.return_value = reservoir_response([sale("2", 20.0, 200), sale("1", 10.0, 100), sale("4", None, 50)])
+        history = await source.request_historical_sales_data(CONTRACT)
+        assert "startTimestamp=0&" in get.call_args.args[0]
+        assert len(history.transactions) == 2
+
+        get.return_value = reservoir_response([sale("3", 30.0, 300), sale("2", 20.0, 200)])
+        history = await source.request_historical_sales_data(CONTRACT)
+        assert "startTimestamp=200&" in get.call_args.args[0]
+        assert get.call_count == 2
+        assert [t.itemId for t in history.transactions] == ["1", "2", "3"]
+
+        get.return_value = reservoir_response([sale("4", None, 50)])
+        monkeypatch.setattr(sales_history_cache, "enabled", False)
+        history = await source.request_historical_sales_data(CONTRACT)
+        assert "startTimestamp=0&" in get.call_args.args[0]
+        assert history.transactions == []
@@ -0,0 +1,68 @@
+from unittest import mock
+
+import pytest
+
+from telliot_feeds.sources.price.historical.kraken_ohlc import DAY
+from telliot_feeds.sources.price.historical.kraken_ohlc import KrakenHistoricalPriceServiceOHLC
+from telliot_feeds.sources.price.historical.ohlc_store import OHLCStore
+from telliot_feeds.sources.price.historical.ohlc_store import RECORD
+from telliot_feeds.utils.stdev_calculator import stdev_calculator
+
+
+def candle(day, close):
+    return day * DAY, close, close + 1, close - 1, close
+
+
+def test_store_keeps_only_new_closed_candles(tmp_path):
+    store = OHLCStore(tmp_path)
+    assert len(store.load("kraken", "ETHUSD", DAY)) == 0
+
+    # the candle of day 3 is still open at the start of day 3.5
+    store.append("kraken", "ETHUSD", DAY, [candle(2, 20.0), candle(1, 10.0), candle(3, 30.0)], now=3.5 * DAY)
+    candles = store.append("kraken", "ETHUSD", DAY, [candle(2, 21.0), candle(3, 31.0)], now=4 * DAY)
+    assert list(candles.closes) == [10.0, 20.0, 31.0]
+    assert candles.last_closes(2) == [20.0, 31.0]
+    assert candles.last_closes(5, until=3 * DAY) == [10.0, 20.0]
+
+    # read back from disk, a truncated record is ignored and overwritten
+    with open(store.path("kraken", "ETHUSD", DAY), "ab") as f:
+        f.write(b"\x01" * (RECORD.size // 2))
+    store = OHLCStore(tmp_path)
+    candles = store.load("kraken", "ETHUSD", DAY)
+    assert list(candles.timestamps) == [DAY, 2 * DAY, 3 * DAY]
+    store.append("kraken", "ETHUSD", DAY, [candle(4, 40.0)], now=5 * DAY)
+    assert list(OHLCStore(tmp_path).load("kraken", "ETHUSD", DAY).closes) == [10.0, 20.0, 31.0, 40.0]
+
+
+def kraken_response(candles):
+    rows = [[ts, str(o), str(h), str(low), str(c), "0", "0", 0] for ts, o, h, low, c in candles]
+    return {"response": {"error": [], "result": {"XETHZUSD": rows, "last": candles[-1][0]}}}
+
+
+@pytest.mark.asyncio
+async def test_kraken_ohlc_fetches_only_new_candles(tmp_path):
+    now = 100 * DAY + 10
+    history = [candle(day, 1000.0 + (day % 7) * 10) for day in range(60, 101)]
+    store = OHLCStore(tmp_path)
+    service = KrakenHistoricalPriceServiceOHLC(days=30, store=store)
+
+    with mock.patch("time.time", return_value=now), mock.patch.object(
+        service, "get_url", return_value=kraken_response(history)
+    ) as get_url:
+        volatility, _ = await service.get_price("eth", "usd")
+        assert get_url.call_count == 1
+        # today's candle is still open
+        assert volatility == pytest.approx(stdev_calculator([c[4] for c in history[-32:-1]]))
+
+        # another window of the same pair needs no download
+        service.days = 7
+        volatility, _ = await service.get_price("eth", "usd")
+        assert get_url.call_count == 1
+        assert volatility == pytest.approx(stdev_calculator([c[4] for c in history[-9:-1]]))
+
+    with mock.patch("time.time", return_value=now + DAY), mock.patch.object(
+        service, "get_url", return_value=kraken_response([candle(100, 1.0), candle(101, 2.0)])
+    ) as get_url:
+        await service.get_price("eth", "usd")
+        assert f"since={99 * DAY}" in get_url.call_args[0][0]
+        assert list(store.load("kraken", "ETHUSD", DAY).closes)[-1] == 1.0
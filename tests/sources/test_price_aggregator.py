@@ -0,0 +1,178 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from telliot_feeds.dtypes.datapoint import datetime_now_utc
+from telliot_feeds.pricing.price_cache import price_cache
+from telliot_feeds.pricing.price_service import WebPriceService
+from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.sources.price_aggregator import PriceAggregator
+from telliot_feeds.utils.metrics import metrics
+from telliot_feeds.utils.metrics import SOURCE_FETCH
+
+
+class DelayedPriceService(WebPriceService):
+    """Answers with a fixed price after the next delay in a list"""
+
+    def __init__(self, price, delays):
+        super().__init__(name=f"Delayed {price}", url="https://delayed.xyz")
+        self.price = price
+        self.delays = list(delays)
+        self.calls = 0
+
+    async def get_price(self, asset, currency):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        return self.price, datetime_now_utc()
+
+
+@dataclass
+class DelayedSource(PriceSource):
+    asset: str = "eth"
+    currency: str = "usd"
+
+
+def make_sources(*services):
+    return [DelayedSource(service=s) for s in services]
+
+
+@pytest.mark.asyncio
+async def test_default_waits_for_all_sources():
+    agg = PriceAggregator(
+        sources=make_sources(DelayedPriceService(1.0, [0.01]), DelayedPriceService(3.0, [0.05])),
+    )
+    datapoint = await agg.fetch_new_datapoint()
+
+    assert datapoint[0] == 2.0
+    assert datapoint.stats.quorum == 2
+    assert datapoint.stats.dropped == []
+
+
+@pytest.mark.asyncio
+async def test_quorum_returns_before_slow_source():
+    agg = PriceAggregator(
+        quorum=2,
+        sources=make_sources(
+            DelayedPriceService(1.0, [0.01]), DelayedPriceService(2.0, [0.02]), DelayedPriceService(100.0, [5])
+        ),
+    )
+    v, t = await agg.fetch_new_datapoint()
+
+    assert v == 1.5
+    assert agg.last_stats.quorum == 2
+    assert agg.last_stats.dropped == ["Delayed 100.0 eth/usd"]
+    assert agg.last_stats.latency < 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_drops_pending_sources():
+    agg = PriceAggregator(
+        deadline=0.1,
+        sources=make_sources(DelayedPriceService(1.0, [0.01]), DelayedPriceService(100.0, [5])),
+    )
+    v, _ = await agg.fetch_new_datapoint()
+
+    assert v == 1.0
+    assert agg.last_stats.dropped == ["Delayed 100.0 eth/usd"]
+
+    agg = PriceAggregator(deadline=0.05, sources=make_sources(DelayedPriceService(100.0, [5])))
+    assert await agg.fetch_new_datapoint() == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_for_slow_source():
+    # fast for the first five rounds, then one slow answer a duplicate request beats
+    service = DelayedPriceService(1.0, [0.01] * 5 + [1.0, 0.01])
+    agg = PriceAggregator(hedge_percentile=90, sources=make_sources(service))
+
+    for _ in range(5):
+        await agg.fetch_new_datapoint()
+    v, _ = await agg.fetch_new_datapoint()
+
+    assert v == 1.0
+    assert service.calls == 7
+    assert agg.last_stats.hedged == ["Delayed 1.0 eth/usd"]
+    assert agg.last_stats.latency < 0.5
+
+
+@pytest.mark.asyncio
+async def test_overlapping_fetches_keep_their_own_stats():
+    # the sixth request is slow and hedged, a second fetch starts while it is pending
+    service = DelayedPriceService(1.0, [0.05] * 5 + [1.0, 0.05])
+    agg = PriceAggregator(hedge_percentile=90, sources=make_sources(service))
+    for _ in range(5):
+        await agg.fetch_new_datapoint()
+
+    async def later_fetch():
+        await asyncio.sleep(0.07)
+        return await agg.fetch_new_datapoint()
+
+    first, _ = await asyncio.gather(agg.fetch_new_datapoint(), later_fetch())
+
+    assert first.stats.hedged == ["Delayed 1.0 eth/usd"]
+
+
+@pytest.mark.asyncio
+async def test_source_fetches_are_traced():
+    metrics.reset()
+    agg = PriceAggregator(
+        deadline=0.1,
+        sources=make_sources(DelayedPriceService(1.0, [0.01]), DelayedPriceService(100.0, [5])),
+    )
+    await agg.fetch_new_datapoint()
+    # let the cancelled source tasks finish
+    await asyncio.sleep(0.01)
+
+    fast = metrics.histogram(f"{SOURCE_FETCH}_seconds", source="Delayed 1.0 eth/usd")
+    assert fast.count == 1
+    assert metrics.counter(f"{SOURCE_FETCH}_failures", source="Delayed 1.0 eth/usd") == 0
+    # the dropped source is a failure without a latency
+    assert metrics.histogram(f"{SOURCE_FETCH}_seconds", source="Delayed 100.0 eth/usd") is None
+    assert metrics.counter(f"{SOURCE_FETCH}_failures", source="Delayed 100.0 eth/usd") == 1
+
+
+class FailingPriceService(DelayedPriceService):
+    """Answers the duplicate of a slow request quickly, but without a price"""
+
+    async def get_price(self, asset, currency):
+        call = self.calls + 1
+        price, timestamp = await super().get_price(asset, currency)
+        if call == 7:
+            return None, None
+        return price, timestamp
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_waits_for_a_price():
+    service = FailingPriceService(1.0, [0.01] * 5 + [0.2, 0.01])
+    agg = PriceAggregator(hedge_percentile=90, sources=make_sources(service))
+
+    for _ in range(5):
+        await agg.fetch_new_datapoint()
+    v, _ = await agg.fetch_new_datapoint()
+
+    # the duplicate answered first without a price, the original one still counts
+    assert v == 1.0
+    assert service.calls == 7
+    assert agg.last_stats.hedged == ["Delayed 1.0 eth/usd"]
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_is_cached_and_stored():
+    service = DelayedPriceService(1.0, [0.01] * 5 + [1.0, 0.01])
+    source = DelayedSource(service=service, cache_ttl=0.001)
+    agg = PriceAggregator(hedge_percentile=90, sources=[source])
+    price_cache.enable()
+    try:
+        for _ in range(5):
+            await agg.fetch_new_datapoint()
+            await asyncio.sleep(0.002)
+        await agg.fetch_new_datapoint()
+
+        assert service.calls == 7
+        assert len(source.get_all_datapoints()) == 6
+        assert price_cache.get(service.cache_key("eth", "usd"))[0] == 1.0
+    finally:
+        price_cache.disable()
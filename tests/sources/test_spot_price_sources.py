@@ -6,7 +6,6 @@ from datetime import datetime
 from unittest import mock
 
 import pytest
-from requests import Response
 from requests.exceptions import JSONDecodeError
 from telliot_core.apps.telliot_config import TelliotConfig
 
@@ -131,11 +130,9 @@ async def test_coinmarketcap(caplog, coinmarketcap_key):
         validate_price(v, t)
 
         def bad_status(*args, **kwargs):
-            r = Response()
-            r.status_code = 404
-            return r
+            return {"response": {}, "status": 404}
 
-        with mock.patch("requests.Session.get", side_effect=bad_status):
+        with mock.patch("telliot_feeds.utils.http_client.HTTPClient.request", side_effect=bad_status):
 
             v, t = await get_price("bct", "usd", service["coinmarketcap"])
             assert v is None
@@ -158,7 +155,7 @@ async def test_gemini(caplog, monkeypatch):
         validate_price(v, t)
 
     # mock GeminiSpotPriceService.get_url() to return None
-    def mock_get_url(*args, **kwargs):
+    async def mock_get_url(*args, **kwargs):
         return None
 
     monkeypatch.setattr(GeminiSpotPriceService, "get_url", mock_get_url)
@@ -223,7 +220,7 @@ async def test_pancakeswap_bnb():
 
 @pytest.mark.asyncio
 async def test_coingecko_price_service_rate_limit(caplog):
-    def mock_get_url(self, url=""):
+    def mock_get_url(url="", **kwargs):
         return {
             "error": "<class 'requests.exceptions.JSONDecodeError'>",
             "exception": JSONDecodeError(
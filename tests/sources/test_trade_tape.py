@@ -0,0 +1,101 @@
+from unittest import mock
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+import pytest
+
+from telliot_feeds.sources.price.historical import kraken as kraken_historical
+from telliot_feeds.sources.price.historical.kraken import KrakenHistoricalPriceService
+from telliot_feeds.sources.price.historical.trade_tape import TradeTape
+from telliot_feeds.sources.price.historical.trade_tape import TradeTapes
+
+
+EXPIRY = 1_650_000_000
+
+
+def test_trade_tape():
+    tape = TradeTape()
+    tape.add(100, 200, [(150.0, 1.5), (120.0, 1.2), (250.0, 9.9)])
+    tape.add(300, 400, [(310.0, 3.1)])
+    assert list(tape.times) == [120.0, 150.0, 310.0]
+    assert tape.missing(50, 350) == [(50, 100), (200, 300)]
+
+    # a refetched range replaces its trades and merges coverage
+    tape.add(150, 300, [(150.0, 1.5), (220.0, 2.2)])
+    assert list(tape.prices) == [1.2, 1.5, 2.2, 3.1]
+    assert tape.covered == [(100, 400)]
+    assert tape.missing(100, 400) == []
+
+    assert tape.last_trade(300) == (220.0, 2.2)
+    assert tape.last_trade(150) == (150.0, 1.5)
+    assert tape.last_trade(300, since=250) is None
+    assert tape.last_trade(100) is None
+
+
+class StubKraken:
+    """Kraken Trades endpoint returning pages of at most `page_size` trades since a cursor"""
+
+    def __init__(self, trades, page_size):
+        self.trades = trades
+        self.page_size = page_size
+        self.requests = []
+
+    async def get_url(self, url):
+        since = int(parse_qs(urlparse(url).query)["since"][0])
+        self.requests.append(since)
+        # the cursor is in nanoseconds after the first page
+        since_s = since / 1e9 if since > 1e12 else since
+        page = [t for t in self.trades if t[0] > since_s][: self.page_size]
+        last = int((page[-1][0] if page else since_s) * 1e9)
+        rows = [[str(price), "0.1", ts, "b", "l", ""] for ts, price in page]
+        return {"response": {"error": [], "result": {"XETHZUSD": rows, "last": str(last)}}}
+
+
+@pytest.mark.asyncio
+async def test_kraken_trades_are_fetched_once_for_nearby_expiries(monkeypatch):
+    # a trade every 10 seconds in the hour before expiry
+    trades = [(float(EXPIRY - 3600 + 10 * i), 1000.0 + i) for i in range(360)]
+    kraken = StubKraken(trades, page_size=40)
+    service = KrakenHistoricalPriceService()
+    service.tapes = TradeTapes()
+    monkeypatch.setattr(kraken_historical, "TRADES_PER_PAGE", 40)
+
+    with mock.patch.object(service, "get_url", side_effect=kraken.get_url):
+        price, _ = await service.get_price("eth", "usd", ts=EXPIRY - 5)
+        assert price == trades[-1][1]
+        # the 15 minute window is fetched in pages
+        assert kraken.requests[0] == EXPIRY - 5 - 900
+        assert len(kraken.requests) == 3
+
+        # an expiry within the fetched window needs no request
+        price, _ = await service.get_price("eth", "usd", period=600, ts=EXPIRY - 305)
+        assert price == trades[-31][1]
+        assert len(kraken.requests) == 3
+
+        # nearby ones only fetch what's missing from their window
+        price, _ = await service.get_price("eth", "usd", ts=EXPIRY - 600)
+        assert price == trades[-60][1]
+        assert kraken.requests[3] == EXPIRY - 1500
+        assert len(kraken.requests) == 5
+        price, _ = await service.get_price("eth", "usd", ts=EXPIRY + 120)
+        assert price == trades[-1][1]
+        assert kraken.requests[5:] == [EXPIRY - 5]
+
+
+@pytest.mark.asyncio
+async def test_kraken_range_exceeding_max_pages_is_not_cached(monkeypatch):
+    trades = [(float(EXPIRY - 3600 + 10 * i), 1000.0 + i) for i in range(360)]
+    kraken = StubKraken(trades, page_size=40)
+    service = KrakenHistoricalPriceService()
+    service.tapes = TradeTapes()
+    monkeypatch.setattr(kraken_historical, "TRADES_PER_PAGE", 40)
+    monkeypatch.setattr(kraken_historical, "MAX_PAGES", 2)
+
+    with mock.patch.object(service, "get_url", side_effect=kraken.get_url):
+        # the oldest 80 trades of the window would be taken for the price at expiry
+        price, _ = await service.get_price("eth", "usd", ts=EXPIRY - 5)
+        assert price is None
+        assert len(kraken.requests) == 2
+
+        tape = service.tapes.get(service.exchange, service.pair("eth", "usd"))
+        assert tape.missing(EXPIRY - 905, EXPIRY - 5) == [(EXPIRY - 905, EXPIRY - 5)]
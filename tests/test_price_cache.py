@@ -0,0 +1,92 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from telliot_feeds.pricing.price_cache import price_cache
+from telliot_feeds.pricing.price_cache import PriceCache
+from telliot_feeds.pricing.price_service import WebPriceService
+from telliot_feeds.pricing.price_source import PriceSource
+
+
+class CountingPriceService(WebPriceService):
+    """Returns a constant price and counts the requests made"""
+
+    def __init__(self, **kwargs):
+        super().__init__(name="Counting", url="https://counting.xyz", **kwargs)
+        self.calls = 0
+
+    async def get_price(self, asset, currency):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return 1.0, datetime.now()
+
+
+@pytest.fixture
+def enabled_cache():
+    price_cache.enable(default_ttl=60)
+    yield price_cache
+    price_cache.disable()
+
+
+@pytest.mark.asyncio
+async def test_disabled_by_default():
+    service = CountingPriceService()
+    source = PriceSource(asset="eth", currency="usd", service=service)
+
+    await source.fetch_new_datapoint()
+    await source.fetch_new_datapoint()
+
+    assert not price_cache.enabled
+    assert service.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_sources_share_cached_prices(enabled_cache):
+    service = CountingPriceService()
+    source_a = PriceSource(asset="eth", currency="usd", service=service)
+    source_b = PriceSource(asset="ETH", currency="USD", service=service)
+
+    v1, _ = await source_a.fetch_new_datapoint()
+    v2, _ = await source_b.fetch_new_datapoint()
+
+    assert v1 == v2 == 1.0
+    assert service.calls == 1
+    assert enabled_cache.hits >= 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_request(enabled_cache):
+    service = CountingPriceService()
+    sources = [PriceSource(asset="btc", currency="usd", service=service) for _ in range(5)]
+
+    await asyncio.gather(*[s.fetch_new_datapoint() for s in sources])
+
+    assert service.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_bypasses_cache(enabled_cache):
+    service = CountingPriceService()
+    source = PriceSource(asset="eth", currency="usd", service=service, cache_ttl=0)
+
+    await source.fetch_new_datapoint()
+    await source.fetch_new_datapoint()
+
+    assert service.calls == 2
+
+
+def test_expiry_and_lru_eviction():
+    cache = PriceCache(default_ttl=60, max_size=2, enabled=True)
+    now = datetime.now()
+
+    cache.put("a", (1.0, now))
+    cache.put("b", (2.0, now))
+    assert cache.get("a") == (1.0, now)
+    cache.put("c", (3.0, now))
+
+    # "b" was least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == (1.0, now)
+    assert cache.get("c", ttl=-1) is None
+    assert cache.stats["evictions"] == 1
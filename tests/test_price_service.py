@@ -1,28 +1,53 @@
+import asyncio
 from unittest import mock
 
 import pytest
-import requests
+from aiohttp import web
 
 from telliot_feeds.pricing.price_service import WebPriceService
 
 
+class FakePriceService(WebPriceService):
+    """Must implement get_price or NotImplementedError will be raised"""
+
+    async def get_price(self, asset, currency):
+        return None, None
+
+
 @pytest.mark.asyncio
 async def test_webpriceservice_errors(caplog):
     """ "Test failures of WebPriceService class"""
 
-    class FakePriceService(WebPriceService):
-        """Must implement get_price or NotImplementedError will be raised"""
+    async def not_json(request):
+        return web.Response(text="<html>rate limited</html>")
 
-        async def get_price(self, asset, currency):
-            return None, None
+    app = web.Application()
+    app.router.add_get("/", not_json)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
 
-    def json_decode_error(*args, **kwargs):
-        """Override get method and raise JSONDecodeError"""
-        raise requests.exceptions.JSONDecodeError("JSON Decode Error", "", 0)
-
-    with mock.patch("requests.Session.get", side_effect=json_decode_error):
-        wsp = FakePriceService(name="FakePriceService", url="https://fakeurl.xyz")
-        result = wsp.get_url()
+    try:
+        wsp = FakePriceService(name="FakePriceService", url=f"http://127.0.0.1:{port}")
+        result = await wsp.get_url("/")
 
         assert "error" in result
         assert "JSON Decode Error" == result["error"]
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_webpriceservice_timeout():
+    """Timeouts are reported in the get_url result instead of raised"""
+
+    def timeout(*args, **kwargs):
+        raise asyncio.TimeoutError()
+
+    with mock.patch("telliot_feeds.utils.http_client.ClientSession.request", side_effect=timeout):
+        wsp = FakePriceService(name="FakePriceService", url="https://fakeurl.xyz")
+        result = await wsp.get_url()
+
+        assert "Timeout Error" == result["error"]
@@ -0,0 +1,91 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from telliot_feeds.pricing.request_batcher import RequestBatcher
+from telliot_feeds.sources.price.spot.coingecko import CoinGeckoSpotPriceService
+from telliot_feeds.sources.price.spot.coingecko import CoinGeckoSpotPriceSource
+
+
+@pytest.mark.asyncio
+async def test_lookups_within_window_are_batched():
+    calls = []
+
+    async def fetch_batch(keys):
+        calls.append(sorted(keys))
+        return {k: k * 2 for k in keys}
+
+    batcher = RequestBatcher(fetch_batch, window=0.01)
+    results = await asyncio.gather(*[batcher.get(k) for k in (1, 2, 3, 2)])
+
+    assert results == [2, 4, 6, 4]
+    assert calls == [[1, 2, 3]]
+    assert batcher.batches == 1
+    assert batcher.lookups == 4
+
+
+@pytest.mark.asyncio
+async def test_max_batch_size_flushes_early():
+    calls = []
+
+    async def fetch_batch(keys):
+        calls.append(len(keys))
+        return {k: k for k in keys}
+
+    batcher = RequestBatcher(fetch_batch, window=10, max_batch_size=2)
+    results = await asyncio.gather(batcher.get("a"), batcher.get("b"))
+
+    assert results == ["a", "b"]
+    assert calls == [2]
+
+
+@pytest.mark.asyncio
+async def test_missing_keys_and_errors():
+    async def fetch_batch(keys):
+        if "boom" in keys:
+            raise ValueError("boom")
+        return {}
+
+    batcher = RequestBatcher(fetch_batch, window=0.01)
+    assert await batcher.get("missing") is None
+
+    with pytest.raises(ValueError):
+        await batcher.get("boom")
+
+
+@pytest.mark.asyncio
+async def test_coingecko_sources_share_one_request():
+    """Prices of several CoinGecko sources are fetched with a single request"""
+    requested = []
+
+    def mock_get_url(url="", **kwargs):
+        requested.append(url)
+        return {
+            "response": {"ethereum": {"usd": 2000.0, "eur": 1800.0}, "bitcoin": {"usd": 30000.0}},
+            "status": 200,
+        }
+
+    sources = [
+        CoinGeckoSpotPriceSource(asset="eth", currency="usd"),
+        CoinGeckoSpotPriceSource(asset="eth", currency="eur"),
+        CoinGeckoSpotPriceSource(asset="btc", currency="usd"),
+    ]
+    with mock.patch("telliot_feeds.sources.price.spot.coingecko.WebPriceService.get_url", side_effect=mock_get_url):
+        datapoints = await asyncio.gather(*[s.fetch_new_datapoint() for s in sources])
+
+    assert [v for v, _ in datapoints] == [2000.0, 1800.0, 30000.0]
+    assert len(requested) == 1
+    assert "ids=bitcoin%2Cethereum" in requested[0]
+    assert "vs_currencies=eur%2Cusd" in requested[0]
+
+
+def test_coingecko_batcher_follows_service_settings():
+    """Services share a batcher only when their settings match"""
+    service = CoinGeckoSpotPriceService()
+    assert service.batcher is CoinGeckoSpotPriceService().batcher
+
+    slow = CoinGeckoSpotPriceService(timeout=30.0, batch_window=0.5)
+    assert slow.batcher is not service.batcher
+    assert slow.batcher.window == 0.5
+    assert slow.batcher.fetch_batch.__self__.timeout == 30.0
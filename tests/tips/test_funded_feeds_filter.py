@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import Values
+from telliot_feeds.reporters.tips.listener.funded_feeds_filter import first_in_window_flags
+from telliot_feeds.reporters.tips.listener.funded_feeds_filter import FundedFeedFilter
+
+
+START = 1_000_000
+HOUR = 3600
+
+
+def make_feed(query_id=b"q" * 32, price_threshold=0, balance=10, reward=1, reports=(), current_timestamp=0):
+    return QueryIdandFeedDetails(
+        params=FeedDetails(
+            reward=reward,
+            balance=balance,
+            startTime=START,
+            interval=HOUR,
+            window=600,
+            priceThreshold=price_threshold,
+            rewardIncreasePerSecond=0,
+        ),
+        feed_id=b"f" * 32 + query_id,
+        query_id=query_id,
+        query_data=b"data" + query_id,
+        current_queryid_value=(100).to_bytes(32, "big"),
+        current_value_timestamp=current_timestamp,
+        queryid_timestamps_values_list=[Values(value.to_bytes(32, "big"), t) for t, value in reports],
+    )
+
+
+def test_first_in_window_flags():
+    timestamps = [START + 10, START + 20, START + HOUR + 5, START + HOUR + 700, START + 2 * HOUR + 1]
+    assert first_in_window_flags(timestamps, START, HOUR, 600) == [False, True, False, True]
+    # agrees with the single timestamp check
+    filtr = FundedFeedFilter()
+    for before, timestamp, flag in zip(timestamps, timestamps[1:], first_in_window_flags(timestamps, START, HOUR, 600)):
+        assert filtr.is_timestamp_first_in_window(before, timestamp, START, 600, HOUR)[0] == flag
+
+
+def test_filter_historical_submissions():
+    reports = [(START + 10, 100), (START + 20, 101), (START + HOUR + 5, 102), (START + HOUR + 700, 150)]
+    window_feed = make_feed(reports=reports)
+    threshold_feed = make_feed(query_id=b"t" * 32, price_threshold=2500, reports=reports)
+
+    FundedFeedFilter().filter_historical_submissions([window_feed, threshold_feed])
+
+    eligible = [v.timestamp for v in window_feed.queryid_timestamps_values_list]
+    assert eligible == [START + 10, START + HOUR + 5]
+    # the last report moved the value by more than 25%
+    eligible = [v.timestamp for v in threshold_feed.queryid_timestamps_values_list]
+    assert eligible == [START + 10, START + HOUR + 5, START + HOUR + 700]
+
+
+def test_undecodable_values_do_not_meet_the_threshold(caplog):
+    feed = make_feed(price_threshold=2500, reports=[(START + 10, 100), (START + HOUR + 5, 102)])
+    feed.queryid_timestamps_values_list.append(Values(b"", START + HOUR + 700))
+
+    FundedFeedFilter().filter_historical_submissions([feed])
+
+    eligible = [v.timestamp for v in feed.queryid_timestamps_values_list]
+    assert eligible == [START + 10, START + HOUR + 5]
+    assert (b"q" * 32).hex() in caplog.text
+
+
+def test_calculate_true_feed_balance():
+    feeds = [make_feed(query_id=bytes([i]) * 32, balance=3, reward=1) for i in range(4)]
+    unclaimed = {(feeds[1].feed_id, feeds[1].query_id): 3, (feeds[2].feed_id, feeds[2].query_id): 1}
+
+    result = FundedFeedFilter().calculate_true_feed_balance(feeds, unclaimed)
+
+    assert result is feeds
+    assert [feed.query_id[0] for feed in result] == [0, 2, 3]
+    assert result[1].params.balance == 2
+
+
+@pytest.mark.asyncio
+async def test_price_thresholds_checked_concurrently_once_per_query_id():
+    now = START + HOUR + 700  # outside the 600 second windows
+    feeds = [
+        make_feed(query_id=b"a" * 32, price_threshold=100, current_timestamp=START + HOUR + 5),
+        make_feed(query_id=b"a" * 32, price_threshold=5000, current_timestamp=START + HOUR + 5),
+        make_feed(query_id=b"b" * 32, price_threshold=100, current_timestamp=START + HOUR + 5),
+        make_feed(query_id=b"c" * 32, current_timestamp=START + HOUR + 5),
+        make_feed(query_id=b"d" * 32, price_threshold=100, current_timestamp=START + 5),
+    ]
+    # now is first in d's longer window
+    feeds[4].params.window = 800
+    changes = {b"data" + b"a" * 32: 1000, b"data" + b"b" * 32: None}
+    calls = []
+
+    class Filter(FundedFeedFilter):
+        def has_price_source(self, feed):
+            return True
+
+        async def price_change(self, query_data, value_before):
+            calls.append(query_data)
+            await asyncio.sleep(0.2)
+            return changes[query_data]
+
+    start = time.perf_counter()
+    result = await Filter().window_and_priceThreshold_unmet_filter(feeds, now_timestamp=now)
+    elapsed = time.perf_counter() - start
+
+    assert sorted(calls) == [b"data" + b"a" * 32, b"data" + b"b" * 32]
+    assert elapsed < 0.35
+    # a met its lower threshold only, b's price was unavailable, c has no threshold and is outside its window,
+    # d is first in its window
+    assert [(feed.query_id[:1], feed.params.priceThreshold) for feed in result] == [(b"a", 100), (b"d", 100)]
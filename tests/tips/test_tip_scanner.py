@@ -0,0 +1,116 @@
+from unittest import mock
+
+import pytest
+from telliot_core.utils.response import ResponseStatus
+
+from telliot_feeds.reporters.tips.listener.dtypes import FeedDetails
+from telliot_feeds.reporters.tips.listener.dtypes import QueryIdandFeedDetails
+from telliot_feeds.reporters.tips.listener.tip_scanner import TipScanner
+
+
+QUERY_ID = b"q" * 32
+FEED_ID = b"f" * 32
+MONTH = 2_592_000
+
+
+class FakeMulticall:
+    """Answers autopay multicalls from in-memory reports and claims, recording each request"""
+
+    def __init__(self):
+        self.reports = []  # (timestamp, value)
+        self.claimed = set()
+        self.requests = []
+
+    def get_multiple_values_before(self, query_id, now_timestamp, max_age, max_count):
+        return ("values", query_id, now_timestamp, max_age)
+
+    def get_reward_claimed_status(self, feed_id, query_id, timestamps):
+        return ("claims", feed_id, query_id, timestamps)
+
+    async def multi_call(self, calls, success=False):
+        self.requests.append(calls)
+        resp = {}
+        for call in calls:
+            if call[0] == "values":
+                _, query_id, now, max_age = call
+                reports = [(t, v) for t, v in sorted(self.reports) if now - max_age < t < now]
+                resp[("values_array", query_id)] = [v for _, v in reports]
+                resp[("timestamps_array", query_id)] = [t for t, _ in reports]
+            else:
+                _, feed_id, query_id, timestamps = call
+                resp[(feed_id, query_id)] = [t in self.claimed for t in timestamps]
+        return resp, ResponseStatus()
+
+
+def funded_feed():
+    params = FeedDetails(
+        reward=1, balance=100, startTime=0, interval=10, window=5, priceThreshold=0, rewardIncreasePerSecond=0
+    )
+    return QueryIdandFeedDetails(params=params, feed_id=FEED_ID, query_id=QUERY_ID)
+
+
+@pytest.mark.asyncio
+async def test_scanner_fetches_only_new_reports():
+    now = 10 * MONTH
+    multi_call = FakeMulticall()
+    multi_call.reports = [(now - 100_000, b"a"), (now - 50_000, b"b"), (now - 10, b"c")]
+    scanner = TipScanner(multi_call, refresh_window=1_000)
+
+    feeds, status = await scanner.timestamps_and_values([funded_feed()], now, now - MONTH)
+    assert status.ok
+    assert [v.value for v in feeds[0].queryid_timestamps_values_list] == [b"a", b"b", b"c"]
+    assert multi_call.requests[-1][0][3] == MONTH
+
+    # next cycle: one new report, one recent report disputed away
+    multi_call.reports = [(now - 100_000, b"a"), (now - 50_000, b"b"), (now + 50, b"d")]
+    feeds, status = await scanner.timestamps_and_values([funded_feed()], now + 100, now + 100 - MONTH)
+    assert status.ok
+    assert [v.value for v in feeds[0].queryid_timestamps_values_list] == [b"a", b"b", b"d"]
+    assert feeds[0].current_queryid_value == b"d"
+    assert feeds[0].current_value_timestamp == now + 50
+    # only the refresh window since the last cycle was requested
+    assert multi_call.requests[-1][0][3] == 100 + 1_000
+
+
+@pytest.mark.asyncio
+async def test_scanner_caches_claimed_timestamps():
+    now = 10 * MONTH
+    multi_call = FakeMulticall()
+    multi_call.reports = [(now - 300, b"a"), (now - 200, b"b"), (now - 100, b"c")]
+    multi_call.claimed = {now - 300}
+    scanner = TipScanner(multi_call)
+
+    feeds, _ = await scanner.timestamps_and_values([funded_feed()], now, now - MONTH)
+    counts, status = await scanner.unclaimed_timestamps_count(feeds)
+    assert status.ok
+    assert counts == {(FEED_ID, QUERY_ID): 2}
+
+    multi_call.claimed.add(now - 200)
+    feeds, _ = await scanner.timestamps_and_values([funded_feed()], now, now - MONTH)
+    counts, _ = await scanner.unclaimed_timestamps_count(feeds)
+    assert counts == {(FEED_ID, QUERY_ID): 1}
+    # the timestamp known to be claimed is not asked for again
+    assert multi_call.requests[-1][0][3] == [now - 200, now - 100]
+
+
+@pytest.mark.asyncio
+async def test_scanner_starts_over_when_time_goes_back():
+    now = 10 * MONTH
+    multi_call = FakeMulticall()
+    multi_call.reports = [(now - 100, b"a")]
+    scanner = TipScanner(multi_call, refresh_window=0)
+    await scanner.timestamps_and_values([funded_feed()], now, now - MONTH)
+
+    multi_call.reports = [(now - 5_000, b"z")]
+    feeds, _ = await scanner.timestamps_and_values([funded_feed()], now - 1_000, now - 1_000 - MONTH)
+    assert [v.value for v in feeds[0].queryid_timestamps_values_list] == [b"z"]
+
+
+@pytest.mark.asyncio
+async def test_scanner_failed_call():
+    scanner = TipScanner(FakeMulticall())
+    with mock.patch.object(FakeMulticall, "multi_call", return_value=({}, ResponseStatus())):
+        feeds, status = await scanner.timestamps_and_values([funded_feed()], MONTH, 0)
+    assert feeds is None
+    assert not status.ok
+    assert QUERY_ID not in scanner.histories
@@ -0,0 +1,48 @@
+import pytest
+
+from telliot_feeds.queries.price.spot_price import SpotPrice
+from telliot_feeds.reporters.tips.suggest_datafeed import get_feed_and_tip
+from telliot_feeds.reporters.tips.suggest_datafeed import get_feeds_and_tips
+
+
+@pytest.fixture
+def sorted_tips(monkeypatch):
+    tips = [
+        (SpotPrice("eth", "usd").query_data, 30),
+        (SpotPrice("ordi", "usd").query_data, 20),
+        (SpotPrice("atla", "usd").query_data, 10),
+        (SpotPrice("btc", "usd").query_data, 0),
+    ]
+
+    async def get_sorted_suggestions(*args, **kwargs):
+        return tips
+
+    monkeypatch.setattr("telliot_feeds.reporters.tips.suggest_datafeed.get_sorted_suggestions", get_sorted_suggestions)
+    return tips
+
+
+@pytest.mark.asyncio
+async def test_top_feeds(sorted_tips):
+    suggestions = await get_feeds_and_tips(None, skip_manual_feeds=False, limit=5)
+
+    # zero tips are not suggested
+    assert [tip for _, tip in suggestions] == [30, 20, 10]
+    assert [feed.query.asset for feed, _ in suggestions] == ["eth", "ordi", "atla"]
+    # uncatalogued pairs are built from the same feed, each suggestion gets its own copy
+    ordi, atla = suggestions[1][0], suggestions[2][0]
+    assert ordi is not atla
+    assert ordi.source is not atla.source
+    assert (ordi.source.asset, atla.source.asset) == ("ordi", "atla")
+
+
+@pytest.mark.asyncio
+async def test_top_feeds_limit(sorted_tips):
+    suggestions = await get_feeds_and_tips(None, skip_manual_feeds=False, limit=2)
+    assert [tip for _, tip in suggestions] == [30, 20]
+
+    # manual spot price feeds are skipped
+    suggestions = await get_feeds_and_tips(None, skip_manual_feeds=True, limit=5)
+    assert [tip for _, tip in suggestions] == [30]
+
+    feed, tip = await get_feed_and_tip(None, skip_manual_feeds=False)
+    assert (feed.query.asset, tip) == ("eth", 30)
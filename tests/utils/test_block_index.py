@@ -0,0 +1,95 @@
+import random
+from bisect import bisect_right
+
+import pytest
+
+from telliot_feeds.utils.block_index import BlockTimeIndex
+
+
+class StubEth:
+    """Chain with known block timestamps, counting block fetches"""
+
+    def __init__(self, timestamps):
+        self.timestamps = timestamps
+        self.calls = 0
+
+    @property
+    def block_number(self):
+        return len(self.timestamps) - 1
+
+    def get_block(self, block_identifier, full_transaction=False):
+        self.calls += 1
+        number = len(self.timestamps) - 1 if block_identifier == "latest" else block_identifier
+        return {"number": number, "timestamp": self.timestamps[number]}
+
+
+class StubWeb3:
+    def __init__(self, timestamps):
+        self.eth = StubEth(timestamps)
+
+
+def stub_chain(blocks=500_000, seed=0):
+    rng = random.Random(seed)
+    timestamps = [1_600_000_000]
+    for _ in range(blocks - 1):
+        timestamps.append(timestamps[-1] + rng.choice([12, 12, 12, 13, 15, 24]))
+    return timestamps
+
+
+def expected_block(timestamps, target):
+    i = bisect_right(timestamps, target) - 1
+    return i if i >= 0 else None
+
+
+@pytest.mark.asyncio
+async def test_block_number_at(tmp_path):
+    timestamps = stub_chain()
+    w3 = StubWeb3(timestamps)
+    index = BlockTimeIndex(w3, 1, tmp_path)
+    rng = random.Random(1)
+
+    calls = []
+    for _ in range(50):
+        target = rng.randint(timestamps[0], timestamps[-1])
+        before = w3.eth.calls
+        assert await index.block_number_at(target) == expected_block(timestamps, target)
+        calls.append(w3.eth.calls - before)
+
+    # far fewer fetches than the ~19 sequential ones of a binary search
+    assert sum(calls) / len(calls) < 10
+
+    # exact block timestamps, the head and the first block
+    assert await index.block_number_at(timestamps[1234]) == 1234
+    assert await index.block_number_at(timestamps[-1] + 100) == len(timestamps) - 1
+    assert await index.block_number_at(timestamps[0]) == 0
+    assert await index.block_number_at(timestamps[0] - 1) is None
+
+
+@pytest.mark.asyncio
+async def test_anchors_persist_across_instances(tmp_path):
+    timestamps = stub_chain()
+    w3 = StubWeb3(timestamps)
+    target = timestamps[100_000] + 5
+    await BlockTimeIndex(w3, 1, tmp_path).block_number_at(target)
+
+    index = BlockTimeIndex(w3, 1, tmp_path)
+    before = w3.eth.calls
+    assert await index.block_number_at(target) == expected_block(timestamps, target)
+    # already bracketed by stored anchors: one check of the stored anchors, no block time sample
+    assert w3.eth.calls - before <= 6
+    assert index.numbers
+    assert await index.block_timestamp(index.numbers[0]) == timestamps[index.numbers[0]]
+    assert w3.eth.calls - before <= 6
+
+
+@pytest.mark.asyncio
+async def test_stale_anchors_are_discarded(tmp_path):
+    w3 = StubWeb3(stub_chain(blocks=10_000))
+    await BlockTimeIndex(w3, 1337, tmp_path).block_number_at(w3.eth.timestamps[5_000])
+
+    # a local chain restarted with different block times
+    timestamps = stub_chain(blocks=2_000, seed=3)
+    w3 = StubWeb3(timestamps)
+    index = BlockTimeIndex(w3, 1337, tmp_path)
+    for target in (timestamps[10], timestamps[1_500] + 3, timestamps[-1]):
+        assert await index.block_number_at(target) == expected_block(timestamps, target)
@@ -1,7 +1,24 @@
+from unittest import mock
+
+from telliot_feeds.queries.price.spot_price import SpotPrice
 from telliot_feeds.utils.query_search_utils import decode_typ_name
+from telliot_feeds.utils.query_search_utils import get_query_from_qtyp_name
 
 
 def test_decode_qtype_name():
     # query data with non empty bytes error
     querydata = "0x00000000000000000000000000000000000000000000000000000000000000400000000000000000000000000000000000000000000000000000000000000080000000000000000000000000000000000000000000000000000000000000000745564d43616c6c000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000001000000000000000000000000ae7ab96520de3a18e5e111b5eaab095312d7fe840000000000000000000000000000000000000000000000000000000000000060000000000000000000000000000000000000000000000000000000000000002470a082310000000000000000000000004e518e2b4e1649974d29e0697818d6e030e328cf00000000000000000000000000000000000000000000000000000000"  # noqa: E501
     assert decode_typ_name(bytes.fromhex(querydata[2:])) == ""
+
+
+def test_get_query_from_qtyp_name_is_interned():
+    query_data = SpotPrice(asset="btc", currency="usd").query_data
+    with mock.patch.object(SpotPrice, "get_query_from_data", wraps=SpotPrice.get_query_from_data) as decode:
+        first = get_query_from_qtyp_name(query_data)
+        second = get_query_from_qtyp_name(query_data)
+        assert decode.call_count <= 1
+    assert first == second == SpotPrice(asset="btc", currency="usd")
+
+    # callers get copies, so mutating one doesn't change later lookups
+    second.asset = "eth"
+    assert get_query_from_qtyp_name(query_data).asset == "btc"
@@ -0,0 +1,158 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from telliot_feeds.utils import discord
+from telliot_feeds.utils.discord import MAX_MESSAGE_LENGTH
+from telliot_feeds.utils.discord import WebhookDispatcher
+
+
+class StubWebhook(ThreadingHTTPServer):
+    """Local Discord webhook answering with the next of a list of statuses"""
+
+    def __init__(self, statuses=(204,), delay=0.0, retry_after=0.01):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.retry_after = retry_after
+        self.posts = []
+        self.accepted = []
+        super().__init__(("127.0.0.1", 0), StubWebhookHandler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api/webhooks/1/token"
+
+
+class StubWebhookHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        content = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["content"]
+        server = self.server
+        status = server.statuses[min(len(server.posts), len(server.statuses) - 1)]
+        server.posts.append(content)
+        time.sleep(server.delay)
+        body = b""
+        if status == 429:
+            body = json.dumps({"message": "rate limited", "retry_after": server.retry_after}).encode()
+        elif status < 300:
+            server.accepted.append(content)
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_dispatcher(webhook, **kwargs):
+    settings = {"linger": 0.05, "backoff": 0.01, **kwargs}
+    return WebhookDispatcher(webhook_url=lambda: webhook.url, **settings)
+
+
+def test_submit_does_not_wait_for_slow_webhook():
+    webhook = StubWebhook(delay=0.5)
+    dispatcher = make_dispatcher(webhook, linger=0)
+
+    start = time.perf_counter()
+    dispatcher.submit("reported")
+    assert time.perf_counter() - start < 0.1
+
+    assert dispatcher.flush()
+    assert webhook.accepted == ["reported"]
+    assert dispatcher.sent == 1
+
+
+def test_burst_is_sent_in_one_post():
+    webhook = StubWebhook()
+    dispatcher = make_dispatcher(webhook)
+
+    for i in range(3):
+        dispatcher.submit(f"message {i}")
+    assert dispatcher.flush()
+
+    assert webhook.posts == ["message 0\n\nmessage 1\n\nmessage 2"]
+
+
+def test_batches_respect_message_length_limit():
+    webhook = StubWebhook()
+    dispatcher = make_dispatcher(webhook)
+
+    long_message = "x" * (MAX_MESSAGE_LENGTH - 3)
+    dispatcher.submit(long_message)
+    dispatcher.submit("short")
+    dispatcher.submit("y" * (MAX_MESSAGE_LENGTH + 10))
+    assert dispatcher.flush()
+
+    assert webhook.posts == [long_message, "short", "y" * MAX_MESSAGE_LENGTH]
+
+
+def test_retries_rate_limited_and_failing_posts():
+    webhook = StubWebhook(statuses=[429, 502, 204])
+    dispatcher = make_dispatcher(webhook)
+
+    dispatcher.submit("reported")
+    assert dispatcher.flush()
+
+    assert webhook.posts == ["reported"] * 3
+    assert webhook.accepted == ["reported"]
+    assert (dispatcher.sent, dispatcher.failed) == (1, 0)
+
+
+def test_gives_up_on_rejected_and_persistently_failing_posts():
+    webhook = StubWebhook(statuses=[400])
+    dispatcher = make_dispatcher(webhook, linger=0, max_retries=3)
+    dispatcher.submit("bad request")
+    assert dispatcher.flush()
+    assert len(webhook.posts) == 1
+
+    webhook = StubWebhook(statuses=[500])
+    dispatcher = make_dispatcher(webhook, linger=0, max_retries=3)
+    dispatcher.submit("server down")
+    assert dispatcher.flush()
+    assert len(webhook.posts) == 3
+    assert dispatcher.failed == 1
+
+
+def test_full_queue_drops_oldest_messages():
+    webhook = StubWebhook()
+    dispatcher = make_dispatcher(webhook, max_queued=2, linger=0.2)
+
+    for i in range(4):
+        dispatcher.submit(f"message {i}")
+    assert dispatcher.flush()
+
+    assert dispatcher.dropped == 2
+    assert webhook.posts == ["message 2\n\nmessage 3"]
+
+
+def test_notifications_are_not_queued_without_webhook(monkeypatch):
+    monkeypatch.delenv("DISCORD_WEBHOOK_URL_4", raising=False)
+    assert "Webhook not set" in discord.dispute_notification("stake decreased")
+
+
+REPORT = {
+    "account": "0xabc",
+    "last_report": 0,
+    "reporter_lock_time": 43200,
+    "transaction_url": "https://explorer/tx/0x1",
+    "tbrtips": 1.5,
+    "usd_profit": 2.0,
+    "percent_profit": 10.0,
+    "query": "SpotPrice(eth, usd)",
+    "price_submitted": 3000.5,
+}
+
+
+@pytest.mark.parametrize("data", ["Transaction failed", REPORT])
+def test_submit_or_not_queues_message(monkeypatch, data):
+    webhook = StubWebhook()
+    monkeypatch.setattr(discord, "dispatcher", make_dispatcher(webhook, linger=0))
+
+    assert "Queued" in discord.submit_or_not(data.copy() if isinstance(data, dict) else data)
+    assert discord.dispatcher.flush()
+    assert "Notification" in webhook.accepted[0]
@@ -0,0 +1,114 @@
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from telliot_feeds.pricing.price_service import WebPriceService
+from telliot_feeds.pricing.price_source import PriceSource
+from telliot_feeds.sources.price_aggregator import PriceAggregator
+from telliot_feeds.utils.http_client import HTTPClient
+from telliot_feeds.utils.http_client import HTTPClientConfig
+
+
+DELAY = 0.2
+
+
+@pytest_asyncio.fixture(scope="function")
+async def stub_server():
+    """Local HTTP server answering every price request after a fixed delay"""
+    calls = {"price": 0, "flaky": 0}
+
+    async def price(request):
+        calls["price"] += 1
+        await asyncio.sleep(DELAY)
+        return web.json_response({"price": float(request.match_info["value"])})
+
+    async def flaky(request):
+        calls["flaky"] += 1
+        if calls["flaky"] == 1:
+            await asyncio.sleep(1)
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/price/{value}", price)
+    app.router.add_get("/flaky", flaky)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    yield f"http://127.0.0.1:{port}", calls
+
+    await runner.cleanup()
+
+
+class StubPriceService(WebPriceService):
+    async def get_price(self, asset, currency):
+        d = await self.get_url(f"/price/{asset}")
+        if "error" in d:
+            return None, None
+        return d["response"]["price"], time.time()
+
+
+@pytest.mark.asyncio
+async def test_sources_fetch_concurrently(stub_server):
+    """A median over several sources takes as long as one request, not the sum"""
+    url, calls = stub_server
+    sources = [
+        PriceSource(asset=str(v), currency="usd", service=StubPriceService(name="stub", url=url))
+        for v in (1.0, 2.0, 3.0, 4.0, 5.0)
+    ]
+    agg = PriceAggregator(asset="stub", currency="usd", algorithm="median", sources=sources)
+
+    start = time.perf_counter()
+    v, _ = await agg.fetch_new_datapoint()
+    elapsed = time.perf_counter() - start
+
+    assert v == 3.0
+    assert calls["price"] == 5
+    assert elapsed < DELAY * 3
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused(stub_server):
+    url, _ = stub_server
+    client = HTTPClient()
+
+    await client.get(f"{url}/price/1")
+    session = client.session()
+    await client.get(f"{url}/price/2")
+
+    assert client.session() is session
+    await client.close()
+    assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_retry(stub_server):
+    url, calls = stub_server
+    client = HTTPClient(HTTPClientConfig(timeout=0.3, retries=1, backoff=0.01))
+
+    result = await client.get(f"{url}/flaky")
+
+    assert result == {"response": {"ok": True}, "status": 200}
+    assert calls["flaky"] == 2
+
+    result = await client.get(f"{url}/price/1", timeout=0.01, retries=0)
+    assert result["error"] == "Timeout Error"
+    await client.close()
+
+
+def test_sessions_of_closed_loops_are_dropped():
+    client = HTTPClient()
+
+    async def open_session():
+        return client.session()
+
+    first = asyncio.run(open_session())
+    second = asyncio.run(open_session())
+
+    assert second is not first
+    assert list(client._sessions.values()) == [second]
@@ -0,0 +1,147 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from telliot_feeds.utils.metrics import CONTENT_TYPE
+from telliot_feeds.utils.metrics import Histogram
+from telliot_feeds.utils.metrics import Metrics
+from telliot_feeds.utils.metrics import REPORT_STAGE
+from telliot_feeds.utils.metrics import RPC_ERRORS
+from telliot_feeds.utils.metrics import RPC_REQUESTS
+
+
+def test_histogram_quantiles():
+    histogram = Histogram((1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0, 10.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.count == 5
+    assert histogram.sum == 16.5
+    # 2.5 observations rank within the (1, 2] bucket holding 2 of them
+    assert histogram.quantile(0.5) == pytest.approx(1.75)
+    assert histogram.quantile(0.99) == 4.0
+    assert Histogram((1.0,)).quantile(0.5) is None
+
+    later = histogram.since(None)
+    later.observe(0.1)
+    assert later.since(histogram).counts == [1, 0, 0, 0]
+
+
+def test_span_records_latency_and_failures():
+    metrics = Metrics()
+    with metrics.stage("ensure_staked"):
+        pass
+    with metrics.stage("ensure_staked") as span:
+        span.failed = True
+    with pytest.raises(ValueError):
+        with metrics.stage("ensure_staked"):
+            raise ValueError("boom")
+
+    assert metrics.histogram(f"{REPORT_STAGE}_seconds", stage="ensure_staked").count == 3
+    assert metrics.counter(f"{REPORT_STAGE}_failures", stage="ensure_staked") == 2
+    assert span.seconds is not None
+
+
+@pytest.mark.asyncio
+async def test_cancelled_span_counts_as_failure_without_latency():
+    metrics = Metrics()
+
+    async def slow():
+        with metrics.stage("fetch_datafeed"):
+            await asyncio.sleep(10)
+
+    task = asyncio.ensure_future(slow())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert metrics.histogram(f"{REPORT_STAGE}_seconds", stage="fetch_datafeed") is None
+    assert metrics.counter(f"{REPORT_STAGE}_failures", stage="fetch_datafeed") == 1
+
+
+def test_rpc_middleware_counts_requests_and_errors():
+    metrics = Metrics()
+    responses = {"eth_call": {"result": "0x"}, "eth_chainId": {"error": {"code": -32000}}}
+
+    def make_request(method, params):
+        if method == "eth_sendRawTransaction":
+            raise ConnectionError("down")
+        return responses[method]
+
+    middleware = metrics.rpc_middleware(make_request, None)
+    middleware("eth_call", [])
+    middleware("eth_call", [])
+    middleware("eth_chainId", [])
+    with pytest.raises(ConnectionError):
+        middleware("eth_sendRawTransaction", [])
+
+    assert metrics.counter(RPC_REQUESTS, method="eth_call") == 2
+    assert metrics.counter(RPC_ERRORS, method="eth_call") == 0
+    assert metrics.counter(RPC_ERRORS, method="eth_chainId") == 1
+    assert metrics.counter(RPC_ERRORS, method="eth_sendRawTransaction") == 1
+
+
+def test_render_openmetrics():
+    metrics = Metrics(buckets=(0.5, 1.0))
+    metrics.observe(f"{REPORT_STAGE}_seconds", 0.75, stage="build_transaction")
+    metrics.inc(f"{REPORT_STAGE}_failures", stage="build_transaction")
+    metrics.inc(RPC_REQUESTS, amount=3, method='eth_"call"')
+
+    assert metrics.render().splitlines() == [
+        "# TYPE telliot_report_stage_seconds histogram",
+        "# HELP telliot_report_stage_seconds Duration of reporter stages",
+        'telliot_report_stage_seconds_bucket{stage="build_transaction",le="0.5"} 0',
+        'telliot_report_stage_seconds_bucket{stage="build_transaction",le="1.0"} 1',
+        'telliot_report_stage_seconds_bucket{stage="build_transaction",le="+Inf"} 1',
+        'telliot_report_stage_seconds_sum{stage="build_transaction"} 0.75',
+        'telliot_report_stage_seconds_count{stage="build_transaction"} 1',
+        "# TYPE telliot_report_stage_failures counter",
+        "# HELP telliot_report_stage_failures Reporter stages that raised or returned an error status",
+        'telliot_report_stage_failures_total{stage="build_transaction"} 1',
+        "# TYPE telliot_rpc_requests counter",
+        "# HELP telliot_rpc_requests JSON-RPC requests by method",
+        'telliot_rpc_requests_total{method="eth_\\"call\\""} 3',
+        "# EOF",
+    ]
+
+
+def test_summary_covers_time_since_previous_summary():
+    metrics = Metrics()
+    metrics.observe(f"{REPORT_STAGE}_seconds", 0.2, stage="ensure_profitable")
+    metrics.inc(f"{REPORT_STAGE}_failures", stage="ensure_profitable")
+    metrics.inc(RPC_REQUESTS, amount=5, method="eth_call")
+    metrics.inc(RPC_REQUESTS, amount=2, method="eth_blockNumber")
+
+    summary = metrics.summary()
+    assert "stages: ensure_profitable n=1" in summary
+    assert "failed=1" in summary
+    assert "rpc: 7 requests (eth_call=5 eth_blockNumber=2), 0 errors" in summary
+
+    metrics.inc(RPC_REQUESTS, method="eth_call")
+    summary = metrics.summary()
+    assert "stages" not in summary
+    assert "rpc: 1 requests (eth_call=1)" in summary
+
+
+@pytest.mark.asyncio
+async def test_serve_metrics():
+    metrics = Metrics()
+    metrics.inc(RPC_REQUESTS, method="eth_call")
+    # find a free port
+    server = await asyncio.start_server(lambda r, w: None, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+
+    await metrics.serve(port)
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                assert response.status == 200
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+                assert 'telliot_rpc_requests_total{method="eth_call"} 1' in await response.text()
+    finally:
+        await metrics.stop()
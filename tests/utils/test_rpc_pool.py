@@ -0,0 +1,136 @@
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from telliot_feeds.utils.rpc_pool import AllEndpointsFailed
+from telliot_feeds.utils.rpc_pool import RPCPool
+
+
+class StubNode(ThreadingHTTPServer):
+    """Local JSON-RPC server answering eth_blockNumber after a delay"""
+
+    def __init__(self, block_number, delay=0.0, error=None):
+        self.block_number = block_number
+        self.delay = delay
+        self.error = error
+        self.methods = []
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.methods.append(request["method"])
+        time.sleep(self.server.delay)
+        response = {"jsonrpc": "2.0", "id": request["id"]}
+        if self.server.error:
+            response["error"] = self.server.error
+        else:
+            response["result"] = hex(self.server.block_number)
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def dead_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+@pytest.fixture
+def nodes():
+    started = []
+
+    def start(*args, **kwargs):
+        node = StubNode(*args, **kwargs)
+        started.append(node)
+        return node
+
+    yield start
+    for node in started:
+        node.shutdown()
+        node.server_close()
+
+
+def test_fails_over_to_next_endpoint(nodes):
+    node = nodes(7)
+    pool = RPCPool([dead_url(), node.url], timeout=2)
+
+    assert pool.make_request("eth_blockNumber", [])["result"] == "0x7"
+    health = pool.health()
+    assert [h["url"] for h in health] == [node.url, pool.stats[0].url]
+    assert not health[1]["healthy"]
+    assert health[1]["error_rate"] == 1.0
+
+    # the failed endpoint is in cooldown and no longer tried first
+    pool.make_request("eth_blockNumber", [])
+    assert pool.stats[0].requests == 1
+    assert pool.isConnected()
+
+
+def test_prefers_faster_endpoint(nodes):
+    slow = nodes(1, delay=0.2)
+    fast = nodes(2)
+    pool = RPCPool([slow.url, fast.url])
+
+    results = [pool.make_request("eth_blockNumber", [])["result"] for _ in range(5)]
+    # both are measured once, then only the fast one is used
+    assert results.count("0x2") == 4
+    assert len(slow.methods) == 1
+    assert pool.health()[0]["url"] == fast.url
+
+
+def test_rate_limited_endpoint_is_skipped(nodes):
+    limited = nodes(1, error={"code": -32005, "message": "limit exceeded"})
+    node = nodes(2)
+    pool = RPCPool([limited.url, node.url])
+
+    assert pool.make_request("eth_blockNumber", [])["result"] == "0x2"
+    assert pool.stats[0].failures == 1
+
+
+def test_request_errors_are_not_failover(nodes):
+    reverting = nodes(1, error={"code": -32000, "message": "execution reverted"})
+    node = nodes(2)
+    pool = RPCPool([reverting.url, node.url])
+
+    assert pool.make_request("eth_call", [])["error"]["message"] == "execution reverted"
+    assert node.methods == []
+
+
+def test_all_endpoints_failed():
+    pool = RPCPool([dead_url(), dead_url()], timeout=1)
+    with pytest.raises(AllEndpointsFailed):
+        pool.make_request("eth_blockNumber", [])
+    assert not pool.isConnected()
+
+
+def test_race_reads(nodes):
+    slow = nodes(1, delay=0.5)
+    fast = nodes(2)
+    pool = RPCPool([slow.url, fast.url], race_reads=True)
+
+    start = time.monotonic()
+    assert pool.make_request("eth_blockNumber", [])["result"] == "0x2"
+    assert time.monotonic() - start < 0.4
+
+    # writes go to a single endpoint
+    pool.make_request("eth_sendRawTransaction", ["0x"])
+    assert fast.methods.count("eth_sendRawTransaction") + slow.methods.count("eth_sendRawTransaction") == 1
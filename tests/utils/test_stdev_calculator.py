@@ -0,0 +1,33 @@
+from statistics import stdev
+
+import pytest
+
+from telliot_feeds.utils.stdev_calculator import pct_returns
+from telliot_feeds.utils.stdev_calculator import stdev_calculator
+from telliot_feeds.utils.stdev_calculator import trailing_volatilities
+from telliot_feeds.utils.stdev_calculator import volatility_table
+
+
+PRICES = [1800.0, 1850.5, 1790.2, 1820.0, 1905.3, 1880.1, 1875.0, 1930.8]
+
+
+def test_trailing_volatilities_match_stdev_of_returns():
+    returns = pct_returns(PRICES)
+    volatilities = trailing_volatilities(PRICES, [2, 5, 7])
+    for window in (2, 5, 7):
+        assert volatilities[window] == pytest.approx(stdev(returns[-window:]), rel=1e-9)
+    assert stdev_calculator(PRICES) == pytest.approx(stdev(returns), rel=1e-9)
+
+
+def test_unavailable_windows():
+    assert trailing_volatilities(PRICES, [1, 8]) == {1: None, 8: None}
+    assert trailing_volatilities([1.0, 0.0, 2.0], [2]) == {2: None}
+    with pytest.raises(ValueError):
+        stdev_calculator([1.0, 2.0])
+
+
+def test_volatility_table():
+    table = volatility_table({"eth": PRICES, "btc": PRICES[::-1]}, [3, 7])
+    assert set(table) == {"eth", "btc"}
+    assert table["eth"][7] == pytest.approx(stdev_calculator(PRICES))
+    assert table["btc"][3] == pytest.approx(stdev(pct_returns(PRICES[::-1])[-3:]))